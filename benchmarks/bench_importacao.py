@@ -0,0 +1,114 @@
+"""
+Benchmark do tempo de inicialização do bot: quanto custa `import bot`.
+
+O bot é importado em um interpretador novo com `python -X importtime`, e a saída é
+usada para medir o tempo acumulado da importação e listar os módulos mais caros.
+As dependências pesadas (pandas, reportlab, o plugin do Gmail) só devem ser
+importadas quando usadas; se alguma delas for carregada por `import bot`, ou se o
+tempo total passar do orçamento, o programa termina com erro.
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.bench_importacao
+    python -m benchmarks.bench_importacao --orcamento-ms 250 --repeticoes 5
+
+Developer's Note:
+    O tempo de cada importação varia bastante entre execuções (cache do sistema de
+    arquivos, `__pycache__`), por isso vale o menor tempo entre as repetições. Ao
+    mover uma importação pesada para o topo de um módulo importado por `bot.py`,
+    este benchmark acusa o módulo em `MODULOS_PESADOS`.
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+from typing import Dict, List, Optional, Tuple
+
+# Módulos que `import bot` não deve carregar.
+MODULOS_PESADOS = ("pandas", "numpy", "reportlab", "botcity.plugins.gmail", "googleapiclient")
+# Orçamento padrão para `import bot`, em milissegundos.
+ORCAMENTO_PADRAO_MS = 300
+
+# Linha da saída do `-X importtime`: "import time: self | cumulative | módulo"
+_LINHA = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+_RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def medir_importacao(modulo: str = "bot") -> Dict[str, Tuple[int, int]]:
+    """Importa um módulo em um interpretador novo e lê os tempos de importação.
+
+    Args:
+        modulo (str): O módulo importado.
+
+    Returns:
+        Dict[str, Tuple[int, int]]: O tempo próprio e o acumulado, em microssegundos,
+            de cada módulo importado.
+    """
+    processo = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {modulo}"],
+        cwd=_RAIZ, capture_output=True, text=True, check=True
+    )
+    tempos = {}
+    for linha in processo.stderr.splitlines():
+        encontrado = _LINHA.match(linha)
+        if encontrado:
+            proprio, acumulado, _, nome = encontrado.groups()
+            tempos[nome] = (int(proprio), int(acumulado))
+    return tempos
+
+
+def pesados_importados(tempos: Dict[str, Tuple[int, int]]) -> List[str]:
+    """Lista os módulos de `MODULOS_PESADOS` que foram importados.
+
+    Args:
+        tempos (Dict[str, Tuple[int, int]]): O resultado de `medir_importacao`.
+
+    Returns:
+        List[str]: Os módulos pesados encontrados.
+    """
+    return [pesado for pesado in MODULOS_PESADOS if pesado in tempos]
+
+
+def main(argumentos: Optional[List[str]] = None) -> int:
+    """Ponto de entrada do benchmark.
+
+    Args:
+        argumentos (Optional[List[str]]): Os argumentos da linha de comando.
+
+    Returns:
+        int: 0 se a importação couber no orçamento, 1 caso contrário.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--modulo", default="bot", help="O módulo importado.")
+    parser.add_argument("--orcamento-ms", type=float, default=ORCAMENTO_PADRAO_MS,
+                        help="Tempo máximo aceito para a importação, em milissegundos.")
+    parser.add_argument("--repeticoes", type=int, default=3,
+                        help="Quantas vezes a importação é medida (vale o menor tempo).")
+    parser.add_argument("--top", type=int, default=10,
+                        help="Quantos módulos mais caros são listados.")
+    args = parser.parse_args(argumentos)
+
+    medicoes = [medir_importacao(args.modulo) for _ in range(max(args.repeticoes, 1))]
+    tempos = min(medicoes, key=lambda t: t.get(args.modulo, (0, 0))[1])
+    total_ms = tempos[args.modulo][1] / 1000
+
+    print(f"import {args.modulo}: {total_ms:.1f} ms (orçamento: {args.orcamento_ms:.0f} ms)")
+    mais_caros = sorted(tempos.items(), key=lambda item: item[1][1], reverse=True)
+    for nome, (_, acumulado) in mais_caros[1:args.top + 1]:
+        print(f"  {acumulado / 1000:8.1f} ms  {nome}")
+
+    falhou = False
+    pesados = pesados_importados(tempos)
+    if pesados:
+        print("ERRO: módulos pesados importados na inicialização: " + ", ".join(pesados))
+        falhou = True
+    if total_ms > args.orcamento_ms:
+        print("ERRO: a importação passou do orçamento.")
+        falhou = True
+    return 1 if falhou else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,199 @@
+"""
+Benchmark e verificação da caixa de saída do Maestro contra um Maestro local.
+
+As chamadas passam pelo `BotMaestroSDK` de verdade, até o servidor de
+`maestro_local.py`, que simula latência de rede e respostas de erro. São medidos e
+conferidos:
+
+- `direto`: um alerta por turma com falha, enviado pelo SDK, como o lote fazia antes.
+  O tempo é todo gasto pelo bot, esperando a rede.
+- `caixa_de_saida`: os mesmos alertas pela caixa de saída. Mede-se o tempo gasto pelo
+  bot para registrá-los e o tempo até tudo chegar ao Maestro, e confere-se que os
+  alertas viraram um único resumo, enviado antes da finalização da tarefa.
+- `rede_instavel`: com parte das respostas com erro, todas as chamadas chegam e a
+  finalização continua sendo a última.
+- `maestro_fora_do_ar`: com o Maestro fora do ar, as chamadas ficam no banco e são
+  enviadas pela execução seguinte.
+- `final_do_log`: um erro com um log grande anexa apenas o final do log.
+
+O programa termina com erro se alguma verificação falhar. A durabilidade, a ordem
+por tarefa e o resumo dos alertas também são conferidos, sem rede, pelos testes em
+`tests/test_caixa_de_saida.py`; este benchmark os repete pelo SDK de verdade.
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.bench_maestro
+    python -m benchmarks.bench_maestro --turmas 200 --latencia 0.02
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from typing import List, Optional
+from botcity.maestro import AlertType, AutomationTaskFinishStatus
+
+from benchmarks.fakes import configuracao_falsa
+from benchmarks.maestro_local import MaestroLocal
+from src.notificacao.caixa_de_saida import CaixaDeSaidaDoMaestro
+
+TASK_ID = "bench"
+
+
+def _caixa(maestro, diretorio: str, **parametros) -> CaixaDeSaidaDoMaestro:
+    """Cria uma caixa de saída com o banco em `diretorio`.
+
+    Args:
+        maestro: O SDK (ou o que houver no lugar dele).
+        diretorio (str): O diretório do banco.
+        **parametros: Parâmetros da automação a substituir.
+
+    Returns:
+        CaixaDeSaidaDoMaestro: A caixa de saída, com espera curta entre tentativas.
+    """
+    config = configuracao_falsa({
+        "PATH_TO_CAIXA_DE_SAIDA": os.path.join(diretorio, "caixa_de_saida.sqlite3"),
+        **parametros
+    }, task_id=TASK_ID)
+    return CaixaDeSaidaDoMaestro(maestro, config, espera_inicial=0.05)
+
+
+def _falhas_do_lote(caixa, turmas: int):
+    """Registra uma falha por turma e a finalização da tarefa, como no fim de um lote."""
+    for turma in range(turmas):
+        caixa.agrupar_alerta(TASK_ID, "Falhas no lote", f"Turma {turma}", "SMTPException: recusado", AlertType.WARN)
+    caixa.finish_task(TASK_ID, AutomationTaskFinishStatus.PARTIALLY_COMPLETED, "Lote concluído.")
+
+
+def direto(turmas: int, latencia: float) -> List[str]:
+    """Envia um alerta por turma diretamente pelo SDK."""
+    with MaestroLocal(latencia=latencia) as servidor:
+        maestro = servidor.sdk()
+        inicio = time.perf_counter()
+        for turma in range(turmas):
+            maestro.alert(task_id=TASK_ID, title=f"Falha na turma {turma}",
+                          message="SMTPException: recusado", alert_type=AlertType.WARN)
+        maestro.finish_task(TASK_ID, AutomationTaskFinishStatus.PARTIALLY_COMPLETED, "Lote concluído.")
+        tempo = time.perf_counter() - inicio
+        print(f"direto:             bot bloqueado {tempo:7.3f} s | {len(servidor.requisicoes)} requisições")
+    return []
+
+
+def caixa_de_saida(turmas: int, latencia: float, diretorio: str) -> List[str]:
+    """Envia os mesmos alertas pela caixa de saída."""
+    problemas = []
+    with MaestroLocal(latencia=latencia) as servidor:
+        caixa = _caixa(servidor.sdk(), diretorio)
+        inicio = time.perf_counter()
+        _falhas_do_lote(caixa, turmas)
+        registro = time.perf_counter() - inicio
+        caixa.encerrar()
+        total = time.perf_counter() - inicio
+        print(f"caixa_de_saida:     bot bloqueado {registro:7.3f} s | tudo enviado em {total:.3f} s | "
+              f"{len(servidor.requisicoes)} requisições")
+        rotas = [r["rota"] for r in servidor.requisicoes]
+        if rotas != ["alerts", f"task/{TASK_ID}"]:
+            problemas.append(f"caixa_de_saida: esperava um resumo e a finalização, recebeu {rotas}")
+        elif not servidor.requisicoes[0]["dados"]["title"].endswith(f"({turmas})"):
+            problemas.append("caixa_de_saida: o resumo não conta todas as turmas")
+    return problemas
+
+
+def rede_instavel(turmas: int, diretorio: str) -> List[str]:
+    """Com 40% das respostas com erro, todas as chamadas devem chegar, em ordem."""
+    problemas = []
+    with MaestroLocal(taxa_de_falhas=0.4) as servidor:
+        caixa = _caixa(servidor.sdk(), diretorio, MAESTRO_TENTATIVAS=20)
+        for turma in range(turmas):
+            caixa.alert(TASK_ID, f"Turma {turma}", "ok", AlertType.INFO)
+        caixa.finish_task(TASK_ID, AutomationTaskFinishStatus.SUCCESS, "ok")
+        caixa.encerrar()
+        alertas = [r["dados"]["title"] for r in servidor.recebidas("alerts")]
+        print(f"rede_instavel:      {len(alertas)} de {turmas} alertas entregues | "
+              f"última chamada: {servidor.requisicoes[-1]['rota'] if servidor.requisicoes else '-'}")
+        if alertas != [f"Turma {turma}" for turma in range(turmas)]:
+            problemas.append("rede_instavel: alertas perdidos ou fora de ordem")
+        if not servidor.requisicoes or servidor.requisicoes[-1]["rota"] != f"task/{TASK_ID}":
+            problemas.append("rede_instavel: a finalização não foi a última chamada")
+    return problemas
+
+
+def maestro_fora_do_ar(diretorio: str) -> List[str]:
+    """As chamadas feitas com o Maestro fora do ar devem ser enviadas na execução seguinte."""
+    problemas = []
+    with MaestroLocal() as servidor:
+        maestro = servidor.sdk()
+    # O servidor já foi parado: as conexões são recusadas.
+    caixa = _caixa(maestro, diretorio, MAESTRO_TEMPO_DE_ENCERRAMENTO=0.5)
+    caixa.alert(TASK_ID, "Relatório Enviado", "ok", AlertType.INFO)
+    caixa.finish_task(TASK_ID, AutomationTaskFinishStatus.SUCCESS, "ok")
+    caixa.encerrar()
+    pendentes = caixa.pendentes()
+
+    with MaestroLocal() as servidor:
+        maestro = servidor.sdk()
+        caixa = _caixa(maestro, diretorio)
+        caixa.encerrar()
+        rotas = [r["rota"] for r in servidor.requisicoes]
+    print(f"maestro_fora_do_ar: {pendentes} chamadas guardadas | entregues depois: {rotas}")
+    if pendentes != 2 or rotas != ["alerts", f"task/{TASK_ID}"]:
+        problemas.append("maestro_fora_do_ar: as chamadas guardadas não foram entregues na execução seguinte")
+    return problemas
+
+
+def final_do_log(diretorio: str) -> List[str]:
+    """Um erro com um log de 5 MB deve anexar apenas o final do log."""
+    problemas = []
+    log = os.path.join(diretorio, "log_grande.txt")
+    with open(log, "w", encoding="utf-8") as f:
+        linha = '{"nivel": "INFO", "mensagem": "' + "x" * 100 + '"}\n'
+        f.write(linha * (5 * 1024 * 1024 // len(linha)))
+        f.write('{"nivel": "ERROR", "mensagem": "a última linha"}\n')
+
+    with MaestroLocal() as servidor:
+        caixa = _caixa(servidor.sdk(), diretorio, MAESTRO_CAUDA_DO_LOG_KB=64)
+        caixa.error(TASK_ID, ValueError("falha de teste"), attachments=[log])
+        caixa.encerrar()
+        anexos = [r for r in servidor.recebidas("error/") if r["rota"].endswith("attachments")]
+        erros = servidor.recebidas("error")
+    # O SDK sempre anexa a lista de pacotes; o log é o último anexo.
+    tamanho = anexos[-1]["tamanho"] if anexos else 0
+    print(f"final_do_log:       log de {os.path.getsize(log) / 2**20:.1f} MB | anexo enviado com {tamanho / 1024:.0f} KB")
+    if not erros or erros[0]["dados"]["type"] != "ValueError":
+        problemas.append("final_do_log: o erro não chegou com o tipo original")
+    if not 0 < tamanho <= 70 * 1024:
+        problemas.append("final_do_log: o anexo não é apenas o final do log")
+    return problemas
+
+
+def main(argumentos: Optional[List[str]] = None) -> int:
+    """Ponto de entrada do benchmark.
+
+    Args:
+        argumentos (Optional[List[str]]): Os argumentos da linha de comando.
+
+    Returns:
+        int: 0 se todas as verificações passarem, 1 caso contrário.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--turmas", type=int, default=100, help="Quantidade de turmas com falha.")
+    parser.add_argument("--latencia", type=float, default=0.02, help="Latência do Maestro local, em segundos.")
+    args = parser.parse_args(argumentos)
+
+    problemas = direto(args.turmas, args.latencia)
+    for cenario in (
+        lambda d: caixa_de_saida(args.turmas, args.latencia, d),
+        lambda d: rede_instavel(20, d),
+        maestro_fora_do_ar,
+        final_do_log,
+    ):
+        with tempfile.TemporaryDirectory() as diretorio:
+            problemas += cenario(diretorio)
+
+    for problema in problemas:
+        print(f"ERRO: {problema}")
+    return 1 if problemas else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
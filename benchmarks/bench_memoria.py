@@ -0,0 +1,158 @@
+"""
+Benchmark da memória usada na geração do PDF conforme a turma cresce.
+
+Cada tamanho de tabela é medido em um processo novo: a tabela sintética é lida, e
+só então o relatório é gerado em disco enquanto uma thread amostra a memória (RSS)
+do processo. O que interessa é o pico acima da memória que o processo já usava
+antes da renderização.
+
+O reportlab só escreve o PDF no fim, então as páginas já prontas (comprimidas)
+ficam em memória: o pico não é constante, mas deve crescer no ritmo do tamanho do
+PDF, e não no das linhas formatadas. O programa termina com erro se o crescimento
+do pico entre o menor e o maior tamanho passar de `--fator-maximo` vezes o
+crescimento do PDF.
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.bench_memoria
+    python -m benchmarks.bench_memoria --linhas 5000 20000 80000 --fator-maximo 3
+
+Developer's Note:
+    A amostragem usa `rss_atual` (veja `src/relatorio/utils/memoria.py`), que só
+    mede a memória atual no Linux. Em outros sistemas, o resultado é o pico do
+    processo inteiro, inclusive a leitura da tabela.
+"""
+
+import argparse
+import contextlib
+import gc
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from typing import List, Optional
+
+# Tamanhos de tabela medidos por padrão.
+TAMANHOS_PADRAO = (5_000, 20_000, 80_000)
+# Intervalo entre as amostras de memória, em segundos.
+INTERVALO_DA_AMOSTRA = 0.01
+
+
+def medir_renderizacao(csv: str) -> dict:
+    """Gera o relatório de uma tabela e mede o pico de memória (roda no processo filho).
+
+    Args:
+        csv (str): O caminho da tabela de frequência.
+
+    Returns:
+        dict: O tempo, o tamanho do PDF e o pico de memória acima da base, em MB.
+    """
+    from benchmarks.fakes import configuracao_falsa
+    from src.dados.ler_tabela import ler_tabela_frequencia
+    from src.relatorio.gerar_relatorio import report
+    from src.relatorio.utils.memoria import rss_atual
+
+    df = ler_tabela_frequencia(csv)
+    config = configuracao_falsa({"CACHE_MAX_MB": 0})
+    gc.collect()
+    base = rss_atual() or 0
+    pico = base
+    parar = threading.Event()
+
+    def amostrar():
+        nonlocal pico
+        while not parar.wait(INTERVALO_DA_AMOSTRA):
+            pico = max(pico, rss_atual() or 0)
+
+    amostrador = threading.Thread(target=amostrar, daemon=True)
+    with tempfile.TemporaryDirectory() as diretorio:
+        pdf = os.path.join(diretorio, "relatorio.pdf")
+        amostrador.start()
+        inicio = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            report(config, pdf).given_report(df)
+        tempo = time.perf_counter() - inicio
+        parar.set()
+        amostrador.join()
+        tamanho_do_pdf = os.path.getsize(pdf)
+
+    return {
+        "linhas": len(df),
+        "tempo_s": round(tempo, 3),
+        "pdf_mb": round(tamanho_do_pdf / 2**20, 2),
+        "pico_acima_da_base_mb": round(max(pico - base, 0) / 2**20, 2),
+    }
+
+
+def medir_em_processo_novo(csv: str) -> dict:
+    """Executa `medir_renderizacao` em um interpretador novo.
+
+    Args:
+        csv (str): O caminho da tabela de frequência.
+
+    Returns:
+        dict: O resultado de `medir_renderizacao`.
+    """
+    raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    processo = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_memoria", "--filho", csv],
+        cwd=raiz, capture_output=True, text=True, check=True
+    )
+    return json.loads(processo.stdout.strip().splitlines()[-1])
+
+
+def main(argumentos: Optional[List[str]] = None) -> int:
+    """Ponto de entrada do benchmark.
+
+    Args:
+        argumentos (Optional[List[str]]): Os argumentos da linha de comando.
+
+    Returns:
+        int: 0 se a memória crescer no ritmo esperado, 1 caso contrário.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--linhas", type=int, nargs="+", default=list(TAMANHOS_PADRAO),
+                        help="Quantidades de linhas das tabelas sintéticas.")
+    parser.add_argument("--dados", default=os.path.join(tempfile.gettempdir(), "bench_frequencia"),
+                        help="Diretório dos CSVs sintéticos.")
+    parser.add_argument("--fator-maximo", type=float, default=3.0,
+                        help="Crescimento do pico aceito, em múltiplos do crescimento do PDF.")
+    parser.add_argument("--filho", help=argparse.SUPPRESS)
+    args = parser.parse_args(argumentos)
+
+    if args.filho:
+        print(json.dumps(medir_renderizacao(args.filho)))
+        return 0
+
+    from benchmarks.dados_sinteticos import gerar_csv_frequencia
+
+    os.makedirs(args.dados, exist_ok=True)
+    resultados = []
+    for linhas in sorted(args.linhas):
+        csv = os.path.join(args.dados, f"frequencia_{linhas}.csv")
+        if not os.path.exists(csv):
+            gerar_csv_frequencia(csv, linhas)
+        resultado = medir_em_processo_novo(csv)
+        resultados.append(resultado)
+        print(f"{linhas:>9} linhas | {resultado['tempo_s']:8.2f} s | PDF {resultado['pdf_mb']:7.2f} MB | "
+              f"pico acima da base {resultado['pico_acima_da_base_mb']:7.2f} MB")
+
+    if len(resultados) < 2:
+        return 0
+    menor, maior = resultados[0], resultados[-1]
+    crescimento_do_pdf = maior["pdf_mb"] - menor["pdf_mb"]
+    crescimento_do_pico = maior["pico_acima_da_base_mb"] - menor["pico_acima_da_base_mb"]
+    fator = crescimento_do_pico / crescimento_do_pdf if crescimento_do_pdf > 0 else 0.0
+    print(f"O pico cresceu {crescimento_do_pico:.2f} MB para {crescimento_do_pdf:.2f} MB a mais de PDF "
+          f"({fator:.2f}x; máximo: {args.fator_maximo:.2f}x).")
+    if fator > args.fator_maximo:
+        print("ERRO: a memória da renderização cresce mais rápido que o PDF.")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
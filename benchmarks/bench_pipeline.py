@@ -0,0 +1,266 @@
+"""
+Benchmark do caminho principal do bot: da leitura do CSV até o envio do PDF.
+
+Para cada tamanho de tabela, um CSV sintético é gerado (veja `dados_sinteticos.py`) e
+cada etapa é medida separadamente:
+
+- `leitura_e_validacao`: `ler_tabela_frequencia` (leitura em blocos e validação).
+- `linhas_da_tabela`: a formatação de todas as linhas da tabela, página por página,
+  como o reportlab as pede (`LinhasDaTabela.fatia`).
+- `given_report`: a geração completa do PDF, em memória.
+- `envio_email`: a montagem da mensagem com o PDF anexado e a entrega ao transporte
+  de e-mail falso, sem rede.
+
+Os resultados (tempo, linhas por segundo e pico de memória de cada etapa) são salvos
+em JSON. Com `--comparar`, eles são confrontados com um resultado anterior e o
+programa termina com erro se alguma etapa ficar mais lenta que a tolerância.
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.bench_pipeline --linhas 1000 100000 --saida resultados.json
+    python -m benchmarks.bench_pipeline --comparar resultados.json --tolerancia 0.2
+
+Developer's Note:
+    Para medir uma nova etapa, escreva uma função que receba o `Contexto` e a
+    acrescente a `ETAPAS`. O pico de memória é medido com `tracemalloc` em uma
+    segunda execução da etapa, para que o custo do rastreamento não distorça o tempo.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, List, Optional
+
+import pandas as pd
+import reportlab
+
+from benchmarks.dados_sinteticos import gerar_csv_frequencia
+from benchmarks.fakes import configuracao_falsa
+from src.dados.ler_tabela import ler_tabela_frequencia
+from src.relatorio.gerar_relatorio import report
+from src.relatorio.utils.linhas_tabela import LinhasDaTabela
+from src.send_email.send_email import enviar_relatorio, obter_enviador
+from settings import ConfiguracaoDaExecucao
+
+# Tamanhos de tabela medidos por padrão.
+TAMANHOS_PADRAO = (1_000, 100_000, 1_000_000)
+# Linhas formatadas por vez na etapa `linhas_da_tabela` (aprox. uma página do PDF).
+LINHAS_POR_FATIA = 40
+
+
+@dataclass
+class Contexto:
+    """Os dados compartilhados pelas etapas de um tamanho de tabela.
+
+    Attributes:
+        csv (str): O caminho do CSV sintético.
+        config (ConfiguracaoDaExecucao): A configuração local usada pelo bot.
+        df (Optional[pd.DataFrame]): A tabela lida, preenchida pela primeira etapa.
+        pdf (Optional[bytes]): O PDF gerado, preenchido pela etapa `given_report`.
+    """
+    csv: str
+    config: ConfiguracaoDaExecucao
+    df: Optional[pd.DataFrame] = None
+    pdf: Optional[bytes] = None
+
+
+@dataclass
+class Resultado:
+    """A medida de uma etapa para um tamanho de tabela.
+
+    Attributes:
+        etapa (str): O nome da etapa.
+        linhas (int): A quantidade de linhas da tabela.
+        tempo_s (float): O menor tempo entre as repetições, em segundos.
+        linhas_por_s (float): A vazão da etapa.
+        pico_memoria_mb (Optional[float]): O pico de memória alocada durante a etapa.
+    """
+    etapa: str
+    linhas: int
+    tempo_s: float
+    linhas_por_s: float
+    pico_memoria_mb: Optional[float]
+
+
+def etapa_leitura(contexto: Contexto):
+    """Lê e valida o CSV."""
+    contexto.df = ler_tabela_frequencia(contexto.csv)
+
+
+def etapa_linhas(contexto: Contexto):
+    """Formata todas as linhas da tabela, uma página por vez."""
+    linhas = LinhasDaTabela(contexto.df)
+    for inicio in range(0, len(linhas), LINHAS_POR_FATIA):
+        linhas.fatia(inicio, inicio + LINHAS_POR_FATIA)
+
+
+def etapa_relatorio(contexto: Contexto):
+    """Gera o PDF completo em memória."""
+    contexto.pdf = report(contexto.config, em_memoria=True).given_report(contexto.df)
+
+
+def etapa_envio(contexto: Contexto):
+    """Entrega o PDF ao transporte de e-mail falso."""
+    enviar_relatorio(contexto.config, conteudo=contexto.pdf)
+    # O transporte falso guarda as mensagens; descarta-as para não acumular PDFs.
+    obter_enviador(contexto.config).transporte.enviadas.clear()
+
+
+ETAPAS: Dict[str, Callable[[Contexto], None]] = {
+    "leitura_e_validacao": etapa_leitura,
+    "linhas_da_tabela": etapa_linhas,
+    "given_report": etapa_relatorio,
+    "envio_email": etapa_envio,
+}
+
+
+def medir(etapa: Callable[[Contexto], None], contexto: Contexto, repeticoes: int,
+          medir_memoria: bool) -> tuple:
+    """Mede o tempo e, opcionalmente, o pico de memória de uma etapa.
+
+    Args:
+        etapa (Callable[[Contexto], None]): A etapa a ser medida.
+        contexto (Contexto): Os dados da etapa.
+        repeticoes (int): Quantas vezes a etapa é cronometrada.
+        medir_memoria (bool): Se verdadeiro, a etapa é executada mais uma vez com
+            `tracemalloc` ativo.
+
+    Returns:
+        tuple: O menor tempo, em segundos, e o pico de memória em MB (ou `None`).
+    """
+    tempos = []
+    for _ in range(max(repeticoes, 1)):
+        inicio = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            etapa(contexto)
+        tempos.append(time.perf_counter() - inicio)
+
+    pico = None
+    if medir_memoria:
+        tracemalloc.start()
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                etapa(contexto)
+            pico = round(tracemalloc.get_traced_memory()[1] / (1024 * 1024), 2)
+        finally:
+            tracemalloc.stop()
+    return min(tempos), pico
+
+
+def executar(tamanhos: List[int], diretorio: str, repeticoes: int = 1,
+             medir_memoria: bool = True) -> List[Resultado]:
+    """Executa o benchmark para cada tamanho de tabela.
+
+    Args:
+        tamanhos (List[int]): As quantidades de linhas das tabelas.
+        diretorio (str): Onde os CSVs sintéticos são gerados (e reaproveitados).
+        repeticoes (int): Quantas vezes cada etapa é cronometrada.
+        medir_memoria (bool): Se verdadeiro, mede também o pico de memória.
+
+    Returns:
+        List[Resultado]: As medidas, por tamanho e etapa.
+    """
+    # Sem cache de tabelas, para medir sempre a leitura completa.
+    config = configuracao_falsa({"CACHE_MAX_MB": 0})
+    resultados = []
+    for linhas in tamanhos:
+        csv = os.path.join(diretorio, f"frequencia_{linhas}.csv")
+        if not os.path.exists(csv):
+            gerar_csv_frequencia(csv, linhas)
+        contexto = Contexto(csv=csv, config=config)
+        for nome, etapa in ETAPAS.items():
+            tempo, pico = medir(etapa, contexto, repeticoes, medir_memoria)
+            resultado = Resultado(nome, linhas, round(tempo, 4), round(linhas / tempo, 1), pico)
+            resultados.append(resultado)
+            print(f"{linhas:>9} linhas | {nome:<20} | {tempo:9.3f} s | "
+                  f"{resultado.linhas_por_s:>12,.0f} linhas/s | {pico if pico is not None else '-'} MB")
+    return resultados
+
+
+def comparar(resultados: List[Resultado], anterior: dict, tolerancia: float) -> List[str]:
+    """Lista as etapas que ficaram mais lentas que o resultado anterior.
+
+    Args:
+        resultados (List[Resultado]): As medidas atuais.
+        anterior (dict): O conteúdo de um arquivo de resultados anterior.
+        tolerancia (float): A piora relativa aceita (ex: 0.2 para 20%).
+
+    Returns:
+        List[str]: Uma descrição de cada regressão encontrada.
+    """
+    tempos_anteriores = {(r["linhas"], r["etapa"]): r["tempo_s"] for r in anterior.get("resultados", [])}
+    regressoes = []
+    for resultado in resultados:
+        tempo_anterior = tempos_anteriores.get((resultado.linhas, resultado.etapa))
+        if tempo_anterior and resultado.tempo_s > tempo_anterior * (1 + tolerancia):
+            regressoes.append(
+                f"{resultado.etapa} com {resultado.linhas} linhas: "
+                f"{tempo_anterior:.3f} s -> {resultado.tempo_s:.3f} s"
+            )
+    return regressoes
+
+
+def _ambiente() -> dict:
+    """Descreve o ambiente em que o benchmark foi executado."""
+    return {
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "reportlab": reportlab.Version,
+        "plataforma": platform.platform(),
+        "processadores": os.cpu_count(),
+    }
+
+
+def main(argumentos: Optional[List[str]] = None) -> int:
+    """Ponto de entrada do benchmark.
+
+    Args:
+        argumentos (Optional[List[str]]): Os argumentos da linha de comando.
+
+    Returns:
+        int: 0 se não houver regressões, 1 caso contrário.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--linhas", type=int, nargs="+", default=list(TAMANHOS_PADRAO),
+                        help="Quantidades de linhas das tabelas sintéticas.")
+    parser.add_argument("--repeticoes", type=int, default=1,
+                        help="Quantas vezes cada etapa é cronometrada (vale o menor tempo).")
+    parser.add_argument("--sem-memoria", action="store_true",
+                        help="Não mede o pico de memória (economiza uma execução por etapa).")
+    parser.add_argument("--dados", default=os.path.join(tempfile.gettempdir(), "bench_frequencia"),
+                        help="Diretório dos CSVs sintéticos.")
+    parser.add_argument("--saida", default="resultados_benchmark.json",
+                        help="Arquivo JSON com os resultados.")
+    parser.add_argument("--comparar", help="Arquivo JSON de uma execução anterior.")
+    parser.add_argument("--tolerancia", type=float, default=0.2,
+                        help="Piora relativa de tempo aceita na comparação.")
+    args = parser.parse_args(argumentos)
+
+    anterior = None
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as f:
+            anterior = json.load(f)
+
+    resultados = executar(args.linhas, args.dados, args.repeticoes, not args.sem_memoria)
+    with open(args.saida, "w", encoding="utf-8") as f:
+        json.dump({"ambiente": _ambiente(), "resultados": [asdict(r) for r in resultados]},
+                  f, ensure_ascii=False, indent=2)
+    print(f"Resultados salvos em {args.saida}")
+
+    if anterior is not None:
+        regressoes = comparar(resultados, anterior, args.tolerancia)
+        for regressao in regressoes:
+            print(f"REGRESSÃO: {regressao}")
+        return 1 if regressoes else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
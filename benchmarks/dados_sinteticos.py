@@ -0,0 +1,110 @@
+"""
+Este módulo gera tabelas de frequência sintéticas para os benchmarks.
+
+As tabelas têm o mesmo formato de `resources/frequenciaTurmaA.csv`: uma coluna com o
+nome do aluno e uma coluna por dia de aula, com "P" (presente) ou "F" (falta). Outras
+colunas, de outros tipos, podem ser acrescentadas para exercitar a inferência de tipos
+e os formatadores da tabela.
+
+Developer's Note:
+    O arquivo é escrito em blocos, então tabelas com milhões de linhas não precisam
+    caber em memória. A semente fixa garante que execuções diferentes do benchmark
+    meçam exatamente os mesmos dados.
+"""
+
+import os
+from datetime import date, timedelta
+from typing import Dict, List, Optional
+import numpy as np
+import pandas as pd
+
+# Linhas geradas e escritas por vez.
+LINHAS_POR_BLOCO = 100_000
+
+# Tipos aceitos para as colunas extras.
+TIPOS_DE_COLUNA = ("presenca", "texto", "inteiro", "real", "booleano")
+
+
+def gerar_csv_frequencia(caminho: str, linhas: int, dias: int = 20,
+                         extras: Optional[Dict[str, str]] = None,
+                         taxa_de_faltas: float = 0.1, semente: int = 0) -> str:
+    """Gera um CSV de frequência sintético.
+
+    Args:
+        caminho (str): O caminho do arquivo CSV a ser gerado.
+        linhas (int): A quantidade de alunos (linhas de dados).
+        dias (int): A quantidade de colunas de dias de aula.
+        extras (Optional[Dict[str, str]]): Colunas adicionais, por nome, com um dos
+            tipos de `TIPOS_DE_COLUNA`.
+        taxa_de_faltas (float): A probabilidade de cada célula de presença ser "F".
+        semente (int): A semente do gerador de números aleatórios.
+
+    Returns:
+        str: O caminho do arquivo gerado.
+
+    Raises:
+        ValueError: Se o tipo de alguma coluna extra não for conhecido.
+    """
+    extras = extras or {}
+    for nome, tipo in extras.items():
+        if tipo not in TIPOS_DE_COLUNA:
+            raise ValueError(f"Tipo de coluna desconhecido para '{nome}': {tipo}")
+
+    diretorio = os.path.dirname(caminho)
+    if diretorio:
+        os.makedirs(diretorio, exist_ok=True)
+
+    rng = np.random.default_rng(semente)
+    colunas_dos_dias = _nomes_dos_dias(dias)
+    with open(caminho, "w", encoding="utf-8", newline="") as f:
+        for inicio in range(0, max(linhas, 1), LINHAS_POR_BLOCO):
+            quantidade = min(LINHAS_POR_BLOCO, linhas - inicio)
+            if quantidade <= 0:
+                break
+            bloco = {"Aluno": [f"Aluno {i:07d}" for i in range(inicio, inicio + quantidade)]}
+            for coluna in colunas_dos_dias:
+                bloco[coluna] = _coluna(rng, "presenca", quantidade, taxa_de_faltas)
+            for nome, tipo in extras.items():
+                bloco[nome] = _coluna(rng, tipo, quantidade, taxa_de_faltas)
+            pd.DataFrame(bloco).to_csv(f, index=False, header=(inicio == 0))
+    return caminho
+
+
+def _nomes_dos_dias(dias: int) -> List[str]:
+    """Retorna os nomes das colunas de dias de aula (ex: '01/03', '04/03').
+
+    Args:
+        dias (int): A quantidade de dias de aula.
+
+    Returns:
+        List[str]: Os nomes das colunas, apenas com dias úteis.
+    """
+    nomes, dia = [], date(2024, 3, 1)
+    while len(nomes) < dias:
+        if dia.weekday() < 5:
+            nomes.append(dia.strftime("%d/%m"))
+        dia += timedelta(days=1)
+    return nomes
+
+
+def _coluna(rng: np.random.Generator, tipo: str, quantidade: int, taxa_de_faltas: float) -> np.ndarray:
+    """Gera os valores de uma coluna sintética.
+
+    Args:
+        rng (np.random.Generator): O gerador de números aleatórios.
+        tipo (str): Um dos tipos de `TIPOS_DE_COLUNA`.
+        quantidade (int): A quantidade de valores.
+        taxa_de_faltas (float): A probabilidade de uma falta, nas colunas de presença.
+
+    Returns:
+        np.ndarray: Os valores da coluna.
+    """
+    if tipo == "presenca":
+        return np.where(rng.random(quantidade) < taxa_de_faltas, "F", "P")
+    if tipo == "texto":
+        return rng.choice(np.array(["Manhã", "Tarde", "Noite"]), quantidade)
+    if tipo == "inteiro":
+        return rng.integers(0, 100, quantidade)
+    if tipo == "real":
+        return rng.random(quantidade).round(4)
+    return rng.random(quantidade) < 0.5
@@ -0,0 +1,100 @@
+"""
+Este módulo fornece substitutos locais do Maestro (e do log) para os benchmarks e os testes.
+
+Com eles, o bot pode ser executado sem um servidor do BotCity Orquestrador: a
+execução da tarefa é montada localmente com os parâmetros desejados e as chamadas ao
+Maestro são apenas registradas.
+
+Developer's Note:
+    Para rodar o `bot.main` inteiro localmente, substitua `BotMaestroSDK.from_sys_args`
+    por uma função que devolva um `MaestroFalso` (veja `bench_pipeline.py`).
+"""
+
+from typing import Dict, List, Optional, Tuple
+from botcity.maestro import BotExecution
+import settings as s
+
+# Parâmetros obrigatórios preenchidos com valores fictícios.
+PARAMETROS_PADRAO = {
+    "EMAIL_PESSOAL": "robo@exemplo.com",
+    "EMAIL_DESTINATARIO": "professor@exemplo.com",
+    "ASSUNTO_EMAIL": "Relatório de frequência (benchmark)",
+    "EMAIL_TRANSPORTE": "falso",
+}
+
+
+def execucao_falsa(parametros: Optional[Dict[str, object]] = None, task_id: str = "benchmark") -> BotExecution:
+    """Cria uma execução de tarefa local, sem o Maestro.
+
+    Args:
+        parametros (Optional[Dict[str, object]]): Os parâmetros da automação. Eles
+            se somam a `PARAMETROS_PADRAO`, substituindo-os quando repetidos.
+        task_id (str): O identificador da tarefa.
+
+    Returns:
+        BotExecution: A execução com os parâmetros informados.
+    """
+    return BotExecution("local", task_id, "", {**PARAMETROS_PADRAO, **(parametros or {})})
+
+
+def configuracao_falsa(parametros: Optional[Dict[str, object]] = None,
+                       task_id: str = "benchmark") -> s.ConfiguracaoDaExecucao:
+    """Cria a configuração de uma execução local, sem o Maestro.
+
+    Args:
+        parametros (Optional[Dict[str, object]]): Os parâmetros da automação (veja
+            `execucao_falsa`).
+        task_id (str): O identificador da tarefa.
+
+    Returns:
+        s.ConfiguracaoDaExecucao: A configuração já resolvida e validada.
+    """
+    return s.resolver_configuracao(execucao_falsa(parametros, task_id))
+
+
+class MaestroFalso:
+    """Imita o `BotMaestroSDK`, registrando as chamadas em vez de enviá-las.
+
+    Attributes:
+        execucao (BotExecution): A execução devolvida por `get_execution`.
+        chamadas (List[Tuple[str, dict]]): As chamadas feitas, na ordem, com o nome
+            do método e os argumentos nomeados.
+    """
+    def __init__(self, execucao: BotExecution):
+        """Inicializa a classe MaestroFalso.
+
+        Args:
+            execucao (BotExecution): A execução devolvida por `get_execution`.
+        """
+        self.execucao = execucao
+        self.chamadas: List[Tuple[str, dict]] = []
+
+    def get_execution(self, *args, **kwargs) -> BotExecution:
+        """Retorna a execução local."""
+        return self.execucao
+
+    def __getattr__(self, nome: str):
+        """Retorna um método falso que apenas registra a chamada (ex: `alert`)."""
+        if nome.startswith("_"):
+            raise AttributeError(nome)
+
+        def registrar(*args, **kwargs):
+            self.chamadas.append((nome, kwargs))
+
+        return registrar
+
+
+class LogFalso:
+    """Imita o `LogFile`, guardando as mensagens em memória.
+
+    Attributes:
+        mensagens (List[Tuple[str, str]]): As mensagens registradas, na ordem, com o
+            nível e o texto.
+    """
+    def __init__(self):
+        """Inicializa a classe LogFalso."""
+        self.mensagens: List[Tuple[str, str]] = []
+
+    def log_message(self, contents: str, level: str = "INFO"):
+        """Guarda uma mensagem."""
+        self.mensagens.append((level, contents))
@@ -0,0 +1,173 @@
+"""
+Este módulo fornece um servidor HTTP local que imita a API do BotCity Maestro.
+
+Diferente do `MaestroFalso` (veja `fakes.py`), que substitui o SDK, este servidor é
+usado pelo próprio `BotMaestroSDK`: as chamadas passam pelo `requests` e pela rede
+local, como em produção. Ele registra cada requisição recebida e pode simular uma
+rede ruim, com latência e uma fração de respostas de erro.
+
+Uso:
+    with MaestroLocal(latencia=0.05, taxa_de_falhas=0.3) as servidor:
+        maestro = servidor.sdk()
+        maestro.alert(task_id="1", title="Teste", message="...", alert_type=AlertType.INFO)
+        print(servidor.recebidas("alerts"))
+
+Developer's Note:
+    Só as rotas usadas pelo bot são implementadas (alertas, erros e seus anexos,
+    artefatos e a finalização da tarefa). As demais respondem 404.
+"""
+
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional
+from botcity.maestro import BotMaestroSDK
+
+# Versão informada ao SDK, alta o bastante para liberar todos os métodos.
+VERSAO = "999.0.0"
+
+
+class _Atendimento(BaseHTTPRequestHandler):
+    """Responde às requisições do SDK como o Maestro responderia."""
+
+    def log_message(self, *args):
+        """Não imprime uma linha por requisição."""
+
+    def do_GET(self):
+        """Responde à consulta da versão do Maestro."""
+        if self.path == "/api/v2/maestro/version":
+            self._responder(200, {"version": VERSAO})
+        else:
+            self._responder(404, {"message": "Rota não implementada"})
+
+    def do_POST(self):
+        """Registra a requisição e responde conforme a rota."""
+        servidor: MaestroLocal = self.server.maestro_local
+        corpo = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        if servidor.latencia:
+            time.sleep(servidor.latencia)
+        if servidor.sortear_falha():
+            self._responder(503, {"message": "Falha simulada"})
+            return
+
+        rota = self.path.removeprefix("/api/v2/")
+        if rota == "workspace/login":
+            self._responder(200, {"accessToken": "token-local"})
+            return
+        try:
+            dados = json.loads(corpo) if self.headers.get("Content-Type") == "application/json" else None
+        except ValueError:
+            dados = None
+        identificador = servidor.registrar(rota, dados, len(corpo))
+
+        if rota in ("alerts", "artifact") or re.fullmatch(r"task/[^/]+", rota):
+            self._responder(200, {"id": identificador, "message": "ok", "type": "success"})
+        elif rota == "error":
+            self._responder(201, {"id": identificador})
+        elif re.fullmatch(r"error/\d+/attachments|artifact/log/\d+", rota):
+            self._responder(200, {"message": "ok", "type": "success"})
+        else:
+            self._responder(404, {"message": "Rota não implementada"})
+
+    def _responder(self, codigo: int, dados: dict):
+        """Envia uma resposta JSON.
+
+        Args:
+            codigo (int): O código HTTP.
+            dados (dict): O corpo da resposta.
+        """
+        corpo = json.dumps(dados).encode("utf-8")
+        self.send_response(codigo)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+
+class MaestroLocal:
+    """Servidor HTTP local que imita o Maestro, em uma thread.
+
+    Attributes:
+        latencia (float): A espera, em segundos, antes de cada resposta.
+        taxa_de_falhas (float): A fração das requisições respondidas com erro 503.
+        requisicoes (List[dict]): As requisições aceitas, na ordem, com a rota, o
+            corpo JSON (se houver) e o tamanho do corpo em bytes.
+    """
+    def __init__(self, latencia: float = 0.0, taxa_de_falhas: float = 0.0, semente: Optional[int] = 0):
+        """Inicializa a classe MaestroLocal.
+
+        Args:
+            latencia (float): A espera, em segundos, antes de cada resposta.
+            taxa_de_falhas (float): A fração das requisições respondidas com erro 503.
+            semente (Optional[int]): A semente do sorteio das falhas.
+        """
+        self.latencia = latencia
+        self.taxa_de_falhas = taxa_de_falhas
+        self.requisicoes: List[dict] = []
+        self._sorteio = random.Random(semente)
+        self._trava = threading.Lock()
+        self._http = ThreadingHTTPServer(("127.0.0.1", 0), _Atendimento)
+        self._http.daemon_threads = True
+        self._http.maestro_local = self
+        self._thread = threading.Thread(target=self._http.serve_forever, name="maestro-local", daemon=True)
+
+    @property
+    def url(self) -> str:
+        """O endereço do servidor."""
+        host, porta = self._http.server_address[:2]
+        return f"http://{host}:{porta}"
+
+    def __enter__(self) -> "MaestroLocal":
+        """Inicia o servidor."""
+        self._thread.start()
+        return self
+
+    def __exit__(self, *args):
+        """Para o servidor."""
+        self._http.shutdown()
+        self._http.server_close()
+
+    def sdk(self) -> BotMaestroSDK:
+        """Retorna um `BotMaestroSDK` conectado a este servidor."""
+        maestro = BotMaestroSDK(server=self.url, login="local", key="local")
+        falhas, self.taxa_de_falhas = self.taxa_de_falhas, 0.0
+        try:
+            maestro.login()
+        finally:
+            self.taxa_de_falhas = falhas
+        return maestro
+
+    def sortear_falha(self) -> bool:
+        """Sorteia se a requisição atual deve falhar."""
+        with self._trava:
+            return self._sorteio.random() < self.taxa_de_falhas
+
+    def registrar(self, rota: str, dados: Optional[dict], tamanho: int) -> int:
+        """Registra uma requisição aceita.
+
+        Args:
+            rota (str): A rota, sem o prefixo `/api/v2/`.
+            dados (Optional[dict]): O corpo JSON, se houver.
+            tamanho (int): O tamanho do corpo, em bytes.
+
+        Returns:
+            int: O número da requisição, usado como id dos objetos criados.
+        """
+        with self._trava:
+            self.requisicoes.append({"rota": rota, "dados": dados, "tamanho": tamanho})
+            return len(self.requisicoes)
+
+    def recebidas(self, prefixo: str) -> List[dict]:
+        """Retorna as requisições aceitas cuja rota começa com `prefixo`.
+
+        Args:
+            prefixo (str): O início da rota (ex: "alerts", "task/").
+
+        Returns:
+            List[dict]: As requisições, na ordem em que chegaram.
+        """
+        with self._trava:
+            return [r for r in self.requisicoes if r["rota"].startswith(prefixo)]
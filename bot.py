@@ -2,24 +2,39 @@
 Este é o script principal da automação.
 
 O bot executa as seguintes etapas:
-1. Conecta-se ao BotCity Maestro para obter parâmetros e gerenciar a tarefa.
-2. Lê os dados de frequência de um arquivo CSV usando pandas.
-3. Valida os dados para garantir que não há valores nulos.
-4. Gera um relatório em PDF com os dados de frequência.
+1. Conecta-se ao BotCity Maestro para obter e validar os parâmetros e gerenciar a tarefa.
+2. Lê os dados de frequência de um arquivo CSV em blocos, usando pandas.
+3. Valida cada bloco para garantir que não há valores nulos ou fora do esquema.
+4. Gera um relatório em PDF com os dados de frequência (e, se pedido, em CSV, HTML
+   ou XLSX).
 5. Envia o relatório gerado por e-mail para um destinatário especificado.
-6. Notifica o Maestro sobre o sucesso ou falha da execução.
+6. Notifica o Maestro sobre o sucesso ou falha da execução. As notificações passam
+   por uma caixa de saída local e são enviadas em segundo plano, com novas tentativas.
+
+Se o parâmetro `PATH_TO_DATA_BATCH` for definido, o bot roda em modo em lote: gera,
+em paralelo, um relatório para cada tabela CSV encontrada e envia cada um por e-mail,
+registrando as falhas por turma em vez de encerrar na primeira delas.
+
+Se o parâmetro `PATH_TO_AGENDA` for definido, o bot roda em modo agenda: gera e envia
+os relatórios de todas as escolas e turmas listadas no arquivo da agenda, cada uma
+com os seus parâmetros, na ordem dos prazos, retomando uma execução interrompida.
 
 Para mais informações sobre como configurar e executar o bot, consulte o README.md.
 """
 
-from botcity.maestro import BotMaestroSDK, AutomationTaskFinishStatus, AlertType
-import pandas as pd
-from src.errors.errors import ErrorProtocol
-from src.relatorio.gerar_relatorio import report
-from src.send_email.send_email import enviar_relatorio
+import os
+from botcity.maestro import BotMaestroSDK, BotExecution, AutomationTaskFinishStatus, AlertType
+from src.errors.errors import ErrorProtocol, DadosInvalidosError
 from src.log.registrar_logs import LogFile
+from src.notificacao.caixa_de_saida import CaixaDeSaidaDoMaestro
+from src.perfil.perfil_execucao import PerfilDeExecucao
+from src.servico.cliente import ServicoIndisponivelError, SITUACAO_INALTERADO, enviar_trabalho
 import settings as s
 
+# Os módulos que dependem de pandas, reportlab e do plugin do Gmail são importados
+# dentro de `main`, `executar_lote` e `executar_agenda`, só depois que os parâmetros forem validados:
+# uma execução com parâmetros inválidos termina sem pagar por essas importações.
+
 # Desabilita erros caso não esteja conectado ao Maestro
 BotMaestroSDK.RAISE_NOT_CONNECTED = True
 
@@ -34,59 +49,466 @@ def main():
         para cada novo passo, para facilitar o rastreamento e a depuração.
         Se o novo passo for crítico e puder falhar, envolva-o em seu próprio
         bloco `try...except` e use o `error_protocol` para tratar a falha.
+        Para que o novo passo apareça no resumo de desempenho (`PATH_TO_PROFILE`),
+        envolva-o em `with perfil.etapa("nome-do-passo"):`.
     """
     # Instancia o SDK do Maestro a partir dos argumentos do sistema
     maestro = BotMaestroSDK.from_sys_args()
     # Obtém os detalhes da execução atual
     execution = maestro.get_execution()
 
+    # Resolve e valida todos os parâmetros de uma vez, antes de qualquer trabalho
+    try:
+        config = s.resolver_configuracao(execution)
+    except s.ConfiguracaoInvalidaError as e:
+        finalizar_configuracao_invalida(maestro, execution, e)
+        return
+
     # Inicializa o gerenciador de logs
-    log_file = LogFile(execution)
+    log_file = LogFile(config)
+    # Daqui em diante, as chamadas ao Maestro são enviadas em segundo plano
+    maestro = CaixaDeSaidaDoMaestro(maestro, config, log_file)
     # Inicializa o protocolo de tratamento de erros
     error_protocol = ErrorProtocol(maestro, log_file)
+    # Inicializa a medição de tempo e memória de cada etapa
+    perfil = PerfilDeExecucao(config.task_id)
+
+    # Modo em lote: várias turmas em uma única execução
+    if config.PATH_TO_DATA_BATCH:
+        try:
+            executar_lote(maestro, config, log_file, perfil)
+        except Exception as e:
+            salvar_perfil(maestro, config, perfil, enviar=False)
+            error_protocol.send_and_register_error(f"Ocorreu um erro inesperado: {e}", e)
+        return
+
+    # Modo agenda: várias escolas e turmas, cada uma com os seus parâmetros
+    if config.PATH_TO_AGENDA:
+        try:
+            executar_agenda(maestro, config, log_file, perfil)
+        except Exception as e:
+            salvar_perfil(maestro, config, perfil, enviar=False)
+            error_protocol.send_and_register_error(f"Ocorreu um erro inesperado: {e}", e)
+        return
+
+    # Serviço de relatórios: o relatório é gerado por um processo já aquecido
+    if config.PATH_TO_SOCKET_SERVICO:
+        try:
+            if executar_no_servico(maestro, config, log_file, perfil):
+                return
+        except Exception as e:
+            salvar_perfil(maestro, config, perfil, enviar=False)
+            error_protocol.send_and_register_error(f"Ocorreu um erro inesperado: {e}", e)
+            return
 
     try:
-        # --- 1. Leitura dos Dados ---
-        log_file.log_message("Extraindo dados da tabela...")
-        path_to_data_table = s.PATH_TO_DATA_TABLE.get_value_as_str(execution)
-        frequencia_df = pd.read_csv(path_to_data_table)
-
-        # --- 2. Validação dos Dados ---
-        log_file.log_message('Procurando por valores nulos...')
-        if frequencia_df.isna().any().any():
-            # Se houver valores nulos, registra um erro e encerra
+        with perfil.etapa("importacao"):
+            from src.dados.cache_tabela import cache_da_execucao, ler_tabela_com_cache
+            from src.relatorio.exportacao import exportar_relatorio
+            from src.relatorio.gerar_relatorio import report
+            from src.relatorio.manifesto import ManifestoDoRelatorio, manifesto_do_relatorio
+            from src.relatorio.partes import partes_do_relatorio
+            from src.relatorio.utils.gravacao import GravacaoEmSegundoPlano
+            from src.send_email.send_email import enviar_partes
+
+        # --- 1 e 2. Leitura e Validação dos Dados ---
+        # A tabela é lida em blocos, e cada bloco é validado (esquema e nulos) ao ser lido.
+        # Se o CSV não mudou desde a última execução, a tabela validada vem do cache.
+        log_file.log_message("Extraindo e validando os dados da tabela...")
+        path_to_data_table = config.PATH_TO_DATA_TABLE
+        try:
+            with perfil.etapa("leitura_e_validacao"):
+                frequencia_df = ler_tabela_com_cache(
+                    path_to_data_table,
+                    cache_da_execucao(config),
+                    log_file,
+                    chunksize=config.CSV_CHUNKSIZE,
+                    max_erros=config.MAX_ERROS_REPORTADOS
+                )
+        except DadosInvalidosError as e:
+            # Se houver valores nulos ou fora do esquema, registra um erro e encerra
+            salvar_perfil(maestro, config, perfil, enviar=False)
             error_protocol.send_and_register_error(
-                "Há valores nulos nos dados. Corrija e tente novamente.",
-                ValueError('Valores nulos encontrados nos dados')
+                f"Há valores inválidos nos dados. Corrija e tente novamente. {e}", e
             )
 
         # --- 3. Geração do Relatório ---
+        # No modo em memória, o PDF não passa pelo disco: é gerado em um buffer e,
+        # se `SALVAR_PDF` estiver ativo, salvo em segundo plano durante o envio.
+        relatorio = report(config, em_memoria=config.PDF_EM_MEMORIA)
+
+        # Se os dados não mudaram desde o último envio, o relatório já enviado vale.
+        manifesto = None
+        if config.RELATORIO_INCREMENTAL:
+            with perfil.etapa("comparacao_com_anterior"):
+                manifesto = manifesto_do_relatorio(config, frequencia_df, relatorio.linhas_por_pagina())
+                anterior = ManifestoDoRelatorio.carregar(relatorio.path_to_output)
+            if manifesto.inalterado(anterior):
+                finalizar_inalterado(maestro, config, log_file, perfil)
+                return
+            if anterior is not None:
+                alteradas = manifesto.paginas_alteradas(anterior)
+                log_file.log_message(f"{len(alteradas)} páginas da tabela mudaram desde o último envio.")
+
+        # Os demais formatos pedidos pelos destinatários saem da mesma tabela, ao mesmo tempo.
         log_file.log_message("Gerando o PDF do relatório...")
-        relatorio = report(execution)
-        relatorio.given_report(frequencia_df)
+        with perfil.etapa("renderizacao", **_opcoes_de_perfilamento(config, "renderizacao")):
+            exportado = exportar_relatorio(config, relatorio, frequencia_df)
+        if exportado.do_acervo:
+            log_file.log_message("O mesmo relatório já estava no acervo e não foi gerado de novo.")
+        conteudo = exportado.pdf
+        gravacao = None
+        if conteudo is not None and config.SALVAR_PDF:
+            gravacao = GravacaoEmSegundoPlano(conteudo, relatorio.path_to_output)
+
+        # Se o PDF passar do limite de tamanho do anexo, ele é dividido ou compactado
+        with perfil.etapa("limite_de_anexo"):
+            partes = partes_do_relatorio(config, frequencia_df, relatorio.path_to_output, conteudo)
+        if len(partes) > 1:
+            log_file.log_message(
+                f"O relatório passou de {config.TAMANHO_MAXIMO_ANEXO_MB} MB e será enviado em {len(partes)} partes."
+            )
 
         # --- 4. Envio do E-mail ---
         log_file.log_message("Enviando o relatório por e-mail...")
-        enviar_relatorio(execution)
+        with perfil.etapa("envio_email"):
+            enviar_partes(config, partes, exportado.arquivos, exportado.assinatura)
+            if gravacao is not None:
+                gravacao.aguardar()
+        # O manifesto só é salvo depois do envio, para que uma falha no envio faça
+        # o relatório ser gerado e enviado de novo na próxima execução.
+        if manifesto is not None:
+            manifesto.salvar(relatorio.path_to_output)
 
         # --- 5. Notificação de Sucesso ---
-        log_file.log_message("Tarefa concluída com sucesso.")
+        finalizar_enviado(maestro, config, log_file, perfil)
+
+    except Exception as e:
+        # Em caso de qualquer exceção não tratada, aciona o protocolo de erro
+        salvar_perfil(maestro, config, perfil, enviar=False)
+        error_protocol.send_and_register_error(f"Ocorreu um erro inesperado: {e}", e)
+
+def executar_no_servico(maestro: CaixaDeSaidaDoMaestro, config: s.ConfiguracaoDaExecucao, log_file: LogFile,
+                        perfil: PerfilDeExecucao) -> bool:
+    """Pede ao serviço de relatórios que gere e envie o relatório.
+
+    O serviço (veja `src/servico`) já tem as dependências e a sessão de e-mail
+    carregadas, então o bot não precisa importar pandas nem reportlab.
+
+    Args:
+        maestro (CaixaDeSaidaDoMaestro): A caixa de saída das chamadas ao Maestro.
+        config (ConfiguracaoDaExecucao): A configuração da execução.
+        log_file (LogFile): A instância do gerenciador de logs.
+        perfil (PerfilDeExecucao): A medição das etapas da execução.
+
+    Returns:
+        bool: Verdadeiro se a tarefa foi concluída pelo serviço; falso se o serviço
+            não está no ar e o relatório deve ser gerado pelo próprio bot.
+
+    Raises:
+        RuntimeError: Se o serviço não conseguiu gerar ou enviar o relatório.
+    """
+    log_file.log_message(f"Enviando o trabalho ao serviço de relatórios em {config.PATH_TO_SOCKET_SERVICO}...")
+    try:
+        with perfil.etapa("servico_de_relatorios"):
+            resposta = enviar_trabalho(config.PATH_TO_SOCKET_SERVICO, config, timeout=config.SERVICO_TIMEOUT)
+    except ServicoIndisponivelError as e:
+        log_file.log_message(f"{e}. O relatório será gerado localmente.", level="WARNING")
+        return False
+
+    if not resposta.sucesso:
+        raise RuntimeError(f"O serviço de relatórios falhou: {resposta.mensagem}")
+    log_file.log_message(f"Serviço de relatórios concluiu o trabalho em {resposta.tempo_s} s.")
+    if resposta.situacao == SITUACAO_INALTERADO:
+        finalizar_inalterado(maestro, config, log_file, perfil)
+    else:
+        finalizar_enviado(maestro, config, log_file, perfil)
+    return True
+
+def executar_lote(maestro: CaixaDeSaidaDoMaestro, config: s.ConfiguracaoDaExecucao, log_file: LogFile,
+                  perfil: PerfilDeExecucao):
+    """Executa o modo em lote, gerando e enviando um relatório por turma.
+
+    O lote é processado por um `PipelineDeRelatorios` (veja `src/pipeline`), que gera
+    e envia os relatórios ao mesmo tempo. As falhas de cada turma (na geração do PDF
+    ou no envio do e-mail) são registradas no log e entram na caixa de saída do
+    Maestro, que as junta em alertas de resumo; no fim, o resultado do lote inteiro é
+    resumido em um único alerta, sem interromper as demais turmas.
+
+    Args:
+        maestro (CaixaDeSaidaDoMaestro): A caixa de saída das chamadas ao Maestro.
+        config (ConfiguracaoDaExecucao): A configuração da execução.
+        log_file (LogFile): A instância do gerenciador de logs.
+        perfil (PerfilDeExecucao): A medição das etapas da execução.
+    """
+    with perfil.etapa("importacao"):
+        import asyncio
+        from src.lote.processar_lote import tabelas_do_lote
+        from src.pipeline.orquestrador import PipelineDeRelatorios
+
+    origem = config.PATH_TO_DATA_BATCH
+    diretorio_saida = config.PATH_TO_OUTPUT_DIR
+    tabelas = tabelas_do_lote(origem, diretorio_saida)
+    if not tabelas:
+        raise FileNotFoundError(f"Nenhuma tabela encontrada em {origem}")
+    os.makedirs(diretorio_saida, exist_ok=True)
+
+    # --- 1 a 4. Leitura, validação, geração e envio dos relatórios ---
+    # A renderização (em processos) e o envio (em threads) acontecem ao mesmo tempo:
+    # enquanto um relatório é enviado, os próximos já estão sendo gerados.
+    pipeline = PipelineDeRelatorios(
+        maestro,
+        config,
+        log_file,
+        max_workers=config.MAX_WORKERS,
+        concorrencia_de_envio=config.EMAIL_MAX_CONCORRENCIA,
+        tamanho_da_fila=config.TAMANHO_DA_FILA_DE_ENVIO,
+        trabalhadores_aquecidos=config.TRABALHADORES_AQUECIDOS
+    )
+    log_file.log_message(f"Gerando e enviando os relatórios em lote a partir de {origem}...")
+    with perfil.etapa("pipeline_lote", **_opcoes_de_perfilamento(config, "pipeline_lote")):
+        resultados = asyncio.run(pipeline.executar(tabelas))
+
+    # --- 5. Notificação do Resultado ---
+    finalizar_lote(maestro, config, log_file, perfil, resultados, "Relatórios em lote")
+
+def executar_agenda(maestro: CaixaDeSaidaDoMaestro, config: s.ConfiguracaoDaExecucao, log_file: LogFile,
+                    perfil: PerfilDeExecucao):
+    """Executa o modo agenda, gerando e enviando os relatórios de várias escolas.
+
+    A agenda (veja `src/agenda/trabalhos.py`) lista as escolas e turmas, cada uma
+    com os seus parâmetros. Os relatórios passam pelo mesmo pipeline do modo em
+    lote, na ordem dos prazos, e cada CSV compartilhado por várias turmas é lido
+    uma única vez (veja `src/agenda/agendador.py`). As turmas concluídas são
+    registradas em `PATH_TO_PROGRESSO_DA_AGENDA`, e uma execução interrompida é
+    retomada sem refazê-las.
+
+    Args:
+        maestro (CaixaDeSaidaDoMaestro): A caixa de saída das chamadas ao Maestro.
+        config (ConfiguracaoDaExecucao): A configuração da execução.
+        log_file (LogFile): A instância do gerenciador de logs.
+        perfil (PerfilDeExecucao): A medição das etapas da execução.
+
+    Raises:
+        AgendaInvalidaError: Se o arquivo da agenda não puder ser lido ou tiver
+            entradas inválidas.
+    """
+    with perfil.etapa("importacao"):
+        import asyncio
+        from src.agenda.agendador import AgendadorDeTrabalhos, ProgressoDaAgenda
+        from src.agenda.trabalhos import carregar_trabalhos
+
+    trabalhos = carregar_trabalhos(config.PATH_TO_AGENDA, config)
+    progresso = ProgressoDaAgenda(config.PATH_TO_PROGRESSO_DA_AGENDA, config.PATH_TO_AGENDA,
+                                  retomar=config.AGENDA_RETOMAR)
+    try:
+        pendentes = [t for t in trabalhos if t.identificador not in progresso.concluidos]
+        concluidos_antes = len(trabalhos) - len(pendentes)
+        if progresso.retomada:
+            log_file.log_message(
+                f"Retomando a agenda: {concluidos_antes} de {len(trabalhos)} turmas já concluídas anteriormente."
+            )
+        for trabalho in pendentes:
+            os.makedirs(os.path.dirname(trabalho.path_to_output), exist_ok=True)
+
+        # --- 1 a 4. Leitura, validação, geração e envio dos relatórios ---
+        agendador = AgendadorDeTrabalhos(
+            maestro,
+            config,
+            log_file,
+            progresso=progresso,
+            leituras_simultaneas=config.AGENDA_LEITURAS_SIMULTANEAS,
+            max_workers=config.MAX_WORKERS,
+            concorrencia_de_envio=config.EMAIL_MAX_CONCORRENCIA,
+            tamanho_da_fila=config.TAMANHO_DA_FILA_DE_ENVIO,
+            trabalhadores_aquecidos=config.TRABALHADORES_AQUECIDOS
+        )
+        log_file.log_message(
+            f"Gerando e enviando os relatórios da agenda {config.PATH_TO_AGENDA} (turmas pendentes: {len(pendentes)})..."
+        )
+        with perfil.etapa("pipeline_agenda", **_opcoes_de_perfilamento(config, "pipeline_agenda")):
+            resultados = asyncio.run(agendador.executar_trabalhos(pendentes))
+
+        # Sem falhas, a próxima execução da mesma agenda começa do zero.
+        if all(r.sucesso for r in resultados):
+            progresso.concluir()
+    finally:
+        progresso.fechar()
+
+    # --- 5. Notificação do Resultado ---
+    finalizar_lote(maestro, config, log_file, perfil, resultados, "Relatórios da agenda",
+                   concluidos_antes=concluidos_antes)
+
+def finalizar_lote(maestro: CaixaDeSaidaDoMaestro, config: s.ConfiguracaoDaExecucao, log_file: LogFile,
+                   perfil: PerfilDeExecucao, resultados: list, titulo: str, concluidos_antes: int = 0):
+    """Resume o resultado das turmas em um alerta e finaliza a tarefa no Maestro.
+
+    Args:
+        maestro (CaixaDeSaidaDoMaestro): A caixa de saída das chamadas ao Maestro.
+        config (ConfiguracaoDaExecucao): A configuração da execução.
+        log_file (LogFile): A instância do gerenciador de logs.
+        perfil (PerfilDeExecucao): A medição das etapas da execução.
+        resultados (list): Os `ResultadoDoEnvio` das turmas desta execução.
+        titulo (str): O título do alerta de resumo.
+        concluidos_antes (int): Quantas turmas já tinham sido concluídas por uma
+            execução anterior interrompida (modo agenda).
+    """
+    falhas = [(r.turma, r.erro) for r in resultados if not r.sucesso]
+    inalterados = [r for r in resultados if r.sucesso and r.inalterado]
+
+    total = len(resultados) + concluidos_antes
+    enviados = len(resultados) - len(falhas) - len(inalterados)
+    resumo = f"{enviados} de {total} relatórios enviados."
+    if concluidos_antes:
+        resumo += f" {concluidos_antes} já concluídos em uma execução anterior."
+    if inalterados:
+        resumo += f" {len(inalterados)} sem alterações desde o último envio."
+    if falhas:
+        resumo += " Falhas: " + ", ".join(turma for turma, _ in falhas) + "."
+    log_file.log_message(resumo)
+
+    if not falhas:
+        status = AutomationTaskFinishStatus.SUCCESS
+    elif enviados or inalterados or concluidos_antes:
+        status = AutomationTaskFinishStatus.PARTIALLY_COMPLETED
+    else:
+        status = AutomationTaskFinishStatus.FAILED
+
+    with perfil.etapa("notificacao_maestro"):
+        maestro.alert(
+            task_id=config.task_id,
+            title=titulo,
+            message=resumo,
+            alert_type=AlertType.WARN if falhas else AlertType.INFO
+        )
+    salvar_perfil(maestro, config, perfil)
+
+    maestro.finish_task(
+        task_id=config.task_id,
+        status=status,
+        message=resumo,
+        total_items=total,
+        processed_items=total - len(falhas),
+        failed_items=len(falhas)
+    )
+
+def finalizar_enviado(maestro: CaixaDeSaidaDoMaestro, config: s.ConfiguracaoDaExecucao, log_file: LogFile,
+                      perfil: PerfilDeExecucao):
+    """Notifica o Maestro de que o relatório foi enviado e finaliza a tarefa.
+
+    Args:
+        maestro (CaixaDeSaidaDoMaestro): A caixa de saída das chamadas ao Maestro.
+        config (ConfiguracaoDaExecucao): A configuração da execução.
+        log_file (LogFile): A instância do gerenciador de logs.
+        perfil (PerfilDeExecucao): A medição das etapas da execução.
+    """
+    log_file.log_message("Tarefa concluída com sucesso.")
+    with perfil.etapa("notificacao_maestro"):
         maestro.alert(
-            task_id=execution.task_id,
+            task_id=config.task_id,
             title="Relatório Enviado",
-            message="Um relatório da frequência da turma A foi enviado ao professor Ângelo por e-mail.",
+            message=f"Um relatório da frequência da turma {config.NOME_DA_TURMA} foi enviado ao professor "
+                    f"{config.NOME_DO_PROFESSOR} por e-mail.",
             alert_type=AlertType.INFO
         )
-        # Finaliza a tarefa no Maestro como sucesso
-        maestro.finish_task(
-            task_id=execution.task_id,
-            status=AutomationTaskFinishStatus.SUCCESS,
-            message="Tarefa concluída com sucesso."
+    salvar_perfil(maestro, config, perfil)
+
+    # Finaliza a tarefa no Maestro como sucesso
+    maestro.finish_task(
+        task_id=config.task_id,
+        status=AutomationTaskFinishStatus.SUCCESS,
+        message="Tarefa concluída com sucesso."
+    )
+
+def finalizar_inalterado(maestro: CaixaDeSaidaDoMaestro, config: s.ConfiguracaoDaExecucao, log_file: LogFile,
+                         perfil: PerfilDeExecucao):
+    """Finaliza a tarefa sem gerar nem enviar o relatório, pois os dados não mudaram.
+
+    Args:
+        maestro (CaixaDeSaidaDoMaestro): A caixa de saída das chamadas ao Maestro.
+        config (ConfiguracaoDaExecucao): A configuração da execução.
+        log_file (LogFile): A instância do gerenciador de logs.
+        perfil (PerfilDeExecucao): A medição das etapas da execução.
+    """
+    mensagem = "Os dados não mudaram desde o último envio; o relatório não foi gerado de novo."
+    log_file.log_message(mensagem)
+    with perfil.etapa("notificacao_maestro"):
+        maestro.alert(
+            task_id=config.task_id,
+            title="Relatório sem alterações",
+            message=mensagem,
+            alert_type=AlertType.INFO
         )
+    salvar_perfil(maestro, config, perfil)
+
+    maestro.finish_task(
+        task_id=config.task_id,
+        status=AutomationTaskFinishStatus.SUCCESS,
+        message=mensagem
+    )
+
+def finalizar_configuracao_invalida(maestro: BotMaestroSDK, execution: BotExecution,
+                                    erro: s.ConfiguracaoInvalidaError):
+    """Encerra a tarefa como falha quando os parâmetros da automação são inválidos.
+
+    Nesse ponto ainda não há configuração (nem arquivo de log), então o problema é
+    informado apenas ao Maestro.
+
+    Args:
+        maestro (BotMaestroSDK): A instância do SDK do BotCity Maestro.
+        execution (BotExecution): O objeto de execução da tarefa do Maestro.
+        erro (s.ConfiguracaoInvalidaError): O erro com os parâmetros inválidos.
+    """
+    print(erro)
+    maestro.alert(
+        task_id=execution.task_id,
+        title="Configuração inválida",
+        message=str(erro),
+        alert_type=AlertType.ERROR
+    )
+    maestro.finish_task(
+        task_id=execution.task_id,
+        status=AutomationTaskFinishStatus.FAILED,
+        message=str(erro)
+    )
+
+def salvar_perfil(maestro: CaixaDeSaidaDoMaestro, config: s.ConfiguracaoDaExecucao, perfil: PerfilDeExecucao,
+                  enviar: bool = True):
+    """Salva o resumo de desempenho da execução e, se configurado, o envia ao Maestro.
+
+    Falhas aqui nunca interrompem o bot: o resumo é apenas informativo.
 
+    Args:
+        maestro (CaixaDeSaidaDoMaestro): A caixa de saída das chamadas ao Maestro.
+        config (ConfiguracaoDaExecucao): A configuração da execução.
+        perfil (PerfilDeExecucao): A medição das etapas da execução.
+        enviar (bool): Se falso, o resumo é apenas salvo em disco.
+    """
+    try:
+        caminho = perfil.salvar(config.PATH_TO_PROFILE)
+        if enviar and config.ENVIAR_PERFIL:
+            maestro.post_artifact(
+                task_id=config.task_id,
+                artifact_name=os.path.basename(caminho),
+                filepath=caminho
+            )
     except Exception as e:
-        # Em caso de qualquer exceção não tratada, aciona o protocolo de erro
-        error_protocol.send_and_register_error(f"Ocorreu um erro inesperado: {e}", e)
+        print(f"Não foi possível salvar o resumo de desempenho: {e}")
+
+def _opcoes_de_perfilamento(config: s.ConfiguracaoDaExecucao, etapa: str) -> dict:
+    """Retorna as opções de `perfil.etapa` para a etapa de renderização.
+
+    Args:
+        config (ConfiguracaoDaExecucao): A configuração da execução.
+        etapa (str): O nome da etapa, usado no nome do arquivo `.prof`.
+
+    Returns:
+        dict: `perfilar` e `path_perfil`, conforme o parâmetro `PERFILAR_RENDERIZACAO`.
+    """
+    if not config.PERFILAR_RENDERIZACAO:
+        return {}
+    base = os.path.splitext(config.PATH_TO_PROFILE)[0]
+    return {"perfilar": True, "path_perfil": f"{base}_{etapa}.prof"}
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
@@ -5,19 +5,35 @@ facilitando o acesso e a manutenção.
 A classe `ParameterOfAutomation` permite definir parâmetros com um nome e um valor padrão,
 que podem ser sobrescritos no BotCity Maestro.
 
+Os parâmetros são resolvidos uma única vez, no início da execução, por
+`resolver_configuracao`: cada valor é lido do Maestro, convertido para o seu tipo e
+validado, e o resultado é uma `ConfiguracaoDaExecucao` imutável, passada para os
+demais módulos (e para os processos trabalhadores do modo em lote). Parâmetros
+obrigatórios ausentes ou valores inválidos fazem a execução falhar logo no início,
+com uma mensagem que lista todos eles.
+
 Para usar um parâmetro em outros módulos:
-1. Importe o módulo: `import settings as s`
-2. Acesse o parâmetro e obtenha seu valor: `meu_parametro = s.NOME_DO_PARAMETRO.get_value(execution)`
+1. Receba a configuração da execução: `config: s.ConfiguracaoDaExecucao`
+2. Acesse o valor já convertido pelo nome do parâmetro: `meu_parametro = config.NOME_DO_PARAMETRO`
 
 Developer's Note:
     Para adicionar um novo parâmetro de automação, crie uma nova instância da classe
-    `ParameterOfAutomation` neste arquivo, seguindo os exemplos abaixo.
-    - Para parâmetros obrigatórios, defina `default_value=None`.
+    `ParameterOfAutomation` neste arquivo, seguindo os exemplos abaixo. Ela passa a
+    fazer parte da configuração automaticamente.
+    - Para parâmetros obrigatórios, defina `required=True`.
     - Para parâmetros opcionais, forneça um valor padrão para `default_value`.
+    - O tipo do valor é o tipo do valor padrão. Se o padrão for `None`, informe
+      o tipo em `value_type` (o padrão é `str`).
 """
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Tuple
 from botcity.maestro import BotExecution
 
+# Textos aceitos como verdadeiro e como falso em parâmetros booleanos.
+_VERDADEIROS = ("true", "1", "sim", "yes")
+_FALSOS = ("false", "0", "nao", "não", "no")
+
 @dataclass(frozen=True)
 class ParameterOfAutomation:
     """Representa um parâmetro de automação com um nome e valor padrão.
@@ -26,41 +42,231 @@ class ParameterOfAutomation:
         name (str): O nome do parâmetro, usado para identificá-lo no Maestro.
         default_value (object): O valor padrão a ser usado se o parâmetro não for
                                 fornecido pelo Maestro.
+        required (bool): Se verdadeiro, a execução falha quando o parâmetro não é
+                         fornecido pelo Maestro.
+        value_type (Optional[type]): O tipo do valor (`str`, `int`, `float` ou
+                                     `bool`). Se omitido, é o tipo do valor padrão.
+        choices (Optional[Tuple[str, ...]]): Os valores aceitos, para parâmetros de
+                                             texto que são uma opção (ex: "enviar",
+                                             "pular" ou "avisar"). Maiúsculas e
+                                             espaços nas pontas são ignorados.
     """
     name: str
     default_value: object
+    required: bool = False
+    value_type: Optional[type] = None
+    choices: Optional[Tuple[str, ...]] = None
+
+    @property
+    def tipo(self) -> type:
+        """O tipo para o qual o valor do parâmetro é convertido."""
+        if self.value_type is not None:
+            return self.value_type
+        return str if self.default_value is None else type(self.default_value)
 
-    def get_value(self, execution: BotExecution) -> object:
-        """Retorna o valor do parâmetro do Maestro ou o valor padrão.
+    def resolve(self, execution: BotExecution) -> object:
+        """Retorna o valor do parâmetro do Maestro, já convertido para o seu tipo.
+
+        Valores ausentes ou vazios resultam no valor padrão.
 
         Args:
             execution (BotExecution): O objeto de execução da tarefa do Maestro.
 
         Returns:
-            object: O valor do parâmetro.
+            object: O valor convertido, ou `None` se não houver valor nem padrão.
+
+        Raises:
+            ValueError: Se o parâmetro for obrigatório e estiver ausente, ou se o
+                valor não puder ser convertido para o seu tipo.
         """
-        return execution.parameters.get(self.name, self.default_value)
+        value = execution.parameters.get(self.name)
+        if value is None or str(value).strip() == "":
+            if self.required:
+                raise ValueError(f"o parâmetro obrigatório '{self.name}' não foi informado")
+            value = self.default_value
+            if value is None:
+                return None
+        try:
+            return self._converter(value)
+        except ValueError:
+            raise ValueError(self._descrever_erro(value)) from None
 
-    def get_value_as_str(self, execution: BotExecution) -> str:
-        """Retorna o valor do parâmetro do Maestro como uma string.
+    def _converter(self, value: object) -> object:
+        """Converte um valor (em geral, o texto vindo do Maestro) para o tipo do parâmetro.
+
+        Booleanos aceitam "true", "1", "sim" e "yes" como verdadeiro e "false", "0",
+        "nao", "não" e "no" como falso (sem diferenciar maiúsculas e minúsculas), e
+        números reais aceitam vírgula como separador decimal (ex: "0,75"). Textos com
+        `choices` são normalizados (sem espaços nas pontas, em minúsculas).
 
         Args:
-            execution (BotExecution): O objeto de execução da tarefa do Maestro.
+            value (object): O valor a ser convertido.
+
+        Returns:
+            object: O valor convertido.
+
+        Raises:
+            ValueError: Se o valor não puder ser convertido (ex: um booleano "ture").
+        """
+        tipo = self.tipo
+        if tipo is bool:
+            if isinstance(value, bool):
+                return value
+            texto = str(value).strip().lower()
+            if texto in _VERDADEIROS:
+                return True
+            if texto in _FALSOS:
+                return False
+            raise ValueError(texto)
+        if tipo is int:
+            return int(str(value).strip())
+        if tipo is float:
+            return float(str(value).strip().replace(",", "."))
+        if self.choices is not None:
+            texto = str(value).strip().lower()
+            if texto not in self.choices:
+                raise ValueError(texto)
+            return texto
+        return str(value)
+
+    def _descrever_erro(self, value: object) -> str:
+        """Descreve um valor que não pôde ser convertido, para `ConfiguracaoInvalidaError`."""
+        if self.choices is not None:
+            opcoes = [f"'{opcao}'" for opcao in self.choices]
+            return f"o parâmetro '{self.name}' deveria ser {', '.join(opcoes[:-1])} ou {opcoes[-1]}, mas é {value!r}"
+        return f"o parâmetro '{self.name}' deveria ser do tipo {self.tipo.__name__}, mas é {value!r}"
+
+
+class ConfiguracaoInvalidaError(ValueError):
+    """Indica que um ou mais parâmetros da automação estão ausentes ou são inválidos.
+
+    Attributes:
+        problemas (List[str]): A descrição de cada parâmetro com problema.
+    """
+    def __init__(self, problemas: List[str]):
+        """Inicializa a exceção.
+
+        Args:
+            problemas (List[str]): A descrição de cada parâmetro com problema.
+        """
+        self.problemas = problemas
+        super().__init__("Configuração inválida: " + "; ".join(problemas))
+
+
+@dataclass(frozen=True)
+class ConfiguracaoDaExecucao:
+    """Os valores de todos os parâmetros da automação, resolvidos uma única vez.
+
+    Os valores são acessados como atributos, pelo nome do parâmetro (ex:
+    `config.EMAIL_PESSOAL`), e não podem ser alterados. A configuração é pequena e
+    serializável com `pickle`, então é enviada pronta aos processos trabalhadores.
+
+    Attributes:
+        task_id (str): O identificador da tarefa do Maestro.
+        valores (Mapping[str, object]): Os valores convertidos, por nome do parâmetro.
+    """
+    task_id: str
+    valores: Mapping[str, object] = field(default_factory=dict)
+
+    def __post_init__(self):
+        """Impede alterações nos valores depois de criada a configuração."""
+        object.__setattr__(self, "valores", MappingProxyType(dict(self.valores)))
+
+    def __getattr__(self, nome: str) -> object:
+        """Retorna o valor do parâmetro `nome`."""
+        valores = self.__dict__.get("valores", {})
+        if nome in valores:
+            return valores[nome]
+        raise AttributeError(f"Parâmetro desconhecido: {nome}")
+
+    def __reduce__(self):
+        """Serializa a configuração com um `dict` comum (o `MappingProxyType` não é serializável)."""
+        return (ConfiguracaoDaExecucao, (self.task_id, dict(self.valores)))
+
+    def com(self, **valores: object) -> "ConfiguracaoDaExecucao":
+        """Retorna uma cópia da configuração com alguns valores substituídos.
+
+        Args:
+            **valores (object): Os novos valores, por nome do parâmetro.
 
         Returns:
-            str: O valor do parâmetro convertido para string.
+            ConfiguracaoDaExecucao: A nova configuração.
         """
-        return str(
-            execution.parameters.get(self.name, self.default_value)
-        )
+        return ConfiguracaoDaExecucao(self.task_id, {**self.valores, **valores})
+
+
+def parametros() -> List[ParameterOfAutomation]:
+    """Lista todos os parâmetros da automação definidos neste módulo.
+
+    Returns:
+        List[ParameterOfAutomation]: Os parâmetros, na ordem em que foram definidos.
+    """
+    return [valor for valor in globals().values() if isinstance(valor, ParameterOfAutomation)]
+
+
+def resolver_configuracao(execution: BotExecution) -> ConfiguracaoDaExecucao:
+    """Lê, converte e valida todos os parâmetros da automação.
+
+    Args:
+        execution (BotExecution): O objeto de execução da tarefa do Maestro.
+
+    Returns:
+        ConfiguracaoDaExecucao: A configuração da execução.
+
+    Raises:
+        ConfiguracaoInvalidaError: Se algum parâmetro obrigatório estiver ausente ou
+            algum valor for inválido. Todos os problemas são listados de uma vez.
+    """
+    valores, problemas = {}, []
+    for parametro in parametros():
+        try:
+            valores[parametro.name] = parametro.resolve(execution)
+        except ValueError as e:
+            problemas.append(str(e))
+    if problemas:
+        raise ConfiguracaoInvalidaError(problemas)
+    return ConfiguracaoDaExecucao(str(execution.task_id), valores)
+
+
+def converter_valores(valores: Mapping[str, object]) -> Dict[str, object]:
+    """Converte valores de parâmetros informados fora do Maestro (ex: na agenda).
+
+    Os valores passam pela mesma conversão dos parâmetros lidos do Maestro, e podem
+    ser aplicados a uma configuração com `ConfiguracaoDaExecucao.com`.
+
+    Args:
+        valores (Mapping[str, object]): Os valores, por nome do parâmetro.
+
+    Returns:
+        Dict[str, object]: Os valores convertidos, por nome do parâmetro.
+
+    Raises:
+        ConfiguracaoInvalidaError: Se algum parâmetro não existir ou algum valor não
+            puder ser convertido. Todos os problemas são listados de uma vez.
+    """
+    por_nome = {parametro.name: parametro for parametro in parametros()}
+    convertidos, problemas = {}, []
+    for nome, valor in valores.items():
+        parametro = por_nome.get(nome)
+        if parametro is None:
+            problemas.append(f"o parâmetro '{nome}' não existe")
+            continue
+        try:
+            convertidos[nome] = None if valor is None else parametro._converter(valor)
+        except ValueError:
+            problemas.append(parametro._descrever_erro(valor))
+    if problemas:
+        raise ConfiguracaoInvalidaError(problemas)
+    return convertidos
 
 # ====================================================
 # PARÂMETROS OBRIGATÓRIOS
 # (Devem ser configurados no Maestro)
 # ====================================================
-EMAIL_PESSOAL = ParameterOfAutomation(name="EMAIL_PESSOAL", default_value=None)
-EMAIL_DESTINATARIO = ParameterOfAutomation(name="EMAIL_DESTINATARIO", default_value=None)
-ASSUNTO_EMAIL = ParameterOfAutomation(name="ASSUNTO_EMAIL", default_value=None)
+EMAIL_PESSOAL = ParameterOfAutomation(name="EMAIL_PESSOAL", default_value=None, required=True)
+# Aceita vários endereços, separados por vírgula ou ponto e vírgula.
+EMAIL_DESTINATARIO = ParameterOfAutomation(name="EMAIL_DESTINATARIO", default_value=None, required=True)
+ASSUNTO_EMAIL = ParameterOfAutomation(name="ASSUNTO_EMAIL", default_value=None, required=True)
 
 # ====================================================
 # PARÂMETROS OPCIONAIS
@@ -71,17 +277,297 @@ PATH_TO_CREDENTIALS: ParameterOfAutomation = ParameterOfAutomation(
     default_value="resources/credenciais_oauth.json"
 )
 
+# Transporte dos e-mails: "gmail", "smtp" (ex: um servidor local de testes) ou
+# "falso" (não envia nada; útil para medir a vazão sem rede).
+EMAIL_TRANSPORTE: ParameterOfAutomation = ParameterOfAutomation(
+    name="EMAIL_TRANSPORTE",
+    default_value="gmail"
+)
+
+SMTP_HOST: ParameterOfAutomation = ParameterOfAutomation(
+    name="SMTP_HOST",
+    default_value="localhost"
+)
+
+SMTP_PORTA: ParameterOfAutomation = ParameterOfAutomation(
+    name="SMTP_PORTA",
+    default_value=1025
+)
+
+EMAIL_MAX_CONCORRENCIA: ParameterOfAutomation = ParameterOfAutomation(
+    name="EMAIL_MAX_CONCORRENCIA",
+    default_value=4
+)
+
+EMAIL_TENTATIVAS: ParameterOfAutomation = ParameterOfAutomation(
+    name="EMAIL_TENTATIVAS",
+    default_value=5
+)
+
 PATH_TO_LOGFILE: ParameterOfAutomation = ParameterOfAutomation(
     name="PATH_TO_LOGFILE",
     default_value="resources/logs.txt"
 )
 
+LOG_MAX_BYTES: ParameterOfAutomation = ParameterOfAutomation(
+    name="LOG_MAX_BYTES",
+    default_value=5 * 1024 * 1024
+)
+
+LOG_BACKUPS: ParameterOfAutomation = ParameterOfAutomation(
+    name="LOG_BACKUPS",
+    default_value=3
+)
+
+LOG_FILA_MAX: ParameterOfAutomation = ParameterOfAutomation(
+    name="LOG_FILA_MAX",
+    default_value=10_000
+)
+
 PATH_TO_OUTPUT: ParameterOfAutomation = ParameterOfAutomation(
     name="PATH_TO_OUTPUT",
     default_value="resources/report.pdf"
 )
 
+RELATORIO_INCREMENTAL: ParameterOfAutomation = ParameterOfAutomation(
+    name="RELATORIO_INCREMENTAL",
+    default_value=False
+)
+
+LIMITE_DE_FREQUENCIA: ParameterOfAutomation = ParameterOfAutomation(
+    name="LIMITE_DE_FREQUENCIA",
+    default_value=0.75
+)
+
+MAX_ALUNOS_NO_RESUMO: ParameterOfAutomation = ParameterOfAutomation(
+    name="MAX_ALUNOS_NO_RESUMO",
+    default_value=20
+)
+
+LIMITE_RSS_MB: ParameterOfAutomation = ParameterOfAutomation(
+    name="LIMITE_RSS_MB",
+    default_value=0
+)
+
 PATH_TO_DATA_TABLE: ParameterOfAutomation = ParameterOfAutomation(
     name="PATH_TO_DATA_TABLE",
     default_value="resources/frequenciaTurmaA.csv"
-)
\ No newline at end of file
+)
+
+# Nomes exibidos na capa do relatório e no e-mail. No modo agenda, cada trabalho
+# informa os seus.
+NOME_DA_ESCOLA: ParameterOfAutomation = ParameterOfAutomation(
+    name="NOME_DA_ESCOLA",
+    default_value="Escola Raimunda Conceição"
+)
+
+NOME_DA_TURMA: ParameterOfAutomation = ParameterOfAutomation(
+    name="NOME_DA_TURMA",
+    default_value="A"
+)
+
+NOME_DO_PROFESSOR: ParameterOfAutomation = ParameterOfAutomation(
+    name="NOME_DO_PROFESSOR",
+    default_value="Ângelo"
+)
+
+PATH_TO_PROFILE: ParameterOfAutomation = ParameterOfAutomation(
+    name="PATH_TO_PROFILE",
+    default_value="resources/perfil_execucao.json"
+)
+
+PERFILAR_RENDERIZACAO: ParameterOfAutomation = ParameterOfAutomation(
+    name="PERFILAR_RENDERIZACAO",
+    default_value=False
+)
+
+ENVIAR_PERFIL: ParameterOfAutomation = ParameterOfAutomation(
+    name="ENVIAR_PERFIL",
+    default_value=False
+)
+
+PDF_EM_MEMORIA: ParameterOfAutomation = ParameterOfAutomation(
+    name="PDF_EM_MEMORIA",
+    default_value=False
+)
+
+SALVAR_PDF: ParameterOfAutomation = ParameterOfAutomation(
+    name="SALVAR_PDF",
+    default_value=True
+)
+
+PDF_COMPACTO: ParameterOfAutomation = ParameterOfAutomation(
+    name="PDF_COMPACTO",
+    default_value=True
+)
+
+TAMANHO_MAXIMO_ANEXO_MB: ParameterOfAutomation = ParameterOfAutomation(
+    name="TAMANHO_MAXIMO_ANEXO_MB",
+    default_value=20,
+    value_type=float
+)
+
+ANEXO_ACIMA_DO_LIMITE: ParameterOfAutomation = ParameterOfAutomation(
+    name="ANEXO_ACIMA_DO_LIMITE",
+    default_value="dividir",
+    choices=("dividir", "zip")
+)
+
+# Formatos do relatório enviados a cada destinatário: "pdf", "csv", "html" e
+# "xlsx", separados por "+" (ex: "pdf+xlsx").
+FORMATOS_DO_RELATORIO: ParameterOfAutomation = ParameterOfAutomation(
+    name="FORMATOS_DO_RELATORIO",
+    default_value="pdf"
+)
+
+# Formatos específicos de alguns destinatários, no formato
+# "endereço: formatos; endereço: formatos".
+FORMATOS_POR_DESTINATARIO: ParameterOfAutomation = ParameterOfAutomation(
+    name="FORMATOS_POR_DESTINATARIO",
+    default_value=None
+)
+
+# O que fazer com quem já recebeu o mesmo relatório: "enviar", "pular" ou "avisar".
+REENVIO_DE_RELATORIO: ParameterOfAutomation = ParameterOfAutomation(
+    name="REENVIO_DE_RELATORIO",
+    default_value="enviar",
+    choices=("enviar", "pular", "avisar")
+)
+
+PATH_TO_INDICE_DE_ENVIOS: ParameterOfAutomation = ParameterOfAutomation(
+    name="PATH_TO_INDICE_DE_ENVIOS",
+    default_value="resources/envios.sqlite3"
+)
+
+CSV_CHUNKSIZE: ParameterOfAutomation = ParameterOfAutomation(
+    name="CSV_CHUNKSIZE",
+    default_value=100_000
+)
+
+MAX_ERROS_REPORTADOS: ParameterOfAutomation = ParameterOfAutomation(
+    name="MAX_ERROS_REPORTADOS",
+    default_value=10
+)
+
+PATH_TO_CACHE_DIR: ParameterOfAutomation = ParameterOfAutomation(
+    name="PATH_TO_CACHE_DIR",
+    default_value="resources/cache"
+)
+
+CACHE_MAX_MB: ParameterOfAutomation = ParameterOfAutomation(
+    name="CACHE_MAX_MB",
+    default_value=512
+)
+
+PATH_TO_ACERVO: ParameterOfAutomation = ParameterOfAutomation(
+    name="PATH_TO_ACERVO",
+    default_value="resources/acervo"
+)
+
+ACERVO_MAX_MB: ParameterOfAutomation = ParameterOfAutomation(
+    name="ACERVO_MAX_MB",
+    default_value=256
+)
+
+# ====================================================
+# PARÂMETROS DO MODO EM LOTE
+# (Opcionais. Se PATH_TO_DATA_BATCH não for definido, o bot processa
+# apenas a tabela de PATH_TO_DATA_TABLE.)
+# ====================================================
+PATH_TO_DATA_BATCH: ParameterOfAutomation = ParameterOfAutomation(
+    name="PATH_TO_DATA_BATCH",
+    default_value=None
+)
+
+PATH_TO_OUTPUT_DIR: ParameterOfAutomation = ParameterOfAutomation(
+    name="PATH_TO_OUTPUT_DIR",
+    default_value="resources/relatorios"
+)
+
+MAX_WORKERS: ParameterOfAutomation = ParameterOfAutomation(
+    name="MAX_WORKERS",
+    default_value=None,
+    value_type=int
+)
+
+TAMANHO_DA_FILA_DE_ENVIO: ParameterOfAutomation = ParameterOfAutomation(
+    name="TAMANHO_DA_FILA_DE_ENVIO",
+    default_value=4
+)
+
+TRABALHADORES_AQUECIDOS: ParameterOfAutomation = ParameterOfAutomation(
+    name="TRABALHADORES_AQUECIDOS",
+    default_value=False
+)
+
+# ====================================================
+# PARÂMETROS DO SERVIÇO DE RELATÓRIOS
+# (Opcionais. Se PATH_TO_SOCKET_SERVICO não for definido, o próprio bot gera e
+# envia o relatório.)
+# ====================================================
+PATH_TO_SOCKET_SERVICO: ParameterOfAutomation = ParameterOfAutomation(
+    name="PATH_TO_SOCKET_SERVICO",
+    default_value=None
+)
+
+SERVICO_TIMEOUT: ParameterOfAutomation = ParameterOfAutomation(
+    name="SERVICO_TIMEOUT",
+    default_value=600
+)
+
+# ====================================================
+# PARÂMETROS DA CAIXA DE SAÍDA DO MAESTRO
+# (Opcionais. Os alertas, erros e a finalização da tarefa são enviados ao
+# Maestro em segundo plano, a partir de um banco local.)
+# ====================================================
+# O banco é compartilhado pelos processos da máquina; o que não for enviado até o
+# fim da execução fica nele e é enviado pela próxima.
+PATH_TO_CAIXA_DE_SAIDA: ParameterOfAutomation = ParameterOfAutomation(
+    name="PATH_TO_CAIXA_DE_SAIDA",
+    default_value="resources/maestro/caixa_de_saida.sqlite3"
+)
+
+MAESTRO_TENTATIVAS: ParameterOfAutomation = ParameterOfAutomation(
+    name="MAESTRO_TENTATIVAS",
+    default_value=8
+)
+
+MAESTRO_INTERVALO_DE_ALERTAS: ParameterOfAutomation = ParameterOfAutomation(
+    name="MAESTRO_INTERVALO_DE_ALERTAS",
+    default_value=10.0
+)
+
+MAESTRO_CAUDA_DO_LOG_KB: ParameterOfAutomation = ParameterOfAutomation(
+    name="MAESTRO_CAUDA_DO_LOG_KB",
+    default_value=64
+)
+
+MAESTRO_TEMPO_DE_ENCERRAMENTO: ParameterOfAutomation = ParameterOfAutomation(
+    name="MAESTRO_TEMPO_DE_ENCERRAMENTO",
+    default_value=30.0
+)
+
+# ====================================================
+# PARÂMETROS DO MODO AGENDA
+# (Opcionais. Se PATH_TO_AGENDA for definido, o bot gera os relatórios de todas
+# as escolas e turmas listadas no arquivo da agenda.)
+# ====================================================
+PATH_TO_AGENDA: ParameterOfAutomation = ParameterOfAutomation(
+    name="PATH_TO_AGENDA",
+    default_value=None
+)
+
+PATH_TO_PROGRESSO_DA_AGENDA: ParameterOfAutomation = ParameterOfAutomation(
+    name="PATH_TO_PROGRESSO_DA_AGENDA",
+    default_value="resources/agenda/progresso.jsonl"
+)
+
+AGENDA_RETOMAR: ParameterOfAutomation = ParameterOfAutomation(
+    name="AGENDA_RETOMAR",
+    default_value=True
+)
+
+AGENDA_LEITURAS_SIMULTANEAS: ParameterOfAutomation = ParameterOfAutomation(
+    name="AGENDA_LEITURAS_SIMULTANEAS",
+    default_value=2
+)
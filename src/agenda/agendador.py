@@ -0,0 +1,266 @@
+"""
+Este módulo executa a agenda (veja `trabalhos.py`): os relatórios de várias escolas e
+turmas, em uma única execução do bot, sobre o mesmo pipeline do modo em lote (veja
+`src/pipeline/orquestrador.py`).
+
+O planejamento acrescenta ao pipeline:
+
+- Prioridade: os trabalhos são renderizados na ordem dos prazos.
+- Tabelas compartilhadas: quando várias turmas usam o mesmo CSV (ex: um arquivo com
+  todas as turmas de uma escola), ele é lido e validado uma única vez, em um estágio
+  próprio de leitura (no máximo `leituras_simultaneas` CSVs de cada vez), e guardado
+  no cache de tabelas (veja `cache_tabela.py`); cada turma o carrega de lá.
+- Configuração por trabalho: cada relatório é gerado e enviado com os parâmetros da
+  sua escola e turma (nomes, destinatários, etc.).
+- Progresso: cada turma concluída é registrada em um arquivo (`ProgressoDaAgenda`).
+  Se a execução for interrompida, a seguinte retoma de onde ela parou, sem refazer
+  as turmas já enviadas.
+
+Developer's Note:
+    O progresso vale para uma agenda (o conteúdo do arquivo) em um dia: uma agenda
+    alterada, ou a primeira execução de um novo dia, começa do zero. O arquivo só
+    recebe linhas novas (uma por turma, gravada em disco antes da seguinte), então
+    uma interrupção no meio da escrita perde, no máximo, a última linha. Sem o cache
+    de tabelas (`CACHE_MAX_MB` = 0), ou com um CSV maior que ele, cada turma lê o
+    seu CSV.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Set, Tuple
+from src.agenda.trabalhos import Trabalho
+from src.dados.cache_tabela import cache_da_execucao
+from src.log.registrar_logs import LogFile
+from src.lote.processar_lote import ResultadoTurma, preparar_tabela, renderizar_turma
+from src.notificacao.caixa_de_saida import CaixaDeSaidaDoMaestro
+from src.pipeline.orquestrador import PipelineDeRelatorios, ResultadoDoEnvio
+from src.relatorio.utils.getdata import data_atual
+from settings import ConfiguracaoDaExecucao
+
+
+class ProgressoDaAgenda:
+    """O registro, em disco, das turmas da agenda já concluídas.
+
+    O arquivo tem uma linha JSON por evento: a identificação da execução (a agenda e
+    o dia), uma linha por turma concluída e, no fim, a marca de agenda concluída.
+
+    Attributes:
+        caminho (str): O caminho do arquivo de progresso.
+        concluidos (Set[str]): Os identificadores das turmas já concluídas.
+        retomada (bool): Indica que o progresso veio de uma execução interrompida.
+    """
+    def __init__(self, caminho: str, caminho_da_agenda: str, retomar: bool = True):
+        """Abre o progresso da agenda, retomando-o ou começando um novo.
+
+        Args:
+            caminho (str): O caminho do arquivo de progresso.
+            caminho_da_agenda (str): O caminho do arquivo da agenda.
+            retomar (bool): Se falso, o progresso anterior é sempre descartado.
+        """
+        self.caminho = caminho
+        self.concluidos: Set[str] = set()
+        self.retomada = False
+        execucao = _identificar_execucao(caminho_da_agenda)
+
+        tamanho_valido = 0
+        if retomar:
+            anterior, tamanho_valido = _ler_linhas(caminho)
+            if anterior and anterior[0].get("execucao") == execucao and not anterior[-1].get("concluida"):
+                self.concluidos = {linha["trabalho"] for linha in anterior[1:] if "trabalho" in linha}
+                self.retomada = True
+
+        diretorio = os.path.dirname(os.path.abspath(caminho))
+        os.makedirs(diretorio, exist_ok=True)
+        if self.retomada:
+            # Descarta a última linha, se ela ficou incompleta na interrupção.
+            self._arquivo = open(caminho, "r+", encoding="utf-8")
+            self._arquivo.truncate(tamanho_valido)
+            self._arquivo.seek(tamanho_valido)
+        else:
+            self._arquivo = open(caminho, "w", encoding="utf-8")
+            self._escrever({"execucao": execucao, "inicio": time.time()})
+
+    def registrar(self, identificador: str, situacao: str):
+        """Registra uma turma concluída.
+
+        Args:
+            identificador (str): O identificador do trabalho (veja `Trabalho`).
+            situacao (str): "enviado" ou "inalterado".
+        """
+        self.concluidos.add(identificador)
+        self._escrever({"trabalho": identificador, "situacao": situacao, "horario": time.time()})
+
+    def concluir(self):
+        """Marca a agenda como concluída: a próxima execução começa do zero."""
+        self._escrever({"concluida": True, "horario": time.time()})
+        self.fechar()
+
+    def fechar(self):
+        """Fecha o arquivo de progresso."""
+        if not self._arquivo.closed:
+            self._arquivo.close()
+
+    def _escrever(self, linha: dict):
+        """Acrescenta uma linha ao arquivo e a grava em disco."""
+        self._arquivo.write(json.dumps(linha, ensure_ascii=False) + "\n")
+        self._arquivo.flush()
+        os.fsync(self._arquivo.fileno())
+
+
+class AgendadorDeTrabalhos(PipelineDeRelatorios):
+    """Gera e envia os relatórios da agenda, por prazo, com leitura única de cada CSV.
+
+    Attributes:
+        maestro (CaixaDeSaidaDoMaestro): A caixa de saída das chamadas ao Maestro.
+        config (ConfiguracaoDaExecucao): A configuração da execução.
+        log_file (LogFile): A instância do gerenciador de logs.
+    """
+    def __init__(self, maestro: CaixaDeSaidaDoMaestro, config: ConfiguracaoDaExecucao, log_file: LogFile,
+                 progresso: Optional[ProgressoDaAgenda] = None, leituras_simultaneas: int = 2, **opcoes):
+        """Inicializa a classe AgendadorDeTrabalhos.
+
+        Args:
+            maestro (CaixaDeSaidaDoMaestro): A caixa de saída das chamadas ao Maestro.
+            config (ConfiguracaoDaExecucao): A configuração da execução.
+            log_file (LogFile): A instância do gerenciador de logs.
+            progresso (Optional[ProgressoDaAgenda]): Onde registrar as turmas concluídas.
+            leituras_simultaneas (int): Quantos CSVs compartilhados são lidos ao mesmo tempo.
+            **opcoes: Os demais argumentos de `PipelineDeRelatorios`.
+        """
+        super().__init__(maestro, config, log_file, **opcoes)
+        self._progresso = progresso
+        self._leituras_simultaneas = max(leituras_simultaneas, 1)
+        self._trabalhos: Dict[str, Trabalho] = {}
+        self._configuracoes: Dict[str, ConfiguracaoDaExecucao] = {}
+
+    async def executar_trabalhos(self, trabalhos: List[Trabalho]) -> List[ResultadoDoEnvio]:
+        """Executa os trabalhos informados, já em ordem de prioridade.
+
+        Args:
+            trabalhos (List[Trabalho]): Os trabalhos (veja `carregar_trabalhos`).
+
+        Returns:
+            List[ResultadoDoEnvio]: Um resultado por trabalho, na mesma ordem.
+        """
+        self._trabalhos = {trabalho.path_to_output: trabalho for trabalho in trabalhos}
+        self._configuracoes = {trabalho.path_to_output: trabalho.configuracao(self.config) for trabalho in trabalhos}
+        return await self.executar([(trabalho.dados, trabalho.path_to_output) for trabalho in trabalhos])
+
+    async def _renderizar_tabelas(self, executor: ProcessPoolExecutor, tabelas: List[Tuple[str, str]],
+                                  prontos: asyncio.Queue):
+        """Lê cada CSV compartilhado uma vez e renderiza os trabalhos por prioridade.
+
+        Um trabalho só ocupa uma vaga de renderização depois que a sua tabela está
+        pronta, então um CSV demorado não atrasa os trabalhos de outras tabelas.
+
+        Args:
+            executor (ProcessPoolExecutor): Os processos de leitura e renderização.
+            tabelas (List[Tuple[str, str]]): Pares (caminho da tabela, caminho do PDF),
+                em ordem de prioridade.
+            prontos (asyncio.Queue): A fila de relatórios prontos para envio.
+        """
+        loop = asyncio.get_running_loop()
+        vagas = asyncio.Semaphore(self._max_workers)
+        vagas_de_leitura = asyncio.Semaphore(self._leituras_simultaneas)
+
+        async def ler(dados: str) -> Optional[str]:
+            async with vagas_de_leitura:
+                try:
+                    erro, guardada = await loop.run_in_executor(executor, preparar_tabela, self.config, dados)
+                except Exception as e:
+                    return f"{type(e).__name__}: {e}"
+            if erro is None and not guardada:
+                self.log_file.log_message(
+                    f"A tabela {dados} é maior que o limite do cache de tabelas (CACHE_MAX_MB) e será lida "
+                    f"por cada turma que a usa.", level="WARNING"
+                )
+            return erro
+
+        # As leituras começam na ordem do primeiro trabalho (o mais urgente) de cada CSV.
+        leituras: Dict[str, asyncio.Task] = {}
+        if cache_da_execucao(self.config) is not None:
+            usos = Counter(dados for dados, _ in tabelas)
+            for dados, _ in tabelas:
+                if usos[dados] > 1 and dados not in leituras:
+                    leituras[dados] = asyncio.create_task(ler(dados))
+
+        async def renderizar_um(dados: str, pdf: str):
+            trabalho = self._trabalhos[pdf]
+            erro = await leituras[dados] if dados in leituras else None
+            if erro is not None:
+                resultado = ResultadoTurma(trabalho.identificador, dados, pdf, erro=erro)
+            else:
+                async with vagas:
+                    try:
+                        resultado = await loop.run_in_executor(
+                            executor, renderizar_turma, self._configuracoes[pdf], dados, pdf,
+                            trabalho.identificador, dict(trabalho.filtro)
+                        )
+                    except Exception as e:
+                        # Falhas do próprio processo trabalhador (ex: BrokenProcessPool)
+                        resultado = ResultadoTurma(trabalho.identificador, dados, pdf, erro=f"{type(e).__name__}: {e}")
+            await prontos.put(resultado)
+
+        await asyncio.gather(*(renderizar_um(dados, pdf) for dados, pdf in tabelas))
+
+    def _configuracao_de(self, resultado: ResultadoTurma) -> ConfiguracaoDaExecucao:
+        """Retorna a configuração da escola e turma do relatório."""
+        return self._configuracoes.get(resultado.path_to_output, self.config)
+
+    def _registrar_conclusao(self, resultado: ResultadoDoEnvio):
+        """Salva o manifesto e registra a turma concluída no progresso da agenda.
+
+        A turma entra no progresso mesmo se o manifesto não puder ser salvo, pois o
+        relatório já foi enviado.
+        """
+        try:
+            super()._registrar_conclusao(resultado)
+        finally:
+            if self._progresso is not None:
+                trabalho = self._trabalhos[resultado.path_to_output]
+                self._progresso.registrar(trabalho.identificador, "inalterado" if resultado.inalterado else "enviado")
+
+
+def _identificar_execucao(caminho_da_agenda: str) -> str:
+    """Identifica a execução da agenda: o hash do conteúdo do arquivo e o dia.
+
+    Args:
+        caminho_da_agenda (str): O caminho do arquivo da agenda.
+
+    Returns:
+        str: O identificador, em hexadecimal.
+    """
+    with open(caminho_da_agenda, "rb") as f:
+        conteudo = f.read()
+    return hashlib.blake2b(conteudo + data_atual().encode(), digest_size=16).hexdigest()
+
+
+def _ler_linhas(caminho: str) -> Tuple[List[dict], int]:
+    """Lê as linhas de um arquivo de progresso, ignorando uma última linha incompleta.
+
+    Args:
+        caminho (str): O caminho do arquivo.
+
+    Returns:
+        Tuple[List[dict], int]: As linhas lidas (uma lista vazia se o arquivo não
+            existir) e o tamanho, em bytes, do trecho com as linhas completas.
+    """
+    linhas, tamanho = [], 0
+    try:
+        with open(caminho, "rb") as f:
+            for texto in f:
+                if not texto.endswith(b"\n"):
+                    break
+                try:
+                    linhas.append(json.loads(texto))
+                except ValueError:
+                    break
+                tamanho += len(texto)
+    except OSError:
+        return [], 0
+    return linhas, tamanho
@@ -0,0 +1,298 @@
+"""
+Este módulo lê a agenda: o arquivo (JSON ou YAML) que lista as escolas e turmas
+cujos relatórios são gerados em uma única execução do bot.
+
+Exemplo (`agenda.json`):
+
+    {
+      "parametros": {"ASSUNTO_EMAIL": "Frequência da semana"},
+      "escolas": [
+        {
+          "nome": "Escola Raimunda Conceição",
+          "parametros": {"LIMITE_DE_FREQUENCIA": 0.8},
+          "turmas": [
+            {
+              "nome": "A",
+              "dados": "turmas/raimunda.csv",
+              "filtro": {"Turma": "A"},
+              "destinatarios": "angelo@escola.br",
+              "professor": "Ângelo",
+              "prazo": "2026-10-20 08:00"
+            }
+          ]
+        }
+      ]
+    }
+
+Cada turma vira um `Trabalho`, com a configuração da execução acrescida dos
+parâmetros da agenda, da escola e da turma (nessa ordem de precedência, da menor
+para a maior). `destinatarios`, `professor`, o nome da escola e o da turma são
+atalhos para `EMAIL_DESTINATARIO`, `NOME_DO_PROFESSOR`, `NOME_DA_ESCOLA` e
+`NOME_DA_TURMA`. Os caminhos relativos de `dados` partem do diretório da agenda.
+
+Developer's Note:
+    Todos os problemas da agenda são listados de uma vez em `AgendaInvalidaError`,
+    como em `settings.resolver_configuracao`. Tabelas ausentes ou inválidas não são
+    problemas da agenda: elas fazem falhar apenas as turmas que as usam.
+"""
+
+import json
+import os
+import re
+import unicodedata
+from dataclasses import dataclass, field
+from datetime import date, datetime, time
+from typing import Dict, List, Mapping, Optional
+from settings import ConfiguracaoDaExecucao, ConfiguracaoInvalidaError, converter_valores
+
+
+class AgendaInvalidaError(ValueError):
+    """Indica que o arquivo da agenda não pôde ser lido ou tem entradas inválidas.
+
+    Attributes:
+        problemas (List[str]): A descrição de cada problema encontrado.
+    """
+    def __init__(self, problemas: List[str]):
+        """Inicializa a exceção.
+
+        Args:
+            problemas (List[str]): A descrição de cada problema encontrado.
+        """
+        self.problemas = problemas
+        super().__init__("Agenda inválida: " + "; ".join(problemas))
+
+
+@dataclass(frozen=True)
+class Trabalho:
+    """O relatório de uma turma de uma escola, como descrito na agenda.
+
+    Attributes:
+        escola (str): O nome da escola.
+        turma (str): O nome da turma.
+        dados (str): O caminho da tabela CSV com a frequência da turma.
+        path_to_output (str): O caminho do PDF da turma.
+        valores (Mapping[str, object]): Os parâmetros da automação substituídos para
+            esta turma, já convertidos.
+        filtro (Mapping[str, str]): As colunas e valores que selecionam as linhas da
+            turma, quando a tabela tem várias turmas.
+        prazo (Optional[datetime]): Até quando o relatório deve ser enviado.
+        ordem (int): A posição da turma na agenda.
+    """
+    escola: str
+    turma: str
+    dados: str
+    path_to_output: str
+    valores: Mapping[str, object] = field(default_factory=dict)
+    filtro: Mapping[str, str] = field(default_factory=dict)
+    prazo: Optional[datetime] = None
+    ordem: int = 0
+
+    @property
+    def identificador(self) -> str:
+        """O nome da turma com o da escola, único na agenda (ex: "Escola X / A")."""
+        return f"{self.escola} / {self.turma}"
+
+    def configuracao(self, config: ConfiguracaoDaExecucao) -> ConfiguracaoDaExecucao:
+        """Retorna a configuração da execução com os parâmetros desta turma.
+
+        Args:
+            config (ConfiguracaoDaExecucao): A configuração da execução.
+
+        Returns:
+            ConfiguracaoDaExecucao: A configuração da turma.
+        """
+        return config.com(**self.valores)
+
+
+def carregar_trabalhos(caminho: str, config: ConfiguracaoDaExecucao) -> List[Trabalho]:
+    """Lê a agenda e retorna os trabalhos em ordem de prioridade.
+
+    Os trabalhos com prazo vêm primeiro, do prazo mais próximo para o mais distante;
+    depois, os sem prazo. Empates mantêm a ordem da agenda.
+
+    Args:
+        caminho (str): O caminho do arquivo da agenda (`.json`, `.yaml` ou `.yml`).
+        config (ConfiguracaoDaExecucao): A configuração da execução.
+
+    Returns:
+        List[Trabalho]: Os trabalhos, um por turma.
+
+    Raises:
+        AgendaInvalidaError: Se o arquivo não puder ser lido ou tiver entradas
+            inválidas. Todos os problemas são listados de uma vez.
+    """
+    agenda = _ler_arquivo(caminho)
+    diretorio = os.path.dirname(os.path.abspath(caminho))
+    problemas: List[str] = []
+    trabalhos: List[Trabalho] = []
+    caminhos: Dict[str, str] = {}
+
+    escolas = agenda.get("escolas") if isinstance(agenda, dict) else None
+    if not isinstance(escolas, list) or not escolas:
+        raise AgendaInvalidaError(["a agenda precisa de uma lista 'escolas'"])
+    parametros_da_agenda = _parametros(agenda, "a agenda", problemas)
+
+    for i, escola in enumerate(escolas, start=1):
+        nome_da_escola = _texto(escola, "nome")
+        if nome_da_escola is None:
+            problemas.append(f"a escola {i} não tem 'nome'")
+            continue
+        turmas = escola.get("turmas")
+        if not isinstance(turmas, list) or not turmas:
+            problemas.append(f"a escola '{nome_da_escola}' precisa de uma lista 'turmas'")
+            continue
+        parametros_da_escola = _parametros(escola, f"a escola '{nome_da_escola}'", problemas)
+
+        for j, turma in enumerate(turmas, start=1):
+            nome_da_turma = _texto(turma, "nome")
+            dados = _texto(turma, "dados")
+            descricao = f"a turma '{nome_da_turma or j}' da escola '{nome_da_escola}'"
+            if nome_da_turma is None or dados is None:
+                problemas.append(f"{descricao} precisa de 'nome' e 'dados'")
+                continue
+
+            valores = {
+                **parametros_da_agenda,
+                **parametros_da_escola,
+                "NOME_DA_ESCOLA": nome_da_escola,
+                "NOME_DA_TURMA": nome_da_turma,
+                **_atalhos(turma),
+                **_parametros(turma, descricao, problemas),
+            }
+            try:
+                valores = converter_valores(valores)
+            except ConfiguracaoInvalidaError as e:
+                problemas.extend(f"{descricao}: {problema}" for problema in e.problemas)
+                continue
+
+            filtro = turma.get("filtro") or {}
+            if not isinstance(filtro, dict):
+                problemas.append(f"{descricao}: 'filtro' precisa ser um objeto (coluna: valor)")
+                continue
+            try:
+                prazo = _prazo(turma.get("prazo"))
+            except ValueError:
+                problemas.append(f"{descricao}: prazo inválido {turma.get('prazo')!r} (use AAAA-MM-DD HH:MM)")
+                continue
+
+            diretorio_saida = valores.get("PATH_TO_OUTPUT_DIR", config.PATH_TO_OUTPUT_DIR)
+            path_to_output = os.path.join(
+                diretorio_saida, _nome_de_arquivo(nome_da_escola), _nome_de_arquivo(nome_da_turma) + ".pdf"
+            )
+            if path_to_output in caminhos:
+                problemas.append(f"{descricao} tem o mesmo PDF que '{caminhos[path_to_output]}' ({path_to_output})")
+                continue
+            trabalho = Trabalho(
+                escola=nome_da_escola,
+                turma=nome_da_turma,
+                dados=os.path.join(diretorio, dados),
+                path_to_output=path_to_output,
+                valores=valores,
+                filtro={str(coluna): str(valor) for coluna, valor in filtro.items()},
+                prazo=prazo,
+                ordem=len(trabalhos),
+            )
+            caminhos[path_to_output] = trabalho.identificador
+            trabalhos.append(trabalho)
+
+    if problemas:
+        raise AgendaInvalidaError(problemas)
+    return sorted(trabalhos, key=lambda t: (t.prazo is None, t.prazo or datetime.min, t.ordem))
+
+
+def _ler_arquivo(caminho: str) -> object:
+    """Lê o conteúdo da agenda, em JSON ou YAML, conforme a extensão do arquivo.
+
+    Args:
+        caminho (str): O caminho do arquivo.
+
+    Returns:
+        object: O conteúdo lido.
+
+    Raises:
+        AgendaInvalidaError: Se o arquivo não puder ser lido.
+    """
+    try:
+        with open(caminho, encoding="utf-8") as f:
+            texto = f.read()
+    except OSError as e:
+        raise AgendaInvalidaError([f"não foi possível ler {caminho}: {e}"]) from None
+
+    if not caminho.lower().endswith((".yaml", ".yml")):
+        try:
+            return json.loads(texto)
+        except ValueError as e:
+            raise AgendaInvalidaError([f"{caminho} não é um JSON válido: {e}"]) from None
+
+    # O PyYAML só é importado para agendas em YAML.
+    try:
+        import yaml
+    except ImportError:
+        raise AgendaInvalidaError(["agendas em YAML requerem o pacote PyYAML (pip install pyyaml); use JSON"]) from None
+    try:
+        return yaml.safe_load(texto)
+    except yaml.YAMLError as e:
+        raise AgendaInvalidaError([f"{caminho} não é um YAML válido: {e}"]) from None
+
+
+def _texto(entrada: object, chave: str) -> Optional[str]:
+    """Retorna o texto de uma chave da entrada, ou `None` se estiver ausente ou vazio."""
+    valor = entrada.get(chave) if isinstance(entrada, dict) else None
+    if valor is None:
+        return None
+    return str(valor).strip() or None
+
+
+def _parametros(entrada: object, descricao: str, problemas: List[str]) -> Dict[str, object]:
+    """Retorna os parâmetros da automação substituídos em uma entrada da agenda.
+
+    Args:
+        entrada (object): A agenda, uma escola ou uma turma.
+        descricao (str): Como a entrada é descrita nas mensagens de erro.
+        problemas (List[str]): A lista de problemas, que recebe os desta entrada.
+
+    Returns:
+        Dict[str, object]: Os parâmetros, ainda sem conversão.
+    """
+    parametros = entrada.get("parametros") if isinstance(entrada, dict) else None
+    if parametros is None:
+        return {}
+    if not isinstance(parametros, dict):
+        problemas.append(f"{descricao}: 'parametros' precisa ser um objeto (nome: valor)")
+        return {}
+    return dict(parametros)
+
+
+def _atalhos(turma: dict) -> Dict[str, object]:
+    """Traduz os atalhos de uma turma para os parâmetros da automação."""
+    atalhos = {"destinatarios": "EMAIL_DESTINATARIO", "professor": "NOME_DO_PROFESSOR"}
+    return {parametro: turma[chave] for chave, parametro in atalhos.items() if turma.get(chave)}
+
+
+def _prazo(valor: object) -> Optional[datetime]:
+    """Converte o prazo de uma turma (ex: "2026-10-20 08:00" ou "2026-10-20").
+
+    Prazos com fuso horário (ex: "2026-10-20T08:00-03:00") são convertidos para o
+    horário local, sem fuso, para que possam ser comparados aos demais.
+
+    Raises:
+        ValueError: Se o prazo não estiver no formato ISO.
+    """
+    if valor is None or valor == "":
+        return None
+    if isinstance(valor, datetime):
+        prazo = valor
+    elif isinstance(valor, date):
+        # O YAML converte "2026-10-20" em uma data, sem horário.
+        prazo = datetime.combine(valor, time.min)
+    else:
+        prazo = datetime.fromisoformat(str(valor))
+    if prazo.tzinfo is not None:
+        prazo = prazo.astimezone().replace(tzinfo=None)
+    return prazo
+
+
+def _nome_de_arquivo(nome: str) -> str:
+    """Converte um nome (ex: "Escola Raimunda Conceição") em um nome de arquivo seguro."""
+    sem_acentos = unicodedata.normalize("NFKD", nome).encode("ascii", "ignore").decode()
+    return re.sub(r"[^A-Za-z0-9]+", "_", sem_acentos).strip("_") or "sem_nome"
@@ -0,0 +1,125 @@
+"""
+Este módulo implementa a base dos armazenamentos em disco do bot: um diretório de
+entradas, uma por chave, com escrita atômica e remoção LRU.
+
+É usado pelo cache de tabelas (`src/dados/cache_tabela.py`) e pelo acervo de
+relatórios (`src/relatorio/acervo.py`). Cada entrada é um subdiretório com um
+`meta.json`, que marca a entrada como completa e cujo `mtime` marca o último uso.
+
+Developer's Note:
+    - As entradas são escritas em um diretório temporário (`.tmp-*`) e renomeadas no
+      fim, então vários processos (ex: o modo em lote) podem usar o mesmo diretório:
+      quem chega depois encontra a entrada pronta, e a sua cópia é descartada.
+    - Subdiretórios sem `meta.json` (ex: `chaves/` do cache de tabelas) não contam
+      como entradas e nunca são removidos.
+    - A entrada recém-guardada nunca é removida, e uma entrada maior que o limite
+      inteiro não é guardada.
+"""
+
+import os
+import shutil
+import uuid
+from typing import Callable, List, Optional, Tuple
+
+# Arquivo que marca uma entrada como completa; o seu `mtime` marca o último uso.
+ARQUIVO_DE_META = "meta.json"
+# Prefixo das entradas ainda em escrita.
+_PREFIXO_TEMPORARIO = ".tmp-"
+
+
+class DiretorioLRU:
+    """Um diretório de entradas com escrita atômica e limite de tamanho (LRU).
+
+    Attributes:
+        diretorio (str): O diretório onde as entradas são guardadas.
+        limite_bytes (int): O tamanho máximo da soma das entradas, em bytes.
+    """
+    def __init__(self, diretorio: str, limite_bytes: int):
+        """Inicializa a classe DiretorioLRU.
+
+        Args:
+            diretorio (str): O diretório das entradas. É criado se não existir.
+            limite_bytes (int): O tamanho máximo da soma das entradas, em bytes.
+        """
+        self.diretorio = diretorio
+        self.limite_bytes = limite_bytes
+        os.makedirs(self.diretorio, exist_ok=True)
+
+    def _entrada(self, chave: str) -> str:
+        """Retorna o caminho da entrada de uma chave."""
+        return os.path.join(self.diretorio, chave)
+
+    def _marcar_uso(self, entrada: str):
+        """Marca uma entrada como usada recentemente.
+
+        Raises:
+            OSError: Se a entrada não existir (ex: foi removida por outro processo).
+        """
+        os.utime(os.path.join(entrada, ARQUIVO_DE_META))
+
+    def _publicar(self, chave: str, escrever: Callable[[str], None]) -> bool:
+        """Escreve uma entrada de forma atômica e remove as entradas mais antigas.
+
+        Args:
+            chave (str): A chave da entrada.
+            escrever (Callable[[str], None]): Escreve os arquivos da entrada, inclusive
+                o `meta.json` (por último), no diretório temporário recebido.
+
+        Returns:
+            bool: Verdadeiro se a entrada está guardada (agora ou antes); falso se
+                ela, sozinha, passa do limite e foi descartada.
+        """
+        entrada = self._entrada(chave)
+        if os.path.exists(entrada):
+            return True
+
+        temporario = os.path.join(self.diretorio, f"{_PREFIXO_TEMPORARIO}{uuid.uuid4().hex}")
+        os.makedirs(temporario)
+        try:
+            escrever(temporario)
+            if _tamanho(temporario) > self.limite_bytes:
+                shutil.rmtree(temporario, ignore_errors=True)
+                return False
+            os.rename(temporario, entrada)
+        except OSError:
+            # Outro processo guardou a mesma entrada primeiro.
+            shutil.rmtree(temporario, ignore_errors=True)
+            if not os.path.exists(entrada):
+                raise
+        except BaseException:
+            shutil.rmtree(temporario, ignore_errors=True)
+            raise
+
+        self._remover_excedente(preservar=entrada)
+        return True
+
+    def _remover_excedente(self, preservar: Optional[str] = None):
+        """Apaga as entradas usadas há mais tempo até o diretório caber no limite.
+
+        Args:
+            preservar (Optional[str]): A entrada recém-guardada, que nunca é removida.
+        """
+        entradas: List[Tuple[float, int, str]] = []
+        for nome in os.listdir(self.diretorio):
+            entrada = os.path.join(self.diretorio, nome)
+            meta = os.path.join(entrada, ARQUIVO_DE_META)
+            if nome.startswith(_PREFIXO_TEMPORARIO) or not os.path.exists(meta):
+                continue
+            try:
+                entradas.append((os.stat(meta).st_mtime, _tamanho(entrada), entrada))
+            except OSError:
+                continue
+
+        total = sum(tamanho for _, tamanho, _ in entradas)
+        for _, tamanho, entrada in sorted(entradas):
+            if total <= self.limite_bytes:
+                break
+            if entrada == preservar:
+                continue
+            shutil.rmtree(entrada, ignore_errors=True)
+            total -= tamanho
+
+
+def _tamanho(entrada: str) -> int:
+    """Retorna o tamanho, em bytes, dos arquivos de uma entrada."""
+    return sum(arquivo.stat().st_size for arquivo in os.scandir(entrada))
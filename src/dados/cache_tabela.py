@@ -0,0 +1,311 @@
+"""
+Este módulo implementa um cache em disco da tabela de frequência já lida e validada.
+
+Cada tabela é guardada como um conjunto de arquivos `.npy` (um por coluna) dentro de
+um diretório próprio, cujo nome é derivado do conteúdo do CSV. Nas execuções
+seguintes, se o CSV não mudou, as colunas são abertas com `mmap`, e o bot não
+precisa ler o CSV nem procurar valores nulos de novo.
+
+Developer's Note:
+    - A chave de uma entrada é o hash SHA-256 do conteúdo do CSV, o seu tamanho e as
+      opções de leitura. Para não recalcular o hash a cada execução, o tamanho e o
+      `mtime` do arquivo ficam anotados em `chaves/`; enquanto eles não mudarem, o
+      hash anotado é reaproveitado.
+    - A escrita atômica e a remoção LRU vêm de `DiretorioLRU` (veja
+      `src/armazenamento/diretorio_lru.py`), compartilhado com o acervo de relatórios.
+      Uma tabela maior que o limite inteiro é recusada antes de ser convertida em
+      arquivos `.npy`.
+"""
+
+import hashlib
+import json
+import os
+import uuid
+from typing import Dict, Optional, Tuple
+import numpy as np
+import pandas as pd
+from src.armazenamento.diretorio_lru import ARQUIVO_DE_META, DiretorioLRU
+from src.dados.ler_tabela import ler_tabela_frequencia
+from src.log.registrar_logs import LogFile
+from settings import ConfiguracaoDaExecucao
+
+# Tamanho dos blocos lidos para calcular o hash do CSV.
+_BLOCO_DO_HASH = 1024 * 1024
+
+
+class CacheTabela(DiretorioLRU):
+    """Cache LRU, em disco, de tabelas de frequência já validadas.
+
+    Attributes:
+        diretorio (str): O diretório onde as entradas do cache são guardadas.
+        limite_bytes (int): O tamanho máximo do cache, em bytes.
+    """
+    def __init__(self, diretorio: str, limite_bytes: int):
+        """Inicializa a classe CacheTabela.
+
+        Args:
+            diretorio (str): O diretório do cache. É criado se não existir.
+            limite_bytes (int): O tamanho máximo do cache, em bytes.
+        """
+        super().__init__(diretorio, limite_bytes)
+        os.makedirs(os.path.join(self.diretorio, "chaves"), exist_ok=True)
+
+    def carregar(self, path_to_data_table: str, opcoes: str = "") -> Optional[pd.DataFrame]:
+        """Carrega a tabela do cache, se o CSV não mudou desde que foi guardada.
+
+        Args:
+            path_to_data_table (str): O caminho do arquivo CSV.
+            opcoes (str): As opções de leitura usadas para gerar a tabela.
+
+        Returns:
+            Optional[pd.DataFrame]: A tabela, ou `None` se não houver entrada válida.
+        """
+        entrada = self._entrada(self._chave(path_to_data_table, opcoes))
+        try:
+            with open(os.path.join(entrada, ARQUIVO_DE_META)) as f:
+                meta = json.load(f)
+            colunas = {
+                coluna["nome"]: _coluna_do_disco(os.path.join(entrada, coluna["arquivo"]), coluna["tipo"])
+                for coluna in meta["colunas"]
+            }
+            self._marcar_uso(entrada)
+        except (OSError, ValueError, KeyError):
+            return None
+        return pd.DataFrame(colunas, copy=False)
+
+    def salvar(self, path_to_data_table: str, df: pd.DataFrame, opcoes: str = "") -> bool:
+        """Guarda uma tabela já validada no cache e remove as entradas mais antigas.
+
+        Uma tabela que, sozinha, passa do limite do cache não é guardada: ela seria
+        removida logo em seguida, e cada execução pagaria a escrita sem nunca
+        encontrá-la.
+
+        Args:
+            path_to_data_table (str): O caminho do arquivo CSV de origem.
+            df (pd.DataFrame): A tabela lida e validada.
+            opcoes (str): As opções de leitura usadas para gerar a tabela.
+
+        Returns:
+            bool: Verdadeiro se a tabela está no cache; falso se ela não cabe nele.
+        """
+        chave = self._chave(path_to_data_table, opcoes)
+        if os.path.exists(self._entrada(chave)):
+            return True
+
+        colunas = [(nome, serie.dtype, _coluna_para_disco(serie)) for nome, serie in df.items()]
+        if sum(valores.nbytes for _, _, valores in colunas) > self.limite_bytes:
+            return False
+
+        def escrever(temporario: str):
+            meta = {"colunas": []}
+            for i, (nome, tipo, valores) in enumerate(colunas):
+                arquivo = f"c{i}.npy"
+                np.save(os.path.join(temporario, arquivo), valores, allow_pickle=False)
+                meta["colunas"].append({"nome": nome, "arquivo": arquivo, "tipo": str(tipo)})
+            with open(os.path.join(temporario, ARQUIVO_DE_META), "w") as f:
+                json.dump(meta, f)
+
+        return self._publicar(chave, escrever)
+
+    def _chave(self, path_to_data_table: str, opcoes: str) -> str:
+        """Calcula a chave da entrada de um CSV.
+
+        Args:
+            path_to_data_table (str): O caminho do arquivo CSV.
+            opcoes (str): As opções de leitura usadas para gerar a tabela.
+
+        Returns:
+            str: A chave (hexadecimal) da entrada no cache.
+        """
+        info = os.stat(path_to_data_table)
+        caminho = os.path.abspath(path_to_data_table)
+        anotacao = os.path.join(
+            self.diretorio, "chaves", hashlib.sha1(caminho.encode()).hexdigest() + ".json"
+        )
+
+        conteudo = None
+        try:
+            with open(anotacao) as f:
+                anotado = json.load(f)
+            if anotado["tamanho"] == info.st_size and anotado["mtime_ns"] == info.st_mtime_ns:
+                conteudo = anotado["hash"]
+        except (OSError, ValueError, KeyError):
+            pass
+
+        if conteudo is None:
+            conteudo = _hash_do_arquivo(path_to_data_table)
+            _escrever_json(anotacao, {
+                "tamanho": info.st_size, "mtime_ns": info.st_mtime_ns, "hash": conteudo
+            })
+
+        return hashlib.sha256(f"{conteudo}:{info.st_size}:{opcoes}".encode()).hexdigest()
+
+
+def cache_da_execucao(config: ConfiguracaoDaExecucao) -> Optional[CacheTabela]:
+    """Cria o cache configurado pelos parâmetros da automação.
+
+    Args:
+        config (ConfiguracaoDaExecucao): A configuração da execução.
+
+    Returns:
+        Optional[CacheTabela]: O cache, ou `None` se `CACHE_MAX_MB` for 0.
+    """
+    limite_mb = config.CACHE_MAX_MB
+    if not limite_mb:
+        return None
+    return CacheTabela(config.PATH_TO_CACHE_DIR, limite_mb * 1024 * 1024)
+
+
+def ler_tabela_com_cache(path_to_data_table: str, cache: Optional[CacheTabela], log_file: Optional[LogFile] = None,
+                         **opcoes_de_leitura) -> pd.DataFrame:
+    """Lê a tabela de frequência, usando o cache quando possível.
+
+    Args:
+        path_to_data_table (str): O caminho do arquivo CSV.
+        cache (Optional[CacheTabela]): O cache a ser usado. Se `None`, a tabela é
+            sempre lida do CSV.
+        log_file (Optional[LogFile]): Onde avisar que a tabela não coube no cache. Nos
+            processos trabalhadores, que não têm o log, o aviso vai para a saída padrão.
+        **opcoes_de_leitura: Argumentos repassados a `ler_tabela_frequencia`.
+
+    Returns:
+        pd.DataFrame: A tabela completa, já validada.
+    """
+    df, guardada = _ler_e_guardar(path_to_data_table, cache, opcoes_de_leitura)
+    if not guardada:
+        _avisar_fora_do_cache(path_to_data_table, cache, log_file)
+    return df
+
+
+def guardar_no_cache(path_to_data_table: str, cache: CacheTabela, **opcoes_de_leitura) -> bool:
+    """Lê a tabela e a guarda no cache, sem devolvê-la (veja `preparar_tabela`).
+
+    Args:
+        path_to_data_table (str): O caminho do arquivo CSV.
+        cache (CacheTabela): O cache onde a tabela é guardada.
+        **opcoes_de_leitura: Argumentos repassados a `ler_tabela_frequencia`.
+
+    Returns:
+        bool: Verdadeiro se a tabela está no cache; falso se ela não cabe nele.
+    """
+    return _ler_e_guardar(path_to_data_table, cache, opcoes_de_leitura)[1]
+
+
+def _ler_e_guardar(path_to_data_table: str, cache: Optional[CacheTabela],
+                   opcoes_de_leitura: Dict[str, object]) -> Tuple[pd.DataFrame, bool]:
+    """Carrega a tabela do cache ou a lê do CSV e a guarda no cache.
+
+    Returns:
+        Tuple[pd.DataFrame, bool]: A tabela e se ela está no cache (sempre verdadeiro
+            sem cache, pois não há o que avisar).
+    """
+    if cache is None:
+        return ler_tabela_frequencia(path_to_data_table, **opcoes_de_leitura), True
+
+    opcoes = _descrever_opcoes(opcoes_de_leitura)
+    df = cache.carregar(path_to_data_table, opcoes)
+    if df is not None:
+        return df, True
+    df = ler_tabela_frequencia(path_to_data_table, **opcoes_de_leitura)
+    return df, cache.salvar(path_to_data_table, df, opcoes)
+
+
+def _avisar_fora_do_cache(path_to_data_table: str, cache: CacheTabela, log_file: Optional[LogFile]):
+    """Avisa que uma tabela é maior que o limite do cache e não foi guardada."""
+    mensagem = (
+        f"A tabela {path_to_data_table} é maior que o limite do cache de tabelas "
+        f"({cache.limite_bytes // (1024 * 1024)} MB) e não foi guardada; aumente CACHE_MAX_MB para reaproveitá-la."
+    )
+    if log_file is not None:
+        log_file.log_message(mensagem, level="WARNING")
+    else:
+        print(mensagem)
+
+
+def _descrever_opcoes(opcoes_de_leitura: Dict[str, object]) -> str:
+    """Descreve as opções de leitura de forma estável entre execuções.
+
+    O tamanho dos blocos e o limite de erros não mudam o resultado e ficam de fora.
+
+    Args:
+        opcoes_de_leitura (Dict[str, object]): Os argumentos de `ler_tabela_frequencia`.
+
+    Returns:
+        str: Uma descrição textual das opções que afetam a tabela lida.
+    """
+    def descrever(valor: object) -> object:
+        if isinstance(valor, dict):
+            return {str(k): descrever(v) for k, v in sorted(valor.items())}
+        if callable(valor):
+            return f"{valor.__module__}.{valor.__qualname__}"
+        return valor
+
+    relevantes = {
+        k: descrever(v) for k, v in opcoes_de_leitura.items() if k not in ("chunksize", "max_erros")
+    }
+    return json.dumps(relevantes, sort_keys=True, default=str)
+
+
+def _coluna_para_disco(serie: pd.Series) -> np.ndarray:
+    """Converte uma coluna em um array NumPy que pode ser aberto com `mmap`.
+
+    Textos viram arrays de largura fixa (`<U`), pois arrays de objetos exigiriam `pickle`.
+
+    Args:
+        serie (pd.Series): A coluna da tabela (já validada, sem nulos).
+
+    Returns:
+        np.ndarray: Os valores da coluna.
+    """
+    if pd.api.types.is_numeric_dtype(serie.dtype) or pd.api.types.is_bool_dtype(serie.dtype):
+        if isinstance(serie.dtype, pd.api.extensions.ExtensionDtype):
+            return serie.to_numpy(dtype=serie.dtype.numpy_dtype)
+        return serie.to_numpy()
+    if pd.api.types.is_datetime64_dtype(serie.dtype):
+        return serie.to_numpy()
+    return serie.astype(str).to_numpy(dtype=str)
+
+
+def _coluna_do_disco(arquivo: str, tipo: str) -> pd.Series:
+    """Abre uma coluna do cache com `mmap` e restaura o seu tipo original.
+
+    Args:
+        arquivo (str): O caminho do arquivo `.npy` da coluna.
+        tipo (str): O tipo pandas original da coluna.
+
+    Returns:
+        pd.Series: A coluna da tabela.
+    """
+    valores = np.load(arquivo, mmap_mode="r", allow_pickle=False)
+    if str(valores.dtype) == tipo:
+        return pd.Series(valores, copy=False)
+    return pd.Series(valores).astype(tipo)
+
+
+def _hash_do_arquivo(caminho: str) -> str:
+    """Calcula o hash SHA-256 do conteúdo de um arquivo.
+
+    Args:
+        caminho (str): O caminho do arquivo.
+
+    Returns:
+        str: O hash, em hexadecimal.
+    """
+    hash_ = hashlib.sha256()
+    with open(caminho, "rb") as f:
+        for bloco in iter(lambda: f.read(_BLOCO_DO_HASH), b""):
+            hash_.update(bloco)
+    return hash_.hexdigest()
+
+
+def _escrever_json(caminho: str, conteudo: dict):
+    """Escreve um arquivo JSON de forma atômica.
+
+    Args:
+        caminho (str): O caminho do arquivo.
+        conteudo (dict): O conteúdo a ser escrito.
+    """
+    temporario = f"{caminho}.{uuid.uuid4().hex}.tmp"
+    with open(temporario, "w") as f:
+        json.dump(conteudo, f)
+    os.replace(temporario, caminho)
@@ -0,0 +1,262 @@
+"""
+Este módulo implementa a leitura da tabela de frequência em blocos (chunks).
+
+Tabelas muito grandes não são carregadas de uma vez: o arquivo CSV é lido em blocos
+com tipos de coluna fixos, e cada bloco é validado (esquema e valores nulos) assim
+que é lido. Os blocos válidos são montados coluna a coluna no DataFrame final, de
+modo que nunca existem duas cópias completas da tabela em memória.
+
+Developer's Note:
+    Os tipos das colunas são inferidos de uma pequena amostra do início do arquivo e
+    então fixados para todos os blocos. Se um bloco posterior não couber neles (ex:
+    uma coluna que parecia inteira passa a ter decimais ou texto), a coluna é
+    alargada e o arquivo é lido de novo; só dados que não cabem em nenhum tipo (ex:
+    um conversor que falha) são recusados. Colunas inteiras e booleanas usam os tipos
+    "nullable" do pandas (`Int64`, `boolean`), para que células vazias cheguem até a
+    validação de nulos em vez de quebrar a leitura. Para forçar o tipo de uma coluna,
+    passe-o em `dtypes`; para transformar os valores de uma coluna durante a leitura,
+    passe uma função em `converters`.
+"""
+
+from typing import Callable, Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+from src.errors.errors import DadosInvalidosError
+
+# Linhas lidas para inferir os tipos das colunas.
+LINHAS_DA_AMOSTRA = 1000
+
+# Tipos "nullable" usados no lugar dos tipos inferidos pelo pandas.
+_TIPOS_NULLABLE = {"int64": "Int64", "bool": "boolean"}
+
+
+def ler_tabela_frequencia(path_to_data_table: str,
+                          chunksize: int = 100_000,
+                          dtypes: Optional[Dict[str, str]] = None,
+                          converters: Optional[Dict[str, Callable]] = None,
+                          colunas_esperadas: Optional[List[str]] = None,
+                          max_erros: int = 10) -> pd.DataFrame:
+    """Lê e valida a tabela de frequência em blocos.
+
+    Args:
+        path_to_data_table (str): O caminho do arquivo CSV.
+        chunksize (int): A quantidade de linhas lidas e validadas por vez.
+        dtypes (Optional[Dict[str, str]]): Tipos explícitos por coluna. As demais
+            colunas têm o tipo inferido de uma amostra do arquivo.
+        converters (Optional[Dict[str, Callable]]): Funções de conversão por coluna.
+        colunas_esperadas (Optional[List[str]]): Se informado, o cabeçalho do arquivo
+            precisa ter exatamente estas colunas, nesta ordem.
+        max_erros (int): A quantidade máxima de células inválidas reportadas.
+
+    Returns:
+        pd.DataFrame: A tabela completa, já validada.
+
+    Raises:
+        DadosInvalidosError: Se o cabeçalho não corresponder ao esperado, se algum
+            valor não puder ser convertido para o tipo da coluna ou se houver
+            células nulas.
+    """
+    converters = converters or {}
+    colunas, tipos = _tipos_das_colunas(path_to_data_table, dtypes or {}, converters)
+
+    if colunas_esperadas is not None and colunas != list(colunas_esperadas):
+        raise DadosInvalidosError(
+            f"O cabeçalho da tabela não corresponde ao esperado: {colunas} != {list(colunas_esperadas)}"
+        )
+
+    # Se um bloco tiver valores que não cabem no tipo inferido da amostra (ex: uma
+    # coluna de inteiros que passa a ter decimais), a coluna é alargada e a tabela é
+    # lida de novo. Cada coluna só pode ser alargada duas vezes (veja `_ALARGAMENTOS`).
+    while True:
+        try:
+            partes, erros = _ler_blocos(path_to_data_table, chunksize, tipos, converters, max_erros)
+            break
+        except _BlocoForaDoTipo as e:
+            alargados = _alargar_tipos(path_to_data_table, e.inicio_do_bloco, chunksize, tipos,
+                                       dtypes or {}, converters)
+            if not alargados:
+                raise DadosInvalidosError(
+                    f"Valor fora do esquema após a linha {e.inicio_do_bloco + 1} da tabela: {e.erro}"
+                ) from e.erro
+            tipos.update(alargados)
+
+    if erros:
+        raise DadosInvalidosError("Valores nulos encontrados nos dados", erros)
+
+    return _montar_tabela(partes, colunas)
+
+
+class _BlocoForaDoTipo(Exception):
+    """Indica que um bloco não pôde ser convertido para os tipos das colunas."""
+
+    def __init__(self, inicio_do_bloco: int, erro: Exception):
+        super().__init__(str(erro))
+        self.inicio_do_bloco = inicio_do_bloco
+        self.erro = erro
+
+
+def _ler_blocos(path_to_data_table: str, chunksize: int, tipos: Dict[str, str],
+                converters: Dict[str, Callable],
+                max_erros: int) -> Tuple[Dict[str, List[pd.Series]], List[Tuple[int, str]]]:
+    """Lê o arquivo em blocos com os tipos informados, validando os nulos de cada um.
+
+    Args:
+        path_to_data_table (str): O caminho do arquivo CSV.
+        chunksize (int): A quantidade de linhas lidas e validadas por vez.
+        tipos (Dict[str, str]): O tipo de cada coluna.
+        converters (Dict[str, Callable]): Funções de conversão por coluna.
+        max_erros (int): A quantidade máxima de células inválidas reportadas.
+
+    Returns:
+        Tuple[Dict[str, List[pd.Series]], List[Tuple[int, str]]]: Os pedaços de cada
+            coluna e as células nulas encontradas.
+
+    Raises:
+        _BlocoForaDoTipo: Se algum valor não puder ser convertido para o tipo da coluna.
+    """
+    partes: Dict[str, List[pd.Series]] = {}
+    erros: List[Tuple[int, str]] = []
+    leitor = pd.read_csv(path_to_data_table, chunksize=chunksize, dtype=tipos, converters=converters)
+    inicio_do_bloco = 0
+    try:
+        with leitor:
+            for bloco in leitor:
+                erros.extend(_celulas_nulas(bloco, max_erros - len(erros)))
+                if len(erros) >= max_erros:
+                    break
+                # Depois do primeiro erro os blocos são apenas varridos, não guardados.
+                # Cada coluna é copiada para não manter o bloco inteiro vivo.
+                if not erros:
+                    for coluna in bloco.columns:
+                        partes.setdefault(coluna, []).append(bloco[coluna].copy())
+                inicio_do_bloco += len(bloco)
+    except (ValueError, TypeError) as e:
+        raise _BlocoForaDoTipo(inicio_do_bloco, e) from e
+    return partes, erros
+
+
+def _alargar_tipos(path_to_data_table: str, inicio_do_bloco: int, chunksize: int, tipos: Dict[str, str],
+                   dtypes: Dict[str, str], converters: Dict[str, Callable]) -> Dict[str, str]:
+    """Escolhe tipos mais largos para as colunas que não couberam em um bloco.
+
+    O bloco que falhou é lido de novo sem tipos fixos, e cada coluna recebe o tipo
+    mais largo entre o atual e o inferido do bloco (`Int64` → `float64` → `object`).
+    Colunas com tipo explícito em `dtypes` nunca são alargadas.
+
+    Args:
+        path_to_data_table (str): O caminho do arquivo CSV.
+        inicio_do_bloco (int): A primeira linha de dados do bloco que falhou.
+        chunksize (int): O tamanho do bloco.
+        tipos (Dict[str, str]): O tipo atual de cada coluna.
+        dtypes (Dict[str, str]): Os tipos explícitos, que não são alterados.
+        converters (Dict[str, Callable]): Funções de conversão por coluna.
+
+    Returns:
+        Dict[str, str]: Os novos tipos das colunas alargadas, ou um dicionário vazio
+            se nenhuma coluna puder ser alargada (os dados são mesmo inválidos).
+    """
+    try:
+        bloco = pd.read_csv(path_to_data_table, skiprows=range(1, inicio_do_bloco + 1), nrows=chunksize,
+                            converters=converters)
+    except (ValueError, TypeError):
+        # O bloco não pode ser lido nem sem tipos fixos (ex: um conversor falhou).
+        return {}
+    alargados = {}
+    for coluna, atual in tipos.items():
+        if coluna in dtypes or coluna not in bloco.columns:
+            continue
+        novo = _tipo_mais_largo(atual, _tipo_observado(bloco[coluna]))
+        if novo != atual:
+            alargados[coluna] = novo
+    return alargados
+
+
+# A ordem em que os tipos das colunas são alargados.
+_ALARGAMENTOS = ("Int64", "float64", "object")
+
+
+def _tipo_observado(coluna: pd.Series) -> str:
+    """Retorna o tipo de `_ALARGAMENTOS` (ou `boolean`) que comporta os valores da coluna."""
+    tipo = str(coluna.dtype)
+    if tipo in ("int64", "Int64"):
+        return "Int64"
+    if tipo == "float64":
+        # Inteiros com células vazias são lidos como float; os nulos são validados depois.
+        validos = coluna.dropna()
+        return "Int64" if (validos == validos.round()).all() else "float64"
+    if tipo in ("bool", "boolean"):
+        return "boolean"
+    return "object"
+
+
+def _tipo_mais_largo(atual: str, observado: str) -> str:
+    """Retorna o tipo que comporta tanto o tipo atual quanto o observado."""
+    if atual == observado:
+        return atual
+    if atual in _ALARGAMENTOS and observado in _ALARGAMENTOS:
+        return max(atual, observado, key=_ALARGAMENTOS.index)
+    return "object"
+
+
+def _tipos_das_colunas(path_to_data_table: str, dtypes: Dict[str, str],
+                       converters: Dict[str, Callable]) -> Tuple[List[str], Dict[str, str]]:
+    """Define o tipo de cada coluna a partir de uma amostra do arquivo.
+
+    Args:
+        path_to_data_table (str): O caminho do arquivo CSV.
+        dtypes (Dict[str, str]): Tipos explícitos, que têm precedência sobre a amostra.
+        converters (Dict[str, Callable]): Colunas com conversor próprio (sem tipo fixo).
+
+    Returns:
+        Tuple[List[str], Dict[str, str]]: As colunas do cabeçalho, em ordem, e o tipo
+            de cada coluna que não tem conversor próprio.
+    """
+    amostra = pd.read_csv(path_to_data_table, nrows=LINHAS_DA_AMOSTRA, converters=converters)
+    tipos = {}
+    for coluna, tipo in amostra.dtypes.items():
+        if coluna in converters:
+            continue
+        tipo = str(tipo)
+        tipos[coluna] = dtypes.get(coluna, _TIPOS_NULLABLE.get(tipo, tipo))
+    return amostra.columns.tolist(), tipos
+
+
+def _celulas_nulas(bloco: pd.DataFrame, limite: int) -> List[Tuple[int, str]]:
+    """Localiza as primeiras células nulas de um bloco.
+
+    Args:
+        bloco (pd.DataFrame): O bloco da tabela a ser validado.
+        limite (int): A quantidade máxima de posições retornadas.
+
+    Returns:
+        List[Tuple[int, str]]: Pares (linha no arquivo CSV, nome da coluna).
+    """
+    if limite <= 0:
+        return []
+    linhas, colunas = np.nonzero(bloco.isna().to_numpy())
+    # O cabeçalho ocupa a linha 1 do arquivo.
+    return [
+        (int(bloco.index[linha]) + 2, bloco.columns[coluna])
+        for linha, coluna in zip(linhas[:limite], colunas[:limite])
+    ]
+
+
+def _montar_tabela(partes: Dict[str, List[pd.Series]], colunas: List[str]) -> pd.DataFrame:
+    """Junta os blocos lidos em um único DataFrame, uma coluna por vez.
+
+    Os blocos de cada coluna são liberados logo após serem concatenados, então o
+    pico de memória é a tabela final mais uma coluna, e não duas tabelas inteiras.
+
+    Args:
+        partes (Dict[str, List[pd.Series]]): Os pedaços de cada coluna, em ordem.
+        colunas (List[str]): A ordem das colunas no DataFrame final.
+
+    Returns:
+        pd.DataFrame: A tabela completa.
+    """
+    dados = {}
+    for coluna in colunas:
+        pedacos = partes.pop(coluna, [])
+        dados[coluna] = pd.concat(pedacos, ignore_index=True) if pedacos else pd.Series(dtype=object)
+        del pedacos
+    return pd.DataFrame(dados, copy=False)
@@ -2,18 +2,48 @@
 Este módulo define o protocolo de tratamento de erros da automação.
 """
 
+import traceback
+from typing import List, Tuple, Union
 from botcity.maestro import AlertType, BotMaestroSDK, BotExecution
 from src.log.registrar_logs import LogFile
+from src.notificacao.caixa_de_saida import CaixaDeSaidaDoMaestro
+
+
+class DadosInvalidosError(ValueError):
+    """Indica que a tabela de frequência tem células nulas ou fora do esquema.
+
+    Attributes:
+        posicoes (List[Tuple[int, str]]): As primeiras células problemáticas
+            encontradas, como pares (linha no arquivo CSV, nome da coluna).
+    """
+    def __init__(self, message: str, posicoes: List[Tuple[int, str]] = None):
+        """Inicializa a exceção.
+
+        Args:
+            message (str): A descrição do problema encontrado.
+            posicoes (List[Tuple[int, str]]): As células problemáticas, se conhecidas.
+        """
+        self.posicoes = posicoes or []
+        if self.posicoes:
+            celulas = "; ".join(f"linha {linha}, coluna '{coluna}'" for linha, coluna in self.posicoes)
+            message = f"{message} ({celulas})"
+        super().__init__(message)
+
 
 class ErrorProtocol:
     """Centraliza a lógica de tratamento de erros da automação.
 
     Quando um erro ocorre, esta classe é responsável por:
-    1. Enviar o erro para o BotCity Maestro.
-    2. Enviar um alerta para o Maestro.
-    3. Registrar a exceção no arquivo de log.
+    1. Registrar a exceção, com o rastreamento, no arquivo de log.
+    2. Enviar o erro para o BotCity Maestro, com o final do log como anexo.
+    3. Enviar um alerta para o Maestro.
     4. Encerrar a execução do bot para prevenir comportamento inesperado.
 
+    Com uma `CaixaDeSaidaDoMaestro` no lugar do SDK, o erro e o alerta são enviados
+    em segundo plano: ao encerrar, o bot espera o envio até
+    `MAESTRO_TEMPO_DE_ENCERRAMENTO` segundos, e o que não for enviado fica para a
+    próxima execução.
+
     Developer's Note:
         Para usar este protocolo em uma nova parte do código que pode gerar uma exceção,
         envolva o código em um bloco `try...except` e chame o método
@@ -28,11 +58,12 @@ class ErrorProtocol:
             error_protocol.send_and_register_error("Descrição do erro para o Maestro", e)
         ```
     """
-    def __init__(self, maestro: BotMaestroSDK, log_file: LogFile):
+    def __init__(self, maestro: Union[BotMaestroSDK, CaixaDeSaidaDoMaestro], log_file: LogFile):
         """Inicializa a classe ErrorProtocol.
 
         Args:
-            maestro (BotMaestroSDK): A instância do SDK do BotCity Maestro.
+            maestro (Union[BotMaestroSDK, CaixaDeSaidaDoMaestro]): A instância do SDK
+                do BotCity Maestro, ou a caixa de saída que envia as chamadas a ele.
             log_file (LogFile): A instância do gerenciador de logs.
         """
         self._maestro = maestro
@@ -40,12 +71,18 @@ class ErrorProtocol:
         self.log_file = log_file
         
     def send_and_register_error(self, message: str, e: Exception):
-        """Envia, alerta, registra o erro e encerra a execução.
+        """Registra, envia, alerta o erro e encerra a execução.
 
         Args:
             message (str): A mensagem descritiva do erro para o alerta do Maestro.
             e (Exception): O objeto da exceção que foi capturada.
         """
+        # Registra o erro no arquivo de log e garante que ele já foi gravado,
+        # pois o final do arquivo é enviado como anexo logo abaixo.
+        rastreamento = "".join(traceback.format_exception(type(e), e, e.__traceback__))
+        self.log_file.log_message(f"ERRO DE EXECUÇÃO: {message}\n{rastreamento}", level="ERROR")
+        self.log_file.flush()
+
         # Envia o erro para o orquestrador com o log como anexo.
         self._maestro.error(
             task_id=self._execution.task_id,
@@ -60,8 +97,5 @@ class ErrorProtocol:
             alert_type=AlertType.ERROR
         )
 
-        # Registra o erro no arquivo de log.
-        self.log_file.log_message(f"ERRO DE EXECUÇÃO...\n{e}")
-
-        # Encerra o programa.
+        # Encerra o programa. A caixa de saída termina os envios ao sair.
         exit(1)
\ No newline at end of file
@@ -1,55 +1,178 @@
 """
 Este módulo fornece a classe LogFile para gerenciar a criação e escrita de logs
 durante a execução do bot.
+
+As mensagens não são escritas no arquivo por quem as registra: elas entram em uma
+fila em memória e uma thread em segundo plano as grava em lotes. Assim, registrar
+uma mensagem custa apenas montar o registro e colocá-lo na fila, e nunca bloqueia a
+geração dos relatórios.
 """
 
 from datetime import datetime
+import atexit
+import json
 import os
-from botcity.maestro import BotExecution
-import settings as s
+import queue
+import threading
+import uuid
+from settings import ConfiguracaoDaExecucao
+
+# Quantidade máxima de registros gravados de uma vez.
+_REGISTROS_POR_LOTE = 500
+# Intervalo máximo, em segundos, entre duas gravações.
+_INTERVALO_DE_GRAVACAO = 0.5
+# Marca colocada na fila para encerrar a thread de gravação.
+_FIM = object()
+
 
 class LogFile:
     """Gerencia a criação e o registro de mensagens em um arquivo de log.
 
     A classe verifica se um arquivo de log já existe. Se não, um novo arquivo é criado.
-    As mensagens de log são sempre prefixadas com a data e hora atuais.
+    Cada mensagem é gravada como uma linha JSON, com a data e hora do próprio registro,
+    o nível, o identificador da tarefa do Maestro e o identificador desta execução.
+    Quando o arquivo passa de `LOG_MAX_BYTES`, ele é renomeado para `<arquivo>.1`
+    (os anteriores viram `.2`, `.3`, ...) e um novo arquivo é iniciado.
 
     Attributes:
         path_file (str): O caminho para o arquivo de log, obtido dos parâmetros da automação.
-        horario_aut (str): A data e hora formatadas para serem usadas no log.
+        task_id (str): O identificador da tarefa do Maestro.
+        id_execucao (str): Um identificador único desta execução do bot.
+        descartadas (int): Mensagens descartadas porque a fila estava cheia.
 
     Developer's Note:
-        Se for necessário um formato de log diferente ou uma lógica de rotação de arquivos,
-        você pode adicionar novos métodos a esta classe ou modificar o método `log_message`.
-        Por exemplo, para adicionar um nível de log (INFO, WARNING), você poderia
-        modificar `log_message` para aceitar um parâmetro `level` e formatar a string
-        de acordo.
+        Se for necessário um formato de log diferente, altere o método `_registro`.
+        Antes de ler ou enviar o arquivo de log (ex: como anexo ao Maestro), chame
+        `flush()` para garantir que as mensagens da fila já foram gravadas. A fila é
+        esvaziada automaticamente quando o programa termina.
     """
-    def __init__(self, execution: BotExecution) -> None:
-        """Inicializa a classe LogFile.
+    def __init__(self, config: ConfiguracaoDaExecucao) -> None:
+        """Inicializa a classe LogFile e inicia a thread de gravação.
 
         Args:
-            execution (BotExecution): O objeto de execução da tarefa do Maestro.
+            config (ConfiguracaoDaExecucao): A configuração da execução.
         """
-        self.path_file = s.PATH_TO_LOGFILE.get_value_as_str(execution)
-        agora = str(datetime.now()) + "\n"
-        self.horario_aut = f"Horário: {agora}"
-        
+        self.path_file = config.PATH_TO_LOGFILE
+        self.task_id = str(config.task_id)
+        self.id_execucao = uuid.uuid4().hex
+        self.descartadas = 0
+        self._max_bytes = config.LOG_MAX_BYTES
+        self._backups = config.LOG_BACKUPS
+        self._fila: queue.Queue = queue.Queue(maxsize=config.LOG_FILA_MAX)
+
         # Se não existir um arquivo para logs, criar um com conteúdo vazio.
         if not os.path.exists(self.path_file):
             self._write_log_file("")
 
-    def log_message(self, contents: str):
+        self._gravador = threading.Thread(target=self._gravar_em_segundo_plano, name="log-file", daemon=True)
+        self._gravador.start()
+        atexit.register(self.close)
+
+    def log_message(self, contents: str, level: str = "INFO"):
         """Registra uma nova mensagem no arquivo de log.
 
-        A mensagem é adicionada ao final do arquivo, prefixada com o horário.
+        A mensagem é colocada na fila e gravada em segundo plano. Se a fila estiver
+        cheia, a mensagem é descartada (e contada em `descartadas`) em vez de bloquear.
 
         Args:
             contents (str): O conteúdo da mensagem de log a ser registrada.
+            level (str): O nível da mensagem (ex: "INFO", "WARNING", "ERROR").
         """
-        with open(self.path_file, "a") as f:
-            f.write(self.horario_aut + contents + "...\n")
-    
+        try:
+            self._fila.put_nowait(self._registro(contents, level))
+        except queue.Full:
+            self.descartadas += 1
+
+    def flush(self):
+        """Espera até que todas as mensagens já registradas estejam gravadas no arquivo."""
+        if self._gravador.is_alive():
+            self._fila.join()
+
+    def close(self):
+        """Grava as mensagens pendentes e encerra a thread de gravação."""
+        if self._gravador.is_alive():
+            self._fila.put(_FIM)
+            self._gravador.join()
+
+    def _registro(self, contents: str, level: str) -> dict:
+        """Monta o registro de uma mensagem.
+
+        Args:
+            contents (str): O conteúdo da mensagem.
+            level (str): O nível da mensagem.
+
+        Returns:
+            dict: O registro, pronto para ser gravado como JSON.
+        """
+        return {
+            "horario": datetime.now().isoformat(),
+            "nivel": str(level),
+            "task_id": self.task_id,
+            "execucao": self.id_execucao,
+            # Mensagens que não são texto (ex: uma exceção) são gravadas como texto.
+            "mensagem": str(contents),
+        }
+
+    def _gravar_em_segundo_plano(self):
+        """Laço da thread de gravação: junta os registros da fila e os grava em lotes."""
+        encerrar = False
+        while not encerrar:
+            try:
+                lote = [self._fila.get(timeout=_INTERVALO_DE_GRAVACAO)]
+            except queue.Empty:
+                continue
+            while len(lote) < _REGISTROS_POR_LOTE:
+                try:
+                    lote.append(self._fila.get_nowait())
+                except queue.Empty:
+                    break
+
+            if _FIM in lote:
+                encerrar = True
+            registros = [registro for registro in lote if registro is not _FIM]
+            if self.descartadas:
+                registros.append(self._registro(
+                    f"{self.descartadas} mensagens de log descartadas (fila cheia)", "WARNING"
+                ))
+                self.descartadas = 0
+
+            try:
+                self._gravar(registros)
+            except Exception:
+                # Um lote que não pôde ser gravado é perdido, mas a thread continua
+                # gravando os próximos.
+                pass
+            finally:
+                for _ in lote:
+                    self._fila.task_done()
+
+    def _gravar(self, registros: list):
+        """Grava um lote de registros, girando o arquivo se ele ficar grande demais.
+
+        Args:
+            registros (list): Os registros a serem gravados.
+        """
+        if not registros:
+            return
+        # O limite é em bytes, e não em caracteres: acentos ocupam mais de um byte.
+        linhas = "".join(json.dumps(registro, ensure_ascii=False) + "\n" for registro in registros).encode("utf-8")
+        if self._max_bytes and os.path.exists(self.path_file) \
+                and os.path.getsize(self.path_file) + len(linhas) > self._max_bytes:
+            self._girar()
+        with open(self.path_file, "ab") as f:
+            f.write(linhas)
+
+    def _girar(self):
+        """Renomeia o arquivo atual para `.1` (e os anteriores para `.2`, `.3`, ...)."""
+        for i in range(self._backups - 1, 0, -1):
+            antigo = f"{self.path_file}.{i}"
+            if os.path.exists(antigo):
+                os.replace(antigo, f"{self.path_file}.{i + 1}")
+        if self._backups > 0:
+            os.replace(self.path_file, f"{self.path_file}.1")
+        else:
+            os.remove(self.path_file)
+
     def _write_log_file(self, contents: str):
         """Escreve (ou sobrescreve) o conteúdo do arquivo de log.
 
@@ -59,4 +182,4 @@ class LogFile:
             contents (str): O conteúdo a ser escrito no arquivo.
         """
         with open(self.path_file, "w") as f:
-            f.write(contents)
\ No newline at end of file
+            f.write(contents)
@@ -0,0 +1,239 @@
+"""
+Este módulo implementa o modo em lote da automação: uma única execução gera os
+relatórios de várias turmas em paralelo.
+
+Cada tabela CSV encontrada na origem informada é processada em um processo
+trabalhador, que gera o seu próprio PDF. A distribuição das tabelas entre os
+processos e o envio dos relatórios ficam a cargo de `src/pipeline/orquestrador.py`.
+Os resultados (e as falhas) são coletados por turma, de modo que um arquivo com
+problema não interrompe o processamento das demais turmas.
+
+Developer's Note:
+    A função `renderizar_turma` é executada dentro dos processos trabalhadores, por
+    isso precisa continuar sendo uma função de módulo (serializável com `pickle`) e
+    não deve chamar o `ErrorProtocol`, que encerra o processo. Erros devem ser
+    devolvidos no `ResultadoTurma`.
+"""
+
+import glob
+import os
+from collections import Counter
+from dataclasses import dataclass
+from typing import List, Mapping, Optional, Tuple
+import numpy as np
+import pandas as pd
+from src.dados.cache_tabela import cache_da_execucao, guardar_no_cache, ler_tabela_com_cache
+from src.errors.errors import DadosInvalidosError
+from src.relatorio.exportacao import exportar_relatorio
+from src.relatorio.gerar_relatorio import report
+from src.relatorio.manifesto import ManifestoDoRelatorio, manifesto_do_relatorio
+from src.relatorio.partes import ParteDoRelatorio, partes_do_relatorio
+from settings import ConfiguracaoDaExecucao
+
+
+@dataclass(frozen=True)
+class ResultadoTurma:
+    """Resultado do processamento de uma turma no modo em lote.
+
+    Attributes:
+        turma (str): O nome da turma, derivado do nome do arquivo CSV.
+        path_to_data_table (str): O caminho da tabela de frequência processada.
+        path_to_output (str): O caminho do PDF gerado para a turma.
+        erro (Optional[str]): A descrição do erro, se o processamento falhou.
+        conteudo (Optional[bytes]): O PDF gerado, se a turma foi renderizada em memória.
+        manifesto (Optional[ManifestoDoRelatorio]): O manifesto do relatório gerado,
+            a ser salvo depois que ele for enviado.
+        inalterado (bool): Indica que os dados não mudaram desde o último envio, então
+            o relatório não foi gerado de novo e não deve ser reenviado.
+        partes (Tuple[ParteDoRelatorio, ...]): Os anexos a enviar, dentro do limite de
+            tamanho (veja `partes.py`).
+        arquivos (Tuple[ParteDoRelatorio, ...]): Os arquivos dos demais formatos
+            pedidos pelos destinatários (veja `exportacao.py`).
+        assinatura (Optional[str]): A assinatura do relatório, usada pelo índice de
+            envios (veja `acervo.py`).
+        do_acervo (bool): Indica que o relatório veio do acervo, sem ser gerado.
+    """
+    turma: str
+    path_to_data_table: str
+    path_to_output: str
+    erro: Optional[str] = None
+    conteudo: Optional[bytes] = None
+    manifesto: Optional[ManifestoDoRelatorio] = None
+    inalterado: bool = False
+    partes: Tuple[ParteDoRelatorio, ...] = ()
+    arquivos: Tuple[ParteDoRelatorio, ...] = ()
+    assinatura: Optional[str] = None
+    do_acervo: bool = False
+
+    @property
+    def sucesso(self) -> bool:
+        """Indica se o relatório da turma foi gerado sem erros."""
+        return self.erro is None
+
+
+def listar_tabelas(origem: str) -> List[str]:
+    """Lista as tabelas CSV que compõem o lote.
+
+    Args:
+        origem (str): Um diretório (todos os arquivos `*.csv` dentro dele são usados)
+            ou um padrão glob (ex: `resources/turmas/*.csv`).
+
+    Returns:
+        List[str]: Os caminhos das tabelas encontradas, em ordem alfabética.
+    """
+    if os.path.isdir(origem):
+        origem = os.path.join(origem, "*.csv")
+    return sorted(glob.glob(origem))
+
+
+def renderizar_turma(config: ConfiguracaoDaExecucao, path_to_data_table: str, path_to_output: str,
+                     turma: Optional[str] = None, filtro: Optional[Mapping[str, str]] = None) -> ResultadoTurma:
+    """Lê, valida e gera o relatório de uma única turma.
+
+    Esta função roda dentro de um processo trabalhador e nunca propaga exceções:
+    qualquer falha é devolvida no campo `erro` do resultado. Com `RELATORIO_INCREMENTAL`
+    ativo, a turma cujos dados não mudaram desde o último envio não é renderizada.
+
+    Args:
+        config (ConfiguracaoDaExecucao): A configuração da execução.
+        path_to_data_table (str): O caminho da tabela CSV da turma.
+        path_to_output (str): O caminho onde o PDF da turma será salvo.
+        turma (Optional[str]): O nome da turma. Se omitido, é derivado do nome do CSV.
+        filtro (Optional[Mapping[str, str]]): Se informado, apenas as linhas com estes
+            valores nestas colunas entram no relatório, e as colunas do filtro são
+            removidas (usado quando um CSV tem várias turmas; veja `src/agenda`).
+
+    Returns:
+        ResultadoTurma: O resultado do processamento da turma.
+    """
+    turma = turma or nome_da_turma(path_to_data_table)
+    try:
+        frequencia_df = ler_tabela_com_cache(
+            path_to_data_table,
+            cache_da_execucao(config),
+            chunksize=config.CSV_CHUNKSIZE,
+            max_erros=config.MAX_ERROS_REPORTADOS
+        )
+        if filtro:
+            frequencia_df = filtrar_tabela(frequencia_df, filtro)
+
+        relatorio = report(config, path_to_output, em_memoria=config.PDF_EM_MEMORIA)
+        manifesto = None
+        if config.RELATORIO_INCREMENTAL:
+            manifesto = manifesto_do_relatorio(config, frequencia_df, relatorio.linhas_por_pagina())
+            if manifesto.inalterado(ManifestoDoRelatorio.carregar(path_to_output)):
+                return ResultadoTurma(turma, path_to_data_table, path_to_output, inalterado=True)
+        exportado = exportar_relatorio(config, relatorio, frequencia_df)
+        partes = partes_do_relatorio(config, frequencia_df, path_to_output, exportado.pdf)
+    except Exception as e:
+        return ResultadoTurma(turma, path_to_data_table, path_to_output,
+                              erro=f"{type(e).__name__}: {e}")
+    return ResultadoTurma(turma, path_to_data_table, path_to_output, conteudo=exportado.pdf, manifesto=manifesto,
+                          partes=tuple(partes), arquivos=exportado.arquivos, assinatura=exportado.assinatura,
+                          do_acervo=exportado.do_acervo)
+
+
+def preparar_tabela(config: ConfiguracaoDaExecucao, path_to_data_table: str) -> Tuple[Optional[str], bool]:
+    """Lê e valida uma tabela apenas para guardá-la no cache (roda em um processo trabalhador).
+
+    Usado quando vários relatórios saem da mesma tabela: ela é lida uma única vez, e
+    cada `renderizar_turma` a carrega do cache. A tabela não é devolvida, para não
+    ser copiada entre os processos.
+
+    Args:
+        config (ConfiguracaoDaExecucao): A configuração da execução (com o cache de
+            tabelas ativo).
+        path_to_data_table (str): O caminho da tabela CSV.
+
+    Returns:
+        Tuple[Optional[str], bool]: A descrição do erro, se a tabela não pôde ser
+            lida, e se ela ficou no cache (uma tabela maior que `CACHE_MAX_MB` não
+            fica, e cada relatório precisa lê-la de novo).
+    """
+    try:
+        guardada = guardar_no_cache(
+            path_to_data_table,
+            cache_da_execucao(config),
+            chunksize=config.CSV_CHUNKSIZE,
+            max_erros=config.MAX_ERROS_REPORTADOS
+        )
+    except Exception as e:
+        return f"{type(e).__name__}: {e}", False
+    return None, guardada
+
+
+def filtrar_tabela(df: pd.DataFrame, filtro: Mapping[str, str]) -> pd.DataFrame:
+    """Seleciona as linhas de uma turma em uma tabela com várias turmas.
+
+    Args:
+        df (pd.DataFrame): A tabela de frequência, já validada.
+        filtro (Mapping[str, str]): O valor esperado em cada coluna (comparado como
+            texto, ex: {"Turma": "A"}).
+
+    Returns:
+        pd.DataFrame: As linhas selecionadas, sem as colunas do filtro.
+
+    Raises:
+        DadosInvalidosError: Se alguma coluna do filtro não existir ou nenhuma linha
+            for selecionada.
+    """
+    ausentes = [coluna for coluna in filtro if coluna not in df.columns]
+    if ausentes:
+        raise DadosInvalidosError(f"Colunas do filtro ausentes na tabela: {', '.join(ausentes)}")
+    selecionadas = np.ones(len(df), dtype=bool)
+    for coluna, valor in filtro.items():
+        selecionadas &= (df[coluna].astype(str) == str(valor)).to_numpy()
+    if not selecionadas.any():
+        descricao = ", ".join(f"{coluna}={valor}" for coluna, valor in filtro.items())
+        raise DadosInvalidosError(f"Nenhuma linha da tabela corresponde ao filtro ({descricao})")
+    return df[selecionadas].drop(columns=list(filtro)).reset_index(drop=True)
+
+
+def tabelas_do_lote(origem: str, diretorio_saida: str) -> List[Tuple[str, str]]:
+    """Lista as tabelas do lote e o caminho do PDF de cada uma.
+
+    Tabelas com o mesmo nome em diretórios diferentes (ex: `2024/turmaA.csv` e
+    `2025/turmaA.csv`) recebem, no nome do PDF, o caminho relativo ao diretório
+    comum a elas (`2024_turmaA.pdf` e `2025_turmaA.pdf`), para que um relatório não
+    sobrescreva o outro.
+
+    Args:
+        origem (str): Diretório ou padrão glob com as tabelas das turmas.
+        diretorio_saida (str): Diretório onde os PDFs serão salvos, um por turma,
+            com o mesmo nome do arquivo CSV.
+
+    Returns:
+        List[Tuple[str, str]]: Pares (caminho da tabela, caminho do PDF), na mesma
+            ordem de `listar_tabelas`.
+
+    Raises:
+        ValueError: Se, mesmo assim, duas tabelas resultarem no mesmo PDF.
+    """
+    tabelas = listar_tabelas(origem)
+    repetidos = Counter(nome_da_turma(tabela) for tabela in tabelas)
+    comum = os.path.commonpath([os.path.dirname(os.path.abspath(tabela)) for tabela in tabelas]) if tabelas else ""
+
+    pares, origens = [], {}
+    for tabela in tabelas:
+        nome = nome_da_turma(tabela)
+        if repetidos[nome] > 1:
+            relativo = os.path.relpath(os.path.splitext(os.path.abspath(tabela))[0], comum)
+            nome = relativo.replace(os.sep, "_")
+        pdf = os.path.join(diretorio_saida, nome + ".pdf")
+        if pdf in origens:
+            raise ValueError(f"As tabelas {origens[pdf]} e {tabela} gerariam o mesmo relatório ({pdf})")
+        origens[pdf] = tabela
+        pares.append((tabela, pdf))
+    return pares
+
+
+def nome_da_turma(path_to_data_table: str) -> str:
+    """Retorna o nome da turma, derivado do nome do arquivo CSV.
+
+    Args:
+        path_to_data_table (str): O caminho da tabela da turma.
+
+    Returns:
+        str: O nome do arquivo, sem a extensão.
+    """
+    return os.path.splitext(os.path.basename(path_to_data_table))[0]
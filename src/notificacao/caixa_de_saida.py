@@ -0,0 +1,587 @@
+"""
+Este módulo implementa a caixa de saída do Maestro: as chamadas ao orquestrador
+(alertas, erros, artefatos e a finalização da tarefa) são gravadas em um banco
+SQLite local e enviadas por uma thread em segundo plano, com novas tentativas.
+
+Sem a caixa de saída, cada `maestro.alert` ou `maestro.error` é uma requisição
+síncrona: no modo em lote, são centenas de idas e voltas em série, e uma falha de
+rede derruba o bot. Com ela:
+
+- Registrar uma chamada custa uma inserção no SQLite e nunca bloqueia o bot.
+- As chamadas que falham são repetidas com espera exponencial. As que ainda estão
+  pendentes quando o bot termina ficam no banco e são enviadas na próxima execução.
+- Os alertas de mesmo grupo (ex: as falhas de cada turma no modo em lote) são
+  juntados em um único alerta de resumo a cada `MAESTRO_INTERVALO_DE_ALERTAS`
+  segundos.
+- Em vez do arquivo de log inteiro, os erros levam como anexo apenas o final do log
+  (`MAESTRO_CAUDA_DO_LOG_KB`).
+
+Developer's Note:
+    A caixa de saída imita os métodos do `BotMaestroSDK` usados pelo bot (`alert`,
+    `error`, `post_artifact`, `finish_task` e `get_execution`), então pode ser
+    passada no lugar dele. As chamadas de uma mesma tarefa são enviadas na ordem em
+    que foram registradas: se uma falhar, as seguintes esperam. Por isso os alertas
+    agrupados de uma tarefa são juntados antes de `finish_task` entrar na fila.
+    Para um novo tipo de chamada, acrescente-o a `_enviar`.
+
+    Todos os processos de uma máquina usam o mesmo banco. Cada chamada fica reservada
+    para a caixa de saída que a registrou (`reservado_por`), que renova a reserva
+    enquanto está viva; só ela envia, junta ou espera as suas chamadas. As chamadas
+    de uma caixa que parou sem enviá-las (ex: um processo interrompido) são adotadas
+    por outra quando a reserva vence, depois de `TEMPO_DE_RESERVA` segundos. Um envio
+    que demore mais que isso pode ser repetido por quem adotar a chamada.
+"""
+
+import atexit
+import json
+import os
+import shutil
+import sqlite3
+import threading
+import time
+import uuid
+from typing import List, Optional, Tuple
+from botcity.maestro import AlertType, AutomationTaskFinishStatus, BotExecution, BotMaestroSDK
+from settings import ConfiguracaoDaExecucao
+
+# Espera máxima, em segundos, entre duas tentativas de uma mesma chamada.
+ESPERA_MAXIMA = 60.0
+# Maior mensagem de um alerta de resumo, em caracteres.
+TAMANHO_MAXIMO_DO_RESUMO = 4000
+# Validade, em segundos, da reserva das chamadas de uma caixa de saída. A reserva é
+# renovada a cada quarto desse tempo enquanto a caixa está viva.
+TEMPO_DE_RESERVA = 60.0
+# Gravidade de cada tipo de alerta, para escolher o tipo do alerta de resumo.
+_GRAVIDADE = {AlertType.INFO.value: 0, AlertType.WARN.value: 1, AlertType.ERROR.value: 2}
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS chamadas (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    task_id TEXT NOT NULL,
+    metodo TEXT NOT NULL,
+    argumentos TEXT NOT NULL,
+    grupo TEXT,
+    criado_em REAL NOT NULL,
+    tentativas INTEGER NOT NULL DEFAULT 0,
+    proxima_tentativa REAL NOT NULL DEFAULT 0,
+    ultimo_erro TEXT,
+    reservado_por TEXT,
+    reservado_ate REAL NOT NULL DEFAULT 0
+)
+"""
+# Colunas acrescentadas depois da primeira versão do banco.
+_COLUNAS_NOVAS = {
+    "reservado_por": "TEXT",
+    "reservado_ate": "REAL NOT NULL DEFAULT 0",
+}
+
+
+class ExcecaoRegistrada(Exception):
+    """Uma exceção reconstruída a partir do registro guardado na caixa de saída.
+
+    O `BotMaestroSDK.error` só usa o nome do tipo e a mensagem da exceção; o
+    rastreamento completo vai no final do log anexado.
+    """
+
+
+class CaixaDeSaidaDoMaestro:
+    """Registra as chamadas ao Maestro e as envia em segundo plano.
+
+    Attributes:
+        maestro (BotMaestroSDK): A instância do SDK usada para os envios.
+        caminho (str): O caminho do banco SQLite da caixa de saída.
+        descartadas (int): Chamadas descartadas nesta execução por terem esgotado
+            as tentativas.
+    """
+    def __init__(self, maestro: BotMaestroSDK, config: ConfiguracaoDaExecucao, log_file=None,
+                 espera_inicial: float = 1.0):
+        """Inicializa a caixa de saída e inicia a thread de envio.
+
+        Args:
+            maestro (BotMaestroSDK): A instância do SDK usada para os envios.
+            config (ConfiguracaoDaExecucao): A configuração da execução.
+            log_file (Optional[LogFile]): O gerenciador de logs, onde são registradas
+                as falhas de envio e de onde vem o final do log anexado aos erros.
+            espera_inicial (float): A espera, em segundos, antes da segunda tentativa.
+                Ela dobra a cada nova tentativa, até `ESPERA_MAXIMA`.
+        """
+        self.maestro = maestro
+        self.caminho = config.PATH_TO_CAIXA_DE_SAIDA
+        self.descartadas = 0
+        self._log_file = log_file
+        self._tentativas = max(config.MAESTRO_TENTATIVAS, 1)
+        self._intervalo_de_alertas = config.MAESTRO_INTERVALO_DE_ALERTAS
+        self._cauda_do_log = config.MAESTRO_CAUDA_DO_LOG_KB * 1024
+        self._tempo_de_encerramento = config.MAESTRO_TEMPO_DE_ENCERRAMENTO
+        self._espera_inicial = espera_inicial
+
+        self._diretorio_de_anexos = os.path.join(os.path.dirname(os.path.abspath(self.caminho)), "anexos")
+        os.makedirs(self._diretorio_de_anexos, exist_ok=True)
+
+        self._trava = threading.Lock()
+        self._banco = sqlite3.connect(self.caminho, check_same_thread=False, isolation_level=None)
+        self._banco.execute("PRAGMA journal_mode=WAL")
+        self._banco.execute("PRAGMA synchronous=NORMAL")
+        self._banco.execute(_ESQUEMA)
+        _acrescentar_colunas(self._banco)
+
+        # Identifica as chamadas desta caixa de saída entre as dos outros processos.
+        self._dono = uuid.uuid4().hex
+        self._ultima_renovacao = 0.0
+        # Chamadas deixadas por uma execução anterior (sem reserva válida) são
+        # adotadas e podem ser enviadas já; as de outros processos vivos, não.
+        with self._trava:
+            self._banco.execute(
+                "UPDATE chamadas SET proxima_tentativa = 0, reservado_por = ?, reservado_ate = ? "
+                "WHERE reservado_por IS NULL OR reservado_ate < ?",
+                (self._dono, time.time() + TEMPO_DE_RESERVA, time.time())
+            )
+
+        self._acordar = threading.Event()
+        self._parar = threading.Event()
+        self._enviador = threading.Thread(target=self._enviar_em_segundo_plano, name="maestro", daemon=True)
+        self._enviador.start()
+        atexit.register(self.encerrar)
+
+    # --- Métodos com a mesma assinatura do BotMaestroSDK ---
+
+    def get_execution(self, *args, **kwargs) -> BotExecution:
+        """Retorna a execução da tarefa (a chamada é feita na hora, pelo SDK)."""
+        return self.maestro.get_execution(*args, **kwargs)
+
+    def alert(self, task_id: str, title: str, message: str, alert_type: AlertType):
+        """Registra um alerta para envio.
+
+        Args:
+            task_id (str): O identificador da tarefa.
+            title (str): O título do alerta.
+            message (str): A mensagem do alerta.
+            alert_type (AlertType): O tipo do alerta.
+        """
+        self._registrar(task_id, "alert", {
+            "title": title, "message": message, "alert_type": AlertType(alert_type).value
+        })
+
+    def error(self, task_id: str, exception: Exception, attachments: Optional[List[str]] = None):
+        """Registra um erro para envio, com o final de cada arquivo anexado.
+
+        Args:
+            task_id (str): O identificador da tarefa.
+            exception (Exception): A exceção capturada.
+            attachments (Optional[List[str]]): Os arquivos de log a anexar. Apenas os
+                últimos `MAESTRO_CAUDA_DO_LOG_KB` KB de cada um são enviados.
+        """
+        anexos = [self._guardar_cauda(caminho) for caminho in attachments or []]
+        self._registrar(task_id, "error", {
+            "tipo": type(exception).__name__,
+            "mensagem": str(exception),
+            "attachments": [anexo for anexo in anexos if anexo],
+        })
+
+    def post_artifact(self, task_id: str, artifact_name: str, filepath: str):
+        """Registra um artefato para envio. O arquivo é copiado para a caixa de saída.
+
+        Args:
+            task_id (str): O identificador da tarefa.
+            artifact_name (str): O nome do artefato no Maestro.
+            filepath (str): O caminho do arquivo.
+        """
+        self._registrar(task_id, "post_artifact", {
+            "artifact_name": artifact_name, "filepath": self._guardar_copia(filepath)
+        })
+
+    def finish_task(self, task_id: str, status: AutomationTaskFinishStatus, message: str = "",
+                    total_items: Optional[int] = None, processed_items: Optional[int] = None,
+                    failed_items: Optional[int] = None):
+        """Registra a finalização da tarefa, depois dos alertas agrupados pendentes.
+
+        Args:
+            task_id (str): O identificador da tarefa.
+            status (AutomationTaskFinishStatus): A situação final da tarefa.
+            message (str): A mensagem de finalização.
+            total_items (Optional[int]): O total de itens da tarefa.
+            processed_items (Optional[int]): Os itens processados com sucesso.
+            failed_items (Optional[int]): Os itens que falharam.
+        """
+        self._juntar_alertas(task_id=str(task_id))
+        self._registrar(task_id, "finish_task", {
+            "status": AutomationTaskFinishStatus(status).value, "message": message,
+            "total_items": total_items, "processed_items": processed_items, "failed_items": failed_items
+        })
+
+    # --- Métodos próprios da caixa de saída ---
+
+    def agrupar_alerta(self, task_id: str, grupo: str, title: str, message: str, alert_type: AlertType):
+        """Registra um alerta que será enviado junto com os demais do mesmo grupo.
+
+        Args:
+            task_id (str): O identificador da tarefa.
+            grupo (str): O título do alerta de resumo (ex: "Falhas no lote").
+            title (str): O título deste alerta, que vira uma linha do resumo.
+            message (str): A mensagem deste alerta.
+            alert_type (AlertType): O tipo do alerta. O resumo leva o mais grave.
+        """
+        self._registrar(task_id, "alert", {
+            "title": title, "message": message, "alert_type": AlertType(alert_type).value
+        }, grupo=grupo)
+
+    def pendentes(self) -> int:
+        """Retorna a quantidade de chamadas desta caixa de saída ainda não enviadas."""
+        with self._trava:
+            return self._banco.execute(
+                "SELECT COUNT(*) FROM chamadas WHERE reservado_por = ?", (self._dono,)
+            ).fetchone()[0]
+
+    def aguardar(self, timeout: Optional[float] = None) -> bool:
+        """Junta os alertas pendentes e espera até que as chamadas sejam enviadas.
+
+        Apenas as chamadas desta caixa de saída (registradas ou adotadas por ela) são
+        juntadas e esperadas; as de outros processos ficam com eles.
+
+        Args:
+            timeout (Optional[float]): O tempo máximo de espera, em segundos. Se
+                omitido, usa `MAESTRO_TEMPO_DE_ENCERRAMENTO`.
+
+        Returns:
+            bool: Verdadeiro se não restou nenhuma chamada pendente.
+        """
+        self._renovar_reservas()
+        self._juntar_alertas()
+        prazo = time.monotonic() + (self._tempo_de_encerramento if timeout is None else timeout)
+        while self._enviador.is_alive() and time.monotonic() < prazo:
+            if not self._ha_chamadas_a_enviar():
+                break
+            self._acordar.set()
+            time.sleep(0.02)
+        return self.pendentes() == 0
+
+    def encerrar(self):
+        """Espera o envio das chamadas pendentes (até o tempo limite) e para a thread.
+
+        As chamadas que não puderam ser enviadas continuam no banco e serão enviadas
+        na próxima execução.
+        """
+        if not self._enviador.is_alive():
+            return
+        self.aguardar()
+        self._parar.set()
+        self._acordar.set()
+        self._enviador.join()
+        # Libera as chamadas que sobraram para a próxima execução, sem esperar a
+        # reserva vencer.
+        with self._trava:
+            self._banco.execute("UPDATE chamadas SET reservado_ate = 0 WHERE reservado_por = ?", (self._dono,))
+        restantes = self.pendentes()
+        if restantes:
+            self._registrar_no_log(
+                f"{restantes} chamadas ao Maestro continuam pendentes e serão enviadas na próxima execução.",
+                "WARNING"
+            )
+
+    # --- Funcionamento interno ---
+
+    def _registrar(self, task_id: str, metodo: str, argumentos: dict, grupo: Optional[str] = None):
+        """Grava uma chamada na caixa de saída e acorda a thread de envio.
+
+        Args:
+            task_id (str): O identificador da tarefa.
+            metodo (str): O nome do método do SDK.
+            argumentos (dict): Os argumentos da chamada, serializáveis em JSON.
+            grupo (Optional[str]): O grupo do alerta, se ele for agrupado.
+        """
+        with self._trava:
+            self._banco.execute(
+                "INSERT INTO chamadas (task_id, metodo, argumentos, grupo, criado_em, reservado_por, reservado_ate) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (str(task_id), metodo, json.dumps(argumentos, ensure_ascii=False), grupo, time.time(),
+                 self._dono, time.time() + TEMPO_DE_RESERVA)
+            )
+        if grupo is None:
+            self._acordar.set()
+
+    def _juntar_alertas(self, task_id: Optional[str] = None, antes_de: Optional[float] = None):
+        """Junta os alertas agrupados desta caixa em um alerta de resumo por tarefa e grupo.
+
+        Args:
+            task_id (Optional[str]): Se informado, junta apenas os alertas desta tarefa.
+            antes_de (Optional[float]): Se informado, junta apenas os grupos cujo
+                primeiro alerta foi registrado antes deste horário.
+        """
+        with self._trava:
+            grupos = self._banco.execute(
+                "SELECT task_id, grupo FROM chamadas WHERE grupo IS NOT NULL AND reservado_por = ? "
+                "AND (? IS NULL OR task_id = ?) GROUP BY task_id, grupo "
+                "HAVING (? IS NULL OR MIN(criado_em) <= ?) ORDER BY MIN(id)",
+                (self._dono, task_id, task_id, antes_de, antes_de)
+            ).fetchall()
+            for tarefa, grupo in grupos:
+                linhas = self._banco.execute(
+                    "SELECT id, argumentos FROM chamadas WHERE task_id = ? AND grupo = ? AND reservado_por = ? "
+                    "ORDER BY id",
+                    (tarefa, grupo, self._dono)
+                ).fetchall()
+                alertas = [json.loads(argumentos) for _, argumentos in linhas]
+                resumo = _resumo_dos_alertas(grupo, alertas)
+                self._banco.execute("BEGIN")
+                self._banco.execute(
+                    f"DELETE FROM chamadas WHERE id IN ({','.join('?' * len(linhas))})",
+                    [id_ for id_, _ in linhas]
+                )
+                self._banco.execute(
+                    "INSERT INTO chamadas (task_id, metodo, argumentos, criado_em, reservado_por, reservado_ate) "
+                    "VALUES (?, 'alert', ?, ?, ?, ?)",
+                    (tarefa, json.dumps(resumo, ensure_ascii=False), time.time(),
+                     self._dono, time.time() + TEMPO_DE_RESERVA)
+                )
+                self._banco.execute("COMMIT")
+        if grupos:
+            self._acordar.set()
+
+    def _ha_chamadas_a_enviar(self) -> bool:
+        """Indica se há chamadas (não agrupadas) desta caixa esperando envio."""
+        with self._trava:
+            return self._banco.execute(
+                "SELECT 1 FROM chamadas WHERE grupo IS NULL AND reservado_por = ? LIMIT 1", (self._dono,)
+            ).fetchone() is not None
+
+    def _renovar_reservas(self):
+        """Renova a reserva das chamadas desta caixa e adota as de caixas que pararam.
+
+        A atualização é um único comando SQL, então duas caixas vivas nunca ficam com
+        a mesma chamada.
+        """
+        agora = time.time()
+        with self._trava:
+            self._banco.execute(
+                "UPDATE chamadas SET reservado_por = ?, reservado_ate = ? "
+                "WHERE reservado_por = ? OR reservado_por IS NULL OR reservado_ate < ?",
+                (self._dono, agora + TEMPO_DE_RESERVA, self._dono, agora)
+            )
+        self._ultima_renovacao = agora
+
+    def _proxima_chamada(self) -> Optional[Tuple[int, str, str, dict, int]]:
+        """Retorna a chamada desta caixa mais antiga pronta para envio.
+
+        Uma chamada só é enviada depois das anteriores da mesma tarefa, mesmo que elas
+        sejam de outra caixa.
+
+        Returns:
+            Optional[Tuple[int, str, str, dict, int]]: O id, a tarefa, o método, os
+                argumentos e as tentativas já feitas, ou `None` se não houver.
+        """
+        with self._trava:
+            linha = self._banco.execute(
+                "SELECT id, task_id, metodo, argumentos, tentativas FROM chamadas AS c "
+                "WHERE grupo IS NULL AND reservado_por = ? AND proxima_tentativa <= ? AND NOT EXISTS ("
+                "    SELECT 1 FROM chamadas AS a WHERE a.task_id = c.task_id AND a.grupo IS NULL AND a.id < c.id"
+                ") ORDER BY id LIMIT 1",
+                (self._dono, time.time())
+            ).fetchone()
+        if linha is None:
+            return None
+        id_, task_id, metodo, argumentos, tentativas = linha
+        return id_, task_id, metodo, json.loads(argumentos), tentativas
+
+    def _enviar_em_segundo_plano(self):
+        """Laço da thread de envio: junta os alertas vencidos e envia as chamadas prontas."""
+        while not self._parar.is_set():
+            if time.time() - self._ultima_renovacao > TEMPO_DE_RESERVA / 4:
+                self._renovar_reservas()
+            self._juntar_alertas(antes_de=time.time() - self._intervalo_de_alertas)
+            chamada = self._proxima_chamada()
+            if chamada is None:
+                self._acordar.wait(timeout=0.5)
+                self._acordar.clear()
+                continue
+
+            id_, task_id, metodo, argumentos, tentativas = chamada
+            try:
+                self._enviar(task_id, metodo, argumentos)
+            except Exception as e:
+                self._falhou(id_, metodo, argumentos, tentativas + 1, e)
+                continue
+            with self._trava:
+                self._banco.execute("DELETE FROM chamadas WHERE id = ?", (id_,))
+            self._apagar_anexos(metodo, argumentos)
+
+    def _enviar(self, task_id: str, metodo: str, argumentos: dict):
+        """Faz a chamada ao Maestro pelo SDK.
+
+        Args:
+            task_id (str): O identificador da tarefa.
+            metodo (str): O nome do método do SDK.
+            argumentos (dict): Os argumentos registrados.
+        """
+        if metodo == "alert":
+            self.maestro.alert(
+                task_id=task_id,
+                title=argumentos["title"],
+                message=argumentos["message"],
+                alert_type=AlertType(argumentos["alert_type"])
+            )
+        elif metodo == "error":
+            excecao = type(argumentos["tipo"], (ExcecaoRegistrada,), {})(argumentos["mensagem"])
+            anexos = [caminho for caminho in argumentos["attachments"] if os.path.exists(caminho)]
+            self.maestro.error(task_id=task_id, exception=excecao, attachments=anexos)
+        elif metodo == "post_artifact":
+            self.maestro.post_artifact(
+                task_id=task_id,
+                artifact_name=argumentos["artifact_name"],
+                filepath=argumentos["filepath"]
+            )
+        elif metodo == "finish_task":
+            self.maestro.finish_task(
+                task_id=task_id,
+                status=AutomationTaskFinishStatus(argumentos["status"]),
+                message=argumentos["message"],
+                total_items=argumentos["total_items"],
+                processed_items=argumentos["processed_items"],
+                failed_items=argumentos["failed_items"]
+            )
+        else:
+            raise ValueError(f"Chamada desconhecida na caixa de saída do Maestro: {metodo}")
+
+    def _falhou(self, id_: int, metodo: str, argumentos: dict, tentativas: int, erro: Exception):
+        """Agenda uma nova tentativa da chamada ou a descarta, se as tentativas acabaram.
+
+        Args:
+            id_ (int): O id da chamada.
+            metodo (str): O nome do método do SDK.
+            argumentos (dict): Os argumentos registrados.
+            tentativas (int): As tentativas já feitas, contando a atual.
+            erro (Exception): O erro da última tentativa.
+        """
+        descricao = f"{type(erro).__name__}: {erro}"
+        if tentativas >= self._tentativas:
+            with self._trava:
+                self._banco.execute("DELETE FROM chamadas WHERE id = ?", (id_,))
+            self._apagar_anexos(metodo, argumentos)
+            self.descartadas += 1
+            self._registrar_no_log(
+                f"Chamada '{metodo}' ao Maestro descartada após {tentativas} tentativas: {descricao}", "ERROR"
+            )
+            return
+        espera = min(self._espera_inicial * (2 ** (tentativas - 1)), ESPERA_MAXIMA)
+        with self._trava:
+            self._banco.execute(
+                "UPDATE chamadas SET tentativas = ?, proxima_tentativa = ?, ultimo_erro = ? WHERE id = ?",
+                (tentativas, time.time() + espera, descricao, id_)
+            )
+        self._registrar_no_log(
+            f"Falha na chamada '{metodo}' ao Maestro (tentativa {tentativas}): {descricao}", "WARNING"
+        )
+
+    def _guardar_cauda(self, caminho: str) -> Optional[str]:
+        """Copia o final de um arquivo de log para a caixa de saída.
+
+        Args:
+            caminho (str): O caminho do arquivo de log.
+
+        Returns:
+            Optional[str]: O caminho da cópia, ou `None` se o arquivo não existir.
+        """
+        if not os.path.exists(caminho):
+            return None
+        with open(caminho, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            tamanho = f.tell()
+            f.seek(max(tamanho - self._cauda_do_log, 0))
+            cauda = f.read()
+        if tamanho > self._cauda_do_log:
+            # Começa na primeira linha completa.
+            cauda = cauda[cauda.find(b"\n") + 1:]
+        base, extensao = os.path.splitext(os.path.basename(caminho))
+        destino = self._caminho_de_anexo(f"{base}_final{extensao}")
+        with open(destino, "wb") as f:
+            f.write(cauda)
+        return destino
+
+    def _guardar_copia(self, caminho: str) -> str:
+        """Copia um arquivo para a caixa de saída, para que possa ser enviado mais tarde.
+
+        Args:
+            caminho (str): O caminho do arquivo.
+
+        Returns:
+            str: O caminho da cópia.
+        """
+        destino = self._caminho_de_anexo(os.path.basename(caminho))
+        shutil.copyfile(caminho, destino)
+        return destino
+
+    def _caminho_de_anexo(self, nome: str) -> str:
+        """Retorna um caminho novo para um anexo guardado na caixa de saída.
+
+        Args:
+            nome (str): O nome do arquivo, mantido no fim do caminho.
+
+        Returns:
+            str: O caminho, dentro de um diretório próprio do anexo.
+        """
+        diretorio = os.path.join(self._diretorio_de_anexos, uuid.uuid4().hex)
+        os.makedirs(diretorio, exist_ok=True)
+        return os.path.join(diretorio, nome)
+
+    def _apagar_anexos(self, metodo: str, argumentos: dict):
+        """Apaga as cópias guardadas para uma chamada que já foi enviada ou descartada.
+
+        Args:
+            metodo (str): O nome do método do SDK.
+            argumentos (dict): Os argumentos registrados.
+        """
+        if metodo == "error":
+            caminhos = argumentos["attachments"]
+        elif metodo == "post_artifact":
+            caminhos = [argumentos["filepath"]]
+        else:
+            return
+        for caminho in caminhos:
+            shutil.rmtree(os.path.dirname(caminho), ignore_errors=True)
+
+    def _registrar_no_log(self, mensagem: str, nivel: str):
+        """Registra uma mensagem no log da execução, se houver um.
+
+        Args:
+            mensagem (str): A mensagem.
+            nivel (str): O nível da mensagem.
+        """
+        if self._log_file is not None:
+            self._log_file.log_message(mensagem, level=nivel)
+        else:
+            print(mensagem)
+
+
+def _acrescentar_colunas(banco: sqlite3.Connection):
+    """Acrescenta ao banco de uma versão anterior as colunas que faltam.
+
+    Args:
+        banco (sqlite3.Connection): A conexão com o banco da caixa de saída.
+    """
+    existentes = {linha[1] for linha in banco.execute("PRAGMA table_info(chamadas)")}
+    for coluna, tipo in _COLUNAS_NOVAS.items():
+        if coluna not in existentes:
+            try:
+                banco.execute(f"ALTER TABLE chamadas ADD COLUMN {coluna} {tipo}")
+            except sqlite3.OperationalError:
+                # Outro processo acrescentou a coluna ao mesmo tempo.
+                pass
+
+
+def _resumo_dos_alertas(grupo: str, alertas: List[dict]) -> dict:
+    """Monta o alerta de resumo de um grupo de alertas.
+
+    Args:
+        grupo (str): O grupo, usado como título do resumo.
+        alertas (List[dict]): Os argumentos dos alertas do grupo, na ordem.
+
+    Returns:
+        dict: Os argumentos do alerta de resumo.
+    """
+    linhas = [f"{alerta['title']}: {alerta['message']}" for alerta in alertas]
+    mensagem = "\n".join(linhas)
+    if len(mensagem) > TAMANHO_MAXIMO_DO_RESUMO:
+        mensagem = mensagem[:TAMANHO_MAXIMO_DO_RESUMO].rsplit("\n", 1)[0]
+        omitidos = len(alertas) - len(mensagem.splitlines())
+        mensagem += f"\n... e mais {omitidos} (veja o log)."
+    tipo = max((alerta["alert_type"] for alerta in alertas), key=lambda t: _GRAVIDADE.get(t, 0))
+    return {"title": f"{grupo} ({len(alertas)})", "message": mensagem, "alert_type": tipo}
@@ -0,0 +1,204 @@
+"""
+Este módulo mede o tempo e a memória de cada etapa da execução do bot.
+
+Cada etapa de `bot.main` é envolvida por `PerfilDeExecucao.etapa`, que registra o
+tempo de relógio, o tempo de CPU e o pico de memória (RSS) do processo. Uma etapa
+também pode ser perfilada com `cProfile`. No fim, um resumo compacto em JSON é
+salvo (e pode ser enviado ao Maestro como artefato), incluindo a variação de cada
+etapa em relação ao resumo da execução anterior.
+
+Developer's Note:
+    Para medir um novo passo do bot, envolva-o em `with perfil.etapa("nome"):`. Os
+    nomes das etapas são as chaves usadas para comparar execuções, então evite
+    renomeá-los sem necessidade.
+"""
+
+import cProfile
+import json
+import os
+import pstats
+import sys
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Quantidade de funções listadas no resumo de uma etapa perfilada.
+_FUNCOES_NO_RESUMO = 15
+
+
+@dataclass
+class MedicaoDeEtapa:
+    """As medidas de uma etapa da execução.
+
+    Attributes:
+        nome (str): O nome da etapa.
+        tempo_s (float): O tempo de relógio da etapa, em segundos.
+        cpu_s (float): O tempo de CPU do processo durante a etapa, em segundos.
+        pico_rss_mb (Optional[float]): O pico de memória do processo ao fim da etapa.
+        pico_rss_filhos_mb (Optional[float]): O pico de memória dos processos filhos
+            (ex: os trabalhadores do modo em lote) ao fim da etapa.
+        perfil (Optional[str]): O arquivo `.prof` da etapa, se ela foi perfilada.
+        funcoes (List[dict]): As funções mais custosas da etapa, se ela foi perfilada.
+    """
+    nome: str
+    tempo_s: float
+    cpu_s: float
+    pico_rss_mb: Optional[float]
+    pico_rss_filhos_mb: Optional[float]
+    perfil: Optional[str] = None
+    funcoes: List[dict] = field(default_factory=list)
+
+
+class PerfilDeExecucao:
+    """Registra as medidas das etapas de uma execução e gera o seu resumo.
+
+    Attributes:
+        task_id (str): O identificador da tarefa do Maestro.
+        etapas (List[MedicaoDeEtapa]): As etapas medidas, na ordem de execução.
+    """
+    def __init__(self, task_id: str):
+        """Inicializa a classe PerfilDeExecucao.
+
+        Args:
+            task_id (str): O identificador da tarefa do Maestro.
+        """
+        self.task_id = str(task_id)
+        self.etapas: List[MedicaoDeEtapa] = []
+        self._inicio = time.perf_counter()
+
+    @contextmanager
+    def etapa(self, nome: str, perfilar: bool = False, path_perfil: Optional[str] = None):
+        """Mede o bloco `with` como uma etapa da execução.
+
+        A etapa é registrada mesmo se o bloco lançar uma exceção.
+
+        Args:
+            nome (str): O nome da etapa.
+            perfilar (bool): Se verdadeiro, a etapa é perfilada com `cProfile`.
+            path_perfil (Optional[str]): Onde salvar o arquivo `.prof` da etapa. Se
+                omitido, o perfil só entra no resumo.
+        """
+        perfilador = cProfile.Profile() if perfilar else None
+        inicio, inicio_cpu = time.perf_counter(), time.process_time()
+        if perfilador is not None:
+            perfilador.enable()
+        try:
+            yield
+        finally:
+            if perfilador is not None:
+                perfilador.disable()
+            medicao = MedicaoDeEtapa(
+                nome=nome,
+                tempo_s=round(time.perf_counter() - inicio, 4),
+                cpu_s=round(time.process_time() - inicio_cpu, 4),
+                pico_rss_mb=_pico_rss_mb(filhos=False),
+                pico_rss_filhos_mb=_pico_rss_mb(filhos=True),
+            )
+            if perfilador is not None:
+                medicao.funcoes = _funcoes_mais_custosas(perfilador)
+                if path_perfil:
+                    perfilador.dump_stats(path_perfil)
+                    medicao.perfil = path_perfil
+            self.etapas.append(medicao)
+
+    def resumo(self) -> dict:
+        """Retorna o resumo da execução.
+
+        Returns:
+            dict: O resumo, com o tempo total e as medidas de cada etapa.
+        """
+        return {
+            "task_id": self.task_id,
+            "data": datetime.now().isoformat(timespec="seconds"),
+            "tempo_total_s": round(time.perf_counter() - self._inicio, 4),
+            "etapas": [asdict(etapa) for etapa in self.etapas],
+        }
+
+    def salvar(self, caminho: str) -> str:
+        """Salva o resumo em JSON, comparando-o com o resumo anterior do mesmo arquivo.
+
+        Se `caminho` já tiver o resumo de uma execução anterior, cada etapa recebe a
+        variação (`variacao_tempo`) do seu tempo em relação àquela execução.
+
+        Args:
+            caminho (str): O caminho do arquivo de resumo.
+
+        Returns:
+            str: O caminho do arquivo salvo.
+        """
+        resumo = self.resumo()
+        anterior = _ler_resumo(caminho)
+        if anterior:
+            tempos_anteriores = {e["nome"]: e["tempo_s"] for e in anterior.get("etapas", [])}
+            for etapa in resumo["etapas"]:
+                tempo_anterior = tempos_anteriores.get(etapa["nome"])
+                if tempo_anterior:
+                    etapa["variacao_tempo"] = round(etapa["tempo_s"] / tempo_anterior - 1, 4)
+
+        diretorio = os.path.dirname(caminho)
+        if diretorio:
+            os.makedirs(diretorio, exist_ok=True)
+        with open(caminho, "w", encoding="utf-8") as f:
+            json.dump(resumo, f, ensure_ascii=False, indent=2)
+        return caminho
+
+
+def _pico_rss_mb(filhos: bool) -> Optional[float]:
+    """Retorna o pico de memória (RSS), em MB, do processo ou dos seus filhos.
+
+    Args:
+        filhos (bool): Se verdadeiro, mede os processos filhos já encerrados.
+
+    Returns:
+        Optional[float]: O pico de memória, ou `None` se a plataforma não o informa.
+    """
+    if resource is None:
+        return None
+    uso = resource.getrusage(resource.RUSAGE_CHILDREN if filhos else resource.RUSAGE_SELF)
+    # O Linux informa em KB; o macOS, em bytes.
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return round(uso.ru_maxrss / divisor, 2)
+
+
+def _funcoes_mais_custosas(perfilador: cProfile.Profile) -> List[dict]:
+    """Lista as funções com maior tempo acumulado em um perfil.
+
+    Args:
+        perfilador (cProfile.Profile): O perfil coletado.
+
+    Returns:
+        List[dict]: As funções mais custosas, da mais para a menos custosa.
+    """
+    estatisticas = pstats.Stats(perfilador).stats
+    ordenadas = sorted(estatisticas.items(), key=lambda item: item[1][3], reverse=True)
+    return [
+        {
+            "funcao": f"{os.path.basename(arquivo)}:{linha}({nome})",
+            "chamadas": chamadas,
+            "tempo_acumulado_s": round(acumulado, 4),
+        }
+        for (arquivo, linha, nome), (_, chamadas, _, acumulado, _) in ordenadas[:_FUNCOES_NO_RESUMO]
+    ]
+
+
+def _ler_resumo(caminho: str) -> Optional[Dict]:
+    """Lê um resumo salvo anteriormente, se existir e for válido.
+
+    Args:
+        caminho (str): O caminho do arquivo de resumo.
+
+    Returns:
+        Optional[Dict]: O resumo anterior, ou `None`.
+    """
+    try:
+        with open(caminho, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
@@ -0,0 +1,311 @@
+"""
+Este módulo orquestra o modo em lote como um pipeline assíncrono, em três estágios:
+
+1. Renderização: cada turma é lida, validada e renderizada em um processo
+   trabalhador (`renderizar_turma`), limitado a `max_workers` turmas ao mesmo tempo.
+2. Entrega: os relatórios prontos passam por uma fila limitada até as tarefas de
+   envio, que mandam o e-mail (e salvam o PDF) em threads.
+3. Notificação: o resultado de cada turma é registrado no log (e, se ela foi
+   enviada, o seu manifesto é salvo) ou, se houver falha, entra na caixa de saída
+   do Maestro, que junta as falhas em alertas de resumo.
+
+Os estágios rodam ao mesmo tempo, então o relatório N+1 é renderizado enquanto o
+relatório N é enviado, e a CPU não fica parada esperando a rede.
+
+Com `trabalhadores_aquecidos`, os processos de renderização são criados por um
+servidor `forkserver` que importa os módulos pesados (pandas, reportlab) uma única
+vez; cada trabalhador nasce com eles já carregados.
+
+Developer's Note:
+    A fila entre a renderização e a entrega é limitada (`tamanho_da_fila`): se o
+    envio ficar para trás, os trabalhadores de renderização esperam em vez de
+    acumular PDFs em memória. Um trabalhador só libera a sua vaga depois que o seu
+    relatório entra na fila. Chamadas bloqueantes (e-mail, Maestro) nunca devem ser
+    feitas direto no laço de eventos; use `asyncio.to_thread`.
+"""
+
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+from botcity.maestro import AlertType
+from src.log.registrar_logs import LogFile
+from src.notificacao.caixa_de_saida import CaixaDeSaidaDoMaestro
+from src.lote.processar_lote import ResultadoTurma, renderizar_turma
+from src.relatorio.manifesto import ManifestoDoRelatorio
+from src.relatorio.utils.gravacao import GravacaoEmSegundoPlano
+from src.send_email.send_email import enviar_partes
+from settings import ConfiguracaoDaExecucao
+
+# Marca colocada nas filas para encerrar os estágios seguintes.
+_FIM = None
+
+# Módulos carregados pelo servidor `forkserver` antes de criar os trabalhadores.
+MODULOS_PRE_CARREGADOS = [
+    "src.lote.processar_lote",
+    "src.relatorio.gerar_relatorio",
+    "src.relatorio.manifesto",
+]
+
+
+@dataclass(frozen=True)
+class ResultadoDoEnvio:
+    """O resultado final de uma turma no pipeline: renderização e envio.
+
+    Attributes:
+        turma (str): O nome da turma.
+        path_to_output (str): O caminho do PDF da turma.
+        erro (Optional[str]): A descrição do erro, se a turma falhou em algum estágio.
+        inalterado (bool): Indica que os dados não mudaram desde o último envio e o
+            relatório não foi gerado nem enviado de novo.
+        manifesto (Optional[ManifestoDoRelatorio]): O manifesto do relatório enviado,
+            salvo na conclusão da turma.
+        do_acervo (bool): Indica que o relatório enviado veio do acervo.
+    """
+    turma: str
+    path_to_output: str
+    erro: Optional[str] = None
+    inalterado: bool = False
+    manifesto: Optional[ManifestoDoRelatorio] = None
+    do_acervo: bool = False
+
+    @property
+    def sucesso(self) -> bool:
+        """Indica se a turma foi enviada (ou não precisava ser) sem erros."""
+        return self.erro is None
+
+
+class PipelineDeRelatorios:
+    """Gera e envia os relatórios de várias turmas, sobrepondo renderização e envio.
+
+    Attributes:
+        maestro (CaixaDeSaidaDoMaestro): A caixa de saída das chamadas ao Maestro.
+        config (ConfiguracaoDaExecucao): A configuração da execução.
+        log_file (LogFile): A instância do gerenciador de logs.
+    """
+    def __init__(self, maestro: CaixaDeSaidaDoMaestro, config: ConfiguracaoDaExecucao, log_file: LogFile,
+                 max_workers: Optional[int] = None, concorrencia_de_envio: int = 4,
+                 tamanho_da_fila: int = 4, trabalhadores_aquecidos: bool = False):
+        """Inicializa a classe PipelineDeRelatorios.
+
+        Args:
+            maestro (CaixaDeSaidaDoMaestro): A caixa de saída das chamadas ao Maestro.
+            config (ConfiguracaoDaExecucao): A configuração da execução.
+            log_file (LogFile): A instância do gerenciador de logs.
+            max_workers (Optional[int]): Número de processos de renderização. Se
+                omitido, usa a quantidade de núcleos da máquina.
+            concorrencia_de_envio (int): Quantos relatórios são enviados ao mesmo tempo.
+            tamanho_da_fila (int): Quantos relatórios prontos podem esperar pelo envio.
+            trabalhadores_aquecidos (bool): Se verdadeiro, os trabalhadores são criados
+                por um `forkserver` com os módulos de renderização já importados.
+        """
+        self.maestro = maestro
+        self.config = config
+        self.log_file = log_file
+        self._max_workers = max_workers or os.cpu_count() or 1
+        self._concorrencia_de_envio = max(concorrencia_de_envio, 1)
+        self._tamanho_da_fila = max(tamanho_da_fila, 1)
+        self._salvar_pdf = config.SALVAR_PDF
+        self._trabalhadores_aquecidos = trabalhadores_aquecidos
+
+    async def executar(self, tabelas: List[Tuple[str, str]]) -> List[ResultadoDoEnvio]:
+        """Executa o pipeline para as tabelas informadas.
+
+        Args:
+            tabelas (List[Tuple[str, str]]): Pares (caminho da tabela, caminho do PDF).
+
+        Returns:
+            List[ResultadoDoEnvio]: Um resultado por tabela, na mesma ordem.
+        """
+        if not tabelas:
+            return []
+
+        prontos: asyncio.Queue = asyncio.Queue(maxsize=self._tamanho_da_fila)
+        concluidos: asyncio.Queue = asyncio.Queue()
+        resultados = {}
+
+        entregas = [
+            asyncio.create_task(self._entregar(prontos, concluidos))
+            for _ in range(self._concorrencia_de_envio)
+        ]
+        notificacao = asyncio.create_task(self._notificar(concluidos, resultados))
+
+        try:
+            await self._renderizar(tabelas, prontos)
+        finally:
+            for _ in entregas:
+                await prontos.put(_FIM)
+            await asyncio.gather(*entregas)
+            await concluidos.put(_FIM)
+            await notificacao
+
+        return [resultados[pdf] for _, pdf in tabelas]
+
+    async def _renderizar(self, tabelas: List[Tuple[str, str]], prontos: asyncio.Queue):
+        """Estágio 1: renderiza as turmas em processos e coloca os relatórios na fila.
+
+        Args:
+            tabelas (List[Tuple[str, str]]): Pares (caminho da tabela, caminho do PDF).
+            prontos (asyncio.Queue): A fila de relatórios prontos para envio.
+        """
+        with ProcessPoolExecutor(max_workers=min(self._max_workers, len(tabelas)),
+                                 mp_context=self._contexto_dos_trabalhadores()) as executor:
+            await self._renderizar_tabelas(executor, tabelas, prontos)
+
+    async def _renderizar_tabelas(self, executor: ProcessPoolExecutor, tabelas: List[Tuple[str, str]],
+                                  prontos: asyncio.Queue):
+        """Distribui as turmas entre os processos, no máximo `max_workers` de cada vez.
+
+        Args:
+            executor (ProcessPoolExecutor): Os processos de renderização.
+            tabelas (List[Tuple[str, str]]): Pares (caminho da tabela, caminho do PDF).
+            prontos (asyncio.Queue): A fila de relatórios prontos para envio.
+        """
+        loop = asyncio.get_running_loop()
+        vagas = asyncio.Semaphore(self._max_workers)
+
+        async def renderizar_uma(tabela: str, pdf: str):
+            # O nome do PDF (veja `tabelas_do_lote`) distingue turmas de mesmo nome.
+            turma = os.path.splitext(os.path.basename(pdf))[0]
+            async with vagas:
+                try:
+                    resultado = await loop.run_in_executor(executor, renderizar_turma, self.config, tabela, pdf, turma)
+                except Exception as e:
+                    # Falhas do próprio processo trabalhador (ex: BrokenProcessPool)
+                    resultado = ResultadoTurma(turma, tabela, pdf, erro=f"{type(e).__name__}: {e}")
+                await prontos.put(resultado)
+
+        await asyncio.gather(*(renderizar_uma(tabela, pdf) for tabela, pdf in tabelas))
+
+    def _contexto_dos_trabalhadores(self) -> multiprocessing.context.BaseContext:
+        """Escolhe como os processos de renderização são criados.
+
+        `fork` direto daqui não é seguro: o processo principal já tem threads (log,
+        envio, caixa de saída) e conexões SQLite abertas. Os trabalhadores saem de um
+        processo servidor novo (`forkserver`), sem elas, ou, onde ele não existe (ex:
+        Windows), de um interpretador novo (`spawn`).
+
+        Returns:
+            multiprocessing.context.BaseContext: O contexto `forkserver`, com os
+                módulos de renderização pré-carregados se os trabalhadores aquecidos
+                estiverem ativados, ou o contexto `spawn`.
+        """
+        if "forkserver" not in multiprocessing.get_all_start_methods():
+            if self._trabalhadores_aquecidos:
+                self.log_file.log_message("forkserver indisponível; trabalhadores aquecidos desativados.",
+                                          level="WARNING")
+            return multiprocessing.get_context("spawn")
+        contexto = multiprocessing.get_context("forkserver")
+        if self._trabalhadores_aquecidos:
+            contexto.set_forkserver_preload(MODULOS_PRE_CARREGADOS)
+        return contexto
+
+    async def _entregar(self, prontos: asyncio.Queue, concluidos: asyncio.Queue):
+        """Estágio 2: envia os relatórios da fila, um por vez por tarefa.
+
+        Args:
+            prontos (asyncio.Queue): A fila de relatórios prontos para envio.
+            concluidos (asyncio.Queue): A fila de resultados finais.
+        """
+        while (resultado := await prontos.get()) is not _FIM:
+            try:
+                final = await asyncio.to_thread(self._entregar_um, resultado)
+            except Exception as e:
+                # Uma tarefa de entrega nunca pode parar, ou a renderização esperaria
+                # para sempre por espaço na fila.
+                final = ResultadoDoEnvio(resultado.turma, resultado.path_to_output, erro=f"{type(e).__name__}: {e}")
+            await concluidos.put(final)
+
+    def _entregar_um(self, resultado: ResultadoTurma) -> ResultadoDoEnvio:
+        """Envia um relatório e salva o seu PDF (roda em uma thread).
+
+        Args:
+            resultado (ResultadoTurma): O resultado da renderização da turma.
+
+        Returns:
+            ResultadoDoEnvio: O resultado final da turma.
+        """
+        if not resultado.sucesso or resultado.inalterado:
+            return ResultadoDoEnvio(resultado.turma, resultado.path_to_output,
+                                    erro=resultado.erro, inalterado=resultado.inalterado)
+
+        gravacao = None
+        if resultado.conteudo is not None and self._salvar_pdf:
+            gravacao = GravacaoEmSegundoPlano(resultado.conteudo, resultado.path_to_output)
+        try:
+            enviar_partes(self._configuracao_de(resultado), list(resultado.partes), resultado.arquivos,
+                          resultado.assinatura)
+        except Exception as e:
+            return ResultadoDoEnvio(resultado.turma, resultado.path_to_output, erro=f"{type(e).__name__}: {e}")
+        finally:
+            if gravacao is not None:
+                try:
+                    gravacao.aguardar()
+                except Exception as e:
+                    self.log_file.log_message(f"Falha ao salvar {gravacao.caminho}: {e}", level="WARNING")
+
+        # O manifesto só é salvo depois do envio, na conclusão da turma (veja `bot.main`).
+        return ResultadoDoEnvio(resultado.turma, resultado.path_to_output, manifesto=resultado.manifesto,
+                                do_acervo=resultado.do_acervo)
+
+    def _configuracao_de(self, resultado: ResultadoTurma) -> ConfiguracaoDaExecucao:
+        """Retorna a configuração usada para enviar um relatório.
+
+        Args:
+            resultado (ResultadoTurma): O resultado da renderização da turma.
+
+        Returns:
+            ConfiguracaoDaExecucao: A configuração da execução (a mesma para todas as
+                turmas do lote).
+        """
+        return self.config
+
+    def _registrar_conclusao(self, resultado: ResultadoDoEnvio):
+        """Salva o manifesto de uma turma concluída com sucesso (roda em uma thread).
+
+        Uma falha aqui não desfaz o envio: a turma continua enviada, e apenas a
+        próxima execução não saberá que o relatório não mudou.
+
+        Args:
+            resultado (ResultadoDoEnvio): O resultado final da turma.
+        """
+        if resultado.manifesto is not None:
+            resultado.manifesto.salvar(resultado.path_to_output)
+
+    async def _notificar(self, concluidos: asyncio.Queue, resultados: dict):
+        """Estágio 3: registra cada resultado e põe as falhas na caixa de saída do Maestro.
+
+        Args:
+            concluidos (asyncio.Queue): A fila de resultados finais.
+            resultados (dict): Os resultados por caminho do PDF, preenchidos aqui.
+        """
+        while (resultado := await concluidos.get()) is not _FIM:
+            resultados[resultado.path_to_output] = resultado
+            if resultado.sucesso:
+                situacao = "sem alterações" if resultado.inalterado else "enviado"
+                if resultado.do_acervo:
+                    situacao += " (do acervo, sem ser gerado de novo)"
+                self.log_file.log_message(f"Turma {resultado.turma}: relatório {situacao}.")
+                try:
+                    await asyncio.to_thread(self._registrar_conclusao, resultado)
+                except Exception as e:
+                    self.log_file.log_message(
+                        f"Turma {resultado.turma}: relatório {situacao}, mas a conclusão não foi registrada: {e}",
+                        level="WARNING"
+                    )
+                continue
+
+            self.log_file.log_message(f"Falha na turma {resultado.turma}: {resultado.erro}", level="ERROR")
+            try:
+                await asyncio.to_thread(
+                    self.maestro.agrupar_alerta,
+                    task_id=self.config.task_id,
+                    grupo="Falhas no lote",
+                    title=f"Turma {resultado.turma}",
+                    message=resultado.erro,
+                    alert_type=AlertType.WARN
+                )
+            except Exception as e:
+                self.log_file.log_message(f"Falha ao avisar o Maestro: {e}", level="WARNING")
@@ -0,0 +1,191 @@
+"""
+Este módulo implementa o acervo de relatórios: um armazenamento em disco, endereçado
+pelo conteúdo, dos relatórios já gerados.
+
+Cada relatório é identificado por um hash de tudo o que o compõe: as linhas da
+tabela, as colunas, a versão dos estilos, o código dos módulos que montam os
+documentos (o texto fixo da capa, da descrição e do resumo), a versão do reportlab,
+os parâmetros que mudam o documento e os formatos pedidos. Se uma execução pede um
+relatório que já está no acervo, o PDF e os demais formatos são copiados de lá, sem
+passar pelo reportlab.
+
+O hash sem a data da capa é a "assinatura" do relatório: dois relatórios com a
+mesma assinatura só diferem no dia em que foram gerados. Ela é usada pelo índice de
+envios (veja `indice_de_envios.py`) para saber se um destinatário já recebeu aquele
+relatório.
+
+Developer's Note:
+    - Ao contrário do manifesto (veja `manifesto.py`), que compara os dados com os
+      do último envio de um mesmo PDF, o acervo é compartilhado por todos os
+      relatórios: turmas diferentes com os mesmos dados e dados que voltam a um
+      estado anterior também são encontrados.
+    - A escrita atômica e a remoção LRU vêm de `DiretorioLRU` (veja
+      `src/armazenamento/diretorio_lru.py`), o mesmo do cache de tabelas: o
+      relatório recém-guardado nunca é apagado, e um relatório maior que o limite
+      inteiro não é guardado.
+    - Ao mudar a forma como as chaves são calculadas, incremente `VERSAO_DO_ACERVO`.
+"""
+
+import hashlib
+import importlib
+import json
+import os
+import shutil
+from functools import lru_cache
+from typing import Dict, Optional, Sequence
+import pandas as pd
+import reportlab
+from src.armazenamento.diretorio_lru import ARQUIVO_DE_META, DiretorioLRU
+from src.relatorio.partes import ParteDoRelatorio
+from src.relatorio.utils.getdata import data_atual
+from src.relatorio.utils.mystyles import VERSAO_DOS_ESTILOS
+from settings import ConfiguracaoDaExecucao
+
+VERSAO_DO_ACERVO = 1
+
+# Módulos cujo código define o texto e o leiaute dos documentos.
+MODULOS_DO_MODELO = (
+    "src.relatorio.gerar_relatorio",
+    "src.relatorio.analise_frequencia",
+    "src.relatorio.exportacao",
+    "src.relatorio.utils.linhas_tabela",
+    "src.relatorio.utils.modelos",
+    "src.relatorio.utils.mystyles",
+)
+
+
+class AcervoDeRelatorios(DiretorioLRU):
+    """Acervo LRU, em disco, de relatórios já gerados, endereçado pelo conteúdo.
+
+    Attributes:
+        diretorio (str): O diretório onde as entradas do acervo são guardadas.
+        limite_bytes (int): O tamanho máximo do acervo, em bytes.
+    """
+    def carregar(self, chave: str) -> Optional[Dict[str, str]]:
+        """Procura um relatório no acervo.
+
+        Args:
+            chave (str): A chave do relatório (veja `chave_do_relatorio`).
+
+        Returns:
+            Optional[Dict[str, str]]: O caminho de cada arquivo do relatório, por
+                formato (ex: {"pdf": ..., "csv": ...}), ou `None` se ele não estiver
+                no acervo.
+        """
+        entrada = self._entrada(chave)
+        try:
+            with open(os.path.join(entrada, ARQUIVO_DE_META)) as f:
+                formatos = json.load(f)["formatos"]
+            arquivos = {formato: os.path.join(entrada, formato) for formato in formatos}
+            if not all(os.path.isfile(caminho) for caminho in arquivos.values()):
+                return None
+            self._marcar_uso(entrada)
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        return arquivos
+
+    def salvar(self, chave: str, arquivos: Dict[str, ParteDoRelatorio]) -> bool:
+        """Guarda um relatório no acervo e remove as entradas mais antigas.
+
+        Args:
+            chave (str): A chave do relatório (veja `chave_do_relatorio`).
+            arquivos (Dict[str, ParteDoRelatorio]): Os arquivos do relatório, em
+                memória ou em disco, por formato (ex: {"pdf": ..., "csv": ...}).
+
+        Returns:
+            bool: Verdadeiro se o relatório está no acervo; falso se ele não cabe nele.
+        """
+        def escrever(temporario: str):
+            for formato, arquivo in arquivos.items():
+                destino = os.path.join(temporario, formato)
+                if arquivo.conteudo is not None:
+                    with open(destino, "wb") as f:
+                        f.write(arquivo.conteudo)
+                else:
+                    shutil.copyfile(arquivo.caminho, destino)
+            with open(os.path.join(temporario, ARQUIVO_DE_META), "w") as f:
+                json.dump({"formatos": list(arquivos)}, f)
+
+        return self._publicar(chave, escrever)
+
+
+def acervo_da_execucao(config: ConfiguracaoDaExecucao) -> Optional[AcervoDeRelatorios]:
+    """Cria o acervo configurado pelos parâmetros da automação.
+
+    Args:
+        config (ConfiguracaoDaExecucao): A configuração da execução.
+
+    Returns:
+        Optional[AcervoDeRelatorios]: O acervo, ou `None` se `ACERVO_MAX_MB` for 0.
+    """
+    limite_mb = config.ACERVO_MAX_MB
+    if not limite_mb:
+        return None
+    return AcervoDeRelatorios(config.PATH_TO_ACERVO, limite_mb * 1024 * 1024)
+
+
+def assinatura_do_relatorio(config: ConfiguracaoDaExecucao, df: pd.DataFrame, linhas_por_pagina: int,
+                            formatos: Sequence[str]) -> str:
+    """Calcula o hash de tudo o que compõe o relatório, exceto a data da capa.
+
+    Os hashes das linhas são calculados de forma vetorizada pelo pandas, como no
+    manifesto, então o custo é uma única passada pela tabela.
+
+    Args:
+        config (ConfiguracaoDaExecucao): A configuração da execução.
+        df (pd.DataFrame): A tabela de frequência, já validada.
+        linhas_por_pagina (int): A quantidade de linhas de cada página da tabela.
+        formatos (Sequence[str]): Os formatos gerados além do PDF.
+
+    Returns:
+        str: A assinatura, em hexadecimal.
+    """
+    linhas = hashlib.blake2b(
+        pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes(), digest_size=16
+    ).hexdigest()
+    partes = {
+        "versao": VERSAO_DO_ACERVO,
+        "modelo": _versao_do_modelo(),
+        "estilos": VERSAO_DOS_ESTILOS,
+        "reportlab": reportlab.Version,
+        "linhas": linhas,
+        "colunas": [[str(coluna), str(tipo)] for coluna, tipo in df.dtypes.items()],
+        "linhas_por_pagina": linhas_por_pagina,
+        "escola": config.NOME_DA_ESCOLA,
+        "turma": config.NOME_DA_TURMA,
+        "limite_de_frequencia": config.LIMITE_DE_FREQUENCIA,
+        "max_alunos_no_resumo": config.MAX_ALUNOS_NO_RESUMO,
+        "pdf_compacto": config.PDF_COMPACTO,
+        "formatos": sorted(formatos),
+    }
+    return hashlib.blake2b(json.dumps(partes, sort_keys=True).encode(), digest_size=16).hexdigest()
+
+
+def chave_do_relatorio(assinatura: str) -> str:
+    """Calcula a chave do relatório no acervo: a assinatura mais a data da capa.
+
+    Args:
+        assinatura (str): A assinatura do relatório (veja `assinatura_do_relatorio`).
+
+    Returns:
+        str: A chave, em hexadecimal.
+    """
+    return hashlib.blake2b(f"{assinatura}:{data_atual()}".encode(), digest_size=16).hexdigest()
+
+
+@lru_cache(maxsize=1)
+def _versao_do_modelo() -> str:
+    """Calcula o hash do código dos módulos que montam os documentos.
+
+    Assim, qualquer mudança no texto fixo ou no leiaute invalida os relatórios já
+    guardados, sem depender de uma versão incrementada à mão.
+
+    Returns:
+        str: O hash, em hexadecimal.
+    """
+    hash_ = hashlib.blake2b(digest_size=16)
+    for nome in MODULOS_DO_MODELO:
+        modulo = importlib.import_module(nome)
+        with open(modulo.__file__, "rb") as f:
+            hash_.update(f.read())
+    return hash_.hexdigest()
@@ -0,0 +1,214 @@
+"""
+Este módulo calcula os indicadores de frequência da turma antes da geração do PDF.
+
+Todos os cálculos são vetorizados sobre a tabela inteira (sem laços por aluno em
+Python): as colunas de presença são convertidas em uma matriz booleana (alunos x
+dias) e os indicadores saem de somas, médias e acumulados do NumPy sobre essa matriz.
+Assim, a análise custa uma fração do tempo da renderização mesmo com milhões de
+linhas.
+
+Developer's Note:
+    Uma coluna é considerada um dia de aula se todos os seus valores forem "P"
+    (presente) ou "F" (falta), ou se ela for booleana (verdadeiro = presente). Para
+    adicionar um novo indicador, calcule-o em `analisar_frequencia` a partir da
+    matriz `presencas` e acrescente-o a `ResumoFrequencia`; a página de resumo é
+    montada em `report.pagina_resumo`.
+"""
+
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+import numpy as np
+import pandas as pd
+
+PRESENTE = "P"
+FALTA = "F"
+
+# Nomes das colunas de indicadores acrescentadas à tabela do relatório.
+COLUNA_FREQUENCIA = "Frequência"
+COLUNA_SEQUENCIA_DE_FALTAS = "Faltas seguidas"
+
+# Valores verificados antes de varrer uma coluna inteira em `colunas_de_dias`.
+LINHAS_DA_AMOSTRA = 1000
+
+# Alunos processados por vez no cálculo das sequências de faltas, para limitar o
+# tamanho das matrizes intermediárias.
+LINHAS_POR_BLOCO = 100_000
+
+
+@dataclass(frozen=True)
+class ResumoFrequencia:
+    """Os indicadores de frequência de uma turma.
+
+    Attributes:
+        dias (List[str]): Os nomes das colunas de dias de aula.
+        taxa_por_aluno (np.ndarray): A fração de presenças de cada aluno (0 a 1).
+        maior_sequencia_de_faltas (np.ndarray): A maior quantidade de faltas
+            consecutivas de cada aluno.
+        presentes_por_dia (np.ndarray): A quantidade de alunos presentes em cada dia.
+        limite (float): A frequência mínima esperada (0 a 1).
+        abaixo_do_limite (np.ndarray): As posições dos alunos abaixo do limite,
+            da menor para a maior frequência.
+    """
+    dias: List[str]
+    taxa_por_aluno: np.ndarray
+    maior_sequencia_de_faltas: np.ndarray
+    presentes_por_dia: np.ndarray
+    limite: float
+    abaixo_do_limite: np.ndarray
+
+    @property
+    def alunos(self) -> int:
+        """A quantidade de alunos da turma."""
+        return len(self.taxa_por_aluno)
+
+    @property
+    def taxa_media(self) -> float:
+        """A frequência média da turma (0 a 1)."""
+        return float(self.taxa_por_aluno.mean()) if self.alunos else 0.0
+
+    def tabela_com_indicadores(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Acrescenta à tabela as colunas de frequência e de faltas seguidas.
+
+        Args:
+            df (pd.DataFrame): A tabela de frequência analisada.
+
+        Returns:
+            pd.DataFrame: A tabela com os indicadores por aluno.
+        """
+        return df.assign(**{
+            COLUNA_FREQUENCIA: self.taxa_por_aluno,
+            COLUNA_SEQUENCIA_DE_FALTAS: self.maior_sequencia_de_faltas,
+        })
+
+
+def colunas_de_dias(df: pd.DataFrame) -> List[str]:
+    """Identifica as colunas de dias de aula da tabela.
+
+    Args:
+        df (pd.DataFrame): A tabela de frequência.
+
+    Returns:
+        List[str]: Os nomes das colunas de presença, na ordem da tabela.
+    """
+    dias = []
+    for coluna in df.columns:
+        serie = df[coluna]
+        if pd.api.types.is_bool_dtype(serie.dtype):
+            dias.append(coluna)
+        elif not pd.api.types.is_numeric_dtype(serie.dtype) and len(serie) \
+                and bool(serie.iloc[:LINHAS_DA_AMOSTRA].isin((PRESENTE, FALTA)).all()) \
+                and bool(serie.isin((PRESENTE, FALTA)).all()):
+            # A amostra descarta rápido as colunas de texto (ex: nomes dos alunos).
+            dias.append(coluna)
+    return dias
+
+
+def coluna_dos_nomes(dias: List[str], df: pd.DataFrame) -> Optional[str]:
+    """Identifica a coluna que nomeia os alunos: a primeira que não é um dia de aula.
+
+    Args:
+        dias (List[str]): As colunas de dias de aula (veja `colunas_de_dias`).
+        df (pd.DataFrame): A tabela de frequência.
+
+    Returns:
+        Optional[str]: O nome da coluna, ou `None` se todas forem dias de aula.
+    """
+    for coluna in df.columns:
+        if coluna not in dias:
+            return coluna
+    return None
+
+
+def analisar_frequencia(df: pd.DataFrame, limite: float = 0.75) -> Optional[ResumoFrequencia]:
+    """Calcula os indicadores de frequência da turma.
+
+    Args:
+        df (pd.DataFrame): A tabela de frequência, já validada.
+        limite (float): A frequência mínima esperada (0 a 1).
+
+    Returns:
+        Optional[ResumoFrequencia]: Os indicadores, ou `None` se a tabela não tiver
+            colunas de dias de aula.
+    """
+    dias = colunas_de_dias(df)
+    if not dias:
+        return None
+
+    presencas = _matriz_de_presencas(df, dias)
+    taxa_por_aluno = presencas.mean(axis=1)
+    abaixo = np.flatnonzero(taxa_por_aluno < limite)
+    abaixo = abaixo[np.argsort(taxa_por_aluno[abaixo], kind="stable")]
+
+    return ResumoFrequencia(
+        dias=[str(dia) for dia in dias],
+        taxa_por_aluno=taxa_por_aluno,
+        maior_sequencia_de_faltas=_maior_sequencia_de_faltas(presencas),
+        presentes_por_dia=presencas.sum(axis=0),
+        limite=limite,
+        abaixo_do_limite=abaixo,
+    )
+
+
+def _matriz_de_presencas(df: pd.DataFrame, dias: List[str]) -> np.ndarray:
+    """Monta a matriz booleana de presenças (alunos x dias).
+
+    Args:
+        df (pd.DataFrame): A tabela de frequência.
+        dias (List[str]): As colunas de dias de aula.
+
+    Returns:
+        np.ndarray: Verdadeiro onde o aluno esteve presente.
+    """
+    presencas = np.empty((len(df), len(dias)), dtype=bool)
+    for j, dia in enumerate(dias):
+        serie = df[dia]
+        if pd.api.types.is_bool_dtype(serie.dtype):
+            presencas[:, j] = serie.to_numpy(dtype=bool)
+        else:
+            # `isin` usa uma tabela hash e é bem mais rápido que `==` em colunas de texto.
+            presencas[:, j] = serie.isin((PRESENTE,)).to_numpy(dtype=bool)
+    return presencas
+
+
+def _maior_sequencia_de_faltas(presencas: np.ndarray) -> np.ndarray:
+    """Calcula a maior sequência de faltas consecutivas de cada aluno.
+
+    Para cada linha, a soma acumulada das faltas é "zerada" a cada presença
+    subtraindo o último valor acumulado visto em uma presença (obtido com
+    `np.maximum.accumulate`). O resultado é o tamanho da sequência de faltas em
+    andamento em cada dia, e o seu máximo é a maior sequência.
+
+    Args:
+        presencas (np.ndarray): A matriz booleana de presenças.
+
+    Returns:
+        np.ndarray: A maior sequência de faltas de cada aluno.
+    """
+    tipo = np.int16 if presencas.shape[1] < np.iinfo(np.int16).max else np.int32
+    resultado = np.zeros(presencas.shape[0], dtype=tipo)
+    for inicio in range(0, presencas.shape[0], LINHAS_POR_BLOCO):
+        bloco = presencas[inicio:inicio + LINHAS_POR_BLOCO]
+        faltas_acumuladas = np.cumsum(~bloco, axis=1, dtype=tipo)
+        ultimo_reinicio = np.maximum.accumulate(np.where(bloco, faltas_acumuladas, 0), axis=1)
+        resultado[inicio:inicio + len(bloco)] = (faltas_acumuladas - ultimo_reinicio).max(axis=1, initial=0)
+    return resultado
+
+
+def piores_alunos(resumo: ResumoFrequencia, nomes: pd.Series, quantidade: int) -> List[Tuple[str, float, int]]:
+    """Lista os alunos abaixo do limite com a menor frequência.
+
+    Args:
+        resumo (ResumoFrequencia): Os indicadores da turma.
+        nomes (pd.Series): A coluna de identificação dos alunos.
+        quantidade (int): A quantidade máxima de alunos listados.
+
+    Returns:
+        List[Tuple[str, float, int]]: O nome, a frequência e a maior sequência de
+            faltas de cada aluno.
+    """
+    posicoes = resumo.abaixo_do_limite[:quantidade]
+    return list(zip(
+        nomes.iloc[posicoes].astype(str),
+        resumo.taxa_por_aluno[posicoes].tolist(),
+        resumo.maior_sequencia_de_faltas[posicoes].tolist(),
+    ))
@@ -0,0 +1,409 @@
+"""
+Este módulo exporta o relatório de frequência em vários formatos a partir de uma
+única leitura da tabela.
+
+Além do PDF (gerado por `report`), o relatório pode ser exportado como:
+
+- `csv`: um resumo por aluno (frequência, maior sequência de faltas e situação),
+  separado por ponto e vírgula, para abrir direto em planilhas.
+- `html`: uma página com os indicadores da turma e a tabela completa.
+- `xlsx`: uma planilha com a tabela completa e uma aba de resumo (requer o pacote
+  opcional `openpyxl`, importado apenas quando o formato é pedido; sem ele, pedir o
+  formato é um erro, antes de qualquer relatório ser gerado).
+
+A tabela já lida e validada é analisada uma única vez e percorrida em blocos de
+`LINHAS_POR_BLOCO` linhas; cada bloco é entregue a todos os exportadores, que rodam
+em threads próprias, enquanto o PDF é gerado em outra thread. Os formatos de cada
+destinatário vêm de `FORMATOS_DO_RELATORIO` e `FORMATOS_POR_DESTINATARIO` (veja
+`send_email.formatos_por_destinatario`).
+
+Developer's Note:
+    Para um novo formato, crie uma subclasse de `Exportador` (veja `ExportadorCSV`)
+    e registre-a em `EXPORTADORES`; se ela depender de um pacote opcional, informe-o
+    em `pacote`. Os blocos são fatias do DataFrame (sem cópia) e
+    chegam na ordem da tabela. O PDF continua sendo o relatório principal: o
+    manifesto e a divisão em partes (`partes.py`) valem só para ele.
+"""
+
+import html
+import importlib.util
+import os
+import queue
+import shutil
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from io import BytesIO, StringIO
+from typing import Dict, List, Optional, Tuple, Type
+import pandas as pd
+from src.relatorio.acervo import acervo_da_execucao, assinatura_do_relatorio, chave_do_relatorio
+from src.relatorio.analise_frequencia import (
+    ResumoFrequencia, analisar_frequencia, coluna_dos_nomes, COLUNA_FREQUENCIA, COLUNA_SEQUENCIA_DE_FALTAS
+)
+from src.relatorio.gerar_relatorio import report
+from src.relatorio.partes import ParteDoRelatorio
+from src.relatorio.utils.getdata import data_atual
+from src.relatorio.utils.linhas_tabela import LinhasDaTabela, formatar_percentual
+from src.send_email.indice_de_envios import REENVIO_SEMPRE, politica_de_reenvio
+from src.send_email.send_email import formatos_por_destinatario
+from settings import ConfiguracaoDaExecucao
+
+# Linhas entregues de uma vez a cada exportador.
+LINHAS_POR_BLOCO = 20_000
+# Blocos que podem esperar na fila de cada exportador.
+BLOCOS_NA_FILA = 2
+# Marca colocada nas filas para encerrar os exportadores.
+_FIM = None
+
+
+class FormatoIndisponivelError(RuntimeError):
+    """Indica que um formato pedido depende de um pacote que não está instalado."""
+
+
+class Exportador(ABC):
+    """Um formato de exportação, que recebe a tabela em blocos e devolve o arquivo.
+
+    Attributes:
+        formato (str): O nome do formato, usado nos parâmetros (ex: "csv").
+        sufixo (str): O texto acrescentado ao nome do PDF para formar o nome do arquivo.
+        pacote (Optional[str]): O pacote opcional de que o formato depende, se houver.
+    """
+    formato = ""
+    sufixo = ""
+    pacote: Optional[str] = None
+
+    def comecar(self, tabela: pd.DataFrame, resumo: Optional[ResumoFrequencia], nomes: Optional[str]):
+        """Prepara o arquivo antes do primeiro bloco.
+
+        Args:
+            tabela (pd.DataFrame): A tabela inteira, com os indicadores (apenas para
+                consulta; as linhas chegam por `escrever`).
+            resumo (Optional[ResumoFrequencia]): Os indicadores da turma, se houver.
+            nomes (Optional[str]): A coluna que identifica os alunos, se houver.
+        """
+
+    @abstractmethod
+    def escrever(self, bloco: pd.DataFrame):
+        """Acrescenta um bloco de linhas ao arquivo.
+
+        Args:
+            bloco (pd.DataFrame): As linhas do bloco, com os indicadores.
+        """
+
+    @abstractmethod
+    def terminar(self) -> bytes:
+        """Conclui o arquivo e devolve o seu conteúdo."""
+
+
+class ExportadorCSV(Exportador):
+    """Exporta um resumo por aluno em CSV (separado por ponto e vírgula, UTF-8 com BOM)."""
+    formato = "csv"
+    sufixo = "_resumo.csv"
+
+    def comecar(self, tabela: pd.DataFrame, resumo: Optional[ResumoFrequencia], nomes: Optional[str]):
+        """Escolhe as colunas do resumo."""
+        self._nomes = nomes
+        self._limite = resumo.limite if resumo is not None else None
+        self._colunas = [nomes] if nomes is not None else []
+        if resumo is not None:
+            self._colunas += [COLUNA_FREQUENCIA, COLUNA_SEQUENCIA_DE_FALTAS]
+        self._saida = StringIO()
+        self._linhas_escritas = 0
+
+    def escrever(self, bloco: pd.DataFrame):
+        """Acrescenta o resumo dos alunos do bloco."""
+        resumo = bloco[self._colunas]
+        if self._nomes is None:
+            # Sem coluna de nomes, os alunos são identificados pela linha da tabela.
+            inicio = self._linhas_escritas + 1
+            resumo = resumo.assign(Aluno=range(inicio, inicio + len(bloco)))
+        if COLUNA_FREQUENCIA in resumo:
+            # Em porcentagem, como no PDF.
+            resumo = resumo.assign(**{COLUNA_FREQUENCIA: (resumo[COLUNA_FREQUENCIA] * 100).round(1)}).rename(
+                columns={COLUNA_FREQUENCIA: f"{COLUNA_FREQUENCIA} (%)"}
+            )
+        if self._limite is not None:
+            resumo = resumo.assign(Situação=(bloco[COLUNA_FREQUENCIA] < self._limite).map(
+                {True: "Abaixo do limite", False: "Regular"}
+            ))
+        resumo.to_csv(self._saida, sep=";", decimal=",", index=False, header=self._linhas_escritas == 0)
+        self._linhas_escritas += len(bloco)
+
+    def terminar(self) -> bytes:
+        """Devolve o CSV, com BOM para que planilhas reconheçam o UTF-8."""
+        return self._saida.getvalue().encode("utf-8-sig")
+
+
+class ExportadorHTML(Exportador):
+    """Exporta uma página HTML com os indicadores da turma e a tabela completa."""
+    formato = "html"
+    sufixo = ".html"
+
+    def comecar(self, tabela: pd.DataFrame, resumo: Optional[ResumoFrequencia], nomes: Optional[str]):
+        """Escreve o cabeçalho da página, o resumo e o início da tabela."""
+        self._partes: List[str] = [
+            "<!DOCTYPE html>\n<html lang=\"pt-BR\">\n<head>\n<meta charset=\"utf-8\">\n"
+            "<title>Frequência da turma</title>\n<style>\n"
+            "body{font-family:sans-serif;margin:2em}table{border-collapse:collapse}"
+            "th,td{border:1px solid #999;padding:2px 6px;text-align:center}th{background:#ddd}\n"
+            "</style>\n</head>\n<body>\n",
+            f"<h1>Frequência da turma</h1>\n<p>{html.escape(data_atual())}</p>\n",
+        ]
+        if resumo is not None:
+            abaixo = len(resumo.abaixo_do_limite)
+            self._partes.append(
+                f"<p>Alunos: {resumo.alunos}. Dias de aula: {len(resumo.dias)}. "
+                f"Frequência média da turma: {resumo.taxa_media * 100:.1f}%.</p>\n"
+                f"<p>Alunos abaixo de {resumo.limite * 100:.1f}% de frequência: {abaixo}.</p>\n"
+            )
+        cabecalho = "".join(f"<th>{html.escape(str(coluna))}</th>" for coluna in tabela.columns)
+        self._partes.append(f"<table>\n<thead><tr>{cabecalho}</tr></thead>\n<tbody>\n")
+
+    def escrever(self, bloco: pd.DataFrame):
+        """Acrescenta as linhas do bloco à tabela."""
+        linhas = LinhasDaTabela(bloco, {COLUNA_FREQUENCIA: formatar_percentual}).fatia(0, len(bloco))
+        self._partes.append("".join(
+            "<tr>" + "".join(f"<td>{html.escape(valor)}</td>" for valor in linha) + "</tr>\n"
+            for linha in linhas
+        ))
+
+    def terminar(self) -> bytes:
+        """Fecha a tabela e devolve a página."""
+        self._partes.append("</tbody>\n</table>\n</body>\n</html>\n")
+        return "".join(self._partes).encode("utf-8")
+
+
+class ExportadorXLSX(Exportador):
+    """Exporta uma planilha com a tabela completa e uma aba de resumo (requer `openpyxl`)."""
+    formato = "xlsx"
+    sufixo = ".xlsx"
+    pacote = "openpyxl"
+
+    def comecar(self, tabela: pd.DataFrame, resumo: Optional[ResumoFrequencia], nomes: Optional[str]):
+        """Cria a planilha em modo de escrita sequencial (sem manter as células em memória)."""
+        # Importado só aqui: a presença do pacote é conferida em `formatos_necessarios`.
+        from openpyxl import Workbook
+        self._planilha = Workbook(write_only=True)
+        if resumo is not None:
+            aba = self._planilha.create_sheet("Resumo")
+            aba.append(["Alunos", resumo.alunos])
+            aba.append(["Dias de aula", len(resumo.dias)])
+            aba.append(["Frequência média", resumo.taxa_media])
+            aba.append(["Limite de frequência", resumo.limite])
+            aba.append(["Alunos abaixo do limite", len(resumo.abaixo_do_limite)])
+        self._aba = self._planilha.create_sheet("Frequência")
+        self._aba.append([str(coluna) for coluna in tabela.columns])
+
+    def escrever(self, bloco: pd.DataFrame):
+        """Acrescenta as linhas do bloco, com os valores nos tipos nativos do Python."""
+        colunas = [bloco[coluna].tolist() for coluna in bloco.columns]
+        for linha in zip(*colunas):
+            self._aba.append(linha)
+
+    def terminar(self) -> bytes:
+        """Salva a planilha em memória e devolve o arquivo."""
+        saida = BytesIO()
+        self._planilha.save(saida)
+        return saida.getvalue()
+
+
+# Exportadores disponíveis, por formato. O PDF é gerado por `report`.
+EXPORTADORES: Dict[str, Type[Exportador]] = {
+    exportador.formato: exportador for exportador in (ExportadorCSV, ExportadorHTML, ExportadorXLSX)
+}
+FORMATOS = ("pdf",) + tuple(EXPORTADORES)
+
+
+@dataclass(frozen=True)
+class RelatorioExportado:
+    """O resultado da exportação de um relatório.
+
+    Attributes:
+        pdf (Optional[bytes]): O PDF, se foi gerado em memória (veja `report`).
+        arquivos (Tuple[ParteDoRelatorio, ...]): Os arquivos dos demais formatos.
+        assinatura (Optional[str]): A assinatura do relatório (veja `acervo.py`), se
+            o acervo ou o índice de envios estiverem em uso.
+        do_acervo (bool): Verdadeiro se o relatório veio do acervo, sem ser gerado.
+    """
+    pdf: Optional[bytes] = None
+    arquivos: Tuple[ParteDoRelatorio, ...] = ()
+    assinatura: Optional[str] = None
+    do_acervo: bool = False
+
+
+def formatos_necessarios(config: ConfiguracaoDaExecucao) -> Tuple[str, ...]:
+    """Lista os formatos pedidos por algum destinatário, além do PDF.
+
+    Args:
+        config (ConfiguracaoDaExecucao): A configuração da execução.
+
+    Returns:
+        Tuple[str, ...]: Os formatos, na ordem de `FORMATOS`.
+
+    Raises:
+        ValueError: Se algum formato pedido não existir.
+        FormatoIndisponivelError: Se um formato pedido depender de um pacote que não
+            está instalado.
+    """
+    pedidos = {formato for formatos in formatos_por_destinatario(config).values() for formato in formatos}
+    desconhecidos = pedidos - set(FORMATOS)
+    if desconhecidos:
+        raise ValueError(
+            f"Formatos de relatório desconhecidos: {', '.join(sorted(desconhecidos))}. "
+            f"Use {', '.join(FORMATOS)}."
+        )
+    formatos = tuple(formato for formato in EXPORTADORES if formato in pedidos)
+    for formato in formatos:
+        pacote = EXPORTADORES[formato].pacote
+        if pacote is not None and importlib.util.find_spec(pacote) is None:
+            raise FormatoIndisponivelError(
+                f"O formato {formato} requer o pacote {pacote} (pip install {pacote}). "
+                f"Instale-o ou retire {formato} de FORMATOS_DO_RELATORIO e FORMATOS_POR_DESTINATARIO."
+            )
+    return formatos
+
+
+def exportar_relatorio(config: ConfiguracaoDaExecucao, relatorio: report, df: pd.DataFrame) -> RelatorioExportado:
+    """Gera o PDF e os demais formatos pedidos a partir da mesma tabela.
+
+    Se o mesmo relatório já estiver no acervo (veja `acervo.py`), ele é copiado de
+    lá, sem ser gerado; caso contrário, é gerado e guardado no acervo.
+
+    Args:
+        config (ConfiguracaoDaExecucao): A configuração da execução.
+        relatorio (report): O relatório PDF, ainda não gerado.
+        df (pd.DataFrame): A tabela de frequência, já validada.
+
+    Returns:
+        RelatorioExportado: O PDF (no modo em memória) e os arquivos dos demais formatos.
+
+    Raises:
+        ValueError: Se algum formato pedido não existir.
+        FormatoIndisponivelError: Se um formato depender de um pacote ausente.
+    """
+    formatos = formatos_necessarios(config)
+    acervo = acervo_da_execucao(config)
+    assinatura = None
+    if acervo is not None or politica_de_reenvio(config) != REENVIO_SEMPRE:
+        assinatura = assinatura_do_relatorio(config, df, relatorio.linhas_por_pagina(), formatos)
+
+    base = os.path.splitext(os.path.basename(relatorio.path_to_output))[0]
+    if acervo is not None:
+        chave = chave_do_relatorio(assinatura)
+        guardado = acervo.carregar(chave)
+        if guardado is not None:
+            return _do_acervo(relatorio, guardado, formatos, base, assinatura)
+
+    pdf, arquivos = _gerar(relatorio, df, formatos, config.LIMITE_DE_FREQUENCIA, base)
+
+    if acervo is not None:
+        arquivo_pdf = ParteDoRelatorio(base + ".pdf", conteudo=pdf, caminho=relatorio.path_to_output)
+        acervo.salvar(chave, {"pdf": arquivo_pdf, **dict(zip(formatos, arquivos))})
+    return RelatorioExportado(pdf=pdf, arquivos=arquivos, assinatura=assinatura)
+
+
+def _gerar(relatorio: report, df: pd.DataFrame, formatos: Tuple[str, ...], limite_de_frequencia: float,
+           base: str) -> Tuple[Optional[bytes], Tuple[ParteDoRelatorio, ...]]:
+    """Gera o PDF e os demais formatos, com uma única passagem pela tabela.
+
+    Args:
+        relatorio (report): O relatório PDF, ainda não gerado.
+        df (pd.DataFrame): A tabela de frequência, já validada.
+        formatos (Tuple[str, ...]): Os formatos a gerar além do PDF.
+        limite_de_frequencia (float): O parâmetro `LIMITE_DE_FREQUENCIA`.
+        base (str): O nome dos arquivos, sem a extensão.
+
+    Returns:
+        Tuple[Optional[bytes], Tuple[ParteDoRelatorio, ...]]: O PDF (no modo em
+            memória) e os arquivos dos demais formatos.
+    """
+    resumo = analisar_frequencia(df, limite_de_frequencia)
+    if not formatos:
+        return relatorio.given_report(df, resumo=resumo), ()
+
+    tabela = resumo.tabela_com_indicadores(df) if resumo is not None else df
+    nomes = coluna_dos_nomes(resumo.dias if resumo is not None else [], df)
+    exportadores = [EXPORTADORES[formato]() for formato in formatos]
+    for exportador in exportadores:
+        exportador.comecar(tabela, resumo, nomes)
+
+    with ThreadPoolExecutor(max_workers=len(exportadores) + 1, thread_name_prefix="exportacao") as threads:
+        pdf = threads.submit(relatorio.given_report, df, resumo=resumo)
+        filas = [queue.Queue(maxsize=BLOCOS_NA_FILA) for _ in exportadores]
+        conteudos = [threads.submit(_consumir, exportador, fila) for exportador, fila in zip(exportadores, filas)]
+
+        # Uma única passagem pela tabela: cada bloco vai para todos os exportadores.
+        try:
+            for inicio in range(0, len(tabela), LINHAS_POR_BLOCO):
+                bloco = tabela.iloc[inicio:inicio + LINHAS_POR_BLOCO]
+                for fila in filas:
+                    fila.put(bloco)
+        finally:
+            for fila in filas:
+                fila.put(_FIM)
+
+        arquivos = tuple(
+            ParteDoRelatorio(base + exportador.sufixo, conteudo=conteudo.result())
+            for exportador, conteudo in zip(exportadores, conteudos)
+        )
+        return pdf.result(), arquivos
+
+
+def _do_acervo(relatorio: report, guardado: Dict[str, str], formatos: Tuple[str, ...], base: str,
+               assinatura: str) -> RelatorioExportado:
+    """Monta o resultado a partir de um relatório guardado no acervo.
+
+    Fora do modo em memória, o PDF guardado é copiado para `path_to_output`, como
+    se tivesse sido gerado ali.
+
+    Args:
+        relatorio (report): O relatório PDF, que não será gerado.
+        guardado (Dict[str, str]): O caminho de cada arquivo no acervo, por formato.
+        formatos (Tuple[str, ...]): Os formatos pedidos além do PDF.
+        base (str): O nome dos arquivos, sem a extensão.
+        assinatura (str): A assinatura do relatório.
+
+    Returns:
+        RelatorioExportado: O relatório guardado.
+    """
+    pdf = None
+    if relatorio.em_memoria:
+        pdf = _ler(guardado["pdf"])
+    else:
+        shutil.copyfile(guardado["pdf"], relatorio.path_to_output)
+    arquivos = tuple(
+        ParteDoRelatorio(base + EXPORTADORES[formato].sufixo, conteudo=_ler(guardado[formato]))
+        for formato in formatos
+    )
+    return RelatorioExportado(pdf=pdf, arquivos=arquivos, assinatura=assinatura, do_acervo=True)
+
+
+def _ler(caminho: str) -> bytes:
+    """Lê um arquivo inteiro."""
+    with open(caminho, "rb") as f:
+        return f.read()
+
+
+def _consumir(exportador: Exportador, fila: queue.Queue) -> bytes:
+    """Entrega os blocos da fila a um exportador, até a marca de fim (roda em uma thread).
+
+    Se o exportador falhar, a fila continua sendo esvaziada, para que a passagem
+    pela tabela não fique bloqueada; o erro é propagado no fim.
+
+    Args:
+        exportador (Exportador): O exportador.
+        fila (queue.Queue): A fila de blocos.
+
+    Returns:
+        bytes: O conteúdo do arquivo exportado.
+    """
+    erro = None
+    while (bloco := fila.get()) is not _FIM:
+        if erro is None:
+            try:
+                exportador.escrever(bloco)
+            except Exception as e:
+                erro = e
+    if erro is not None:
+        raise erro
+    return exportador.terminar()
@@ -1,18 +1,42 @@
 """
 Este módulo é responsável pela geração do relatório de frequência em formato PDF.
 
-Utiliza a biblioteca reportlab para criar um documento com capa, página de descrição
-e uma tabela com os dados de frequência dos alunos.
+Utiliza a biblioteca reportlab para criar um documento com capa, página de descrição,
+página de resumo com os indicadores da turma e uma tabela com os dados de frequência
+dos alunos.
 """
 
+from functools import partial
+from io import BytesIO
 from reportlab.platypus import Spacer, Paragraph, SimpleDocTemplate, PageBreak, Table
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.units import cm
+from reportlab.pdfbase.pdfmetrics import stringWidth
 import pandas as pd
-from src.relatorio.utils.mystyles import get_styles
+from src.relatorio.utils.mystyles import (
+    get_styles, estilo_da_tabela, ALTURA_DA_LINHA, FONTE_DA_TABELA, FONTE_DO_CABECALHO,
+    TAMANHO_DA_FONTE_DA_TABELA
+)
 from src.relatorio.utils.getdata import data_atual
-import settings as s
-from botcity.maestro import BotExecution
+from src.relatorio.utils.linhas_tabela import LinhasDaTabela, BlocoDaTabela, formatar_percentual
+from src.relatorio.analise_frequencia import (
+    ResumoFrequencia, analisar_frequencia, coluna_dos_nomes, piores_alunos, COLUNA_FREQUENCIA
+)
+from src.relatorio.utils.modelos import paragrafo_fixo
+from src.relatorio.utils.memoria import CanvasCompacto, HistoriaSobDemanda
+from settings import ConfiguracaoDaExecucao
+from typing import Iterable, Iterator, Optional, Tuple
+
+# Linhas usadas para estimar a largura das colunas da tabela.
+LINHAS_PARA_LARGURA = 200
+# Espaçamento horizontal (esquerda + direita) de cada célula da tabela.
+ESPACAMENTO_HORIZONTAL = 12
+# Espaçamento vertical (topo + base) do quadro de página padrão do reportlab.
+ESPACAMENTO_DO_QUADRO = 12
+
+def _percentual(fracao: float) -> str:
+    """Formata uma fração (0 a 1) como percentual, como `formatar_percentual`."""
+    return f"{fracao * 100:.1f}%"
 
 class report:
     """Gera um relatório em PDF a partir de um DataFrame do pandas.
@@ -22,22 +46,43 @@ class report:
     renderizada pela biblioteca reportlab.
 
     Attributes:
+        path_to_output (str): O caminho do PDF (no modo em memória, o caminho usado
+            se o relatório for salvo em disco depois).
+        em_memoria (bool): Se o PDF é gerado em memória, em vez de em `path_to_output`.
         doc (SimpleDocTemplate): O template do documento PDF.
         styles (StyleSheet1): A folha de estilos para formatação do texto.
-        story (list): A lista de elementos que comporão o PDF.
+        story (HistoriaSobDemanda): A lista de elementos que comporão o PDF. Os
+            elementos da tabela são criados sob demanda, durante a geração.
     """
-    def __init__(self, execution: BotExecution):
+    def __init__(self, config: ConfiguracaoDaExecucao, path_to_output: Optional[str] = None,
+                 em_memoria: bool = False):
         """Inicializa a classe report.
 
         Args:
-            execution (BotExecution): O objeto de execução da tarefa do Maestro.
+            config (ConfiguracaoDaExecucao): A configuração da execução.
+            path_to_output (Optional[str]): Caminho do PDF a ser gerado. Se omitido,
+                usa o parâmetro `PATH_TO_OUTPUT`. O modo em lote informa um caminho
+                por turma.
+            em_memoria (bool): Se verdadeiro, o PDF é gerado em um buffer em memória
+                e devolvido por `given_report`, sem ser escrito em disco.
         """
-        PATH_TO_OUTPUT = s.PATH_TO_OUTPUT.get_value(execution)
-        self.doc = SimpleDocTemplate(PATH_TO_OUTPUT)
+        self.path_to_output = path_to_output or config.PATH_TO_OUTPUT
+        self.em_memoria = em_memoria
+        self._buffer = BytesIO() if em_memoria else None
+        self.doc = SimpleDocTemplate(self._buffer if em_memoria else self.path_to_output)
         self.styles = get_styles()
-        self.story = []
+        self.story = HistoriaSobDemanda()
+        self.nome_da_escola = config.NOME_DA_ESCOLA
+        self.nome_da_turma = config.NOME_DA_TURMA
+        self.limite_de_frequencia = config.LIMITE_DE_FREQUENCIA
+        self.max_alunos_no_resumo = config.MAX_ALUNOS_NO_RESUMO
+        self.limite_rss = config.LIMITE_RSS_MB * 1024 * 1024 if config.LIMITE_RSS_MB else None
+        # Sem ASCII85, o conteúdo comprimido das páginas fica cerca de 20% menor.
+        self.ascii85 = False if config.PDF_COMPACTO else None
         
-    def given_report(self, df: pd.DataFrame):
+    def given_report(self, df: pd.DataFrame, linhas: Optional[Tuple[int, int]] = None,
+                     parte: Optional[Tuple[int, int]] = None,
+                     resumo: Optional[ResumoFrequencia] = None) -> Optional[bytes]:
         """Constrói e gera o relatório PDF com base nos dados fornecidos.
 
         Developer's Note:
@@ -50,15 +95,43 @@ class report:
 
         Args:
             df (pd.DataFrame): O DataFrame contendo os dados de frequência.
+            linhas (Optional[Tuple[int, int]]): O intervalo `[inicio, fim)` das linhas
+                exibidas na tabela. Se omitido, a tabela tem todas as linhas. Os
+                indicadores da turma são sempre calculados sobre a tabela inteira.
+            parte (Optional[Tuple[int, int]]): O número da parte e o total de partes,
+                quando o relatório é dividido (veja `partes.py`). Só a primeira parte
+                tem a capa, a descrição e o resumo.
+            resumo (Optional[ResumoFrequencia]): Os indicadores da turma, se já
+                calculados (veja `exportacao.py`). Se omitido, são calculados aqui.
+
+        Returns:
+            Optional[bytes]: O conteúdo do PDF, no modo em memória. Caso contrário, o
+                PDF é salvo em `path_to_output` e nada é retornado.
         """
-        # Converte o DataFrame para o formato de lista necessário para a tabela
-        for_table = self._df_to_list(df)
-    
-        # Adiciona a capa ao relatório
-        self._add_struct(self.Capa())
+        # Calcula os indicadores da turma (vetorizado, antes da renderização)
+        if resumo is None:
+            resumo = analisar_frequencia(df, self.limite_de_frequencia)
+        if resumo is not None:
+            df = resumo.tabela_com_indicadores(df)
+
+        # Fonte preguiçosa das linhas da tabela (sem copiar o DataFrame)
+        inicio, fim = linhas or (0, len(df))
+        for_table = LinhasDaTabela(df.iloc[inicio:fim], {COLUNA_FREQUENCIA: formatar_percentual})
+
+        if parte is None or parte[0] == 1:
+            # Adiciona a capa ao relatório
+            self._add_struct(self.Capa())
 
-        # Adiciona a página de descrição da automação
-        self._add_struct(self.pagina_descricao_automocao())
+            # Adiciona a página de descrição da automação
+            self._add_struct(self.pagina_descricao_automocao())
+
+            # Adiciona a página de resumo com os indicadores da turma
+            if resumo is not None:
+                self._add_struct(self.pagina_resumo(resumo, df))
+
+        # Identifica a parte e as linhas da tabela que ela contém
+        if parte is not None:
+            self._add_struct(self.cabecalho_da_parte(parte, inicio, fim, len(df)))
 
         # Adiciona a página com a tabela de frequência
         self._add_struct(self.tabela_da_classe(for_table))
@@ -66,47 +139,93 @@ class report:
         # Imprime uma mensagem de status no console
         self._print_info()
 
-        # Constrói o PDF a partir da "história" de elementos
-        self.doc.build(self.story)
+        # Constrói o PDF a partir da "história" de elementos. Cada página é
+        # comprimida assim que termina, e a memória é conferida (veja `memoria.py`).
+        self.doc.build(self.story, canvasmaker=partial(CanvasCompacto, limite_rss=self.limite_rss,
+                                                       ascii85=self.ascii85))
+
+        if self._buffer is not None:
+            return self._buffer.getvalue()
+        return None
 
     # Métodos para criar as seções do relatório
     def Capa(self) -> list:
         """Cria os elementos da página de capa do relatório.
 
+        Os textos fixos (com os nomes da escola e da turma) vêm de modelos já
+        preparados (veja `modelos.py`); apenas o parágrafo com a data é criado a cada
+        relatório.
+
         Returns:
             list: Uma lista de elementos reportlab para a capa.
         """
         posicao_central_vertical = (A4[0] / 2) - 7
         body = [
-            Paragraph("ESCOLA RAIMUNDA CONCEIÇÃO", self.styles['titulo-central-negrito']),
+            paragrafo_fixo(self.nome_da_escola.upper(), 'titulo-central-negrito'),
             Spacer(0, posicao_central_vertical),
-            Paragraph("FREQUENCIA DA TURMA A", self.styles['titulo-central']),
+            paragrafo_fixo(f"FREQUENCIA DA TURMA {self.nome_da_turma}".upper(), 'titulo-central'),
             Spacer(0, posicao_central_vertical - 5),
             Paragraph(data_atual(), self.styles['titulo-central']),
             PageBreak()
         ]
         return body
 
-    def tabela_da_classe(self, data: list) -> list:
+    def tabela_da_classe(self, linhas: LinhasDaTabela) -> Iterator:
         """Cria os elementos da página que contém a tabela de frequência.
 
+        A tabela é dividida em blocos do tamanho de uma página, cada um com o
+        cabeçalho repetido. As larguras das colunas e a altura das linhas são
+        calculadas uma única vez, para que o reportlab não precise medir todas as
+        células da tabela, e o tempo de montagem cresça de forma linear. Os blocos
+        são criados um a um, conforme o reportlab avança pelas páginas, e as linhas
+        de cada bloco só são formatadas quando o bloco é desenhado.
+
         Args:
-            data (list): Os dados a serem exibidos na tabela, formatados como lista de listas.
+            linhas (LinhasDaTabela): A fonte das linhas da tabela.
 
         Returns:
-            list: Uma lista de elementos reportlab para a página da tabela.
+            Iterator: Os elementos reportlab da página da tabela, gerados sob demanda.
         """
-        body = [
-            Paragraph("Frequencia dos alunos", self.styles['corpo-do-texto']),
-            Spacer(0, 2 * cm),
-            Table(data),
-            PageBreak()
+        larguras = self._larguras_das_colunas(linhas)
+        linhas_por_pagina = self.linhas_por_pagina()
+        estilo = estilo_da_tabela()
+
+        yield Paragraph("Frequencia dos alunos", self.styles['corpo-do-texto'])
+        yield Spacer(0, 2 * cm)
+        for inicio in range(0, max(len(linhas), 1), linhas_por_pagina):
+            yield BlocoDaTabela(
+                linhas,
+                inicio,
+                min(inicio + linhas_por_pagina, len(linhas)),
+                larguras,
+                ALTURA_DA_LINHA,
+                estilo
+            )
+        yield PageBreak()
+
+    def cabecalho_da_parte(self, parte: Tuple[int, int], inicio: int, fim: int, total: int) -> list:
+        """Cria o parágrafo que identifica uma parte de um relatório dividido.
+
+        Args:
+            parte (Tuple[int, int]): O número da parte e o total de partes.
+            inicio (int): A posição da primeira linha da tabela nesta parte.
+            fim (int): A posição seguinte à última linha da tabela nesta parte.
+            total (int): A quantidade de linhas da tabela inteira.
+
+        Returns:
+            list: Uma lista de elementos reportlab com a identificação da parte.
+        """
+        numero, partes = parte
+        return [
+            Paragraph(f"PARTE {numero} DE {partes}", self.styles['titulo-central']),
+            Paragraph(f"Alunos {inicio + 1} a {fim} de {total}.", self.styles['corpo-do-texto']),
         ]
-        return body
 
     def pagina_descricao_automocao(self) -> list:
         """Cria a página de descrição com informações sobre a automação.
 
+        A página é fixa, então os seus parágrafos vêm de modelos já preparados.
+
         Returns:
             list: Uma lista de elementos reportlab para a página de descrição.
         """
@@ -117,29 +236,122 @@ class report:
         possivelmente confusa e sem sentido. Isso é porque não sei exatamente como deveria ser um relatório
         neste contexto, e decidi não separar tanto tempo assim para formatação ou estrutura.""")
         body = [
-            Paragraph("Observações sobre a automação e o relatório".upper(), self.styles['titulo-central']),
-            Paragraph(text_context, self.styles['corpo-do-texto']),
+            paragrafo_fixo("Observações sobre a automação e o relatório".upper(), 'titulo-central'),
+            paragrafo_fixo(text_context, 'corpo-do-texto'),
             PageBreak()
         ]
         return body
 
+    def pagina_resumo(self, resumo: ResumoFrequencia, df: pd.DataFrame) -> list:
+        """Cria a página com os indicadores de frequência da turma.
+
+        A página traz a frequência média, a frequência de cada dia de aula e os
+        alunos abaixo do limite (`LIMITE_DE_FREQUENCIA`), dos de menor frequência
+        para os de maior.
+
+        Args:
+            resumo (ResumoFrequencia): Os indicadores calculados da turma.
+            df (pd.DataFrame): A tabela de frequência, usada para os nomes dos alunos.
+
+        Returns:
+            list: Uma lista de elementos reportlab para a página de resumo.
+        """
+        estilo = estilo_da_tabela()
+        alunos = max(resumo.alunos, 1)
+        abaixo = len(resumo.abaixo_do_limite)
+
+        por_dia = [["Dia", "Presentes", "Faltas", "Frequência"]]
+        for dia, presentes in zip(resumo.dias, resumo.presentes_por_dia.tolist()):
+            por_dia.append([dia, presentes, resumo.alunos - presentes, _percentual(presentes / alunos)])
+
+        body = [
+            Paragraph("RESUMO DA FREQUÊNCIA", self.styles['titulo-central']),
+            Spacer(0, 1 * cm),
+            Paragraph(
+                f"Alunos: {resumo.alunos}. Dias de aula: {len(resumo.dias)}. "
+                f"Frequência média da turma: {_percentual(resumo.taxa_media)}.",
+                self.styles['corpo-do-texto']
+            ),
+            Paragraph(
+                f"Alunos abaixo de {_percentual(resumo.limite)} de frequência: "
+                f"{abaixo} ({_percentual(abaixo / alunos)}).",
+                self.styles['corpo-do-texto']
+            ),
+            Spacer(0, 1 * cm),
+            Table(por_dia, repeatRows=1, style=estilo),
+        ]
+
+        piores = piores_alunos(resumo, self._nomes_dos_alunos(resumo, df), self.max_alunos_no_resumo)
+        if piores:
+            linhas = [["Aluno", "Frequência", "Faltas seguidas"]]
+            linhas += [[nome, _percentual(taxa), sequencia] for nome, taxa, sequencia in piores]
+            titulo = "Alunos com menor frequência"
+            if abaixo > len(piores):
+                titulo += f" ({len(piores)} de {abaixo})"
+            body += [
+                Spacer(0, 1 * cm),
+                Paragraph(titulo, self.styles['corpo-do-texto']),
+                Table(linhas, repeatRows=1, style=estilo),
+            ]
+        body.append(PageBreak())
+        return body
+
     # Funções utilitárias internas
-    def _df_to_list(self, df: pd.DataFrame) -> list:
-        """Converte um DataFrame do pandas em uma lista de listas.
+    def _nomes_dos_alunos(self, resumo: ResumoFrequencia, df: pd.DataFrame) -> pd.Series:
+        """Retorna a coluna que identifica os alunos (a primeira que não é um dia de aula).
 
         Args:
-            df (pd.DataFrame): O DataFrame a ser convertido.
+            resumo (ResumoFrequencia): Os indicadores calculados da turma.
+            df (pd.DataFrame): A tabela de frequência.
 
         Returns:
-            list: Uma lista contendo os cabeçalhos e os dados do DataFrame.
+            pd.Series: Os nomes dos alunos ou, se não houver tal coluna, o número da linha.
         """
-        return [df.columns.tolist()] + df.values.tolist()
-    
-    def _add_struct(self, struct: list):
-        """Adiciona uma lista de elementos à "história" do PDF.
+        coluna = coluna_dos_nomes(resumo.dias, df)
+        if coluna is not None:
+            return df[coluna]
+        return pd.Series(range(1, len(df) + 1), index=df.index)
+
+    def _larguras_das_colunas(self, linhas: LinhasDaTabela) -> list:
+        """Calcula a largura de cada coluna da tabela.
+
+        As larguras são estimadas a partir do cabeçalho e das primeiras linhas e,
+        se a soma passar da largura útil da página, reduzidas proporcionalmente.
+
+        Args:
+            linhas (LinhasDaTabela): A fonte das linhas da tabela.
+
+        Returns:
+            list: A largura de cada coluna, em pontos.
+        """
+        amostra = linhas.fatia(0, LINHAS_PARA_LARGURA)
+        larguras = []
+        for i, titulo in enumerate(linhas.cabecalho):
+            largura = stringWidth(str(titulo), FONTE_DO_CABECALHO, TAMANHO_DA_FONTE_DA_TABELA)
+            for linha in amostra:
+                largura = max(largura, stringWidth(str(linha[i]), FONTE_DA_TABELA, TAMANHO_DA_FONTE_DA_TABELA))
+            larguras.append(largura + ESPACAMENTO_HORIZONTAL)
+
+        total = sum(larguras)
+        if total > self.doc.width:
+            larguras = [largura * self.doc.width / total for largura in larguras]
+        return larguras
+
+    def linhas_por_pagina(self) -> int:
+        """Calcula quantas linhas da tabela (além do cabeçalho) cabem em uma página.
+
+        Returns:
+            int: A quantidade de linhas por bloco da tabela.
+        """
+        altura_util = self.doc.height - ESPACAMENTO_DO_QUADRO
+        return max(int(altura_util // ALTURA_DA_LINHA) - 1, 1)
+
+    def _add_struct(self, struct: Iterable):
+        """Adiciona elementos à "história" do PDF.
 
         Args:
-            struct (list): A lista de elementos reportlab a ser adicionada.
+            struct (Iterable): Os elementos reportlab a serem adicionados. Um gerador
+                só é consumido quando o reportlab chega aos seus elementos.
         """
         self.story.extend(struct)
         
@@ -0,0 +1,183 @@
+"""
+Este módulo registra o que foi usado para gerar cada relatório, para que execuções
+seguidas com os mesmos dados não gerem nem enviem o relatório de novo.
+
+Ao lado de cada PDF enviado é salvo um manifesto (`<relatorio>.pdf.manifesto.json`)
+com um hash do conteúdo de cada página da tabela, além de uma "impressão" de tudo o
+que muda o documento fora da tabela (cabeçalho, versão dos estilos, parâmetros da
+página de resumo e do anexo, destinatários e formatos). Na execução seguinte, o
+manifesto dos dados atuais é comparado com o salvo: se forem iguais, o relatório já
+enviado continua válido.
+
+Developer's Note:
+    Qualquer novo dado que altere o PDF ou o e-mail (ex: um novo parâmetro exibido
+    na capa) precisa entrar na impressão (`_impressao`); caso contrário, mudanças
+    nesse dado não farão o relatório ser gerado de novo. Ao mudar a forma como os
+    hashes são calculados, incremente `VERSAO_DO_MANIFESTO`. A data da capa fica de
+    fora de propósito: os mesmos dados, em outro dia, não geram um novo envio (o
+    relatório já enviado mantém a data do seu envio).
+"""
+
+import hashlib
+import json
+import os
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+import pandas as pd
+from src.relatorio.utils.mystyles import VERSAO_DOS_ESTILOS
+from settings import ConfiguracaoDaExecucao
+
+VERSAO_DO_MANIFESTO = 2
+
+
+@dataclass(frozen=True)
+class ManifestoDoRelatorio:
+    """Descreve o conteúdo de um relatório, página por página da tabela.
+
+    Attributes:
+        impressao (str): O hash de tudo o que compõe o relatório fora das linhas da
+            tabela, inclusive a quantidade de linhas por página.
+        paginas (Tuple[str, ...]): O hash das linhas de cada página da tabela.
+    """
+    impressao: str
+    paginas: Tuple[str, ...]
+
+    def inalterado(self, anterior: Optional["ManifestoDoRelatorio"]) -> bool:
+        """Indica se o relatório descrito é igual ao do manifesto anterior.
+
+        Args:
+            anterior (Optional[ManifestoDoRelatorio]): O manifesto do último envio.
+
+        Returns:
+            bool: Verdadeiro se nada no relatório mudou.
+        """
+        return anterior is not None and self == anterior
+
+    def paginas_alteradas(self, anterior: Optional["ManifestoDoRelatorio"]) -> List[int]:
+        """Lista as páginas da tabela cujas linhas mudaram desde o manifesto anterior.
+
+        Se a impressão mudou, todas as páginas contam como alteradas.
+
+        Args:
+            anterior (Optional[ManifestoDoRelatorio]): O manifesto do último envio.
+
+        Returns:
+            List[int]: Os números das páginas alteradas (a partir de 1), incluindo as
+                páginas que só existem em um dos dois manifestos.
+        """
+        total = max(len(self.paginas), len(anterior.paginas) if anterior else 0)
+        if anterior is None or anterior.impressao != self.impressao:
+            return list(range(1, total + 1))
+        return [
+            i + 1 for i in range(total)
+            if i >= len(self.paginas) or i >= len(anterior.paginas)
+            or self.paginas[i] != anterior.paginas[i]
+        ]
+
+    def salvar(self, path_to_output: str):
+        """Salva o manifesto ao lado do relatório.
+
+        Args:
+            path_to_output (str): O caminho do PDF descrito pelo manifesto.
+        """
+        caminho = caminho_do_manifesto(path_to_output)
+        diretorio = os.path.dirname(caminho)
+        if diretorio:
+            os.makedirs(diretorio, exist_ok=True)
+        temporario = caminho + ".tmp"
+        with open(temporario, "w", encoding="utf-8") as f:
+            json.dump({
+                "versao": VERSAO_DO_MANIFESTO,
+                "impressao": self.impressao,
+                "paginas": list(self.paginas),
+            }, f)
+        os.replace(temporario, caminho)
+
+    @classmethod
+    def carregar(cls, path_to_output: str) -> Optional["ManifestoDoRelatorio"]:
+        """Lê o manifesto salvo ao lado de um relatório.
+
+        Args:
+            path_to_output (str): O caminho do PDF.
+
+        Returns:
+            Optional[ManifestoDoRelatorio]: O manifesto, ou `None` se ele não existir,
+                estiver corrompido ou for de outra versão.
+        """
+        try:
+            with open(caminho_do_manifesto(path_to_output), encoding="utf-8") as f:
+                dados = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(dados, dict) or dados.get("versao") != VERSAO_DO_MANIFESTO:
+            return None
+        return cls(impressao=dados["impressao"], paginas=tuple(dados["paginas"]))
+
+
+def caminho_do_manifesto(path_to_output: str) -> str:
+    """Retorna o caminho do manifesto de um relatório.
+
+    Args:
+        path_to_output (str): O caminho do PDF.
+
+    Returns:
+        str: O caminho do manifesto.
+    """
+    return path_to_output + ".manifesto.json"
+
+
+def manifesto_do_relatorio(config: ConfiguracaoDaExecucao, df: pd.DataFrame,
+                           linhas_por_pagina: int) -> ManifestoDoRelatorio:
+    """Calcula o manifesto do relatório que seria gerado com os dados atuais.
+
+    Os hashes das linhas são calculados de forma vetorizada pelo pandas e agrupados
+    por página, então o custo é uma única passada pela tabela, bem menor que o de
+    gerar o PDF.
+
+    Args:
+        config (ConfiguracaoDaExecucao): A configuração da execução.
+        df (pd.DataFrame): A tabela de frequência, já validada.
+        linhas_por_pagina (int): A quantidade de linhas de cada página da tabela
+            (veja `report.linhas_por_pagina`).
+
+    Returns:
+        ManifestoDoRelatorio: O manifesto dos dados atuais.
+    """
+    hashes_das_linhas = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    paginas = tuple(
+        hashlib.blake2b(hashes_das_linhas[inicio:inicio + linhas_por_pagina].tobytes(), digest_size=16).hexdigest()
+        for inicio in range(0, len(hashes_das_linhas), linhas_por_pagina)
+    )
+    return ManifestoDoRelatorio(_impressao(config, df, linhas_por_pagina), paginas)
+
+
+def _impressao(config: ConfiguracaoDaExecucao, df: pd.DataFrame, linhas_por_pagina: int) -> str:
+    """Calcula o hash de tudo o que compõe o relatório e o e-mail fora da tabela.
+
+    Args:
+        config (ConfiguracaoDaExecucao): A configuração da execução.
+        df (pd.DataFrame): A tabela de frequência.
+        linhas_por_pagina (int): A quantidade de linhas de cada página da tabela.
+
+    Returns:
+        str: O hash, em hexadecimal.
+    """
+    partes = {
+        "estilos": VERSAO_DOS_ESTILOS,
+        "escola": config.NOME_DA_ESCOLA,
+        "turma": config.NOME_DA_TURMA,
+        "professor": config.NOME_DO_PROFESSOR,
+        "colunas": [[str(coluna), str(tipo)] for coluna, tipo in df.dtypes.items()],
+        "linhas_por_pagina": linhas_por_pagina,
+        "destinatarios": config.EMAIL_DESTINATARIO,
+        "assunto": config.ASSUNTO_EMAIL,
+        "limite_de_frequencia": config.LIMITE_DE_FREQUENCIA,
+        "max_alunos_no_resumo": config.MAX_ALUNOS_NO_RESUMO,
+        "pdf_compacto": config.PDF_COMPACTO,
+        "tamanho_maximo_anexo_mb": config.TAMANHO_MAXIMO_ANEXO_MB,
+        "anexo_acima_do_limite": config.ANEXO_ACIMA_DO_LIMITE,
+        "formatos_do_relatorio": config.FORMATOS_DO_RELATORIO,
+        "formatos_por_destinatario": config.FORMATOS_POR_DESTINATARIO,
+        "reenvio_de_relatorio": config.REENVIO_DE_RELATORIO,
+    }
+    return hashlib.blake2b(json.dumps(partes, sort_keys=True).encode(), digest_size=16).hexdigest()
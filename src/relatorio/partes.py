@@ -0,0 +1,167 @@
+"""
+Este módulo garante que cada anexo de e-mail caiba no limite de tamanho configurado.
+
+Depois que o relatório é gerado, o seu tamanho é comparado com
+`TAMANHO_MAXIMO_ANEXO_MB`. Se couber, ele é enviado inteiro. Caso contrário, conforme
+`ANEXO_ACIMA_DO_LIMITE`:
+
+- `dividir`: a tabela é dividida em faixas de alunos e cada faixa é gerada como um
+  PDF próprio ("Parte 1 de 3", ...), com a capa e o resumo apenas na primeira.
+- `zip`: o PDF é compactado em um arquivo ZIP; se ainda passar do limite, o
+  relatório é dividido.
+
+Developer's Note:
+    A quantidade de partes é estimada pelo tamanho do relatório inteiro, com uma
+    folga (`FOLGA_DO_LIMITE`) para a capa e o resumo da primeira parte. Se alguma
+    parte ainda passar do limite, a divisão é refeita com mais partes, até
+    `TENTATIVAS_DE_DIVISAO` vezes.
+"""
+
+import math
+import os
+import zipfile
+from dataclasses import dataclass
+from io import BytesIO
+from typing import List, Optional
+import pandas as pd
+from src.relatorio.gerar_relatorio import report
+from settings import ConfiguracaoDaExecucao
+
+# Fração do limite usada ao estimar a quantidade de partes.
+FOLGA_DO_LIMITE = 0.9
+# Quantas vezes a divisão é refeita com mais partes se alguma passar do limite.
+TENTATIVAS_DE_DIVISAO = 3
+
+
+class AnexoGrandeDemaisError(ValueError):
+    """Indica que o relatório não coube no limite de tamanho nem depois de dividido."""
+
+
+@dataclass(frozen=True)
+class ParteDoRelatorio:
+    """Um anexo a ser enviado: o relatório inteiro, compactado ou uma de suas partes.
+
+    Attributes:
+        nome (str): O nome do arquivo anexado.
+        conteudo (Optional[bytes]): O conteúdo do anexo, se estiver em memória.
+        caminho (Optional[str]): O caminho do anexo em disco, se não estiver em memória.
+        numero (int): O número da parte (a partir de 1).
+        total (int): A quantidade de partes do relatório.
+    """
+    nome: str
+    conteudo: Optional[bytes] = None
+    caminho: Optional[str] = None
+    numero: int = 1
+    total: int = 1
+
+    @property
+    def tamanho(self) -> int:
+        """O tamanho do anexo, em bytes."""
+        if self.conteudo is not None:
+            return len(self.conteudo)
+        return os.path.getsize(self.caminho)
+
+    def ler(self) -> bytes:
+        """Retorna o conteúdo do anexo, lendo-o do disco se necessário."""
+        if self.conteudo is not None:
+            return self.conteudo
+        with open(self.caminho, "rb") as f:
+            return f.read()
+
+
+def partes_do_relatorio(config: ConfiguracaoDaExecucao, df: pd.DataFrame, path_to_output: str,
+                        conteudo: Optional[bytes] = None) -> List[ParteDoRelatorio]:
+    """Prepara os anexos de um relatório já gerado, respeitando o limite de tamanho.
+
+    Args:
+        config (ConfiguracaoDaExecucao): A configuração da execução.
+        df (pd.DataFrame): A tabela de frequência usada no relatório.
+        path_to_output (str): O caminho do PDF do relatório.
+        conteudo (Optional[bytes]): O PDF em memória. Se omitido, o PDF é lido de
+            `path_to_output`.
+
+    Returns:
+        List[ParteDoRelatorio]: Os anexos, um por e-mail.
+
+    Raises:
+        AnexoGrandeDemaisError: Se alguma parte continuar acima do limite depois de
+            todas as tentativas de divisão.
+    """
+    inteiro = ParteDoRelatorio(
+        os.path.basename(path_to_output),
+        conteudo=conteudo,
+        caminho=None if conteudo is not None else path_to_output
+    )
+    limite = int(config.TAMANHO_MAXIMO_ANEXO_MB * 1024 * 1024)
+    if limite <= 0 or inteiro.tamanho <= limite:
+        return [inteiro]
+
+    if config.ANEXO_ACIMA_DO_LIMITE == "zip":
+        compactado = _compactar(inteiro)
+        if compactado.tamanho <= limite:
+            return [compactado]
+    return _dividir(config, df, path_to_output, inteiro.tamanho, limite)
+
+
+def _compactar(parte: ParteDoRelatorio) -> ParteDoRelatorio:
+    """Compacta um anexo em um arquivo ZIP, em memória.
+
+    Args:
+        parte (ParteDoRelatorio): O anexo a ser compactado.
+
+    Returns:
+        ParteDoRelatorio: O arquivo ZIP com o anexo dentro.
+    """
+    buffer = BytesIO()
+    with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=9) as arquivo:
+        arquivo.writestr(parte.nome, parte.ler())
+    return ParteDoRelatorio(os.path.splitext(parte.nome)[0] + ".zip", conteudo=buffer.getvalue())
+
+
+def _dividir(config: ConfiguracaoDaExecucao, df: pd.DataFrame, path_to_output: str,
+             tamanho: int, limite: int) -> List[ParteDoRelatorio]:
+    """Gera o relatório em partes, cada uma com uma faixa de alunos da tabela.
+
+    Args:
+        config (ConfiguracaoDaExecucao): A configuração da execução.
+        df (pd.DataFrame): A tabela de frequência.
+        path_to_output (str): O caminho do PDF do relatório inteiro.
+        tamanho (int): O tamanho do relatório inteiro, em bytes.
+        limite (int): O tamanho máximo de cada parte, em bytes.
+
+    Returns:
+        List[ParteDoRelatorio]: As partes, em ordem.
+
+    Raises:
+        AnexoGrandeDemaisError: Se alguma parte continuar acima do limite.
+    """
+    base, extensao = os.path.splitext(os.path.basename(path_to_output))
+    total_de_linhas = max(len(df), 1)
+    quantidade = math.ceil(tamanho / (limite * FOLGA_DO_LIMITE))
+    for _ in range(TENTATIVAS_DE_DIVISAO):
+        quantidade = min(max(quantidade, 2), total_de_linhas)
+        passo = math.ceil(total_de_linhas / quantidade)
+        intervalos = [(inicio, min(inicio + passo, len(df))) for inicio in range(0, total_de_linhas, passo)]
+
+        partes = []
+        for numero, intervalo in enumerate(intervalos, start=1):
+            relatorio = report(config, path_to_output, em_memoria=True)
+            conteudo = relatorio.given_report(df, linhas=intervalo, parte=(numero, len(intervalos)))
+            partes.append(ParteDoRelatorio(
+                f"{base}_parte{numero}de{len(intervalos)}{extensao}",
+                conteudo=conteudo,
+                numero=numero,
+                total=len(intervalos)
+            ))
+
+        maior = max(parte.tamanho for parte in partes)
+        if maior <= limite:
+            return partes
+        if len(intervalos) == total_de_linhas:
+            break
+        quantidade = math.ceil(len(intervalos) * maior / (limite * FOLGA_DO_LIMITE))
+
+    raise AnexoGrandeDemaisError(
+        f"O relatório {base}{extensao} não coube no limite de "
+        f"{config.TAMANHO_MAXIMO_ANEXO_MB} MB por anexo, nem dividido em partes."
+    )
@@ -0,0 +1,56 @@
+"""
+Módulo para salvar em disco, em segundo plano, um relatório gerado em memória.
+
+Quando o PDF é gerado em um buffer (parâmetro `PDF_EM_MEMORIA`), o e-mail é enviado
+direto dos bytes, e a cópia em disco deixa de ser um passo obrigatório do caminho
+crítico: ela é feita por uma thread separada enquanto o e-mail é enviado.
+"""
+
+import os
+import threading
+from typing import Optional
+
+
+class GravacaoEmSegundoPlano(threading.Thread):
+    """Thread que grava um conteúdo em disco de forma atômica.
+
+    O arquivo é escrito em um caminho temporário e renomeado no fim, então quem ler
+    `caminho` nunca vê um PDF pela metade.
+
+    Attributes:
+        caminho (str): O caminho do arquivo a ser gravado.
+        erro (Optional[BaseException]): A exceção da gravação, se ela falhou.
+    """
+    def __init__(self, conteudo: bytes, caminho: str):
+        """Inicializa e inicia a gravação.
+
+        Args:
+            conteudo (bytes): O conteúdo a ser gravado.
+            caminho (str): O caminho do arquivo de destino.
+        """
+        super().__init__(name=f"gravacao-{os.path.basename(caminho)}")
+        self._conteudo = conteudo
+        self.caminho = caminho
+        self.erro: Optional[BaseException] = None
+        self.start()
+
+    def run(self):
+        """Grava o conteúdo, guardando a exceção em vez de propagá-la."""
+        try:
+            diretorio = os.path.dirname(self.caminho)
+            if diretorio:
+                os.makedirs(diretorio, exist_ok=True)
+            temporario = f"{self.caminho}.tmp"
+            with open(temporario, "wb") as f:
+                f.write(self._conteudo)
+            os.replace(temporario, self.caminho)
+        except BaseException as e:
+            self.erro = e
+        finally:
+            self._conteudo = None
+
+    def aguardar(self):
+        """Espera a gravação terminar e propaga o seu erro, se houver."""
+        self.join()
+        if self.erro is not None:
+            raise self.erro
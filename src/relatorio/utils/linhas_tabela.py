@@ -0,0 +1,203 @@
+"""
+Módulo que entrega as linhas da tabela de frequência ao reportlab sob demanda.
+
+Em vez de converter o DataFrame inteiro em uma lista de listas, as linhas são
+formatadas fatia por fatia, direto dos arrays de cada coluna. A formatação é feita
+por coluna, de forma vetorizada (ex: percentuais e datas), e cada fatia só é
+montada quando o reportlab vai desenhar a página correspondente.
+
+Developer's Note:
+    Para mudar a forma como uma coluna aparece no relatório, passe uma função em
+    `formatadores` (nome da coluna -> função que recebe a fatia da coluna como
+    `pd.Series` e devolve uma sequência de textos). As funções `formatar_percentual`
+    e `formatar_data` servem de exemplo. Colunas sem formatador usam o formatador
+    padrão do seu tipo (veja `_formatador_padrao`).
+"""
+
+from typing import Callable, Dict, List, Optional, Sequence
+import numpy as np
+import pandas as pd
+from reportlab.platypus import Flowable, Table, TableStyle
+
+Formatador = Callable[[pd.Series], Sequence[str]]
+
+
+def formatar_percentual(serie: pd.Series) -> Sequence[str]:
+    """Formata frações (0 a 1) como percentuais com uma casa decimal (ex: '87.5%').
+
+    Args:
+        serie (pd.Series): A fatia da coluna.
+
+    Returns:
+        Sequence[str]: Os valores formatados.
+    """
+    return ((serie * 100).round(1).astype(str) + "%").to_numpy()
+
+
+def formatar_data(serie: pd.Series) -> Sequence[str]:
+    """Formata datas no padrão 'dd/mm/YYYY', como em `getdata.data_atual`.
+
+    Args:
+        serie (pd.Series): A fatia da coluna.
+
+    Returns:
+        Sequence[str]: Os valores formatados.
+    """
+    return pd.to_datetime(serie).dt.strftime("%d/%m/%Y").to_numpy()
+
+
+def formatar_numero(serie: pd.Series) -> Sequence[str]:
+    """Formata números reais com duas casas decimais.
+
+    Args:
+        serie (pd.Series): A fatia da coluna.
+
+    Returns:
+        Sequence[str]: Os valores formatados.
+    """
+    return serie.round(2).astype(str).to_numpy()
+
+
+def formatar_booleano(serie: pd.Series) -> Sequence[str]:
+    """Formata valores booleanos como 'Sim' ou 'Não'.
+
+    Args:
+        serie (pd.Series): A fatia da coluna.
+
+    Returns:
+        Sequence[str]: Os valores formatados.
+    """
+    return np.where(serie.to_numpy(dtype=bool), "Sim", "Não")
+
+
+def formatar_texto(serie: pd.Series) -> Sequence[str]:
+    """Formata qualquer valor com `str`.
+
+    Args:
+        serie (pd.Series): A fatia da coluna.
+
+    Returns:
+        Sequence[str]: Os valores formatados.
+    """
+    return serie.astype(str).to_numpy()
+
+
+def _formatador_padrao(serie: pd.Series) -> Formatador:
+    """Escolhe o formatador de uma coluna a partir do seu tipo.
+
+    Args:
+        serie (pd.Series): A coluna do DataFrame.
+
+    Returns:
+        Formatador: A função que formata as fatias da coluna.
+    """
+    if pd.api.types.is_bool_dtype(serie.dtype):
+        return formatar_booleano
+    if pd.api.types.is_float_dtype(serie.dtype):
+        return formatar_numero
+    if pd.api.types.is_datetime64_any_dtype(serie.dtype):
+        return formatar_data
+    return formatar_texto
+
+
+class LinhasDaTabela:
+    """Fornece as linhas formatadas de um DataFrame, uma fatia por vez.
+
+    Nenhuma cópia do DataFrame é feita: cada fatia é formatada a partir das colunas
+    originais apenas quando é pedida.
+
+    Attributes:
+        cabecalho (List[str]): Os nomes das colunas.
+    """
+    def __init__(self, df: pd.DataFrame, formatadores: Optional[Dict[str, Formatador]] = None):
+        """Inicializa a classe LinhasDaTabela.
+
+        Args:
+            df (pd.DataFrame): O DataFrame com os dados da tabela.
+            formatadores (Optional[Dict[str, Formatador]]): Formatadores por coluna,
+                que substituem o formatador padrão do tipo da coluna.
+        """
+        formatadores = formatadores or {}
+        self._df = df
+        self.cabecalho: List[str] = [str(coluna) for coluna in df.columns]
+        self._formatadores = [
+            formatadores.get(coluna) or _formatador_padrao(df[coluna]) for coluna in df.columns
+        ]
+
+    def __len__(self) -> int:
+        """Retorna a quantidade de linhas de dados (sem o cabeçalho)."""
+        return len(self._df)
+
+    def fatia(self, inicio: int, fim: int) -> List[tuple]:
+        """Formata as linhas no intervalo `[inicio, fim)`.
+
+        Args:
+            inicio (int): A posição da primeira linha.
+            fim (int): A posição seguinte à última linha.
+
+        Returns:
+            List[tuple]: As linhas formatadas, uma tupla de textos por linha.
+        """
+        colunas = [
+            formatar(self._df.iloc[inicio:fim, i])
+            for i, formatar in enumerate(self._formatadores)
+        ]
+        return list(zip(*colunas))
+
+
+class BlocoDaTabela(Flowable):
+    """Um bloco (página) da tabela de frequência, montado só na hora de desenhar.
+
+    O `Table` do reportlab com as linhas do bloco é criado quando o bloco é medido e
+    descartado logo depois de desenhado, então apenas uma página de linhas fica em
+    memória de cada vez.
+    """
+    def __init__(self, linhas: LinhasDaTabela, inicio: int, fim: int, larguras: List[float],
+                 altura_da_linha: float, estilo: TableStyle):
+        """Inicializa a classe BlocoDaTabela.
+
+        Args:
+            linhas (LinhasDaTabela): A fonte das linhas da tabela.
+            inicio (int): A posição da primeira linha do bloco.
+            fim (int): A posição seguinte à última linha do bloco.
+            larguras (List[float]): A largura de cada coluna, em pontos.
+            altura_da_linha (float): A altura de cada linha, em pontos.
+            estilo (TableStyle): O estilo da tabela.
+        """
+        super().__init__()
+        self.hAlign = "CENTER"
+        self._linhas = linhas
+        self._inicio = inicio
+        self._fim = fim
+        self._larguras = larguras
+        self._altura_da_linha = altura_da_linha
+        self._estilo = estilo
+        self._tabela: Optional[Table] = None
+
+    def _montar(self) -> Table:
+        """Cria (uma única vez) o `Table` com as linhas do bloco."""
+        if self._tabela is None:
+            self._tabela = Table(
+                [self._linhas.cabecalho] + self._linhas.fatia(self._inicio, self._fim),
+                colWidths=self._larguras,
+                rowHeights=self._altura_da_linha,
+                repeatRows=1,
+                style=self._estilo
+            )
+        return self._tabela
+
+    def wrap(self, availWidth: float, availHeight: float):
+        """Mede o bloco, montando a sua tabela se necessário."""
+        self.width, self.height = self._montar().wrap(availWidth, availHeight)
+        return self.width, self.height
+
+    def split(self, availWidth: float, availHeight: float) -> list:
+        """Divide o bloco quando ele não cabe no espaço restante da página."""
+        partes = self._montar().split(availWidth, availHeight)
+        self._tabela = None
+        return partes
+
+    def draw(self):
+        """Desenha o bloco e descarta a sua tabela."""
+        self._montar().drawOn(self.canv, 0, 0)
+        self._tabela = None
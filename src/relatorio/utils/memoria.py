@@ -0,0 +1,182 @@
+"""
+Módulo com as peças que limitam a memória usada na geração de relatórios grandes.
+
+O reportlab guarda todas as páginas do documento até o fim (`canvas.save`), e o
+conteúdo de cada página fica sem compressão até lá: em uma turma com milhares de
+páginas, é isso que faz a memória crescer. Este módulo ataca o problema em três
+frentes:
+
+- `CanvasCompacto`: comprime o conteúdo de cada página assim que ela termina, com os
+  mesmos filtros que o reportlab usaria ao salvar (o PDF gerado é o mesmo).
+- `HistoriaSobDemanda`: a "história" do documento é consumida aos poucos; os
+  elementos de cada página são criados só quando o reportlab chega até eles e
+  descartados depois de diagramados.
+- `LIMITE_RSS_MB`: a memória do processo é conferida a cada página e, se passar do
+  limite, a geração é interrompida com `LimiteDeMemoriaExcedidoError` em vez de
+  levar a máquina a usar swap.
+
+Developer's Note:
+    A memória que ainda cresce com o tamanho da turma é a das páginas já
+    comprimidas (e, no modo em memória, a do próprio PDF). Para conferir o efeito
+    de uma mudança aqui, use `python -m benchmarks.bench_memoria`.
+"""
+
+import gc
+import sys
+from collections import deque
+from typing import Iterable, Optional
+from reportlab import rl_config
+from reportlab.pdfbase.pdfdoc import PDFArray, PDFBase85Encode, PDFName, PDFStream, PDFZCompress
+from reportlab.pdfgen.canvas import Canvas
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+class LimiteDeMemoriaExcedidoError(MemoryError):
+    """Indica que a geração do relatório passou do limite de memória configurado."""
+
+
+def rss_atual() -> Optional[int]:
+    """Retorna a memória (RSS) usada pelo processo, em bytes.
+
+    No Linux, é a memória atual. Em outros sistemas Unix, é o pico de memória do
+    processo (uma estimativa conservadora). No Windows, não é medida.
+
+    Returns:
+        Optional[int]: A memória em bytes, ou `None` se não for possível medi-la.
+    """
+    try:
+        with open("/proc/self/statm", encoding="ascii") as f:
+            return int(f.read().split()[1]) * _TAMANHO_DA_PAGINA
+    except (OSError, ValueError, IndexError):
+        pass
+    if resource is None:
+        return None
+    multiplicador = 1 if sys.platform == "darwin" else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * multiplicador
+
+
+_TAMANHO_DA_PAGINA = resource.getpagesize() if resource is not None else 4096
+
+
+class CanvasCompacto(Canvas):
+    """Um `Canvas` que comprime cada página assim que ela é concluída.
+
+    Também confere a memória do processo ao fim de cada página, se um limite for
+    informado. Use com `functools.partial` como `canvasmaker` de `doc.build`.
+    """
+    def __init__(self, *args, limite_rss: Optional[int] = None, ascii85: Optional[bool] = None, **kwargs):
+        """Inicializa a classe CanvasCompacto.
+
+        Args:
+            *args: Os argumentos de `Canvas`.
+            limite_rss (Optional[int]): A memória máxima do processo, em bytes. Se
+                omitido, a memória não é conferida.
+            ascii85 (Optional[bool]): Se o conteúdo comprimido das páginas também é
+                codificado em ASCII85 (texto puro, cerca de 25% maior). Se omitido,
+                segue o padrão do reportlab (`rl_config.useA85`).
+            **kwargs: Os argumentos nomeados de `Canvas`.
+        """
+        super().__init__(*args, **kwargs)
+        self._limite_rss = limite_rss
+        self._ascii85 = rl_config.useA85 if ascii85 is None else ascii85
+
+    def showPage(self):
+        """Conclui a página atual, comprime o seu conteúdo e confere a memória."""
+        super().showPage()
+        paginas = self._doc.Pages.pages
+        if paginas and self._pageCompression:
+            _comprimir(paginas[-1], self._ascii85)
+        if self._limite_rss:
+            self._conferir_memoria()
+
+    def _conferir_memoria(self):
+        """Interrompe a geração se a memória do processo passar do limite.
+
+        Raises:
+            LimiteDeMemoriaExcedidoError: Se a memória continuar acima do limite
+                mesmo depois de uma coleta de lixo.
+        """
+        rss = rss_atual()
+        if rss is None or rss <= self._limite_rss:
+            return
+        gc.collect()
+        rss = rss_atual()
+        if rss > self._limite_rss:
+            raise LimiteDeMemoriaExcedidoError(
+                f"A geração do relatório passou do limite de memória na página "
+                f"{self.getPageNumber() - 1}: {rss / 2**20:.0f} MB de {self._limite_rss / 2**20:.0f} MB."
+            )
+
+
+def _comprimir(pagina, ascii85: bool):
+    """Substitui o conteúdo de uma página pela sua versão já comprimida.
+
+    Args:
+        pagina (PDFPage): A página recém-concluída.
+        ascii85 (bool): Se o conteúdo comprimido também é codificado em ASCII85.
+    """
+    if pagina.Contents or not pagina.stream:
+        return
+    # Os mesmos filtros, na mesma ordem, que `PDFPage.check_format` usaria ao salvar.
+    filtros = [PDFBase85Encode, PDFZCompress] if ascii85 else [PDFZCompress]
+    conteudo = pagina.stream
+    for filtro in reversed(filtros):
+        conteudo = filtro.encode(conteudo)
+    fluxo = PDFStream(content=conteudo)
+    # Com os filtros já aplicados, `PDFStream.format` não os aplica de novo.
+    fluxo.dictionary["Filter"] = PDFArray([PDFName(filtro.pdfname) for filtro in filtros])
+    fluxo.__Comment__ = "page stream"
+    pagina.Contents = fluxo
+    pagina.stream = None
+
+
+class HistoriaSobDemanda(list):
+    """A "história" de um documento, com elementos produzidos sob demanda.
+
+    `extend` não consome o iterável recebido: ele é guardado e os seus elementos só
+    são puxados quando a lista fica vazia, ou seja, quando o reportlab terminou de
+    diagramar tudo o que veio antes. Como o reportlab remove cada elemento da lista
+    ao diagramá-lo, apenas os elementos da página atual ficam em memória.
+
+    Developer's Note:
+        A classe depende de como `SimpleDocTemplate.build` percorre a história: ele
+        consulta `len()` antes de cada elemento e o remove da lista ao diagramá-lo.
+        Esse comportamento é conferido em `tests/test_memoria.py`; ao atualizar o
+        reportlab, rode esses testes. Como só o elemento atual está na lista,
+        `keepWithNext` não tem efeito nos elementos da história.
+    """
+    def __init__(self, elementos: Iterable = ()):
+        """Inicializa a classe HistoriaSobDemanda.
+
+        Args:
+            elementos (Iterable): Os primeiros elementos da história.
+        """
+        super().__init__()
+        self._pendentes = deque()
+        self.extend(elementos)
+
+    def extend(self, elementos: Iterable):
+        """Acrescenta elementos ao fim da história, sem consumi-los ainda.
+
+        Args:
+            elementos (Iterable): Os elementos a acrescentar.
+        """
+        self._pendentes.append(iter(elementos))
+
+    def __len__(self) -> int:
+        """Retorna a quantidade de elementos prontos, puxando o próximo se não houver."""
+        if not super().__len__():
+            self._puxar()
+        return super().__len__()
+
+    def _puxar(self):
+        """Puxa o próximo elemento dos iteráveis pendentes, se houver."""
+        while self._pendentes:
+            for elemento in self._pendentes[0]:
+                self.append(elemento)
+                return
+            self._pendentes.popleft()
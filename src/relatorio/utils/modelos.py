@@ -0,0 +1,75 @@
+"""
+Módulo com os modelos das páginas fixas do relatório (capa e descrição).
+
+Essas páginas têm sempre o mesmo texto; só a data da capa muda. Para não refazer,
+a cada relatório, a análise do texto e a quebra de linhas dos seus parágrafos, cada
+parágrafo fixo é preparado uma única vez por processo e reaproveitado como modelo.
+Cada relatório recebe uma cópia rasa do modelo, que compartilha com ele o
+dicionário das linhas já quebradas (veja `ParagrafoPreQuebrado`), e apenas a data é
+criada de novo.
+
+Developer's Note:
+    Os modelos são identificados pelo texto, pelo nome do estilo e pela versão dos
+    estilos (`VERSAO_DOS_ESTILOS`, em `mystyles.py`). Alterar o texto já gera um novo
+    modelo; ao alterar um estilo, incremente `VERSAO_DOS_ESTILOS`.
+"""
+
+import copy
+from functools import lru_cache
+from reportlab.platypus import Paragraph
+from src.relatorio.utils.mystyles import get_styles, VERSAO_DOS_ESTILOS
+
+
+class ParagrafoPreQuebrado(Paragraph):
+    """Parágrafo que reaproveita as linhas quebradas de cada largura já medida.
+
+    As linhas quebradas (`blPara`) ficam em um dicionário, por largura disponível,
+    criado junto com o modelo. As cópias rasas do modelo compartilham esse mesmo
+    dicionário, então a quebra de linhas de uma largura é calculada uma única vez
+    por processo, qualquer que seja a cópia medida primeiro.
+    """
+    def __init__(self, *args, **kwargs):
+        """Inicializa o parágrafo e o seu dicionário de quebras de linha."""
+        super().__init__(*args, **kwargs)
+        # Largura disponível -> (blPara, _wrapWidths, width, height)
+        self._quebras = {}
+
+    def wrap(self, availWidth: float, availHeight: float):
+        """Mede o parágrafo, reaproveitando a quebra de linhas se a largura já foi medida."""
+        quebra = self._quebras.get(availWidth)
+        if quebra is None:
+            medida = super().wrap(availWidth, availHeight)
+            if hasattr(self, "blPara"):
+                self._quebras[availWidth] = (self.blPara, self._wrapWidths, self.width, self.height)
+            return medida
+        self.blPara, self._wrapWidths, self.width, self.height = quebra
+        return self.width, self.height
+
+
+def paragrafo_fixo(texto: str, nome_do_estilo: str) -> ParagrafoPreQuebrado:
+    """Retorna uma cópia do modelo de um parágrafo de texto fixo.
+
+    Args:
+        texto (str): O texto do parágrafo.
+        nome_do_estilo (str): O nome do estilo na folha de `get_styles`.
+
+    Returns:
+        ParagrafoPreQuebrado: Uma cópia rasa do modelo, pronta para ser usada na
+            "história" de um relatório.
+    """
+    return copy.copy(_modelo_do_paragrafo(texto, nome_do_estilo, VERSAO_DOS_ESTILOS))
+
+
+@lru_cache(maxsize=32)
+def _modelo_do_paragrafo(texto: str, nome_do_estilo: str, versao_dos_estilos: int) -> ParagrafoPreQuebrado:
+    """Cria (uma vez por processo) o modelo de um parágrafo fixo.
+
+    Args:
+        texto (str): O texto do parágrafo.
+        nome_do_estilo (str): O nome do estilo na folha de `get_styles`.
+        versao_dos_estilos (int): A versão dos estilos, usada apenas como parte da chave.
+
+    Returns:
+        ParagrafoPreQuebrado: O modelo do parágrafo.
+    """
+    return ParagrafoPreQuebrado(texto, get_styles()[nome_do_estilo])
@@ -3,13 +3,96 @@ Módulo para definir e customizar os estilos de parágrafo usados no relatório
 
 Este módulo utiliza a biblioteca reportlab para criar e configurar estilos como
 título, corpo de texto, etc., garantindo uma formatação consistente no documento.
+
+A folha de estilos e as métricas das fontes são preparadas uma única vez por
+processo e compartilhadas por todos os relatórios gerados nele (ex: no modo em
+lote), por isso a folha devolvida por `get_styles` não pode ser alterada: ela não
+aceita novos estilos e entrega uma cópia de cada estilo consultado.
 """
 
+import copy
+from functools import lru_cache
+from types import MappingProxyType
+
 from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet, StyleSheet1
 from reportlab.lib.enums import TA_CENTER, TA_LEFT
+from reportlab.lib import colors
+from reportlab.pdfbase import pdfmetrics
+from reportlab.platypus import TableStyle
+
+# Versão dos estilos. Incremente ao alterar qualquer estilo deste módulo, para que
+# os modelos de página já preparados (veja `modelos.py`) sejam refeitos.
+VERSAO_DOS_ESTILOS = 1
+
+# Fonte e medidas das células da tabela de frequência. A altura da linha é fixa
+# (tamanho da fonte + espaçamentos), para que o reportlab não precise medir as células.
+FONTE_DA_TABELA = "Helvetica"
+FONTE_DO_CABECALHO = "Helvetica-Bold"
+TAMANHO_DA_FONTE_DA_TABELA = 10
+ESPACAMENTO_DA_CELULA = 3
+ALTURA_DA_LINHA = TAMANHO_DA_FONTE_DA_TABELA * 1.2 + 2 * ESPACAMENTO_DA_CELULA
+
+# Fontes usadas no relatório, cujas métricas são carregadas antecipadamente.
+FONTES_DO_RELATORIO = ("Times-Roman", FONTE_DA_TABELA, FONTE_DO_CABECALHO)
 
+
+class FolhaDeEstilosCongelada(StyleSheet1):
+    """Folha de estilos compartilhada, que não aceita novos estilos nem alterações.
+
+    Cada consulta (`folha[nome]`, `folha.get(nome)` ou `folha.nome`) devolve uma
+    cópia do estilo, então alterar o estilo recebido (ex: `estilo.fontSize = 14`)
+    afeta apenas quem o alterou, e nunca os demais relatórios do processo.
+
+    Developer's Note:
+        Os estilos originais ficam em `byName`/`byAlias`, que são somente leitura.
+        Para uma variação permanente de um estilo, crie-a em `_criar_folha`; para uma
+        variação local, altere a cópia recebida ou crie um novo `ParagraphStyle` com
+        `parent=...`.
+    """
+    _congelada = False
+
+    def __getitem__(self, key):
+        """Devolve uma cópia do estilo, que pode ser alterada sem afetar a folha."""
+        return copy.copy(super().__getitem__(key))
+
+    def add(self, style, alias=None):
+        """Impede a inclusão de estilos depois que a folha foi congelada."""
+        if self._congelada:
+            raise TypeError(
+                "A folha de estilos compartilhada não pode ser alterada. "
+                "Adicione o estilo em `_criar_folha` (mystyles.py)."
+            )
+        super().add(style, alias)
+
+
+@lru_cache(maxsize=None)
 def get_styles() -> StyleSheet1:
-    """Cria e retorna uma folha de estilos customizada para o relatório.
+    """Retorna a folha de estilos customizada do relatório, criada uma vez por processo.
+
+    Chamadas seguintes devolvem a mesma folha (congelada), então gerar vários
+    relatórios no mesmo processo não repete a preparação dos estilos e das fontes.
+
+    Returns:
+        StyleSheet1: Um objeto contendo todos os estilos de parágrafo configurados.
+    """
+    registrar_fontes()
+    return _criar_folha()
+
+
+@lru_cache(maxsize=None)
+def registrar_fontes() -> None:
+    """Carrega, uma vez por processo, as métricas das fontes usadas no relatório.
+
+    O reportlab guarda as fontes carregadas em um registro global; carregá-las aqui
+    tira esse custo (e a sua primeira medição de texto) de dentro da montagem do PDF.
+    """
+    for nome in FONTES_DO_RELATORIO:
+        pdfmetrics.getFont(nome)
+        pdfmetrics.stringWidth("0", nome, TAMANHO_DA_FONTE_DA_TABELA)
+
+
+def _criar_folha() -> FolhaDeEstilosCongelada:
+    """Cria a folha de estilos customizada para o relatório.
 
     Developer's Note:
         Para adicionar um novo estilo de parágrafo, siga estes passos:
@@ -18,13 +101,13 @@ def get_styles() -> StyleSheet1:
            (`titulo_central`, `corpo_do_texto`, etc.).
         2. Na nova função, configure as propriedades do estilo (ex: `name`, `fontName`,
            `fontSize`, `alignment`).
-        3. Dentro da função `get_styles`, chame sua nova função para criar o estilo
+        3. Dentro da função `_criar_folha`, chame sua nova função para criar o estilo
            e adicione-o à folha de estilos com `my_styles.add(...)`.
         4. Agora você pode usar o novo estilo no `gerar_relatorio.py` referenciando-o
            pelo nome (ex: `self.styles['meu-novo-estilo']`).
 
     Returns:
-        StyleSheet1: Um objeto contendo todos os estilos de parágrafo configurados.
+        FolhaDeEstilosCongelada: Um objeto contendo todos os estilos de parágrafo configurados.
     """
     my_styles = getSampleStyleSheet()
     _setup_styles_global(my_styles)
@@ -33,8 +116,13 @@ def get_styles() -> StyleSheet1:
     my_styles.add(titulo_central_negrito(my_styles))
     my_styles.add(titulo_central(my_styles))
     my_styles.add(corpo_do_texto(my_styles))
-    
-    return my_styles
+
+    # Copia os estilos para uma folha que não aceita alterações
+    congelada = FolhaDeEstilosCongelada()
+    congelada.byName = MappingProxyType(dict(my_styles.byName))
+    congelada.byAlias = MappingProxyType(dict(my_styles.byAlias))
+    congelada._congelada = True
+    return congelada
 
 def _setup_styles_global(styles: StyleSheet1):
     """Configura as propriedades globais dos estilos.
@@ -92,4 +180,22 @@ def corpo_do_texto(styles: StyleSheet1) -> ParagraphStyle:
         name="corpo-do-texto",
         parent=styles['Normal'],
         alignment=TA_LEFT
-    )
\ No newline at end of file
+    )
+
+@lru_cache(maxsize=None)
+def estilo_da_tabela() -> TableStyle:
+    """Cria (uma vez por processo) o estilo da tabela de frequência.
+
+    A primeira linha (cabeçalho) é repetida no topo de cada página da tabela, por
+    isso recebe um destaque próprio.
+
+    Returns:
+        TableStyle: O estilo de tabela configurado.
+    """
+    return TableStyle([
+        ('FONT', (0, 0), (-1, -1), FONTE_DA_TABELA, TAMANHO_DA_FONTE_DA_TABELA),
+        ('FONT', (0, 0), (-1, 0), FONTE_DO_CABECALHO, TAMANHO_DA_FONTE_DA_TABELA),
+        ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
+        ('GRID', (0, 0), (-1, -1), 0.25, colors.grey),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ])
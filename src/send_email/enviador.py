@@ -0,0 +1,319 @@
+"""
+Este módulo implementa um enviador de e-mails reutilizável, com uma sessão por
+processo e envios concorrentes.
+
+O `EnviadorDeEmails` mantém o transporte (a conexão com o Gmail ou com um servidor
+SMTP) aberto entre os envios, envia várias mensagens com concorrência limitada e
+repete, com espera exponencial, os envios recusados por limite de taxa.
+
+Developer's Note:
+    Um transporte é qualquer objeto com o método `enviar(mensagem: EmailMessage)`.
+    Ao receber uma recusa por limite de taxa, ele deve lançar `LimiteDeEnvioError`,
+    que é o único erro repetido pelo enviador. Estão disponíveis:
+    - `TransporteGmail`: usa as credenciais OAuth do `BotGmailPlugin` (padrão).
+    - `TransporteSMTP`: um servidor SMTP, ex: um servidor local de testes
+      (`python -m aiosmtpd -n -l localhost:1025`).
+    - `TransporteFalso`: guarda as mensagens em memória, para medir a vazão sem rede.
+"""
+
+import base64
+import mimetypes
+import os
+import random
+import smtplib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from email.message import EmailMessage
+from typing import TYPE_CHECKING, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from botcity.plugins.gmail import BotGmailPlugin
+
+# Códigos SMTP que indicam recusa temporária (ex: limite de envios).
+_CODIGOS_SMTP_TEMPORARIOS = (421, 450, 451, 452)
+# Motivos da API do Gmail que indicam limite de taxa.
+_MOTIVOS_DE_LIMITE_GMAIL = ("rateLimitExceeded", "userRateLimitExceeded")
+
+
+class LimiteDeEnvioError(Exception):
+    """Indica que o servidor de e-mail recusou o envio por limite de taxa."""
+
+
+@dataclass(frozen=True)
+class Anexo:
+    """Um arquivo anexado ao e-mail, em memória ou em disco.
+
+    Attributes:
+        nome (str): O nome do arquivo no e-mail.
+        conteudo (Optional[bytes]): O conteúdo do arquivo, se estiver em memória.
+        caminho (Optional[str]): O caminho do arquivo, se estiver em disco.
+    """
+    nome: str
+    conteudo: Optional[bytes] = None
+    caminho: Optional[str] = None
+
+    def ler(self) -> bytes:
+        """Retorna o conteúdo do anexo, lendo o arquivo se necessário."""
+        if self.conteudo is not None:
+            return self.conteudo
+        with open(self.caminho, "rb") as f:
+            return f.read()
+
+
+@dataclass(frozen=True)
+class MensagemDeEmail:
+    """Uma mensagem a ser enviada pelo `EnviadorDeEmails`.
+
+    Attributes:
+        destinatarios (Tuple[str, ...]): Os endereços dos destinatários.
+        assunto (str): O assunto do e-mail.
+        corpo (str): O corpo do e-mail, em texto simples.
+        anexos (Tuple[Anexo, ...]): Os arquivos anexados.
+    """
+    destinatarios: Tuple[str, ...]
+    assunto: str
+    corpo: str
+    anexos: Tuple[Anexo, ...] = field(default_factory=tuple)
+
+
+class TransporteGmail:
+    """Envia mensagens pela API do Gmail, com as credenciais do `BotGmailPlugin`.
+
+    As credenciais são lidas uma única vez e renovadas apenas quando expiram. Cada
+    thread usa o seu próprio cliente HTTP da API, pois ele não pode ser compartilhado
+    entre threads.
+    """
+    def __init__(self, path_to_credentials: str, email_pessoal: str):
+        """Inicializa a classe TransporteGmail.
+
+        Args:
+            path_to_credentials (str): O caminho das credenciais OAuth do Google.
+            email_pessoal (str): O endereço de e-mail autenticado.
+        """
+        self._path_to_credentials = path_to_credentials
+        self._email_pessoal = email_pessoal
+        self._plugin: Optional["BotGmailPlugin"] = None
+        self._trava = threading.Lock()
+        self._local = threading.local()
+
+    def enviar(self, mensagem: EmailMessage):
+        """Envia uma mensagem pela API do Gmail.
+
+        Args:
+            mensagem (EmailMessage): A mensagem já montada.
+
+        Raises:
+            LimiteDeEnvioError: Se a API recusar o envio por limite de taxa.
+        """
+        from googleapiclient.errors import HttpError
+
+        raw = base64.urlsafe_b64encode(mensagem.as_bytes()).decode()
+        try:
+            self._servico().users().messages().send(userId="me", body={"raw": raw}).execute()
+        except HttpError as e:
+            motivo = str(getattr(e, "reason", "")) + str(getattr(e, "error_details", ""))
+            if e.resp.status == 429 or (
+                e.resp.status == 403 and any(m in motivo for m in _MOTIVOS_DE_LIMITE_GMAIL)
+            ):
+                raise LimiteDeEnvioError(str(e)) from e
+            raise
+
+    def _servico(self):
+        """Retorna o cliente da API do Gmail da thread atual, com credenciais válidas."""
+        # Importados só aqui: o plugin e o cliente do Google levam boa parte do tempo
+        # de inicialização do bot e não são usados pelos outros transportes.
+        from botcity.plugins.gmail import BotGmailPlugin
+        from google.auth.transport.requests import Request
+        from googleapiclient.discovery import build
+
+        with self._trava:
+            if self._plugin is None:
+                self._plugin = BotGmailPlugin(self._path_to_credentials, self._email_pessoal)
+            credenciais = self._plugin.creds
+            if not credenciais.valid and credenciais.refresh_token:
+                credenciais.refresh(Request())
+
+        if getattr(self._local, "servico", None) is None:
+            self._local.servico = build("gmail", "v1", credentials=credenciais, cache_discovery=False)
+        return self._local.servico
+
+
+class TransporteSMTP:
+    """Envia mensagens por um servidor SMTP, mantendo uma conexão aberta por thread."""
+    def __init__(self, host: str, porta: int, usuario: Optional[str] = None,
+                 senha: Optional[str] = None, usar_tls: bool = False):
+        """Inicializa a classe TransporteSMTP.
+
+        Args:
+            host (str): O endereço do servidor SMTP.
+            porta (int): A porta do servidor SMTP.
+            usuario (Optional[str]): O usuário para autenticação, se necessário.
+            senha (Optional[str]): A senha para autenticação, se necessário.
+            usar_tls (bool): Se verdadeiro, inicia TLS (STARTTLS) ao conectar.
+        """
+        self._host = host
+        self._porta = porta
+        self._usuario = usuario
+        self._senha = senha
+        self._usar_tls = usar_tls
+        self._local = threading.local()
+
+    def enviar(self, mensagem: EmailMessage):
+        """Envia uma mensagem pelo servidor SMTP, reconectando se necessário.
+
+        Args:
+            mensagem (EmailMessage): A mensagem já montada.
+
+        Raises:
+            LimiteDeEnvioError: Se o servidor recusar o envio temporariamente.
+        """
+        try:
+            try:
+                self._conexao().send_message(mensagem)
+            except smtplib.SMTPServerDisconnected:
+                self._local.conexao = None
+                self._conexao().send_message(mensagem)
+        except smtplib.SMTPResponseException as e:
+            if e.smtp_code in _CODIGOS_SMTP_TEMPORARIOS:
+                raise LimiteDeEnvioError(str(e)) from e
+            raise
+
+    def _conexao(self) -> smtplib.SMTP:
+        """Retorna a conexão SMTP da thread atual, abrindo-a se necessário."""
+        if getattr(self._local, "conexao", None) is None:
+            conexao = smtplib.SMTP(self._host, self._porta)
+            if self._usar_tls:
+                conexao.starttls()
+            if self._usuario:
+                conexao.login(self._usuario, self._senha)
+            self._local.conexao = conexao
+        return self._local.conexao
+
+
+class TransporteFalso:
+    """Guarda as mensagens em memória em vez de enviá-las.
+
+    Útil para medir a vazão do envio sem rede. Pode simular a latência do servidor e
+    recusas por limite de taxa.
+
+    Attributes:
+        enviadas (List[EmailMessage]): As mensagens "enviadas", em ordem de chegada.
+    """
+    def __init__(self, latencia: float = 0.0, recusas_por_limite: int = 0):
+        """Inicializa a classe TransporteFalso.
+
+        Args:
+            latencia (float): O tempo, em segundos, simulado para cada envio.
+            recusas_por_limite (int): Quantos envios iniciais são recusados com
+                `LimiteDeEnvioError`.
+        """
+        self.enviadas: List[EmailMessage] = []
+        self._latencia = latencia
+        self._recusas_restantes = recusas_por_limite
+        self._trava = threading.Lock()
+
+    def enviar(self, mensagem: EmailMessage):
+        """Registra a mensagem (ou simula uma recusa por limite de taxa).
+
+        Args:
+            mensagem (EmailMessage): A mensagem já montada.
+        """
+        time.sleep(self._latencia)
+        with self._trava:
+            if self._recusas_restantes > 0:
+                self._recusas_restantes -= 1
+                raise LimiteDeEnvioError("Limite de envio simulado")
+            self.enviadas.append(mensagem)
+
+
+class EnviadorDeEmails:
+    """Envia mensagens por um transporte, com concorrência limitada e novas tentativas.
+
+    Attributes:
+        transporte: O transporte usado para enviar as mensagens.
+        remetente (str): O endereço de e-mail do remetente.
+    """
+    def __init__(self, transporte, remetente: str, max_concorrencia: int = 4,
+                 tentativas: int = 5, espera_inicial: float = 1.0):
+        """Inicializa a classe EnviadorDeEmails.
+
+        Args:
+            transporte: O transporte usado para enviar as mensagens.
+            remetente (str): O endereço de e-mail do remetente.
+            max_concorrencia (int): A quantidade máxima de envios simultâneos.
+            tentativas (int): A quantidade máxima de tentativas por mensagem.
+            espera_inicial (float): A espera, em segundos, antes da segunda tentativa.
+                Ela dobra a cada nova tentativa.
+        """
+        self.transporte = transporte
+        self.remetente = remetente
+        self._max_concorrencia = max(max_concorrencia, 1)
+        self._tentativas = max(tentativas, 1)
+        self._espera_inicial = espera_inicial
+
+    def enviar(self, mensagem: MensagemDeEmail):
+        """Envia uma mensagem, repetindo o envio se houver recusa por limite de taxa.
+
+        Args:
+            mensagem (MensagemDeEmail): A mensagem a ser enviada.
+
+        Raises:
+            LimiteDeEnvioError: Se todas as tentativas forem recusadas.
+        """
+        montada = self._montar(mensagem)
+        for tentativa in range(self._tentativas):
+            try:
+                self.transporte.enviar(montada)
+                return
+            except LimiteDeEnvioError:
+                if tentativa == self._tentativas - 1:
+                    raise
+                # Espera exponencial com variação aleatória, para não sincronizar threads.
+                espera = self._espera_inicial * (2 ** tentativa)
+                time.sleep(espera * random.uniform(0.5, 1.5))
+
+    def enviar_varios(self, mensagens: List[MensagemDeEmail]) -> List[Optional[Exception]]:
+        """Envia várias mensagens na mesma sessão, com concorrência limitada.
+
+        Args:
+            mensagens (List[MensagemDeEmail]): As mensagens a serem enviadas.
+
+        Returns:
+            List[Optional[Exception]]: Para cada mensagem, na mesma ordem, `None` se
+                ela foi enviada ou a exceção que impediu o envio.
+        """
+        def enviar_uma(mensagem: MensagemDeEmail) -> Optional[Exception]:
+            try:
+                self.enviar(mensagem)
+            except Exception as e:
+                return e
+            return None
+
+        if len(mensagens) <= 1 or self._max_concorrencia == 1:
+            return [enviar_uma(mensagem) for mensagem in mensagens]
+        with ThreadPoolExecutor(max_workers=self._max_concorrencia) as executor:
+            return list(executor.map(enviar_uma, mensagens))
+
+    def _montar(self, mensagem: MensagemDeEmail) -> EmailMessage:
+        """Monta a mensagem MIME, com os anexos.
+
+        Args:
+            mensagem (MensagemDeEmail): A mensagem a ser montada.
+
+        Returns:
+            EmailMessage: A mensagem pronta para o transporte.
+        """
+        montada = EmailMessage()
+        montada["From"] = self.remetente
+        montada["To"] = ", ".join(mensagem.destinatarios)
+        montada["Subject"] = mensagem.assunto
+        montada.set_content(mensagem.corpo)
+        for anexo in mensagem.anexos:
+            tipo, _ = mimetypes.guess_type(anexo.nome)
+            principal, secundario = (tipo or "application/octet-stream").split("/", 1)
+            montada.add_attachment(
+                anexo.ler(), maintype=principal, subtype=secundario, filename=os.path.basename(anexo.nome)
+            )
+        return montada
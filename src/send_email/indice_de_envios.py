@@ -0,0 +1,148 @@
+"""
+Este módulo registra, em um banco SQLite local, quais relatórios cada destinatário
+já recebeu, para que o mesmo relatório não seja enviado de novo a quem já o tem.
+
+Cada relatório é identificado pela sua assinatura (veja `acervo.py`): o hash dos
+dados, do modelo e dos parâmetros que compõem o documento, sem a data da capa.
+Conforme `REENVIO_DE_RELATORIO`, um destinatário que já recebeu a mesma assinatura:
+
+- `enviar`: recebe o relatório de novo (o índice não é usado);
+- `pular`: não recebe nada;
+- `avisar`: recebe um e-mail curto, sem anexos, avisando que o relatório não mudou
+  desde o envio anterior.
+
+Developer's Note:
+    Um envio só é registrado depois que todas as mensagens do destinatário foram
+    aceitas pelo servidor, então uma falha no envio faz o relatório ser enviado de
+    novo na execução seguinte. Os avisos não são registrados: a data informada é
+    sempre a do último envio do relatório completo.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional, Sequence
+from settings import ConfiguracaoDaExecucao
+
+REENVIO_SEMPRE = "enviar"
+REENVIO_PULAR = "pular"
+REENVIO_AVISAR = "avisar"
+POLITICAS_DE_REENVIO = (REENVIO_SEMPRE, REENVIO_PULAR, REENVIO_AVISAR)
+# Por quantos dias um envio fica registrado.
+RETENCAO_EM_DIAS = 365
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS envios (
+    destinatario TEXT NOT NULL,
+    assinatura TEXT NOT NULL,
+    enviado_em REAL NOT NULL,
+    PRIMARY KEY (destinatario, assinatura)
+)
+"""
+
+# Índices já abertos neste processo, por caminho.
+_indices: Dict[str, "IndiceDeEnvios"] = {}
+_trava_dos_indices = threading.Lock()
+
+
+class IndiceDeEnvios:
+    """Registro dos relatórios já enviados a cada destinatário.
+
+    Attributes:
+        caminho (str): O caminho do banco SQLite.
+    """
+    def __init__(self, caminho: str):
+        """Inicializa a classe IndiceDeEnvios, criando o banco se não existir.
+
+        Args:
+            caminho (str): O caminho do banco SQLite.
+        """
+        self.caminho = caminho
+        diretorio = os.path.dirname(os.path.abspath(caminho))
+        os.makedirs(diretorio, exist_ok=True)
+        self._trava = threading.Lock()
+        self._banco = sqlite3.connect(caminho, check_same_thread=False, isolation_level=None, timeout=30)
+        self._banco.execute("PRAGMA journal_mode=WAL")
+        self._banco.execute("PRAGMA synchronous=NORMAL")
+        self._banco.execute(_ESQUEMA)
+
+    def enviados(self, destinatarios: Sequence[str], assinatura: str) -> Dict[str, float]:
+        """Informa quais destinatários já receberam um relatório.
+
+        Args:
+            destinatarios (Sequence[str]): Os endereços a consultar.
+            assinatura (str): A assinatura do relatório.
+
+        Returns:
+            Dict[str, float]: O horário (timestamp) do último envio, para cada
+                destinatário que já recebeu o relatório.
+        """
+        marcadores = ", ".join("?" for _ in destinatarios)
+        with self._trava:
+            linhas = self._banco.execute(
+                f"SELECT destinatario, enviado_em FROM envios "
+                f"WHERE assinatura = ? AND destinatario IN ({marcadores})",
+                (assinatura, *destinatarios)
+            ).fetchall()
+        return dict(linhas)
+
+    def registrar(self, destinatarios: Sequence[str], assinatura: str):
+        """Registra que os destinatários receberam um relatório agora.
+
+        Os registros mais antigos que `RETENCAO_EM_DIAS` são apagados.
+
+        Args:
+            destinatarios (Sequence[str]): Os endereços que receberam o relatório.
+            assinatura (str): A assinatura do relatório.
+        """
+        agora = time.time()
+        with self._trava:
+            self._banco.execute("BEGIN")
+            self._banco.executemany(
+                "INSERT OR REPLACE INTO envios (destinatario, assinatura, enviado_em) VALUES (?, ?, ?)",
+                [(destinatario, assinatura, agora) for destinatario in destinatarios]
+            )
+            self._banco.execute("DELETE FROM envios WHERE enviado_em < ?", (agora - RETENCAO_EM_DIAS * 86400,))
+            self._banco.execute("COMMIT")
+
+
+def politica_de_reenvio(config: ConfiguracaoDaExecucao) -> str:
+    """Retorna a política de reenvio configurada.
+
+    Args:
+        config (ConfiguracaoDaExecucao): A configuração da execução.
+
+    Returns:
+        str: Uma das políticas de `POLITICAS_DE_REENVIO`.
+
+    Raises:
+        ValueError: Se `REENVIO_DE_RELATORIO` não for uma política conhecida.
+    """
+    politica = (config.REENVIO_DE_RELATORIO or REENVIO_SEMPRE).strip().lower()
+    if politica not in POLITICAS_DE_REENVIO:
+        raise ValueError(
+            f"REENVIO_DE_RELATORIO inválido: {config.REENVIO_DE_RELATORIO}. Use {', '.join(POLITICAS_DE_REENVIO)}."
+        )
+    return politica
+
+
+def indice_da_execucao(config: ConfiguracaoDaExecucao) -> Optional[IndiceDeEnvios]:
+    """Retorna o índice de envios do processo, se a política de reenvio o usar.
+
+    O banco é aberto uma única vez por processo (o serviço de relatórios e o modo em
+    lote o reaproveitam entre os relatórios).
+
+    Args:
+        config (ConfiguracaoDaExecucao): A configuração da execução.
+
+    Returns:
+        Optional[IndiceDeEnvios]: O índice, ou `None` com a política `enviar`.
+    """
+    if politica_de_reenvio(config) == REENVIO_SEMPRE:
+        return None
+    caminho = os.path.abspath(config.PATH_TO_INDICE_DE_ENVIOS)
+    with _trava_dos_indices:
+        if caminho not in _indices:
+            _indices[caminho] = IndiceDeEnvios(caminho)
+        return _indices[caminho]
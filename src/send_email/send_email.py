@@ -1,55 +1,304 @@
 """
 Módulo para orquestrar o envio do e-mail com o relatório em anexo.
+
+O envio usa um `EnviadorDeEmails` (veja `enviador.py`) criado uma única vez por
+processo: as credenciais e a conexão são reaproveitadas por todos os envios, e as
+mensagens de um relatório (veja `enviar_partes`) são enviadas na mesma sessão.
+
+Cada destinatário recebe os formatos do relatório escolhidos para ele (veja
+`formatos_por_destinatario`): os destinatários com os mesmos formatos recebem o
+mesmo e-mail. Quem já recebeu o mesmo relatório pode ser pulado ou receber apenas
+um aviso (veja `indice_de_envios.py`).
 """
 
-from botcity.maestro import BotExecution
-from botcity.plugins.gmail import BotGmailPlugin
-from os.path import abspath
-import settings as s
+import re
+import threading
+import time
+from os.path import abspath, basename, splitext
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
+from src.send_email.enviador import (
+    Anexo, EnviadorDeEmails, MensagemDeEmail, TransporteFalso, TransporteGmail, TransporteSMTP
+)
+from src.send_email.indice_de_envios import REENVIO_AVISAR, indice_da_execucao, politica_de_reenvio
+from settings import ConfiguracaoDaExecucao
+
+if TYPE_CHECKING:
+    from src.relatorio.partes import ParteDoRelatorio
+
+# Enviadores já criados neste processo, por configuração.
+_enviadores: Dict[tuple, EnviadorDeEmails] = {}
+_trava_dos_enviadores = threading.Lock()
+
 
-def enviar_relatorio(execution: BotExecution):
+def enviar_relatorio(config: ConfiguracaoDaExecucao, path_to_output: Optional[str] = None,
+                     conteudo: Optional[bytes] = None):
     """Envia o relatório em PDF por e-mail.
 
-    Esta função obtém os parâmetros de automação, adquire uma instância autenticada
-    do plugin do Gmail e envia o e-mail com o relatório em anexo.
+    Esta função obtém os parâmetros de automação, adquire o enviador de e-mails do
+    processo (já autenticado) e envia o e-mail com o relatório em anexo.
 
     Developer's Note:
-        Para modificar o conteúdo do e-mail, altere as variáveis `subject` e `body_email`
-        nesta função. Para adicionar mais anexos, adicione o caminho absoluto do arquivo
-        à lista `anexo`. A lógica de autenticação (`BotGmailPlugin`)
-        também está aqui; certifique-se de que os parâmetros `PATH_TO_CREDENTIALS` e
-        `EMAIL_PESSOAL` estejam corretamente configurados no Maestro.
+        Para modificar o conteúdo do e-mail, altere a função `_mensagem_do_relatorio`.
+        Para adicionar mais anexos, adicione um `Anexo` à mensagem criada lá. A lógica
+        de autenticação está em `enviador.py`; certifique-se de que os parâmetros
+        `PATH_TO_CREDENTIALS` e `EMAIL_PESSOAL` estejam corretamente configurados no
+        Maestro.
+
+    Args:
+        config (ConfiguracaoDaExecucao): A configuração da execução.
+        path_to_output (Optional[str]): Caminho do PDF a ser anexado. Se omitido,
+            usa o parâmetro `PATH_TO_OUTPUT`.
+        conteudo (Optional[bytes]): O PDF já gerado em memória. Se informado, é
+            anexado direto, sem ler o arquivo de `path_to_output` (cujo nome é usado
+            apenas como nome do anexo).
+    """
+    enviador = obter_enviador(config)
+    enviador.enviar(_mensagem_do_relatorio(config, path_to_output, conteudo))
+
+    print("E-mail foi enviado com sucesso.")
+
+
+def enviar_partes(config: ConfiguracaoDaExecucao, partes: List["ParteDoRelatorio"],
+                  arquivos: Sequence["ParteDoRelatorio"] = (), assinatura: Optional[str] = None):
+    """Envia os anexos de um relatório (veja `partes.py`), um e-mail por parte do PDF.
+
+    Com mais de uma parte, o assunto de cada e-mail indica a parte ("parte 1 de 3")
+    e as partes são enviadas ao mesmo tempo, na mesma sessão. Os arquivos dos
+    demais formatos (veja `exportacao.py`) vão junto com a primeira parte, apenas
+    para os destinatários que os pediram. Os destinatários que já receberam o mesmo
+    relatório são tratados conforme `REENVIO_DE_RELATORIO` (veja
+    `indice_de_envios.py`).
+
+    Args:
+        config (ConfiguracaoDaExecucao): A configuração da execução.
+        partes (List[ParteDoRelatorio]): Os anexos do PDF do relatório.
+        arquivos (Sequence[ParteDoRelatorio]): Os arquivos dos demais formatos.
+        assinatura (Optional[str]): A assinatura do relatório (veja `acervo.py`).
+            Sem ela, o relatório é enviado a todos os destinatários.
+
+    Raises:
+        Exception: O erro da primeira mensagem que não pôde ser enviada, depois de
+            tentar enviar todas.
+    """
+    destinatarios = formatos_por_destinatario(config)
+    indice = indice_da_execucao(config) if assinatura is not None else None
+    recebidos = indice.enviados(list(destinatarios), assinatura) if indice is not None else {}
+
+    grupos: Dict[Tuple[str, ...], List[str]] = {}
+    avisos: Dict[str, List[str]] = {}
+    for destinatario, formatos in destinatarios.items():
+        if destinatario in recebidos:
+            # Avisos agrupados pela data do envio anterior, informada no e-mail.
+            if politica_de_reenvio(config) == REENVIO_AVISAR:
+                enviado_em = time.strftime("%d/%m/%Y", time.localtime(recebidos[destinatario]))
+                avisos.setdefault(enviado_em, []).append(destinatario)
+            continue
+        grupos.setdefault(formatos, []).append(destinatario)
+
+    mensagens = []
+    for formatos, destinatarios_do_grupo in grupos.items():
+        extras = tuple(_anexo(arquivo) for arquivo in arquivos if formato_do_arquivo(arquivo.nome) in formatos)
+        if "pdf" not in formatos:
+            if extras:
+                mensagens.append(_mensagem_com_anexos(config, extras, config.ASSUNTO_EMAIL, destinatarios_do_grupo))
+            continue
+        for parte in partes:
+            assunto = config.ASSUNTO_EMAIL
+            if parte.total > 1:
+                assunto += f" (parte {parte.numero} de {parte.total})"
+            anexos = (_anexo(parte),) + (extras if parte.numero == 1 else ())
+            mensagens.append(_mensagem_com_anexos(config, anexos, assunto, destinatarios_do_grupo))
+    # Os avisos vão por último, para não serem confundidos com os relatórios.
+    completas = len(mensagens)
+    for enviado_em, destinatarios_do_aviso in avisos.items():
+        mensagens.append(_mensagem_de_aviso(config, enviado_em, destinatarios_do_aviso))
+
+    erros: List[Optional[Exception]] = [None] * len(mensagens)
+    if len(mensagens) == 1:
+        obter_enviador(config).enviar(mensagens[0])
+    elif mensagens:
+        erros = obter_enviador(config).enviar_varios(mensagens)
+
+    if indice is not None:
+        # Só conta como recebido quem recebeu todas as mensagens do relatório.
+        falharam = {d for mensagem, erro in zip(mensagens, erros) if erro is not None for d in mensagem.destinatarios}
+        entregues = {d for mensagem in mensagens[:completas] for d in mensagem.destinatarios} - falharam
+        if entregues:
+            indice.registrar(sorted(entregues), assinatura)
+    for erro in erros:
+        if erro is not None:
+            raise erro
+
+    if recebidos:
+        print(f"{len(recebidos)} destinatário(s) já tinham recebido este relatório "
+              f"(REENVIO_DE_RELATORIO={politica_de_reenvio(config)}).")
+    if mensagens:
+        print(f"E-mail foi enviado com sucesso ({len(mensagens)} mensagem(ns)).")
+    else:
+        print("Nenhum e-mail enviado: todos os destinatários já tinham recebido este relatório.")
+
+
+def formatos_por_destinatario(config: ConfiguracaoDaExecucao) -> Dict[str, Tuple[str, ...]]:
+    """Lista os formatos do relatório que cada destinatário deve receber.
+
+    Os destinatários de `EMAIL_DESTINATARIO` recebem os formatos de
+    `FORMATOS_DO_RELATORIO`, exceto os listados em `FORMATOS_POR_DESTINATARIO`
+    (ex: "coordenacao@escola.com: pdf+xlsx; secretaria@escola.com: csv").
+
+    Args:
+        config (ConfiguracaoDaExecucao): A configuração da execução.
+
+    Returns:
+        Dict[str, Tuple[str, ...]]: Os formatos, em letras minúsculas, por
+            destinatário, na ordem de `EMAIL_DESTINATARIO`.
+
+    Raises:
+        ValueError: Se `FORMATOS_POR_DESTINATARIO` citar um endereço que não está
+            em `EMAIL_DESTINATARIO`, ou estiver mal formado.
+    """
+    destinatarios = _destinatarios(config)
+    padrao = _formatos(config.FORMATOS_DO_RELATORIO)
+    especificos = {}
+    for item in re.split(r"[,;]", config.FORMATOS_POR_DESTINATARIO or ""):
+        if not item.strip():
+            continue
+        endereco, separador, formatos = item.partition(":")
+        if not separador:
+            raise ValueError(f"FORMATOS_POR_DESTINATARIO: esperava 'endereço: formatos', recebeu {item.strip()!r}")
+        if endereco.strip() not in destinatarios:
+            raise ValueError(f"FORMATOS_POR_DESTINATARIO: {endereco.strip()} não está em EMAIL_DESTINATARIO")
+        especificos[endereco.strip()] = _formatos(formatos)
+    return {destinatario: especificos.get(destinatario, padrao) for destinatario in destinatarios}
+
+
+def formato_do_arquivo(nome: str) -> str:
+    """Retorna o formato de um arquivo exportado pela sua extensão (ex: "xlsx")."""
+    return splitext(nome)[1].lstrip(".").lower()
+
+
+def obter_enviador(config: ConfiguracaoDaExecucao) -> EnviadorDeEmails:
+    """Retorna o enviador de e-mails do processo, criando-o no primeiro uso.
 
     Args:
-        execution (BotExecution): O objeto de execução da tarefa do Maestro.
+        config (ConfiguracaoDaExecucao): A configuração da execução.
+
+    Returns:
+        EnviadorDeEmails: O enviador configurado pelos parâmetros da automação.
+    """
+    EMAIL_PESSOAL = config.EMAIL_PESSOAL
+    EMAIL_TRANSPORTE = config.EMAIL_TRANSPORTE.lower()
+    PATH_TO_CREDENTIALS = config.PATH_TO_CREDENTIALS
+    SMTP_HOST = config.SMTP_HOST
+    SMTP_PORTA = config.SMTP_PORTA
+    chave = (EMAIL_TRANSPORTE, EMAIL_PESSOAL, PATH_TO_CREDENTIALS, SMTP_HOST, SMTP_PORTA)
+
+    with _trava_dos_enviadores:
+        if chave not in _enviadores:
+            if EMAIL_TRANSPORTE == "smtp":
+                transporte = TransporteSMTP(SMTP_HOST, SMTP_PORTA)
+            elif EMAIL_TRANSPORTE == "falso":
+                transporte = TransporteFalso()
+            else:
+                transporte = TransporteGmail(PATH_TO_CREDENTIALS, EMAIL_PESSOAL)
+            _enviadores[chave] = EnviadorDeEmails(
+                transporte,
+                EMAIL_PESSOAL,
+                max_concorrencia=config.EMAIL_MAX_CONCORRENCIA,
+                tentativas=config.EMAIL_TENTATIVAS
+            )
+        return _enviadores[chave]
+
+
+def _mensagem_do_relatorio(config: ConfiguracaoDaExecucao, path_to_output: Optional[str],
+                           conteudo: Optional[bytes]) -> MensagemDeEmail:
+    """Cria a mensagem de e-mail de um relatório.
+
+    Args:
+        config (ConfiguracaoDaExecucao): A configuração da execução.
+        path_to_output (Optional[str]): Caminho do PDF. Se omitido, usa o parâmetro
+            `PATH_TO_OUTPUT`.
+        conteudo (Optional[bytes]): O PDF em memória, se houver.
+
+    Returns:
+        MensagemDeEmail: A mensagem com o relatório em anexo.
     """
-    
     # Obtém os parâmetros da automação
-    EMAIL_PESSOAL = s.EMAIL_PESSOAL.get_value_as_str(execution)
-    EMAIL_DESTINATARIO = s.EMAIL_DESTINATARIO.get_value_as_str(execution)
-    ASSUNTO_EMAIL = s.ASSUNTO_EMAIL.get_value_as_str(execution)
-    PATH_TO_OUTPUT = s.PATH_TO_OUTPUT.get_value_as_str(execution)
-    PATH_TO_CREDENTIALS = s.PATH_TO_CREDENTIALS.get_value_as_str(execution)
+    PATH_TO_OUTPUT = path_to_output or config.PATH_TO_OUTPUT
+
+    if conteudo is not None:
+        anexo = Anexo(basename(PATH_TO_OUTPUT), conteudo=conteudo)
+    else:
+        anexo = Anexo(basename(PATH_TO_OUTPUT), caminho=abspath(PATH_TO_OUTPUT))
 
-    # Instância do Gmail.
-    gmail = BotGmailPlugin(PATH_TO_CREDENTIALS, EMAIL_PESSOAL)
+    return _mensagem_com_anexos(config, (anexo,), config.ASSUNTO_EMAIL, _destinatarios(config))
 
+
+def _mensagem_com_anexos(config: ConfiguracaoDaExecucao, anexos: Tuple[Anexo, ...], assunto: str,
+                         destinatarios: Sequence[str]) -> MensagemDeEmail:
+    """Cria a mensagem de e-mail com os anexos, para os destinatários informados.
+
+    Args:
+        config (ConfiguracaoDaExecucao): A configuração da execução.
+        anexos (Tuple[Anexo, ...]): Os anexos da mensagem.
+        assunto (str): O assunto da mensagem.
+        destinatarios (Sequence[str]): Os endereços dos destinatários.
+
+    Returns:
+        MensagemDeEmail: A mensagem pronta para envio.
+    """
     # Define os atributos da mensagem
-    to = [EMAIL_DESTINATARIO]
-    subject = ASSUNTO_EMAIL
-    body_email = ("""Bom dia, professor Ângelo.
+    to = tuple(destinatarios)
+    body_email = (f"""Bom dia, professor {config.NOME_DO_PROFESSOR}.
 
         Segue em anexo o relatório.
 
         Atenciosamente, Robô.""")
-    anexo = [abspath(PATH_TO_OUTPUT)]
 
-    # Envia a mensagem de e-mail
-    gmail.send_message(
-        subject=subject,
-        text_content=body_email,
-        to_addrs=to,
-        attachments=anexo
-    )
+    return MensagemDeEmail(destinatarios=to, assunto=assunto, corpo=body_email, anexos=tuple(anexos))
 
-    print("E-mail foi enviado com sucesso.")
+
+def _mensagem_de_aviso(config: ConfiguracaoDaExecucao, enviado_em: str,
+                       destinatarios: Sequence[str]) -> MensagemDeEmail:
+    """Cria o aviso, sem anexos, de que o relatório não mudou desde o último envio.
+
+    Args:
+        config (ConfiguracaoDaExecucao): A configuração da execução.
+        enviado_em (str): A data do envio anterior (dd/mm/YYYY).
+        destinatarios (Sequence[str]): Os endereços dos destinatários.
+
+    Returns:
+        MensagemDeEmail: A mensagem pronta para envio.
+    """
+    body_email = (f"""Bom dia, professor {config.NOME_DO_PROFESSOR}.
+
+        O relatório de frequência não mudou desde o envio de {enviado_em}. Consulte o
+        relatório enviado naquela data.
+
+        Atenciosamente, Robô.""")
+
+    return MensagemDeEmail(destinatarios=tuple(destinatarios), assunto=f"{config.ASSUNTO_EMAIL} (sem alterações)",
+                           corpo=body_email)
+
+
+def _anexo(arquivo: "ParteDoRelatorio") -> Anexo:
+    """Cria o anexo de um arquivo do relatório, em memória ou em disco.
+
+    Args:
+        arquivo (ParteDoRelatorio): O arquivo.
+
+    Returns:
+        Anexo: O anexo.
+    """
+    if arquivo.conteudo is not None:
+        return Anexo(arquivo.nome, conteudo=arquivo.conteudo)
+    return Anexo(arquivo.nome, caminho=abspath(arquivo.caminho))
+
+
+def _destinatarios(config: ConfiguracaoDaExecucao) -> Tuple[str, ...]:
+    """Retorna os endereços de `EMAIL_DESTINATARIO`, separados por vírgula ou ponto e vírgula."""
+    return tuple(e.strip() for e in re.split(r"[,;]", config.EMAIL_DESTINATARIO) if e.strip())
+
+
+def _formatos(texto: str) -> Tuple[str, ...]:
+    """Separa uma lista de formatos (ex: "pdf+xlsx" ou "pdf xlsx") em uma tupla ordenada."""
+    return tuple(sorted({formato.lower() for formato in re.split(r"[+\s]+", texto or "") if formato}))
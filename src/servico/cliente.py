@@ -0,0 +1,154 @@
+"""
+Este módulo envia trabalhos ao serviço de relatórios (veja `servidor.py`).
+
+O serviço é um processo de longa duração que já tem pandas, reportlab, os estilos
+e a sessão de e-mail carregados. Em vez de gerar o relatório, o `bot.py` descreve o
+trabalho (a configuração da execução, com a tabela, os destinatários e o PDF) e o
+envia ao serviço por um socket Unix local, esperando a resposta.
+
+O protocolo é uma linha de JSON em cada sentido:
+
+- Pedido: `{"task_id": ..., "valores": {<parâmetro>: <valor>, ...}}`.
+- Resposta: `{"situacao": "enviado" | "inalterado" | "erro", "mensagem": ...,
+  "tempo_s": ...}`.
+
+Developer's Note:
+    Este módulo é importado pelo `bot.py` na inicialização, então só pode depender
+    da biblioteca padrão e de `settings`. Os caminhos da configuração são
+    convertidos em absolutos antes do envio, pois o serviço roda em outro
+    diretório de trabalho.
+"""
+
+import json
+import os
+import socket
+from dataclasses import dataclass
+from settings import ConfiguracaoDaExecucao
+
+SITUACAO_ENVIADO = "enviado"
+SITUACAO_INALTERADO = "inalterado"
+SITUACAO_ERRO = "erro"
+
+# Maior linha aceita em cada sentido do protocolo.
+TAMANHO_MAXIMO_DA_LINHA = 1024 * 1024
+
+
+class ServicoIndisponivelError(ConnectionError):
+    """Indica que o serviço de relatórios não está em execução e o trabalho não foi aceito."""
+
+
+class ServicoSemRespostaError(RuntimeError):
+    """Indica que o serviço aceitou o trabalho, mas não respondeu.
+
+    O relatório pode ter sido enviado mesmo assim, então ele não deve ser gerado de
+    novo localmente.
+    """
+
+
+@dataclass(frozen=True)
+class RespostaDoServico:
+    """A resposta do serviço a um trabalho.
+
+    Attributes:
+        situacao (str): `enviado`, `inalterado` (os dados não mudaram desde o último
+            envio) ou `erro`.
+        mensagem (str): Uma descrição do resultado ou do erro.
+        tempo_s (float): O tempo gasto pelo serviço no trabalho, em segundos.
+    """
+    situacao: str
+    mensagem: str = ""
+    tempo_s: float = 0.0
+
+    @property
+    def sucesso(self) -> bool:
+        """Indica se o relatório foi enviado (ou não precisava ser)."""
+        return self.situacao != SITUACAO_ERRO
+
+
+def enviar_trabalho(caminho_do_socket: str, config: ConfiguracaoDaExecucao,
+                    timeout: float = 600) -> RespostaDoServico:
+    """Envia um trabalho ao serviço de relatórios e espera o resultado.
+
+    Args:
+        caminho_do_socket (str): O caminho do socket Unix do serviço.
+        config (ConfiguracaoDaExecucao): A configuração do relatório a ser gerado.
+        timeout (float): O tempo máximo de espera pela resposta, em segundos.
+
+    Returns:
+        RespostaDoServico: O resultado do trabalho.
+
+    Raises:
+        ServicoIndisponivelError: Se não for possível conectar ao serviço. Nesse
+            caso, o trabalho não foi aceito e pode ser feito localmente.
+        ServicoSemRespostaError: Se o serviço aceitou o trabalho, mas a resposta não
+            chegou (ex: o tempo de espera acabou).
+    """
+    pedido = {"task_id": config.task_id, "valores": _valores_absolutos(config)}
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conexao:
+        conexao.settimeout(timeout)
+        try:
+            conexao.connect(caminho_do_socket)
+        except OSError as e:
+            raise ServicoIndisponivelError(f"Serviço de relatórios indisponível em {caminho_do_socket}: {e}") from e
+        try:
+            escrever_linha(conexao, pedido)
+            resposta = ler_linha(conexao)
+        except (OSError, ValueError) as e:
+            raise ServicoSemRespostaError(f"O serviço de relatórios não respondeu: {e}") from e
+    if resposta is None:
+        raise ServicoSemRespostaError("O serviço de relatórios encerrou a conexão sem responder.")
+    return RespostaDoServico(**resposta)
+
+
+def escrever_linha(conexao: socket.socket, dados: dict):
+    """Envia um objeto como uma linha de JSON.
+
+    Args:
+        conexao (socket.socket): A conexão.
+        dados (dict): O objeto a ser enviado.
+    """
+    conexao.sendall(json.dumps(dados, ensure_ascii=False).encode("utf-8") + b"\n")
+
+
+def ler_linha(conexao: socket.socket) -> dict:
+    """Lê um objeto enviado como uma linha de JSON.
+
+    Args:
+        conexao (socket.socket): A conexão.
+
+    Returns:
+        dict: O objeto lido, ou `None` se a conexão foi encerrada antes da linha.
+
+    Raises:
+        ValueError: Se a linha for maior que `TAMANHO_MAXIMO_DA_LINHA` ou não for JSON.
+    """
+    partes = []
+    recebidos = 0
+    while True:
+        parte = conexao.recv(65536)
+        if not parte:
+            return None
+        fim = parte.find(b"\n")
+        if fim >= 0:
+            partes.append(parte[:fim])
+            break
+        partes.append(parte)
+        recebidos += len(parte)
+        if recebidos > TAMANHO_MAXIMO_DA_LINHA:
+            raise ValueError("Linha grande demais no protocolo do serviço de relatórios.")
+    return json.loads(b"".join(partes).decode("utf-8"))
+
+
+def _valores_absolutos(config: ConfiguracaoDaExecucao) -> dict:
+    """Retorna os valores da configuração com os caminhos convertidos em absolutos.
+
+    Args:
+        config (ConfiguracaoDaExecucao): A configuração da execução.
+
+    Returns:
+        dict: Os valores dos parâmetros, prontos para o JSON.
+    """
+    return {
+        nome: os.path.abspath(valor) if nome.startswith("PATH_TO_") and isinstance(valor, str) and valor else valor
+        for nome, valor in config.valores.items()
+    }
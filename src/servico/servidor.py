@@ -0,0 +1,202 @@
+"""
+Este módulo implementa o serviço de relatórios: um processo de longa duração que
+gera e envia relatórios pedidos pelo `bot.py` através de um socket Unix local.
+
+Sem o serviço, cada tarefa do Maestro inicia um `python bot.py` novo e paga, a cada
+relatório, a importação de pandas e reportlab, a montagem dos estilos e a
+autenticação do e-mail. O serviço faz isso uma única vez: os módulos, a folha de
+estilos (`get_styles`) e o enviador de e-mails (`obter_enviador`) ficam carregados
+entre os trabalhos, e cada pedido custa apenas a leitura da tabela, a renderização
+e o envio.
+
+Uso (a partir da raiz do projeto):
+    python -m src.servico.servidor --socket /tmp/relatorios.sock
+
+Com o serviço no ar, defina o parâmetro `PATH_TO_SOCKET_SERVICO` com o mesmo caminho
+para que o bot lhe envie os relatórios (veja `cliente.py`).
+
+Developer's Note:
+    Cada conexão é atendida em uma thread, mas a renderização acontece uma de cada
+    vez (`_trava_da_renderizacao`): pandas e reportlab disputam o GIL, e renderizar
+    em paralelo aqui só aumentaria a memória. O envio do e-mail, que espera pela
+    rede, fica fora da trava, então o relatório seguinte é renderizado enquanto o
+    anterior é enviado. Erros de um trabalho nunca derrubam o serviço: eles voltam
+    na resposta.
+"""
+
+import argparse
+import os
+import signal
+import socket
+import socketserver
+import sys
+import threading
+import time
+from typing import List, Optional
+from src.lote.processar_lote import renderizar_turma
+from src.relatorio.utils.gravacao import GravacaoEmSegundoPlano
+from src.relatorio.utils.mystyles import get_styles
+from src.send_email.send_email import enviar_partes
+from src.servico.cliente import (
+    RespostaDoServico, SITUACAO_ENVIADO, SITUACAO_ERRO, SITUACAO_INALTERADO, escrever_linha, ler_linha
+)
+from settings import ConfiguracaoDaExecucao
+
+
+class _AtendimentoDeTrabalho(socketserver.BaseRequestHandler):
+    """Atende uma conexão: lê um trabalho, executa-o e devolve a resposta."""
+
+    def handle(self):
+        """Executa o trabalho recebido na conexão."""
+        try:
+            pedido = ler_linha(self.request)
+        except ValueError as e:
+            escrever_linha(self.request, RespostaDoServico(SITUACAO_ERRO, f"Pedido inválido: {e}").__dict__)
+            return
+        if pedido is None:
+            return
+        resposta = self.server.executar(pedido)
+        escrever_linha(self.request, resposta.__dict__)
+
+
+class ServicoDeRelatorios(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Servidor que gera e envia relatórios, mantendo as dependências carregadas.
+
+    Attributes:
+        caminho_do_socket (str): O caminho do socket Unix em que o serviço escuta.
+    """
+    daemon_threads = True
+
+    def __init__(self, caminho_do_socket: str):
+        """Inicializa o serviço e abre o socket.
+
+        Args:
+            caminho_do_socket (str): O caminho do socket Unix.
+
+        Raises:
+            RuntimeError: Se já houver um serviço escutando no mesmo caminho.
+        """
+        self.caminho_do_socket = caminho_do_socket
+        _remover_socket_abandonado(caminho_do_socket)
+        self._trava_da_renderizacao = threading.Lock()
+        super().__init__(caminho_do_socket, _AtendimentoDeTrabalho)
+        # Monta a folha de estilos uma vez, antes do primeiro trabalho.
+        get_styles()
+
+    def executar(self, pedido: dict) -> RespostaDoServico:
+        """Gera e envia o relatório descrito por um pedido.
+
+        Args:
+            pedido (dict): O pedido recebido (veja o protocolo em `cliente.py`).
+
+        Returns:
+            RespostaDoServico: O resultado do trabalho.
+        """
+        inicio = time.perf_counter()
+        try:
+            config = ConfiguracaoDaExecucao(task_id=pedido["task_id"], valores=pedido["valores"])
+            situacao, mensagem = self._gerar_e_enviar(config)
+        except Exception as e:
+            situacao, mensagem = SITUACAO_ERRO, f"{type(e).__name__}: {e}"
+        tempo = round(time.perf_counter() - inicio, 3)
+        print(f"Tarefa {pedido.get('task_id')}: {situacao} em {tempo} s. {mensagem}".rstrip())
+        return RespostaDoServico(situacao, mensagem, tempo)
+
+    def _gerar_e_enviar(self, config: ConfiguracaoDaExecucao) -> tuple:
+        """Gera, envia e registra o manifesto de um relatório.
+
+        Args:
+            config (ConfiguracaoDaExecucao): A configuração do relatório.
+
+        Returns:
+            tuple: A situação e a mensagem da resposta.
+        """
+        with self._trava_da_renderizacao:
+            resultado = renderizar_turma(config, config.PATH_TO_DATA_TABLE, config.PATH_TO_OUTPUT)
+        if not resultado.sucesso:
+            return SITUACAO_ERRO, resultado.erro
+        if resultado.inalterado:
+            return SITUACAO_INALTERADO, "Os dados não mudaram desde o último envio."
+
+        gravacao = None
+        if resultado.conteudo is not None and config.SALVAR_PDF:
+            gravacao = GravacaoEmSegundoPlano(resultado.conteudo, resultado.path_to_output)
+        enviar_partes(config, list(resultado.partes), resultado.arquivos, resultado.assinatura)
+        if gravacao is not None:
+            gravacao.aguardar()
+        # O manifesto só é salvo depois do envio (veja `bot.main`).
+        if resultado.manifesto is not None:
+            resultado.manifesto.salvar(resultado.path_to_output)
+        return SITUACAO_ENVIADO, "Relatório enviado."
+
+    def server_bind(self):
+        """Cria o arquivo do socket acessível apenas pelo usuário do serviço.
+
+        A máscara de permissões vale já na criação do arquivo: ajustá-las depois com
+        `chmod` deixaria um intervalo em que outros usuários poderiam se conectar.
+        """
+        mascara = os.umask(0o077)
+        try:
+            super().server_bind()
+        finally:
+            os.umask(mascara)
+
+    def server_close(self):
+        """Fecha o socket e remove o seu arquivo."""
+        super().server_close()
+        try:
+            os.unlink(self.caminho_do_socket)
+        except FileNotFoundError:
+            pass
+
+
+def _remover_socket_abandonado(caminho_do_socket: str):
+    """Remove o arquivo de um socket deixado por um serviço que já terminou.
+
+    Args:
+        caminho_do_socket (str): O caminho do socket Unix.
+
+    Raises:
+        RuntimeError: Se houver um serviço respondendo nesse caminho.
+    """
+    if not os.path.exists(caminho_do_socket):
+        return
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as teste:
+        try:
+            teste.connect(caminho_do_socket)
+        except OSError:
+            os.unlink(caminho_do_socket)
+            return
+    raise RuntimeError(f"Já há um serviço de relatórios em {caminho_do_socket}")
+
+
+def main(argumentos: Optional[List[str]] = None) -> int:
+    """Inicia o serviço e o mantém no ar até receber SIGINT ou SIGTERM.
+
+    Args:
+        argumentos (Optional[List[str]]): Os argumentos da linha de comando.
+
+    Returns:
+        int: O código de saída do processo.
+    """
+    parser = argparse.ArgumentParser(description="Serviço de relatórios de frequência.")
+    parser.add_argument("--socket", required=True, help="O caminho do socket Unix do serviço.")
+    args = parser.parse_args(argumentos)
+
+    diretorio = os.path.dirname(os.path.abspath(args.socket))
+    os.makedirs(diretorio, exist_ok=True)
+    with ServicoDeRelatorios(args.socket) as servico:
+        # `shutdown` espera o laço de `serve_forever` terminar, então não pode ser
+        # chamado na thread que o executa (onde os sinais são tratados).
+        signal.signal(signal.SIGTERM, lambda *_: threading.Thread(target=servico.shutdown).start())
+        print(f"Serviço de relatórios escutando em {args.socket}")
+        try:
+            servico.serve_forever()
+        except KeyboardInterrupt:
+            pass
+    print("Serviço de relatórios encerrado.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,39 @@
+"""
+Configuração comum dos testes.
+
+Os testes rodam a partir da raiz do projeto (`python -m pytest`), com os módulos
+importados como no bot (`src...`, `settings`, `benchmarks...`).
+"""
+
+import os
+import sys
+import pytest
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if RAIZ not in sys.path:
+    sys.path.insert(0, RAIZ)
+
+
+@pytest.fixture
+def config_de_teste(tmp_path):
+    """Cria uma configuração local, sem o Maestro, com os arquivos em `tmp_path`.
+
+    Returns:
+        Callable[..., ConfiguracaoDaExecucao]: Uma função que recebe os parâmetros
+            a substituir e devolve a configuração.
+    """
+    from benchmarks.fakes import configuracao_falsa
+
+    def criar(**parametros):
+        padrao = {
+            "PATH_TO_LOGFILE": str(tmp_path / "logs.txt"),
+            "PATH_TO_OUTPUT": str(tmp_path / "relatorio.pdf"),
+            "PATH_TO_OUTPUT_DIR": str(tmp_path / "relatorios"),
+            "PATH_TO_CACHE_DIR": str(tmp_path / "cache"),
+            "PATH_TO_ACERVO": str(tmp_path / "acervo"),
+            "PATH_TO_INDICE_DE_ENVIOS": str(tmp_path / "envios.sqlite3"),
+            "PATH_TO_CAIXA_DE_SAIDA": str(tmp_path / "caixa_de_saida.sqlite3"),
+            "PATH_TO_PROFILE": str(tmp_path / "perfil.json"),
+        }
+        return configuracao_falsa({**padrao, **parametros}, task_id="teste")
+    return criar
@@ -0,0 +1,66 @@
+"""Testes do acervo de relatórios (`src/relatorio/acervo.py`)."""
+
+import os
+from src.relatorio.acervo import AcervoDeRelatorios
+from src.relatorio.partes import ParteDoRelatorio
+
+
+def _relatorio(tamanho):
+    return {"pdf": ParteDoRelatorio("relatorio.pdf", conteudo=b"%" * tamanho)}
+
+
+def _usar(acervo, chave, instante):
+    meta = os.path.join(acervo.diretorio, chave, "meta.json")
+    os.utime(meta, (instante, instante))
+
+
+def test_relatorio_guardado_e_encontrado(tmp_path):
+    acervo = AcervoDeRelatorios(str(tmp_path / "acervo"), 1024 * 1024)
+    pdf = tmp_path / "turma.pdf"
+    pdf.write_bytes(b"%PDF")
+
+    assert acervo.salvar("abc", {"pdf": ParteDoRelatorio("turma.pdf", caminho=str(pdf))})
+    arquivos = acervo.carregar("abc")
+
+    assert list(arquivos) == ["pdf"]
+    with open(arquivos["pdf"], "rb") as f:
+        assert f.read() == b"%PDF"
+    assert acervo.carregar("outra") is None
+    assert not [nome for nome in os.listdir(acervo.diretorio) if nome.startswith(".tmp-")]
+
+
+def test_remove_os_usados_ha_mais_tempo(tmp_path):
+    acervo = AcervoDeRelatorios(str(tmp_path / "acervo"), 2500)
+    acervo.salvar("antigo", _relatorio(1000))
+    acervo.salvar("usado", _relatorio(1000))
+    _usar(acervo, "antigo", 1_000)
+    _usar(acervo, "usado", 2_000)
+    assert acervo.carregar("antigo") is not None
+
+    acervo.salvar("novo", _relatorio(1000))
+
+    assert sorted(os.listdir(acervo.diretorio)) == ["antigo", "novo"]
+
+
+def test_relatorio_recem_guardado_nunca_e_removido(tmp_path):
+    acervo = AcervoDeRelatorios(str(tmp_path / "acervo"), 2500)
+    acervo.salvar("a", _relatorio(1000))
+    acervo.salvar("b", _relatorio(1000))
+    # Entradas marcadas no futuro (ex: por outra máquina com o relógio adiantado)
+    # deixam o relatório novo como o usado há mais tempo.
+    futuro = 4_000_000_000
+    _usar(acervo, "a", futuro)
+    _usar(acervo, "b", futuro + 1)
+
+    assert acervo.salvar("novo", _relatorio(1000))
+
+    assert sorted(os.listdir(acervo.diretorio)) == ["b", "novo"]
+
+
+def test_relatorio_maior_que_o_limite_nao_e_guardado(tmp_path):
+    acervo = AcervoDeRelatorios(str(tmp_path / "acervo"), 1024)
+    acervo.salvar("pequeno", _relatorio(100))
+
+    assert acervo.salvar("grande", _relatorio(4096)) is False
+    assert os.listdir(acervo.diretorio) == ["pequeno"]
+    assert acervo.carregar("grande") is None
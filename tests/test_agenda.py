@@ -0,0 +1,219 @@
+import asyncio
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+import pytest
+from benchmarks.fakes import LogFalso, MaestroFalso, execucao_falsa
+from src.agenda import agendador
+from src.agenda.agendador import ProgressoDaAgenda
+from src.agenda.trabalhos import AgendaInvalidaError, carregar_trabalhos
+from src.lote.processar_lote import ResultadoTurma
+
+
+@pytest.fixture
+def escrever_agenda(tmp_path):
+    def escrever(turmas, nome="agenda.json"):
+        caminho = tmp_path / nome
+        conteudo = {"escolas": [{"nome": "Escola Um", "turmas": turmas}]}
+        if nome.endswith(".json"):
+            caminho.write_text(json.dumps(conteudo), encoding="utf-8")
+        else:
+            import yaml
+            caminho.write_text(yaml.safe_dump(conteudo, allow_unicode=True), encoding="utf-8")
+        return str(caminho)
+    return escrever
+
+
+def test_prazos_com_e_sem_fuso_sao_comparados_no_horario_local(escrever_agenda, config_de_teste):
+    caminho = escrever_agenda([
+        {"nome": "A", "dados": "a.csv", "prazo": "2026-10-22 08:00"},
+        {"nome": "B", "dados": "b.csv", "prazo": "2026-10-20T08:00-03:00"},
+        {"nome": "C", "dados": "c.csv", "prazo": "2026-10-21 08:00"},
+    ])
+
+    trabalhos = carregar_trabalhos(caminho, config_de_teste())
+
+    assert [t.turma for t in trabalhos] == ["B", "C", "A"]
+    assert trabalhos[0].prazo == datetime(2026, 10, 20, 11, 0, tzinfo=timezone.utc).astimezone().replace(tzinfo=None)
+    assert all(t.prazo.tzinfo is None for t in trabalhos)
+
+
+def test_prazo_do_yaml_com_fuso(escrever_agenda, config_de_teste):
+    caminho = escrever_agenda([
+        {"nome": "A", "dados": "a.csv", "prazo": "2026-10-21 08:00"},
+        {"nome": "B", "dados": "b.csv", "prazo": datetime(2026, 10, 20, 8, 0, tzinfo=timezone.utc)},
+    ], nome="agenda.yaml")
+
+    trabalhos = carregar_trabalhos(caminho, config_de_teste())
+
+    assert [t.turma for t in trabalhos] == ["B", "A"]
+    assert trabalhos[0].prazo == datetime(2026, 10, 20, 8, 0, tzinfo=timezone.utc).astimezone().replace(tzinfo=None)
+
+
+def test_trabalhos_em_ordem_de_prazo_e_depois_da_agenda(escrever_agenda, config_de_teste):
+    caminho = escrever_agenda([
+        {"nome": "sem prazo 1", "dados": "a.csv"},
+        {"nome": "depois", "dados": "a.csv", "prazo": "2026-10-21"},
+        {"nome": "antes", "dados": "a.csv", "prazo": "2026-10-20 08:00"},
+        {"nome": "sem prazo 2", "dados": "a.csv"},
+        {"nome": "depois 2", "dados": "a.csv", "prazo": "2026-10-21 00:00"},
+    ])
+
+    trabalhos = carregar_trabalhos(caminho, config_de_teste())
+
+    assert [t.turma for t in trabalhos] == ["antes", "depois", "depois 2", "sem prazo 1", "sem prazo 2"]
+    assert trabalhos[0].dados == str(Path(caminho).parent / "a.csv")
+    assert trabalhos[0].configuracao(config_de_teste()).NOME_DA_TURMA == "antes"
+
+
+def test_turmas_com_o_mesmo_pdf_e_demais_problemas_sao_listados_juntos(escrever_agenda, config_de_teste):
+    caminho = escrever_agenda([
+        {"nome": "A-1", "dados": "a.csv"},
+        {"nome": "A 1", "dados": "b.csv"},
+        {"nome": "B", "dados": "b.csv", "prazo": "amanhã"},
+        {"nome": "C"},
+    ])
+
+    with pytest.raises(AgendaInvalidaError) as erro:
+        carregar_trabalhos(caminho, config_de_teste())
+
+    problemas = erro.value.problemas
+    assert len(problemas) == 3
+    assert "'A 1'" in problemas[0] and "mesmo PDF que 'Escola Um / A-1'" in problemas[0]
+    assert "prazo inválido 'amanhã'" in problemas[1]
+    assert "'C'" in problemas[2] and "'dados'" in problemas[2]
+
+
+@pytest.fixture
+def agenda_e_progresso(tmp_path):
+    agenda = tmp_path / "agenda.json"
+    agenda.write_text('{"escolas": []}', encoding="utf-8")
+    return str(agenda), str(tmp_path / "progresso" / "progresso.jsonl")
+
+
+def test_progresso_interrompido_e_retomado_sem_a_linha_incompleta(agenda_e_progresso):
+    agenda, caminho = agenda_e_progresso
+    progresso = ProgressoDaAgenda(caminho, agenda)
+    progresso.registrar("Escola / A", "enviado")
+    progresso.registrar("Escola / B", "inalterado")
+    progresso.fechar()
+    # A interrupção aconteceu no meio da escrita da terceira turma.
+    with open(caminho, "a", encoding="utf-8") as f:
+        f.write('{"trabalho": "Escola / C", "situ')
+
+    retomado = ProgressoDaAgenda(caminho, agenda)
+    retomado.registrar("Escola / C", "enviado")
+    retomado.fechar()
+
+    assert retomado.retomada and retomado.concluidos == {"Escola / A", "Escola / B", "Escola / C"}
+    with open(caminho, encoding="utf-8") as f:
+        linhas = [json.loads(linha) for linha in f]
+    assert [linha.get("trabalho") for linha in linhas] == [None, "Escola / A", "Escola / B", "Escola / C"]
+
+
+def test_agenda_concluida_recomeca_do_zero(agenda_e_progresso):
+    agenda, caminho = agenda_e_progresso
+    progresso = ProgressoDaAgenda(caminho, agenda)
+    progresso.registrar("Escola / A", "enviado")
+    progresso.concluir()
+
+    novo = ProgressoDaAgenda(caminho, agenda)
+    novo.fechar()
+
+    assert not novo.retomada and novo.concluidos == set()
+
+
+def test_progresso_de_outra_agenda_ou_outro_dia_e_descartado(agenda_e_progresso, monkeypatch):
+    agenda, caminho = agenda_e_progresso
+    progresso = ProgressoDaAgenda(caminho, agenda)
+    progresso.registrar("Escola / A", "enviado")
+    progresso.fechar()
+
+    monkeypatch.setattr(agendador, "data_atual", lambda: "01/01/2099")
+    outro_dia = ProgressoDaAgenda(caminho, agenda)
+    outro_dia.registrar("Escola / B", "enviado")
+    outro_dia.fechar()
+    assert not outro_dia.retomada and outro_dia.concluidos == {"Escola / B"}
+
+    with open(agenda, "a", encoding="utf-8") as f:
+        f.write("\n")
+    outra_agenda = ProgressoDaAgenda(caminho, agenda)
+    outra_agenda.fechar()
+    assert not outra_agenda.retomada and outra_agenda.concluidos == set()
+
+    sem_retomar = ProgressoDaAgenda(caminho, agenda, retomar=False)
+    sem_retomar.fechar()
+    assert not sem_retomar.retomada
+
+
+class AgendadorSemProcessos(agendador.AgendadorDeTrabalhos):
+    """Roda a leitura e a renderização em threads, para contar as chamadas."""
+
+    async def _renderizar(self, tabelas, prontos):
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            await self._renderizar_tabelas(executor, tabelas, prontos)
+
+
+@pytest.fixture
+def executar_agenda(escrever_agenda, config_de_teste, monkeypatch, tmp_path):
+    eventos = []
+    trava = threading.Lock()
+
+    def preparar_tabela(config, dados):
+        time.sleep(0.05)
+        with trava:
+            eventos.append(("ler", os.path.basename(dados)))
+        return (None, True) if "ruim" not in dados else ("DadosInvalidosError: coluna ausente", False)
+
+    def renderizar_turma(config, dados, pdf, turma, filtro):
+        with trava:
+            eventos.append(("renderizar", config.NOME_DA_TURMA, dict(filtro)))
+        return ResultadoTurma(turma, dados, pdf, inalterado=True)
+
+    monkeypatch.setattr(agendador, "preparar_tabela", preparar_tabela)
+    monkeypatch.setattr(agendador, "renderizar_turma", renderizar_turma)
+
+    def executar(turmas):
+        config = config_de_teste(CACHE_MAX_MB=64)
+        caminho = escrever_agenda(turmas)
+        progresso = ProgressoDaAgenda(str(tmp_path / "progresso.jsonl"), caminho)
+        maestro = MaestroFalso(execucao_falsa())
+        pipeline = AgendadorSemProcessos(maestro, config, LogFalso(), progresso=progresso, max_workers=4)
+        resultados = asyncio.run(pipeline.executar_trabalhos(carregar_trabalhos(caminho, config)))
+        progresso.fechar()
+        return resultados, eventos, progresso, maestro
+    return executar
+
+
+def test_csv_compartilhado_e_lido_uma_vez_antes_das_turmas(executar_agenda):
+    resultados, eventos, progresso, _ = executar_agenda([
+        {"nome": "A", "dados": "escola.csv", "filtro": {"Turma": "A"}},
+        {"nome": "B", "dados": "escola.csv", "filtro": {"Turma": "B"}},
+        {"nome": "C", "dados": "sozinha.csv"},
+    ])
+
+    assert all(resultado.sucesso for resultado in resultados)
+    assert [evento for evento in eventos if evento[0] == "ler"] == [("ler", "escola.csv")]
+    leitura = eventos.index(("ler", "escola.csv"))
+    assert eventos.index(("renderizar", "A", {"Turma": "A"})) > leitura
+    assert eventos.index(("renderizar", "B", {"Turma": "B"})) > leitura
+    assert ("renderizar", "C", {}) in eventos
+    assert progresso.concluidos == {"Escola Um / A", "Escola Um / B", "Escola Um / C"}
+
+
+def test_falha_na_leitura_compartilhada_falha_apenas_as_suas_turmas(executar_agenda):
+    resultados, eventos, progresso, maestro = executar_agenda([
+        {"nome": "A", "dados": "ruim.csv"},
+        {"nome": "B", "dados": "ruim.csv"},
+        {"nome": "C", "dados": "boa.csv"},
+    ])
+
+    assert [resultado.sucesso for resultado in resultados] == [False, False, True]
+    assert all("coluna ausente" in resultado.erro for resultado in resultados[:2])
+    assert [evento[1] for evento in eventos if evento[0] == "renderizar"] == ["C"]
+    assert progresso.concluidos == {"Escola Um / C"}
+    assert [nome for nome, _ in maestro.chamadas] == ["agrupar_alerta", "agrupar_alerta"]
@@ -0,0 +1,63 @@
+"""Testes do cache de tabelas (`src/dados/cache_tabela.py`)."""
+
+import os
+import pandas as pd
+from src.dados.cache_tabela import CacheTabela, guardar_no_cache, ler_tabela_com_cache
+
+
+def _escrever_csv(caminho, alunos):
+    with open(caminho, "w") as f:
+        f.write("Aluno,01/03,02/03\n")
+        for i in range(alunos):
+            f.write(f"Aluno {i},P,F\n")
+    return str(caminho)
+
+
+def _entradas(cache):
+    return [nome for nome in os.listdir(cache.diretorio) if nome != "chaves"]
+
+
+def test_segunda_leitura_vem_do_cache(tmp_path):
+    csv = _escrever_csv(tmp_path / "t.csv", 50)
+    cache = CacheTabela(str(tmp_path / "cache"), 10 * 1024 * 1024)
+
+    primeira = ler_tabela_com_cache(csv, cache)
+    segunda = ler_tabela_com_cache(csv, cache)
+
+    assert len(_entradas(cache)) == 1
+    pd.testing.assert_frame_equal(primeira, segunda, check_dtype=False)
+
+
+def test_tabela_maior_que_o_limite_nao_e_guardada(tmp_path, capsys):
+    csv = _escrever_csv(tmp_path / "t.csv", 2000)
+    cache = CacheTabela(str(tmp_path / "cache"), 1024)
+
+    df = ler_tabela_com_cache(csv, cache)
+
+    assert len(df) == 2000
+    assert _entradas(cache) == []
+    assert "maior que o limite" in capsys.readouterr().out
+    assert guardar_no_cache(csv, cache) is False
+
+
+def _tamanho_em_disco(cache):
+    return sum(
+        arquivo.stat().st_size
+        for nome in _entradas(cache)
+        for arquivo in os.scandir(os.path.join(cache.diretorio, nome))
+    )
+
+
+def test_entrada_recem_guardada_nunca_e_removida(tmp_path):
+    pequena = _escrever_csv(tmp_path / "pequena.csv", 10)
+    grande = _escrever_csv(tmp_path / "grande.csv", 300)
+    medida = CacheTabela(str(tmp_path / "medida"), 10 * 1024 * 1024)
+    guardar_no_cache(grande, medida)
+    # A grande cabe sozinha no limite, mas não junto com a pequena.
+    cache = CacheTabela(str(tmp_path / "cache"), _tamanho_em_disco(medida) + 1)
+
+    assert guardar_no_cache(pequena, cache)
+    assert guardar_no_cache(grande, cache)
+
+    assert cache.carregar(grande, "{}") is not None
+    assert cache.carregar(pequena, "{}") is None
@@ -0,0 +1,186 @@
+import os
+import subprocess
+import sys
+import textwrap
+import time
+import pytest
+from botcity.maestro import AlertType, AutomationTaskFinishStatus
+from benchmarks.fakes import MaestroFalso, execucao_falsa
+from src.notificacao import caixa_de_saida
+from src.notificacao.caixa_de_saida import CaixaDeSaidaDoMaestro
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class MaestroInstavel(MaestroFalso):
+    """Recusa as primeiras chamadas dos títulos informados, como uma rede instável."""
+
+    def __init__(self, recusas=None):
+        super().__init__(execucao_falsa())
+        self.recusas = dict(recusas or {})
+
+    def alert(self, **kwargs):
+        if self.recusas.get(kwargs["title"], 0) > 0:
+            self.recusas[kwargs["title"]] -= 1
+            raise ConnectionError("Maestro indisponível")
+        self.chamadas.append(("alert", kwargs))
+
+
+class MaestroLento(MaestroFalso):
+    """Demora a responder, como um Maestro do outro lado da rede."""
+
+    def __init__(self):
+        super().__init__(execucao_falsa())
+
+    def alert(self, **kwargs):
+        time.sleep(0.05)
+        self.chamadas.append(("alert", kwargs))
+
+
+@pytest.fixture
+def abrir_caixa(config_de_teste):
+    caixas = []
+
+    def abrir(maestro, **parametros):
+        config = config_de_teste(MAESTRO_INTERVALO_DE_ALERTAS=3600, MAESTRO_TEMPO_DE_ENCERRAMENTO=5,
+                                 **parametros)
+        caixa = CaixaDeSaidaDoMaestro(maestro, config, espera_inicial=0.05)
+        caixas.append(caixa)
+        return caixa
+
+    yield abrir
+    for caixa in caixas:
+        caixa.encerrar()
+
+
+def test_chamadas_sobrevivem_ao_processo_interrompido(abrir_caixa, config_de_teste, tmp_path):
+    artefato = tmp_path / "relatorio.pdf"
+    artefato.write_bytes(b"%PDF")
+    caminho = config_de_teste().PATH_TO_CAIXA_DE_SAIDA
+    # O processo registra as chamadas com o Maestro fora do ar e morre sem encerrar
+    # a caixa de saída (`os._exit` não roda o `atexit`), então as reservas dele só
+    # deixam de valer quando vencem.
+    codigo = textwrap.dedent(f"""
+        import os, sys
+        sys.path.insert(0, {RAIZ!r})
+        from botcity.maestro import AlertType, AutomationTaskFinishStatus
+        from benchmarks.fakes import configuracao_falsa
+        from src.notificacao import caixa_de_saida
+        from src.notificacao.caixa_de_saida import CaixaDeSaidaDoMaestro
+
+        caixa_de_saida.TEMPO_DE_RESERVA = 0.5
+
+        class ForaDoAr:
+            def __getattr__(self, nome):
+                def recusar(*args, **kwargs):
+                    raise ConnectionError("Maestro fora do ar")
+                return recusar
+
+        config = configuracao_falsa({{"PATH_TO_CAIXA_DE_SAIDA": {caminho!r}}}, task_id="teste")
+        caixa = CaixaDeSaidaDoMaestro(ForaDoAr(), config, espera_inicial=60)
+        caixa.alert("teste", "Início", "ok", AlertType.INFO)
+        caixa.post_artifact("teste", "relatorio.pdf", {str(artefato)!r})
+        caixa.finish_task("teste", AutomationTaskFinishStatus.SUCCESS, "fim")
+        os._exit(0)
+    """)
+    subprocess.run([sys.executable, "-c", codigo], check=True, timeout=60)
+    artefato.unlink()
+    time.sleep(0.6)
+
+    maestro = MaestroFalso(execucao_falsa())
+    caixa = abrir_caixa(maestro)
+    assert caixa.aguardar(timeout=5)
+
+    assert [nome for nome, _ in maestro.chamadas] == ["alert", "post_artifact", "finish_task"]
+    # O artefato foi copiado para a caixa de saída antes da interrupção.
+    _, artefato_enviado = maestro.chamadas[1]
+    assert artefato_enviado["artifact_name"] == "relatorio.pdf"
+    assert maestro.chamadas[2][1]["status"] == AutomationTaskFinishStatus.SUCCESS
+
+
+def test_falha_de_uma_tarefa_nao_atrasa_outra_nem_fura_a_fila(abrir_caixa):
+    maestro = MaestroInstavel(recusas={"A1": 2})
+    caixa = abrir_caixa(maestro, MAESTRO_TENTATIVAS=5)
+    caixa.alert("A", "A1", "ok", AlertType.INFO)
+    caixa.alert("A", "A2", "ok", AlertType.INFO)
+    caixa.alert("B", "B1", "ok", AlertType.INFO)
+    assert caixa.aguardar(timeout=5)
+
+    titulos = [chamada["title"] for _, chamada in maestro.chamadas]
+    assert sorted(titulos) == ["A1", "A2", "B1"]
+    assert titulos.index("A1") < titulos.index("A2")
+    assert titulos.index("B1") < titulos.index("A1")
+
+
+def test_alertas_agrupados_viram_um_resumo_antes_da_finalizacao(abrir_caixa):
+    maestro = MaestroFalso(execucao_falsa())
+    caixa = abrir_caixa(maestro)
+    caixa.agrupar_alerta("teste", "Falhas no lote", "Turma A", "erro A", AlertType.INFO)
+    caixa.agrupar_alerta("teste", "Falhas no lote", "Turma B", "erro B", AlertType.ERROR)
+    caixa.agrupar_alerta("outra", "Falhas no lote", "Turma C", "erro C", AlertType.WARN)
+    caixa.agrupar_alerta("teste", "Falhas no lote", "Turma D", "erro D", AlertType.WARN)
+    caixa.finish_task("teste", AutomationTaskFinishStatus.PARTIALLY_COMPLETED, "3 falhas")
+    assert caixa.aguardar(timeout=5)
+
+    do_teste = [(nome, chamada) for nome, chamada in maestro.chamadas if chamada["task_id"] == "teste"]
+    assert [nome for nome, _ in do_teste] == ["alert", "finish_task"]
+    resumo = do_teste[0][1]
+    assert resumo["title"] == "Falhas no lote (3)"
+    assert resumo["message"] == "Turma A: erro A\nTurma B: erro B\nTurma D: erro D"
+    assert resumo["alert_type"] == AlertType.ERROR
+    # O grupo de outra tarefa é juntado à parte (em `aguardar`).
+    da_outra = [chamada for nome, chamada in maestro.chamadas if chamada["task_id"] == "outra"]
+    assert [chamada["title"] for chamada in da_outra] == ["Falhas no lote (1)"]
+
+
+def test_resumo_grande_e_cortado(abrir_caixa, monkeypatch):
+    monkeypatch.setattr(caixa_de_saida, "TAMANHO_MAXIMO_DO_RESUMO", 100)
+    maestro = MaestroFalso(execucao_falsa())
+    caixa = abrir_caixa(maestro)
+    for turma in range(20):
+        caixa.agrupar_alerta("teste", "Falhas", f"Turma {turma}", "x" * 20, AlertType.WARN)
+    assert caixa.aguardar(timeout=5)
+
+    (_, resumo), = maestro.chamadas
+    linhas = resumo["message"].splitlines()
+    assert resumo["title"] == "Falhas (20)"
+    assert linhas[-1] == f"... e mais {20 - (len(linhas) - 1)} (veja o log)."
+
+
+def test_duas_caixas_no_mesmo_banco_nao_repetem_envios(abrir_caixa):
+    maestros = [MaestroLento(), MaestroLento()]
+    primeira, segunda = abrir_caixa(maestros[0]), abrir_caixa(maestros[1])
+    for alerta in range(5):
+        primeira.alert("A", f"A{alerta}", "ok", AlertType.INFO)
+    segunda.alert("B", "B0", "ok", AlertType.INFO)
+    assert primeira.aguardar(timeout=5) and segunda.aguardar(timeout=5)
+
+    titulos = [[chamada["title"] for _, chamada in maestro.chamadas] for maestro in maestros]
+    assert titulos == [[f"A{alerta}" for alerta in range(5)], ["B0"]]
+
+
+def test_caixa_nova_nao_mexe_nas_chamadas_de_outra_viva(abrir_caixa):
+    # A primeira caixa falha e agenda uma nova tentativa para daqui a 60 s.
+    recusando = MaestroInstavel(recusas={"A1": 10})
+    primeira = abrir_caixa(recusando)
+    primeira._espera_inicial = 60
+    primeira.agrupar_alerta("A", "Falhas", "Turma 1", "erro", AlertType.WARN)
+    primeira.alert("A", "A1", "ok", AlertType.INFO)
+    prazo = time.monotonic() + 5
+    while time.monotonic() < prazo and not primeira._banco.execute(
+        "SELECT tentativas FROM chamadas WHERE grupo IS NULL"
+    ).fetchone()[0]:
+        time.sleep(0.01)
+
+    maestro = MaestroFalso(execucao_falsa())
+    segunda = abrir_caixa(maestro)
+    segunda.alert("B", "B1", "ok", AlertType.INFO)
+
+    assert segunda.aguardar(timeout=5)
+    assert [chamada["title"] for _, chamada in maestro.chamadas] == ["B1"]
+    # A espera da primeira caixa continua valendo e o grupo dela não foi juntado.
+    proxima, = primeira._banco.execute(
+        "SELECT proxima_tentativa FROM chamadas WHERE metodo = 'alert' AND grupo IS NULL"
+    ).fetchone()
+    assert proxima > time.time() + 30
+    assert primeira.pendentes() == 2
@@ -0,0 +1,76 @@
+import threading
+import time
+import pytest
+from src.send_email import enviador
+from src.send_email.enviador import EnviadorDeEmails, LimiteDeEnvioError, MensagemDeEmail, TransporteFalso
+
+
+def mensagem(assunto: str = "Relatório") -> MensagemDeEmail:
+    return MensagemDeEmail(destinatarios=("professor@escola.br",), assunto=assunto, corpo="Segue.", anexos=())
+
+
+@pytest.fixture
+def esperas(monkeypatch):
+    """Registra as esperas entre as tentativas, sem esperar de fato."""
+    registradas = []
+    monkeypatch.setattr(enviador.time, "sleep", registradas.append)
+    monkeypatch.setattr(enviador.random, "uniform", lambda a, b: 1.0)
+    return registradas
+
+
+def test_repete_o_envio_recusado_por_limite(esperas):
+    transporte = TransporteFalso(recusas_por_limite=2)
+    EnviadorDeEmails(transporte, "robo@escola.br", tentativas=5, espera_inicial=0.5).enviar(mensagem())
+
+    assert len(transporte.enviadas) == 1
+    # A latência do transporte falso (0) também passa por time.sleep.
+    assert [espera for espera in esperas if espera] == [0.5, 1.0]
+
+
+def test_espera_dobra_a_cada_tentativa_e_desiste_no_fim(esperas):
+    transporte = TransporteFalso(recusas_por_limite=10)
+    with pytest.raises(LimiteDeEnvioError):
+        EnviadorDeEmails(transporte, "robo@escola.br", tentativas=4, espera_inicial=1.0).enviar(mensagem())
+
+    assert transporte.enviadas == []
+    assert [espera for espera in esperas if espera] == [1.0, 2.0, 4.0]
+
+
+def test_enviar_varios_devolve_os_erros_na_ordem_das_mensagens():
+    class TransporteQueRecusa(TransporteFalso):
+        def enviar(self, montada):
+            if montada["Subject"] == "ruim":
+                raise RuntimeError("recusada")
+            super().enviar(montada)
+
+    transporte = TransporteQueRecusa()
+    enviador_ = EnviadorDeEmails(transporte, "robo@escola.br", max_concorrencia=3)
+    erros = enviador_.enviar_varios([mensagem("a"), mensagem("ruim"), mensagem("b"), mensagem("c")])
+
+    assert [type(erro) if erro else None for erro in erros] == [None, RuntimeError, None, None]
+    assert sorted(enviada["Subject"] for enviada in transporte.enviadas) == ["a", "b", "c"]
+
+
+def test_enviar_varios_respeita_a_concorrencia_maxima():
+    ativos, maximo = 0, 0
+    trava = threading.Lock()
+
+    class TransporteMedido(TransporteFalso):
+        def enviar(self, montada):
+            nonlocal ativos, maximo
+            with trava:
+                ativos += 1
+                maximo = max(maximo, ativos)
+            time.sleep(0.02)
+            with trava:
+                ativos -= 1
+            super().enviar(montada)
+
+    transporte = TransporteMedido()
+    erros = EnviadorDeEmails(transporte, "robo@escola.br", max_concorrencia=2).enviar_varios(
+        [mensagem(str(i)) for i in range(8)]
+    )
+
+    assert erros == [None] * 8
+    assert len(transporte.enviadas) == 8
+    assert 1 < maximo <= 2
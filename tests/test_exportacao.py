@@ -0,0 +1,100 @@
+import importlib.util
+from io import BytesIO, StringIO
+import pandas as pd
+import pytest
+from src.relatorio import exportacao
+from src.relatorio.analise_frequencia import COLUNA_FREQUENCIA, analisar_frequencia, coluna_dos_nomes
+from src.relatorio.exportacao import (
+    Exportador, ExportadorCSV, ExportadorHTML, ExportadorXLSX, FormatoIndisponivelError, exportar_relatorio,
+    formatos_necessarios
+)
+from src.relatorio.gerar_relatorio import report
+
+TEM_OPENPYXL = importlib.util.find_spec("openpyxl") is not None
+
+
+@pytest.fixture
+def turma():
+    df = pd.DataFrame({
+        "Aluno": ["Ana", "Bruno <b>", "Carla", "Davi"],
+        "01/03": ["P", "F", "P", "F"],
+        "02/03": ["P", "F", "P", "P"],
+        "03/03": ["P", "P", "F", "F"],
+    })
+    resumo = analisar_frequencia(df, 0.75)
+    return resumo.tabela_com_indicadores(df), resumo, coluna_dos_nomes(resumo.dias, df)
+
+
+def exportar(exportador: Exportador, turma, tamanho_do_bloco: int = 3) -> bytes:
+    tabela, resumo, nomes = turma
+    exportador.comecar(tabela, resumo, nomes)
+    for inicio in range(0, len(tabela), tamanho_do_bloco):
+        exportador.escrever(tabela.iloc[inicio:inicio + tamanho_do_bloco])
+    return exportador.terminar()
+
+
+def test_exportador_e_abstrato():
+    with pytest.raises(TypeError):
+        Exportador()
+
+    class SemTerminar(Exportador):
+        def escrever(self, bloco):
+            pass
+
+    with pytest.raises(TypeError):
+        SemTerminar()
+
+
+def test_csv_tem_um_resumo_por_aluno_em_blocos(turma):
+    conteudo = exportar(ExportadorCSV(), turma)
+
+    assert conteudo.startswith(b"\xef\xbb\xbf")
+    csv = pd.read_csv(StringIO(conteudo.decode("utf-8-sig")), sep=";", decimal=",")
+    assert list(csv.columns[[0, 1, -1]]) == ["Aluno", f"{COLUNA_FREQUENCIA} (%)", "Situação"]
+    assert csv["Aluno"].tolist() == ["Ana", "Bruno <b>", "Carla", "Davi"]
+    assert csv[f"{COLUNA_FREQUENCIA} (%)"].tolist() == [100.0, 33.3, 66.7, 33.3]
+    assert csv["Situação"].tolist() == ["Regular", "Abaixo do limite", "Abaixo do limite", "Abaixo do limite"]
+
+
+def test_html_tem_a_tabela_inteira_com_texto_escapado(turma):
+    pagina = exportar(ExportadorHTML(), turma).decode("utf-8")
+
+    assert pagina.count("<tr><td>") == 4
+    assert "Bruno &lt;b&gt;" in pagina and "Bruno <b>" not in pagina
+    assert "Alunos: 4." in pagina
+    assert pagina.rstrip().endswith("</html>")
+
+
+@pytest.mark.skipif(not TEM_OPENPYXL, reason="openpyxl não está instalado")
+def test_xlsx_tem_a_tabela_e_o_resumo(turma):
+    from openpyxl import load_workbook
+
+    planilha = load_workbook(BytesIO(exportar(ExportadorXLSX(), turma)))
+    assert planilha.sheetnames == ["Resumo", "Frequência"]
+    linhas = list(planilha["Frequência"].values)
+    assert linhas[0][0] == "Aluno" and [linha[0] for linha in linhas[1:]] == ["Ana", "Bruno <b>", "Carla", "Davi"]
+    assert dict(planilha["Resumo"].values)["Alunos"] == 4
+
+
+def test_xlsx_sem_openpyxl_e_recusado_antes_da_geracao(config_de_teste, monkeypatch):
+    encontrar = importlib.util.find_spec
+    monkeypatch.setattr(exportacao.importlib.util, "find_spec",
+                        lambda nome, *args: None if nome == "openpyxl" else encontrar(nome, *args))
+    config = config_de_teste(FORMATOS_DO_RELATORIO="pdf+csv+xlsx")
+
+    with pytest.raises(FormatoIndisponivelError, match="pip install openpyxl"):
+        formatos_necessarios(config)
+    assert formatos_necessarios(config.com(FORMATOS_DO_RELATORIO="pdf+csv")) == ("csv",)
+
+
+def test_exportar_relatorio_gera_todos_os_formatos(config_de_teste, turma, monkeypatch):
+    monkeypatch.setattr(exportacao, "LINHAS_POR_BLOCO", 3)
+    tabela, _, _ = turma
+    df = tabela[["Aluno", "01/03", "02/03", "03/03"]]
+    config = config_de_teste(FORMATOS_DO_RELATORIO="pdf+csv+html")
+
+    exportado = exportar_relatorio(config, report(config, em_memoria=True), df)
+
+    assert exportado.pdf.startswith(b"%PDF") and not exportado.do_acervo
+    assert [arquivo.nome for arquivo in exportado.arquivos] == ["relatorio_resumo.csv", "relatorio.html"]
+    assert exportado.arquivos[0].conteudo == exportar(ExportadorCSV(), turma)
@@ -0,0 +1,15 @@
+from benchmarks.bench_importacao import MODULOS_PESADOS, ORCAMENTO_PADRAO_MS, medir_importacao, pesados_importados
+
+
+def test_import_bot_nao_carrega_modulos_pesados():
+    tempos = medir_importacao("bot")
+
+    assert "bot" in tempos
+    assert "pandas" in MODULOS_PESADOS and "reportlab" in MODULOS_PESADOS
+    assert pesados_importados(tempos) == []
+
+
+def test_import_bot_cabe_no_orcamento():
+    # Vale o menor tempo entre as repetições, como no benchmark.
+    total_ms = min(medir_importacao("bot")["bot"][1] for _ in range(3)) / 1000
+    assert total_ms <= ORCAMENTO_PADRAO_MS, f"import bot levou {total_ms:.1f} ms"
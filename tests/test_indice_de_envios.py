@@ -0,0 +1,107 @@
+import pytest
+from benchmarks.fakes import execucao_falsa
+from src.relatorio.partes import ParteDoRelatorio
+from src.send_email import indice_de_envios, send_email
+from src.send_email.enviador import EnviadorDeEmails, TransporteFalso
+from src.send_email.indice_de_envios import IndiceDeEnvios
+from src.send_email.send_email import enviar_partes
+import settings as s
+
+ASSINATURA = "abc123"
+PARTES = [ParteDoRelatorio("relatorio_1.pdf", conteudo=b"%PDF-1", numero=1, total=2),
+          ParteDoRelatorio("relatorio_2.pdf", conteudo=b"%PDF-2", numero=2, total=2)]
+
+
+class TransporteQueRecusa(TransporteFalso):
+    """Recusa as mensagens para um destinatário com o assunto informado."""
+
+    def __init__(self, destinatario=None, assunto=None):
+        super().__init__()
+        self._recusada = (destinatario, assunto)
+
+    def enviar(self, montada):
+        if (montada["To"], montada["Subject"]) == self._recusada:
+            raise RuntimeError("recusada")
+        super().enviar(montada)
+
+
+@pytest.fixture
+def enviar(config_de_teste, monkeypatch):
+    """Envia o relatório de duas partes por um transporte falso, sem novas tentativas."""
+    def enviar_relatorio(politica, transporte=None, **parametros):
+        transporte = transporte or TransporteFalso()
+        monkeypatch.setattr(send_email, "obter_enviador",
+                            lambda config: EnviadorDeEmails(transporte, "robo@escola.br", tentativas=1))
+        config = config_de_teste(REENVIO_DE_RELATORIO=politica, EMAIL_DESTINATARIO="a@escola.br, b@escola.br",
+                                 ASSUNTO_EMAIL="Frequência", **parametros)
+        enviar_partes(config, PARTES, assinatura=ASSINATURA)
+        return transporte, indice_de_envios.indice_da_execucao(config)
+    return enviar_relatorio
+
+
+def _enviadas(transporte):
+    return sorted((mensagem["To"], mensagem["Subject"]) for mensagem in transporte.enviadas)
+
+
+def test_indice_registra_e_consulta_por_assinatura(tmp_path):
+    indice = IndiceDeEnvios(str(tmp_path / "envios.sqlite3"))
+    indice.registrar(["a@escola.br"], ASSINATURA)
+
+    assert list(indice.enviados(["a@escola.br", "b@escola.br"], ASSINATURA)) == ["a@escola.br"]
+    assert indice.enviados(["a@escola.br"], "outra") == {}
+
+
+def test_pular_nao_envia_de_novo(enviar):
+    primeiro, indice = enviar("pular")
+    segundo, _ = enviar("pular")
+
+    assert len(primeiro.enviadas) == 2
+    assert segundo.enviadas == []
+    assert sorted(indice.enviados(["a@escola.br", "b@escola.br"], ASSINATURA)) == ["a@escola.br", "b@escola.br"]
+
+
+def test_avisar_envia_um_aviso_sem_anexos(enviar):
+    enviar("avisar")
+    segundo, _ = enviar("avisar")
+
+    (aviso,) = segundo.enviadas
+    assert aviso["Subject"] == "Frequência (sem alterações)"
+    assert aviso["To"] == "a@escola.br, b@escola.br"
+    assert not list(aviso.iter_attachments())
+
+
+def test_enviar_ignora_o_indice(enviar):
+    enviar("enviar")
+    segundo, indice = enviar("enviar")
+
+    assert indice is None
+    assert len(segundo.enviadas) == 2
+
+
+def test_quem_nao_recebeu_todas_as_partes_nao_e_registrado(enviar):
+    # "b" pede também o CSV, então recebe mensagens separadas das de "a".
+    recusando = TransporteQueRecusa("b@escola.br", "Frequência (parte 2 de 2)")
+    with pytest.raises(RuntimeError, match="recusada"):
+        enviar("pular", recusando, FORMATOS_POR_DESTINATARIO="b@escola.br: pdf+csv")
+
+    segundo, indice = enviar("pular", FORMATOS_POR_DESTINATARIO="b@escola.br: pdf+csv")
+
+    assert _enviadas(recusando) == [("a@escola.br", "Frequência (parte 1 de 2)"),
+                                    ("a@escola.br", "Frequência (parte 2 de 2)"),
+                                    ("b@escola.br", "Frequência (parte 1 de 2)")]
+    assert _enviadas(segundo) == [("b@escola.br", "Frequência (parte 1 de 2)"),
+                                  ("b@escola.br", "Frequência (parte 2 de 2)")]
+    assert sorted(indice.enviados(["a@escola.br", "b@escola.br"], ASSINATURA)) == ["a@escola.br", "b@escola.br"]
+
+
+@pytest.mark.parametrize("valor, esperado", [(" Pular ", "pular"), ("AVISAR", "avisar"), ("", "enviar")])
+def test_politica_de_reenvio_normalizada(valor, esperado):
+    config = s.resolver_configuracao(execucao_falsa({"REENVIO_DE_RELATORIO": valor}))
+    assert config.REENVIO_DE_RELATORIO == esperado
+
+
+def test_politica_de_reenvio_invalida_e_recusada_no_inicio():
+    with pytest.raises(s.ConfiguracaoInvalidaError, match="REENVIO_DE_RELATORIO.*'pular' ou 'avisar'.*'pula'"):
+        s.resolver_configuracao(execucao_falsa({"REENVIO_DE_RELATORIO": "pula"}))
+    with pytest.raises(s.ConfiguracaoInvalidaError, match="REENVIO_DE_RELATORIO"):
+        s.converter_valores({"REENVIO_DE_RELATORIO": "sempre"})
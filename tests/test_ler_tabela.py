@@ -0,0 +1,69 @@
+"""Testes da leitura em blocos da tabela de frequência (`src/dados/ler_tabela.py`)."""
+
+import pandas as pd
+import pytest
+from src.dados import ler_tabela
+from src.dados.ler_tabela import ler_tabela_frequencia
+from src.errors.errors import DadosInvalidosError
+
+
+@pytest.fixture
+def amostra_pequena(monkeypatch):
+    """Reduz a amostra de tipos para que os testes não precisem de milhares de linhas."""
+    monkeypatch.setattr(ler_tabela, "LINHAS_DA_AMOSTRA", 5)
+
+
+def _escrever(caminho, linhas):
+    caminho.write_text("\n".join(linhas) + "\n")
+    return str(caminho)
+
+
+def test_le_a_tabela_em_blocos_igual_ao_read_csv(tmp_path):
+    caminho = _escrever(tmp_path / "t.csv", ["Aluno,01/03,Nota"] + [f"A{i},P,{i}" for i in range(25)])
+
+    df = ler_tabela_frequencia(caminho, chunksize=4)
+
+    pd.testing.assert_frame_equal(df, pd.read_csv(caminho), check_dtype=False)
+
+
+@pytest.mark.parametrize("valor_tardio, tipo", [("7.5", "float64"), ("sete", "object")])
+def test_coluna_alargada_quando_blocos_posteriores_nao_cabem_no_tipo_da_amostra(
+        tmp_path, amostra_pequena, valor_tardio, tipo):
+    linhas = ["Aluno,Nota"] + [f"A{i},{i}" for i in range(10)] + [f"B,{valor_tardio}"]
+    caminho = _escrever(tmp_path / "t.csv", linhas)
+
+    df = ler_tabela_frequencia(caminho, chunksize=3)
+
+    assert str(df["Nota"].dtype) == tipo
+    assert len(df) == 11
+    assert str(df["Nota"].iloc[-1]) == valor_tardio
+    # Os mesmos valores que o `pd.read_csv` lê do arquivo inteiro.
+    esperado = pd.read_csv(caminho)["Nota"]
+    assert df["Nota"].astype(str).tolist() == esperado.astype(str).tolist()
+
+
+def test_alarga_em_duas_etapas(tmp_path, amostra_pequena):
+    linhas = ["Aluno,Nota"] + [f"A{i},{i}" for i in range(6)] + ["B,1.5", "C,1", "D,texto"]
+    caminho = _escrever(tmp_path / "t.csv", linhas)
+
+    df = ler_tabela_frequencia(caminho, chunksize=2)
+
+    assert str(df["Nota"].dtype) == "object"
+    assert df["Nota"].tolist()[-1] == "texto"
+    assert len(df) == 9
+
+
+def test_nulos_em_blocos_posteriores_continuam_sendo_recusados(tmp_path, amostra_pequena):
+    linhas = ["Aluno,Nota"] + [f"A{i},{i}" for i in range(8)] + ["B,"]
+    caminho = _escrever(tmp_path / "t.csv", linhas)
+
+    with pytest.raises(DadosInvalidosError, match="Valores nulos"):
+        ler_tabela_frequencia(caminho, chunksize=3)
+
+
+def test_tipo_explicito_nao_e_alargado(tmp_path, amostra_pequena):
+    linhas = ["Aluno,Nota"] + [f"A{i},{i}" for i in range(8)] + ["B,1.5"]
+    caminho = _escrever(tmp_path / "t.csv", linhas)
+
+    with pytest.raises(DadosInvalidosError, match="fora do esquema"):
+        ler_tabela_frequencia(caminho, chunksize=3, dtypes={"Nota": "Int64"})
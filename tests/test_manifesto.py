@@ -0,0 +1,56 @@
+from datetime import datetime
+import pandas as pd
+import settings as s
+from src.relatorio import manifesto as m
+from src.relatorio.manifesto import ManifestoDoRelatorio, manifesto_do_relatorio
+from src.relatorio.utils import getdata
+
+
+def tabela(presencas=(1, 0, 1, 1)) -> pd.DataFrame:
+    return pd.DataFrame({"Aluno": [f"aluno{i}" for i in range(len(presencas))], "Presenca": list(presencas)})
+
+
+def test_relatorio_incremental_vem_desligado():
+    assert s.RELATORIO_INCREMENTAL.default_value is False
+
+
+def test_mesmos_dados_em_outro_dia_dao_o_mesmo_manifesto(config_de_teste, monkeypatch):
+    config = config_de_teste()
+
+    def no_dia(dia: int):
+        class Relogio(datetime):
+            @classmethod
+            def now(cls, tz=None):
+                return datetime(2026, 3, dia, 8, 0)
+        monkeypatch.setattr(getdata, "dt", Relogio)
+
+    no_dia(1)
+    hoje = manifesto_do_relatorio(config, tabela(), linhas_por_pagina=2)
+    no_dia(2)
+    assert getdata.data_atual() == "02/03/2026"
+    amanha = manifesto_do_relatorio(config, tabela(), linhas_por_pagina=2)
+
+    assert amanha.inalterado(hoje)
+
+
+def test_manifesto_muda_com_os_dados_e_os_parametros(config_de_teste):
+    config = config_de_teste()
+    base = manifesto_do_relatorio(config, tabela(), linhas_por_pagina=2)
+
+    outros_dados = manifesto_do_relatorio(config, tabela((1, 0, 1, 0)), linhas_por_pagina=2)
+    assert not outros_dados.inalterado(base)
+    assert outros_dados.paginas_alteradas(base) == [2]
+
+    outro_assunto = manifesto_do_relatorio(config.com(ASSUNTO_EMAIL="Outro"), tabela(), linhas_por_pagina=2)
+    assert outro_assunto.impressao != base.impressao
+    assert outro_assunto.paginas_alteradas(base) == [1, 2]
+
+
+def test_manifesto_de_outra_versao_e_ignorado(config_de_teste, tmp_path, monkeypatch):
+    pdf = str(tmp_path / "relatorio.pdf")
+    manifesto = manifesto_do_relatorio(config_de_teste(), tabela(), linhas_por_pagina=2)
+    manifesto.salvar(pdf)
+    assert ManifestoDoRelatorio.carregar(pdf) == manifesto
+
+    monkeypatch.setattr(m, "VERSAO_DO_MANIFESTO", m.VERSAO_DO_MANIFESTO + 1)
+    assert ManifestoDoRelatorio.carregar(pdf) is None
@@ -0,0 +1,75 @@
+from io import BytesIO
+from reportlab.platypus import Flowable, PageBreak, SimpleDocTemplate
+from benchmarks.bench_memoria import medir_em_processo_novo
+from benchmarks.dados_sinteticos import gerar_csv_frequencia
+from src.relatorio.utils.memoria import HistoriaSobDemanda
+
+
+class Contador:
+    def __init__(self):
+        self.criados = 0
+        self.desenhados = 0
+        self.maximo_pendente = 0
+
+
+class Linha(Flowable):
+    """Um elemento pequeno que registra quando é desenhado."""
+
+    def __init__(self, contador: Contador):
+        super().__init__()
+        self._contador = contador
+
+    def wrap(self, availWidth, availHeight):
+        return availWidth, 40
+
+    def draw(self):
+        self._contador.desenhados += 1
+        self.canv.line(0, 0, 100, 0)
+
+
+def elementos(contador: Contador, quantidade: int):
+    for i in range(quantidade):
+        contador.criados += 1
+        contador.maximo_pendente = max(contador.maximo_pendente, contador.criados - contador.desenhados)
+        yield Linha(contador)
+        if i % 50 == 49:
+            yield PageBreak()
+
+
+def gerar(historia) -> bytes:
+    buffer = BytesIO()
+    SimpleDocTemplate(buffer, invariant=1).build(historia)
+    return buffer.getvalue()
+
+
+def test_build_puxa_os_elementos_um_a_um_ate_o_fim():
+    # Fixa o que `HistoriaSobDemanda` espera de `SimpleDocTemplate.build`: que ele
+    # consulte `len()` a cada elemento e remova cada um da lista ao diagramá-lo.
+    contador = Contador()
+    historia = HistoriaSobDemanda(elementos(contador, 300))
+    historia.extend(elementos(contador, 20))
+    gerar(historia)
+
+    assert contador.desenhados == contador.criados == 320
+    assert contador.maximo_pendente <= 2
+
+
+def test_pdf_e_igual_ao_de_uma_lista_comum():
+    sob_demanda = gerar(HistoriaSobDemanda(elementos(Contador(), 120)))
+    lista = gerar(list(elementos(Contador(), 120)))
+    assert sob_demanda == lista
+
+
+def test_pico_de_memoria_nao_cresce_com_as_linhas_da_tabela(tmp_path):
+    # Uma turma 10x maior só pode aumentar o pico no ritmo do PDF (as páginas já
+    # comprimidas), como em `bench_memoria`, e não no das linhas formatadas.
+    medicoes = []
+    for linhas in (1_000, 10_000):
+        csv = str(tmp_path / f"frequencia_{linhas}.csv")
+        gerar_csv_frequencia(csv, linhas)
+        medicoes.append(medir_em_processo_novo(csv))
+    menor, maior = medicoes
+
+    crescimento_do_pico = maior["pico_acima_da_base_mb"] - menor["pico_acima_da_base_mb"]
+    crescimento_do_pdf = maior["pdf_mb"] - menor["pdf_mb"]
+    assert crescimento_do_pico <= 3 * crescimento_do_pdf + 2, medicoes
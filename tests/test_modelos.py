@@ -0,0 +1,60 @@
+"""Testes dos modelos de parágrafos fixos (`src/relatorio/utils/modelos.py`)."""
+
+import pandas as pd
+import pytest
+from src.relatorio.gerar_relatorio import report
+from src.relatorio.utils import modelos
+from src.relatorio.utils.modelos import ParagrafoPreQuebrado, paragrafo_fixo
+
+
+@pytest.fixture
+def contar_quebras(monkeypatch):
+    """Conta as chamadas a `breakLines` dos parágrafos fixos, a partir de modelos novos."""
+    # Relatórios gerados por outros testes já deixaram os modelos com as linhas quebradas.
+    modelos._modelo_do_paragrafo.cache_clear()
+    chamadas = []
+    original = ParagrafoPreQuebrado.breakLines
+
+    def breakLines(self, *args, **kwargs):
+        chamadas.append(self.text)
+        return original(self, *args, **kwargs)
+
+    monkeypatch.setattr(ParagrafoPreQuebrado, "breakLines", breakLines)
+    return chamadas
+
+
+def test_copias_do_modelo_reaproveitam_as_linhas_quebradas(contar_quebras):
+    texto = "Um parágrafo fixo de teste, longo o bastante para ocupar mais de uma linha. " * 3
+
+    primeira = paragrafo_fixo(texto, "corpo-do-texto")
+    segunda = paragrafo_fixo(texto, "corpo-do-texto")
+    medida_1 = primeira.wrap(400, 800)
+    medida_2 = segunda.wrap(400, 800)
+
+    assert primeira is not segunda
+    assert medida_1 == medida_2
+    assert segunda.blPara is primeira.blPara
+    assert len(contar_quebras) == 1
+
+
+def test_outra_largura_quebra_as_linhas_de_novo(contar_quebras):
+    texto = "Outro parágrafo fixo de teste, medido em duas larguras diferentes. " * 3
+
+    paragrafo_fixo(texto, "corpo-do-texto").wrap(400, 800)
+    paragrafo_fixo(texto, "corpo-do-texto").wrap(200, 800)
+    paragrafo_fixo(texto, "corpo-do-texto").wrap(400, 800)
+
+    assert len(contar_quebras) == 2
+
+
+def test_relatorios_seguintes_nao_quebram_as_linhas_de_novo(config_de_teste, contar_quebras):
+    config = config_de_teste()
+    df = pd.DataFrame({"Aluno": [f"Aluno {i}" for i in range(5)], "01/03": ["P", "F", "P", "P", "F"]})
+
+    report(config, em_memoria=True).given_report(df)
+    quebras_do_primeiro = len(contar_quebras)
+    report(config, em_memoria=True).given_report(df)
+    report(config, em_memoria=True).given_report(df)
+
+    assert quebras_do_primeiro > 0
+    assert len(contar_quebras) == quebras_do_primeiro
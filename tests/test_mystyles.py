@@ -0,0 +1,36 @@
+"""Testes da folha de estilos compartilhada (`src/relatorio/utils/mystyles.py`)."""
+
+import pytest
+from reportlab.lib.styles import ParagraphStyle
+from src.relatorio.utils.mystyles import get_styles
+
+
+def test_get_styles_devolve_a_mesma_folha():
+    assert get_styles() is get_styles()
+
+
+def test_alterar_um_estilo_recebido_nao_afeta_a_folha():
+    estilo = get_styles()["titulo-central"]
+    tamanho = estilo.fontSize
+
+    estilo.fontSize = tamanho + 10
+    get_styles().get("corpo-do-texto").leading = 99
+
+    assert get_styles()["titulo-central"].fontSize == tamanho
+    assert get_styles()["corpo-do-texto"].leading != 99
+
+
+def test_folha_nao_aceita_novos_estilos():
+    folha = get_styles()
+
+    with pytest.raises(TypeError):
+        folha.add(ParagraphStyle(name="novo"))
+    with pytest.raises(TypeError):
+        folha.byName["novo"] = ParagraphStyle(name="novo")
+
+
+def test_estilo_da_folha_serve_de_pai_para_um_novo_estilo():
+    filho = ParagraphStyle(name="variacao", parent=get_styles()["Normal"], fontSize=20)
+
+    assert filho.fontName == get_styles()["Normal"].fontName
+    assert filho.fontSize == 20
@@ -0,0 +1,75 @@
+import asyncio
+import multiprocessing
+import pytest
+from benchmarks.fakes import LogFalso
+from src.lote.processar_lote import ResultadoTurma
+from src.pipeline.orquestrador import PipelineDeRelatorios
+from src.relatorio.manifesto import ManifestoDoRelatorio
+
+
+class PipelineSemRenderizacao(PipelineDeRelatorios):
+    """Entrega resultados de renderização prontos, sem processos trabalhadores."""
+
+    def __init__(self, *args, renderizados=(), **kwargs):
+        super().__init__(*args, **kwargs)
+        self._renderizados = renderizados
+
+    async def _renderizar(self, tabelas, prontos):
+        for resultado in self._renderizados:
+            await prontos.put(resultado)
+
+
+@pytest.fixture
+def executar(config_de_teste):
+    def executar_pipeline(*renderizados):
+        log = LogFalso()
+        pipeline = PipelineSemRenderizacao(None, config_de_teste(SALVAR_PDF="false"), log,
+                                           renderizados=renderizados)
+        tabelas = [(r.path_to_data_table, r.path_to_output) for r in renderizados]
+        return asyncio.run(pipeline.executar(tabelas)), log
+    return executar_pipeline
+
+
+def turma_enviada(tmp_path, nome="turmaA"):
+    manifesto = ManifestoDoRelatorio(impressao="abc", paginas=("1",))
+    return ResultadoTurma(nome, f"{nome}.csv", str(tmp_path / f"{nome}.pdf"), conteudo=b"%PDF", manifesto=manifesto)
+
+
+def test_manifesto_e_salvo_depois_do_envio(executar, tmp_path):
+    turma = turma_enviada(tmp_path)
+    (resultado,), log = executar(turma)
+
+    assert resultado.sucesso
+    assert ManifestoDoRelatorio.carregar(turma.path_to_output) == turma.manifesto
+    assert [nivel for nivel, _ in log.mensagens] == ["INFO"]
+
+
+def test_falha_ao_salvar_o_manifesto_nao_desfaz_o_envio(executar, tmp_path, monkeypatch):
+    def salvar_com_falha(self, path_to_output):
+        raise OSError("disco cheio")
+    monkeypatch.setattr(ManifestoDoRelatorio, "salvar", salvar_com_falha)
+
+    (resultado,), log = executar(turma_enviada(tmp_path))
+
+    assert resultado.sucesso and not resultado.inalterado
+    avisos = [mensagem for nivel, mensagem in log.mensagens if nivel == "WARNING"]
+    assert len(avisos) == 1 and "turmaA" in avisos[0] and "disco cheio" in avisos[0]
+    assert not any(nivel == "ERROR" for nivel, _ in log.mensagens)
+
+
+def test_relatorio_do_acervo_aparece_no_log(executar, tmp_path):
+    turma = ResultadoTurma("turmaA", "turmaA.csv", str(tmp_path / "turmaA.pdf"), conteudo=b"%PDF", do_acervo=True)
+    (resultado,), log = executar(turma)
+
+    assert resultado.sucesso and resultado.do_acervo
+    assert log.mensagens == [("INFO", "Turma turmaA: relatório enviado (do acervo, sem ser gerado de novo).")]
+
+
+@pytest.mark.parametrize("aquecidos", ["true", "false"])
+def test_trabalhadores_nunca_sao_criados_com_fork(config_de_teste, aquecidos):
+    pipeline = PipelineDeRelatorios(None, config_de_teste(TRABALHADORES_AQUECIDOS=aquecidos), LogFalso())
+
+    metodo = pipeline._contexto_dos_trabalhadores().get_start_method()
+
+    assert metodo != "fork"
+    assert metodo == ("forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn")
@@ -0,0 +1,83 @@
+import pandas as pd
+import pytest
+from benchmarks.fakes import execucao_falsa
+from src.relatorio import partes
+from src.relatorio.partes import AnexoGrandeDemaisError
+import settings as s
+
+LINHAS = 10
+BYTES_POR_LINHA = 100
+
+
+@pytest.fixture
+def dividir(config_de_teste, monkeypatch):
+    """Divide uma tabela de 10 alunos com um relatório falso de tamanho previsível.
+
+    Cada aluno ocupa 100 bytes e a primeira parte leva ainda a capa, com o tamanho
+    informado.
+    """
+    tentativas = []
+
+    def dividir_tabela(capa, limite):
+        class RelatorioFalso:
+            def __init__(self, config, path_to_output, em_memoria=False):
+                assert em_memoria
+
+            def given_report(self, df, linhas, parte):
+                inicio, fim = linhas
+                numero, total = parte
+                if numero == 1:
+                    tentativas.append([])
+                tentativas[-1].append(linhas)
+                return b"x" * ((fim - inicio) * BYTES_POR_LINHA + (capa if numero == 1 else 0))
+
+        monkeypatch.setattr(partes, "report", RelatorioFalso)
+        df = pd.DataFrame({"Aluno": [f"Aluno {i}" for i in range(LINHAS)]})
+        tamanho = LINHAS * BYTES_POR_LINHA + capa
+        return partes._dividir(config_de_teste(), df, "saida/turma.pdf", tamanho, limite)
+    return dividir_tabela, tentativas
+
+
+def _linhas(intervalos):
+    return [linha for inicio, fim in intervalos for linha in range(inicio, fim)]
+
+
+def test_partes_cobrem_cada_linha_uma_vez(dividir):
+    dividir_tabela, tentativas = dividir
+    resultado = dividir_tabela(capa=0, limite=500)
+
+    assert len(tentativas) == 1
+    assert _linhas(tentativas[0]) == list(range(LINHAS))
+    assert [parte.nome for parte in resultado] == ["turma_parte1de3.pdf", "turma_parte2de3.pdf", "turma_parte3de3.pdf"]
+    assert [(parte.numero, parte.total) for parte in resultado] == [(1, 3), (2, 3), (3, 3)]
+    assert all(parte.tamanho <= 500 for parte in resultado)
+
+
+def test_divisao_refeita_com_mais_partes_se_alguma_passar_do_limite(dividir):
+    dividir_tabela, tentativas = dividir
+    # Estimadas 3 partes; a primeira, com a capa, fica com 700 bytes e é refeita em 5.
+    resultado = dividir_tabela(capa=300, limite=500)
+
+    assert [len(intervalos) for intervalos in tentativas] == [3, 5]
+    assert all(_linhas(intervalos) == list(range(LINHAS)) for intervalos in tentativas)
+    assert len(resultado) == 5 and all(parte.tamanho <= 500 for parte in resultado)
+
+
+def test_relatorio_que_nao_cabe_nem_dividido(dividir):
+    dividir_tabela, tentativas = dividir
+    with pytest.raises(AnexoGrandeDemaisError, match="turma.pdf"):
+        dividir_tabela(capa=1000, limite=500)
+
+    # A última tentativa já tinha um aluno por parte.
+    assert len(tentativas[-1]) == LINHAS
+
+
+@pytest.mark.parametrize("valor, esperado", [(" ZIP ", "zip"), ("Dividir", "dividir"), ("", "dividir")])
+def test_anexo_acima_do_limite_normalizado(valor, esperado):
+    config = s.resolver_configuracao(execucao_falsa({"ANEXO_ACIMA_DO_LIMITE": valor}))
+    assert config.ANEXO_ACIMA_DO_LIMITE == esperado
+
+
+def test_anexo_acima_do_limite_invalido_e_recusado_no_inicio():
+    with pytest.raises(s.ConfiguracaoInvalidaError, match="ANEXO_ACIMA_DO_LIMITE.*'dividir' ou 'zip'.*'zipar'"):
+        s.resolver_configuracao(execucao_falsa({"ANEXO_ACIMA_DO_LIMITE": "zipar"}))
@@ -0,0 +1,40 @@
+"""Testes do modo em lote (`src/lote/processar_lote.py`)."""
+
+import os
+import pytest
+from src.lote.processar_lote import tabelas_do_lote
+
+
+def _criar_csv(caminho):
+    os.makedirs(os.path.dirname(caminho), exist_ok=True)
+    with open(caminho, "w") as f:
+        f.write("Aluno,01/03\nAna,P\n")
+
+
+def test_tabelas_com_nomes_diferentes_mantem_o_nome_do_csv(tmp_path):
+    _criar_csv(tmp_path / "turmas" / "A.csv")
+    _criar_csv(tmp_path / "turmas" / "B.csv")
+
+    pares = tabelas_do_lote(str(tmp_path / "turmas"), "saida")
+
+    assert [os.path.basename(pdf) for _, pdf in pares] == ["A.pdf", "B.pdf"]
+
+
+def test_tabelas_de_mesmo_nome_em_diretorios_diferentes_geram_pdfs_distintos(tmp_path):
+    _criar_csv(tmp_path / "turmas" / "2024" / "A.csv")
+    _criar_csv(tmp_path / "turmas" / "2025" / "A.csv")
+    _criar_csv(tmp_path / "turmas" / "2025" / "B.csv")
+
+    pares = tabelas_do_lote(str(tmp_path / "turmas" / "*" / "*.csv"), "saida")
+
+    pdfs = [os.path.basename(pdf) for _, pdf in pares]
+    assert pdfs == ["2024_A.pdf", "2025_A.pdf", "B.pdf"]
+
+
+def test_colisao_que_persiste_depois_do_caminho_relativo_falha(tmp_path):
+    _criar_csv(tmp_path / "turmas" / "x" / "A.csv")
+    _criar_csv(tmp_path / "turmas" / "y" / "A.csv")
+    _criar_csv(tmp_path / "turmas" / "z" / "x_A.csv")
+
+    with pytest.raises(ValueError, match="mesmo relatório"):
+        tabelas_do_lote(str(tmp_path / "turmas" / "*" / "*.csv"), "saida")
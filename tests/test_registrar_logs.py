@@ -0,0 +1,67 @@
+import glob
+import json
+import pytest
+from src.log.registrar_logs import LogFile
+
+
+@pytest.fixture
+def criar_log(config_de_teste):
+    logs = []
+
+    def criar(**parametros):
+        log = LogFile(config_de_teste(**parametros))
+        logs.append(log)
+        return log
+    yield criar
+    for log in logs:
+        log.close()
+
+
+def _mensagens(caminho):
+    with open(caminho, encoding="utf-8") as f:
+        return [json.loads(linha)["mensagem"] for linha in f]
+
+
+def test_mensagem_que_nao_e_texto_e_gravada_como_texto(criar_log):
+    log = criar_log()
+    log.log_message(ValueError("coluna ausente"), level="ERROR")
+    log.log_message({"turma": "A", "alunos": {1, 2}})
+    log.flush()
+
+    assert _mensagens(log.path_file) == ["coluna ausente", "{'turma': 'A', 'alunos': {1, 2}}"]
+
+
+def test_erro_ao_gravar_um_lote_nao_encerra_a_thread(criar_log, monkeypatch):
+    log = criar_log()
+    gravar = log._gravar
+    falhas = []
+
+    def gravar_falhando_uma_vez(registros):
+        if not falhas:
+            falhas.append(registros)
+            raise TypeError("registro inválido")
+        gravar(registros)
+
+    monkeypatch.setattr(log, "_gravar", gravar_falhando_uma_vez)
+    log.log_message("perdida")
+    log.flush()
+    log.log_message("gravada")
+    log.flush()
+
+    assert log._gravador.is_alive()
+    assert _mensagens(log.path_file) == ["gravada"]
+
+
+def test_arquivo_girado_pelo_tamanho_em_bytes(criar_log):
+    # Cada registro tem cerca de 330 caracteres, mas 530 bytes: contando o novo
+    # registro em caracteres, o segundo caberia junto com o primeiro.
+    limite = 1000
+    log = criar_log(LOG_MAX_BYTES=limite, LOG_BACKUPS=5)
+    for _ in range(3):
+        log.log_message("é" * 200)
+        log.flush()
+
+    arquivos = sorted(glob.glob(log.path_file + "*"))
+    assert len(arquivos) == 3
+    assert all(len(_mensagens(arquivo)) == 1 for arquivo in arquivos)
+    assert all(len(open(arquivo, "rb").read()) <= limite for arquivo in arquivos)
@@ -0,0 +1,64 @@
+import os
+import stat
+import threading
+import pytest
+from src.send_email import send_email
+from src.send_email.enviador import EnviadorDeEmails, TransporteFalso
+from src.servico.cliente import SITUACAO_ENVIADO, SITUACAO_ERRO, SITUACAO_INALTERADO, enviar_trabalho
+from src.servico.servidor import ServicoDeRelatorios
+
+
+@pytest.fixture
+def servico(tmp_path, monkeypatch):
+    """Mantém um serviço de relatórios no ar, em uma thread, com e-mails falsos."""
+    transporte = TransporteFalso()
+    monkeypatch.setattr(send_email, "obter_enviador",
+                        lambda config: EnviadorDeEmails(transporte, "robo@escola.br", tentativas=1))
+    # Um caminho curto: sockets Unix têm um limite de ~100 caracteres.
+    caminho = os.path.join(str(tmp_path), "s.sock")
+    servidor = ServicoDeRelatorios(caminho)
+    thread = threading.Thread(target=servidor.serve_forever, daemon=True)
+    thread.start()
+    yield servidor, transporte
+    servidor.shutdown()
+    servidor.server_close()
+    thread.join()
+
+
+@pytest.fixture
+def tabela(tmp_path):
+    caminho = tmp_path / "turma.csv"
+    caminho.write_text("Aluno,01/03,02/03\nAna,P,P\nBruno,F,P\n", encoding="utf-8")
+    return str(caminho)
+
+
+def test_socket_criado_apenas_para_o_usuario(servico):
+    servidor, _ = servico
+    modo = os.stat(servidor.caminho_do_socket).st_mode
+
+    assert stat.S_ISSOCK(modo)
+    assert stat.S_IMODE(modo) & 0o077 == 0
+
+
+def test_trabalho_enviado_pelo_servico_e_devolvido_ao_cliente(servico, tabela, config_de_teste):
+    servidor, transporte = servico
+    config = config_de_teste(PATH_TO_DATA_TABLE=tabela, EMAIL_DESTINATARIO="a@escola.br", RELATORIO_INCREMENTAL=True)
+
+    resposta = enviar_trabalho(servidor.caminho_do_socket, config, timeout=60)
+    repetida = enviar_trabalho(servidor.caminho_do_socket, config, timeout=60)
+
+    assert resposta.situacao == SITUACAO_ENVIADO, resposta.mensagem
+    assert repetida.situacao == SITUACAO_INALTERADO
+    (mensagem,) = transporte.enviadas
+    assert mensagem["To"] == "a@escola.br"
+    assert os.path.exists(config.PATH_TO_OUTPUT)
+
+
+def test_erro_do_trabalho_volta_na_resposta(servico, config_de_teste, tmp_path):
+    servidor, transporte = servico
+    config = config_de_teste(PATH_TO_DATA_TABLE=str(tmp_path / "ausente.csv"))
+
+    resposta = enviar_trabalho(servidor.caminho_do_socket, config, timeout=60)
+
+    assert resposta.situacao == SITUACAO_ERRO and "ausente.csv" in resposta.mensagem
+    assert transporte.enviadas == []
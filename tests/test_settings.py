@@ -0,0 +1,32 @@
+import pytest
+from benchmarks.fakes import execucao_falsa
+import settings as s
+
+
+@pytest.mark.parametrize("texto, esperado", [
+    ("true", True), ("SIM", True), (" 1 ", True), ("yes", True),
+    ("false", False), ("0", False), ("nao", False), ("Não", False), ("no", False),
+])
+def test_booleanos_aceitos(texto, esperado):
+    config = s.resolver_configuracao(execucao_falsa({"PDF_EM_MEMORIA": texto}))
+    assert config.PDF_EM_MEMORIA is esperado
+
+
+def test_booleano_vazio_usa_o_padrao():
+    config = s.resolver_configuracao(execucao_falsa({"PDF_EM_MEMORIA": ""}))
+    assert config.PDF_EM_MEMORIA is s.PDF_EM_MEMORIA.default_value
+
+
+def test_booleano_com_erro_de_digitacao_e_recusado():
+    with pytest.raises(s.ConfiguracaoInvalidaError) as erro:
+        s.resolver_configuracao(execucao_falsa({"PDF_EM_MEMORIA": "ture", "SALVAR_PDF": "talvez", "CSV_CHUNKSIZE": "x"}))
+
+    problemas = erro.value.problemas
+    assert len(problemas) == 3
+    assert any("PDF_EM_MEMORIA" in problema and "'ture'" in problema for problema in problemas)
+    assert any("SALVAR_PDF" in problema for problema in problemas)
+
+
+def test_converter_valores_recusa_booleano_invalido():
+    with pytest.raises(s.ConfiguracaoInvalidaError, match="PDF_EM_MEMORIA"):
+        s.converter_valores({"PDF_EM_MEMORIA": "verdadeiro"})